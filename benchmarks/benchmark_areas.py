@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Permite importar o simulador.py (raiz do projeto)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from simulador import Simulador, gerar_conexoes
+from benchmark_convergencia import resumir
+
+
+# Função para gerar uma topologia hierárquica: um backbone e as demais áreas com o mesmo tamanho, cada área (grafo aleatório com o grau
+# médio informado) ligada ao backbone por alguns enlaces, retornando as conexões e a área de cada enlace
+# Grafos aleatórios sem hierarquia não se dividem em áreas contíguas: fora do backbone, quase todos os roteadores ficam conectados entre si
+def gerar_conexoes_areas(quant_nos: int, quantidade_areas: int, grau_medio: float, enlaces_backbone: int = 2) -> tuple[list[tuple[str, str, int]], dict[tuple[str, str], int]]:
+    conexoes = []
+    areas = {}
+    roteadores_area = []
+    inicio = 0
+    for area in range(quantidade_areas):
+        tamanho = quant_nos // quantidade_areas + (area < quant_nos % quantidade_areas)
+        nomes = {f"r{indice + 1}": f"r{inicio + indice + 1}" for indice in range(tamanho)}
+        for origem, destino, custo in gerar_conexoes(tamanho, grau_medio):
+            conexoes.append((nomes[origem], nomes[destino], custo))
+            areas[(nomes[origem], nomes[destino])] = area
+        roteadores_area.append(sorted(nomes.values()))
+        inicio += tamanho
+
+    # Os enlaces até o backbone pertencem à área de fora, tornando ABRs os roteadores do backbone
+    for area in range(1, quantidade_areas):
+        for _ in range(enlaces_backbone):
+            origem, destino = random.choice(roteadores_area[0]), random.choice(roteadores_area[area])
+            if ((origem, destino) not in areas):
+                conexoes.append((origem, destino, random.randint(1, 10)))
+                areas[(origem, destino)] = area
+    return conexoes, areas
+
+
+# Função para simular a topologia (com as áreas informadas, ou em uma única área), retornando as medições por roteador após a convergência
+def executar(conexoes: list[tuple[str, str, int]], areas: dict[tuple[str, str], int] | None, semente: int, limite: float) -> dict:
+    areas = areas or {}
+    inicio_cpu = time.process_time()
+    simulador = Simulador(conexoes, semente=semente, areas=areas)
+    convergencia = simulador.executar_ate_convergir(limite)
+    cpu = time.process_time() - inicio_cpu
+
+    roteadores = simulador.roteadores.values()
+    estatisticas = simulador.estatisticas_roteadores()
+    return {
+        "areas": max(len(set(areas.values())), 1),
+        "abrs": sum(roteador.abr for roteador in roteadores),
+        "convergencia": convergencia,
+        "tempo_cpu": cpu,
+        "entradas_lsdb": resumir([valores["entradas_lsdb"] for valores in estatisticas.values()]),
+        "lsas_recebidos": resumir([valores["lsas_recebidos"] for valores in estatisticas.values()]),
+        # Tempo total gasto nos cálculos do SPF de cada roteador (somado entre as LSDBs das áreas de um ABR)
+        "spf_segundos": resumir([sum(lsdb.duracao_spf.soma for lsdb in roteador.lsdbs.values()) for roteador in roteadores]),
+        "rotas": resumir([len(fib.instaladas) for fib in simulador.fibs.values()]),
+    }
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Compara a rede simulada em uma única área e dividida em áreas (LSDB, LSAs recebidos, tempo de SPF e rotas por roteador)")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 200],
+                        help="Quantidades de roteadores das topologias geradas")
+    parser.add_argument("--grau", type=float, default=4,
+                        help="Grau médio das topologias geradas")
+    parser.add_argument("--areas", type=int, default=4,
+                        help="Quantidade de áreas da topologia gerada (backbone e demais áreas)")
+    parser.add_argument("--limite", type=float, default=300,
+                        help="Tempo (virtual, em segundos) máximo aguardado pela convergência")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente dos geradores aleatórios")
+    args = parser.parse_args()
+
+    print(f"{'nós':>6} {'áreas':>6} {'ABRs':>5} {'conv. (s)':>10} {'LSDB p50':>9} {'LSDB máx.':>10} {'LSAs rec. p50':>14} "
+          f"{'SPF p50 (ms)':>13} {'rotas p50':>10} {'cpu (s)':>8}")
+    for tamanho in args.tamanhos:
+        random.seed(args.semente)
+        conexoes, areas = gerar_conexoes_areas(tamanho, args.areas, args.grau)
+        # A mesma topologia, em uma única área e dividida em áreas
+        for areas_execucao in (None, areas):
+            resultado = executar(conexoes, areas_execucao, args.semente, args.limite)
+            convergencia = resultado["convergencia"]
+            print(f"{tamanho:>6} {resultado['areas']:>6} {resultado['abrs']:>5} "
+                  f"{convergencia if (convergencia is not None) else float('nan'):>10.3f} "
+                  f"{resultado['entradas_lsdb']['p50']:>9.0f} {resultado['entradas_lsdb']['max']:>10.0f} "
+                  f"{resultado['lsas_recebidos']['p50']:>14.0f} {1000 * resultado['spf_segundos']['p50']:>13.2f} "
+                  f"{resultado['rotas']['p50']:>10.0f} {resultado['tempo_cpu']:>8.2f}")
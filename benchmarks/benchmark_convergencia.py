@@ -0,0 +1,152 @@
+import os
+import sys
+import csv
+import json
+import time
+import random
+import argparse
+
+# Permite importar o grafo.py e o simulador.py (raiz do projeto)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from simulador import Simulador, gerar_conexoes
+
+# Percentis calculados para cada métrica
+PERCENTIS = [50, 90, 99]
+
+# Métricas coletadas de cada roteador
+METRICAS_ROTEADOR = ["lsas_enviados", "lsas_recebidos", "lsas_retransmitidos", "execucoes_spf", "escritas_rotas"]
+
+
+# Função para calcular um percentil (interpolação linear entre as posições vizinhas, como no numpy)
+def percentil(valores: list[float], p: float) -> float:
+    ordenados = sorted(valores)
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+# Função para resumir uma lista de valores (mínimo, média, percentis e máximo)
+def resumir(valores: list[float]) -> dict:
+    if (not valores):
+        return {}
+    resumo = {"min": min(valores), "media": sum(valores) / len(valores)}
+    for p in PERCENTIS:
+        resumo[f"p{p}"] = percentil(valores, p)
+    resumo["max"] = max(valores)
+    return resumo
+
+
+# Função para executar um cenário uma única vez, retornando as medições da execução
+def executar(quant_nos: int, grau_medio: float, semente: int, limite: float, perda: float, latencia: float) -> dict:
+    random.seed(semente)
+    conexoes = gerar_conexoes(quant_nos, grau_medio)
+
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+    simulador = Simulador(conexoes, latencia=latencia, perda=perda, semente=semente)
+    convergencia = simulador.executar_ate_convergir(limite)
+    por_roteador = simulador.estatisticas_roteadores()
+
+    execucao = {
+        "semente": semente,
+        "roteadores": len(simulador.roteadores),
+        "enlaces": len(conexoes),
+        "convergencia": convergencia,
+        "tempo_real": time.perf_counter() - inicio,
+        "tempo_cpu": time.process_time() - inicio_cpu,
+    }
+    for metrica in METRICAS_ROTEADOR:
+        valores = [estatisticas[metrica] for estatisticas in por_roteador.values()]
+        execucao[metrica] = sum(valores)
+        execucao[f"{metrica}_por_roteador"] = valores
+    return execucao
+
+
+# Função para executar um cenário várias vezes, resumindo as medições de todas as execuções
+def executar_cenario(quant_nos: int, grau_medio: float, repeticoes: int, semente: int, limite: float, perda: float, latencia: float) -> dict:
+    execucoes = [executar(quant_nos, grau_medio, semente + repeticao, limite, perda, latencia)
+                 for repeticao in range(repeticoes)]
+
+    resumo = {
+        "convergencia": resumir([execucao["convergencia"] for execucao in execucoes if execucao["convergencia"] is not None]),
+        "tempo_cpu": resumir([execucao["tempo_cpu"] for execucao in execucoes]),
+    }
+    for metrica in METRICAS_ROTEADOR:
+        resumo[metrica] = resumir([execucao[metrica] for execucao in execucoes])
+        # Distribuição entre todos os roteadores de todas as execuções
+        resumo[f"{metrica}_por_roteador"] = resumir(
+            [valor for execucao in execucoes for valor in execucao.pop(f"{metrica}_por_roteador")])
+
+    return {
+        "roteadores": quant_nos,
+        "grau_medio": grau_medio,
+        "repeticoes": repeticoes,
+        "perda": perda,
+        "latencia": latencia,
+        "nao_convergiram": sum(execucao["convergencia"] is None for execucao in execucoes),
+        "resumo": resumo,
+        "execucoes": execucoes,
+    }
+
+
+# Função para salvar os resumos dos cenários em .csv (uma linha por cenário e métrica)
+def salvar_csv(cenarios: list[dict], caminho_csv: str):
+    colunas = ["min", "media"] + [f"p{p}" for p in PERCENTIS] + ["max"]
+    with open(caminho_csv, mode='w', newline='') as arquivo_csv:
+        escritor = csv.writer(arquivo_csv)
+        escritor.writerow(["roteadores", "grau_medio", "repeticoes", "perda", "latencia", "metrica"] + colunas)
+        for cenario in cenarios:
+            for metrica, resumo in cenario["resumo"].items():
+                escritor.writerow(
+                    [cenario["roteadores"], cenario["grau_medio"], cenario["repeticoes"], cenario["perda"], cenario["latencia"], metrica] +
+                    [resumo.get(coluna, "") for coluna in colunas])
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Mede o tempo de convergência da rede simulada para vários tamanhos e densidades de topologia")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[50, 100, 200],
+                        help="Quantidades de roteadores das topologias geradas")
+    parser.add_argument("--graus", type=float, nargs="+", default=[4, 8],
+                        help="Graus médios das topologias geradas")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Quantidade de execuções de cada cenário (cada uma com uma topologia e semente diferentes)")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente da primeira execução de cada cenário")
+    parser.add_argument("--limite", type=float, default=300,
+                        help="Tempo (virtual, em segundos) máximo aguardado pela convergência")
+    parser.add_argument("--perdas", type=float, nargs="+", default=[0.0],
+                        help="Probabilidades de perda de cada pacote (entre 0 e 1)")
+    parser.add_argument("--latencia", type=float, default=0.005,
+                        help="Latência (em segundos) de cada enlace")
+    parser.add_argument("--json", help="Arquivo .json onde os resultados completos são salvos")
+    parser.add_argument("--csv", help="Arquivo .csv onde os resumos (mínimo, média, percentis e máximo) são salvos")
+    args = parser.parse_args()
+
+    print(f"{'nós':>6} {'grau':>5} {'perda':>6} {'conv. p50 (s)':>14} {'conv. p90 (s)':>14} {'LSAs env./rot. p50':>19} "
+          f"{'retx./rot. p50':>15} {'SPF/rot. p50':>13} {'rotas/rot. p50':>15} {'cpu p50 (s)':>12}")
+    cenarios = []
+    for tamanho in args.tamanhos:
+        for grau in args.graus:
+            for perda in args.perdas:
+                cenario = executar_cenario(tamanho, grau, args.repeticoes, args.semente, args.limite, perda, args.latencia)
+                cenarios.append(cenario)
+                resumo = cenario["resumo"]
+                convergencia = resumo["convergencia"]
+                print(f"{tamanho:>6} {grau:>5g} {perda:>6g} {convergencia.get('p50', float('nan')):>14.3f} {convergencia.get('p90', float('nan')):>14.3f} "
+                      f"{resumo['lsas_enviados_por_roteador']['p50']:>19.0f} {resumo['lsas_retransmitidos_por_roteador']['p50']:>15.0f} "
+                      f"{resumo['execucoes_spf_por_roteador']['p50']:>13.0f} {resumo['escritas_rotas_por_roteador']['p50']:>15.0f} "
+                      f"{resumo['tempo_cpu']['p50']:>12.2f}")
+                if (cenario["nao_convergiram"]):
+                    print(f"       {cenario['nao_convergiram']} execuções não convergiram em {args.limite:.0f} s")
+
+    if (args.json):
+        with open(args.json, "w") as arquivo:
+            json.dump({"parametros": vars(args), "cenarios": cenarios}, arquivo, indent=2)
+        print(f"Resultados salvos em: {args.json}")
+    if (args.csv):
+        salvar_csv(cenarios, args.csv)
+        print(f"Resumos salvos em: {args.csv}")
@@ -0,0 +1,216 @@
+import os
+import sys
+import time
+import random
+import tracemalloc
+import argparse
+
+# Permite importar o grafo.py (raiz do projeto) e o roteador.py (pasta roteador)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "roteador"))
+
+from grafo import gerar_grafo
+from roteador import LSDB, TopologiaLSDB
+
+
+# Função para montar uma LSDB completa a partir de um grafo do networkx
+def montar_lsdb(grafo, router_id: str = "r1") -> LSDB:
+    lsdb = LSDB(router_id, {})
+    for no in grafo.nodes():
+        links = {vizinho: dados["weight"] for vizinho, dados in grafo[no].items()}
+        lsdb._tabela[no] = lsdb.criar_entrada(1, 0, [], links)
+    return lsdb
+
+
+# Função para medir a memória (em KiB) da topologia nos dois formatos: dicionários de enlaces com o índice reverso usado no cálculo dos
+# próximos pulos, e a topologia em arrays (índices inteiros e enlaces em formato CSR)
+def medir_memoria(grafo) -> tuple[float, float, TopologiaLSDB]:
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    tabela = {no: {"links": {vizinho: dados["weight"] for vizinho, dados in grafo[no].items()}} for no in grafo.nodes()}
+    entrantes = LSDB.indexar_entrantes(tabela)
+    meio = tracemalloc.get_traced_memory()[0]
+    topologia = TopologiaLSDB()
+    topologia.reconstruir(tabela)
+    fim = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entrantes
+    return (meio - inicio) / 1024, (fim - meio) / 1024, topologia
+
+
+# Função para executar o SPF completo com ECMP sobre os dicionários (Dijkstra seguido do cálculo dos próximos pulos pelo índice reverso)
+def spf_dicionarios(lsdb: LSDB) -> dict:
+    distancias, _ = lsdb.dijkstra_completo(lsdb._tabela)
+    lsdb.atualizar_proximo_pulo(distancias, lsdb.indexar_entrantes(lsdb._tabela))
+    return lsdb._roteamento
+
+
+# Função para medir o menor tempo (em segundos) de execução de uma função
+def medir(funcao, repeticoes: int) -> tuple[float, dict]:
+    melhor = float("inf")
+    resultado = None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+# Função para medir o tempo médio (em segundos) do SPF incremental após a alteração do custo de um único enlace
+def medir_incremental(lsdb: LSDB, alteracoes: int) -> float:
+    # Mesmo estado deixado pelo cálculo completo da LSDB: árvore de menores caminhos e próximos pulos de todos os destinos
+    distancias, caminhos = lsdb.dijkstra_completo(lsdb._tabela)
+    lsdb.reconstruir_arvore(distancias, caminhos, lsdb._tabela)
+    lsdb.atualizar_proximo_pulo(distancias, lsdb._entrantes)
+    roteadores = list(lsdb._tabela.keys())
+    total = 0
+    for _ in range(alteracoes):
+        roteador = random.choice(roteadores)
+        entrada = lsdb._tabela[roteador]
+        if (not entrada["links"]):
+            continue
+        links = dict(entrada["links"])
+        vizinho = random.choice(list(links.keys()))
+        links[vizinho] = random.randint(1, 10)
+        lsdb._tabela[roteador] = lsdb.criar_entrada(
+            entrada["sequence_number"] + 1, 0, [], links)
+
+        inicio = time.perf_counter()
+        lsdb.spf_incremental({roteador}, lsdb._tabela)
+        total += time.perf_counter() - inicio
+    return total / alteracoes
+
+
+# Função para alterar aleatoriamente a tabela, como as inundações de LSAs: custo de um enlace, enlace novo ou removido (nos dois sentidos ou
+# apenas em um, antes do LSA do outro lado chegar), queda de um roteador (com ou sem a remoção dos enlaces dos vizinhos até ele) ou o retorno
+# de um roteador caído, retornando os roteadores alterados
+def alterar_topologia(lsdb: LSDB, tabela: dict, caidos: dict) -> set:
+    roteadores = [roteador for roteador in tabela if roteador != lsdb._router_id]
+    operacao = random.choice(["custo", "custo", "enlace", "enlace", "remocao", "queda", "retorno"])
+    alterados = set()
+
+    def substituir_links(roteador: str, links: dict):
+        entrada = tabela[roteador]
+        tabela[roteador] = lsdb.criar_entrada(entrada["sequence_number"] + 1, 0, [], links)
+        alterados.add(roteador)
+
+    if (operacao == "retorno" and caidos):
+        roteador = random.choice(list(caidos.keys()))
+        tabela[roteador] = caidos.pop(roteador)
+        alterados.add(roteador)
+    elif (operacao == "queda" and len(roteadores) > 2):
+        roteador = random.choice(roteadores)
+        caidos[roteador] = tabela.pop(roteador)
+        alterados.add(roteador)
+        if (random.random() < 0.5):
+            for vizinho in [vizinho for vizinho in tabela if roteador in tabela[vizinho]["links"]]:
+                substituir_links(vizinho, {destino: custo for destino, custo in tabela[vizinho]["links"].items() if destino != roteador})
+    else:
+        origem, destino = random.sample(list(tabela.keys()), 2)
+        ligados = destino in tabela[origem]["links"]
+        custo = random.randint(1, 10)
+        for de, ate in ([(origem, destino), (destino, origem)] if (random.random() < 0.8) else [(origem, destino)]):
+            links = dict(tabela[de]["links"])
+            if (operacao == "remocao" and ligados):
+                links.pop(ate, None)
+            else:
+                links[ate] = custo
+            substituir_links(de, links)
+    return alterados
+
+
+# Função para verificar o SPF incremental: após cada alteração aleatória da topologia, as distâncias e os próximos pulos (com ECMP) devem
+# ser os mesmos de um Dijkstra completo sobre a mesma tabela, retornando a quantidade de divergências
+def verificar_incremental(grafo, alteracoes: int) -> int:
+    lsdb = montar_lsdb(grafo)
+    tabela = dict(lsdb._tabela)
+    distancias, caminhos = lsdb.dijkstra_completo(tabela)
+    lsdb.reconstruir_arvore(distancias, caminhos, tabela)
+    lsdb.atualizar_proximo_pulo(distancias, lsdb._entrantes)
+
+    infinito = float("inf")
+    caidos = {}
+    divergencias = 0
+    for alteracao in range(alteracoes):
+        # Cada cálculo recebe uma nova cópia da tabela, como as versões publicadas pela LSDB
+        tabela = dict(tabela)
+        alterados = alterar_topologia(lsdb, tabela, caidos)
+        lsdb.spf_incremental(alterados, tabela)
+
+        referencia = LSDB(lsdb._router_id, {})
+        distancias, _ = referencia.dijkstra_completo(tabela)
+        referencia.atualizar_proximo_pulo(distancias, LSDB.indexar_entrantes(tabela))
+        # Destinos inalcançáveis podem permanecer com distância infinita ou sem próximos pulos
+        obtidas = {destino: distancia for destino, distancia in lsdb._distancias.items() if distancia < infinito}
+        esperadas = {destino: distancia for destino, distancia in distancias.items() if distancia < infinito}
+        pulos_obtidos = {destino: pulos for destino, pulos in lsdb._roteamento.items() if pulos}
+        pulos_esperados = {destino: pulos for destino, pulos in referencia._roteamento.items() if pulos}
+        if (obtidas != esperadas or pulos_obtidos != pulos_esperados):
+            divergencias += 1
+            if (divergencias == 1):
+                destinos = {destino for destino in obtidas.keys() | esperadas.keys() if obtidas.get(destino) != esperadas.get(destino)}
+                destinos |= {destino for destino in pulos_obtidos.keys() | pulos_esperados.keys()
+                             if pulos_obtidos.get(destino) != pulos_esperados.get(destino)}
+                print(f"  Divergência na alteração {alteracao + 1} (roteadores alterados: {', '.join(sorted(alterados))}): "
+                      f"{', '.join(sorted(destinos)[:10])}")
+    return divergencias
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Compara o Dijkstra com fila de prioridade, a versão linear (O(V²)) e a topologia em arrays (CSR) da LSDB")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Quantidades de roteadores dos grafos gerados")
+    parser.add_argument("--grau-medio", type=float, default=8,
+                        help="Grau médio desejado (define a probabilidade de conexão de cada grafo)")
+    parser.add_argument("--repeticoes", type=int, default=3,
+                        help="Quantidade de execuções por motor (é considerado o menor tempo)")
+    parser.add_argument("--alteracoes", type=int, default=100,
+                        help="Quantidade de alterações de custo medidas no SPF incremental")
+    parser.add_argument("--verificar", type=int, metavar="ALTERACOES",
+                        help="Em vez de medir, compara o SPF incremental com o completo após a quantidade informada de alterações aleatórias da "
+                             "topologia (custos, enlaces, quedas e retornos de roteadores) em cada tamanho, terminando com erro caso divirjam")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente do gerador aleatório")
+    args = parser.parse_args()
+    random.seed(args.semente)
+
+    if (args.verificar):
+        total = 0
+        for tamanho in args.tamanhos:
+            grafo = gerar_grafo(tamanho, prob_conexao=min(0.3, args.grau_medio / max(tamanho - 1, 1)))
+            divergencias = verificar_incremental(grafo, args.verificar)
+            print(f"{tamanho:>7} nós: {divergencias} divergências em {args.verificar} alterações")
+            total += divergencias
+        if (total):
+            raise SystemExit(f"SPF incremental divergente do completo em {total} alterações")
+        sys.exit(0)
+
+    print(f"{'nós':>7} {'arestas':>9} {'heap (ms)':>11} {'linear (ms)':>12} {'ganho':>8} {'incremental (ms)':>17} "
+          f"{'ECMP dict (ms)':>15} {'ECMP CSR (ms)':>14} {'ganho':>8} {'dict (KiB)':>11} {'CSR (KiB)':>10}")
+    for tamanho in args.tamanhos:
+        # Mantém o grau médio constante, evitando grafos densos demais nos tamanhos maiores
+        prob_conexao = min(0.3, args.grau_medio / max(tamanho - 1, 1))
+        grafo = gerar_grafo(tamanho, prob_conexao=prob_conexao)
+        lsdb = montar_lsdb(grafo)
+
+        tempo_heap, caminhos_heap = medir(lsdb.dijkstra, args.repeticoes)
+        tempo_linear, caminhos_linear = medir(lsdb.dijkstra_linear, args.repeticoes)
+
+        # Os dois motores devem produzir exatamente a mesma árvore (inclusive nos empates)
+        if (caminhos_heap != caminhos_linear):
+            raise RuntimeError(f"Resultados divergentes para o grafo com {tamanho} nós")
+
+        # SPF completo com ECMP (distâncias e próximos pulos de todos os destinos) nos dois formatos da topologia
+        memoria_dict, memoria_csr, lsdb._topologia = medir_memoria(grafo)
+        tempo_dict, roteamento_dict = medir(lambda: dict(spf_dicionarios(lsdb)), args.repeticoes)
+        tempo_csr, _ = medir(lsdb.dijkstra_topologia, args.repeticoes)
+        if (lsdb._roteamento != roteamento_dict):
+            raise RuntimeError(f"Próximos pulos divergentes entre os formatos para o grafo com {tamanho} nós")
+
+        tempo_incremental = medir_incremental(lsdb, args.alteracoes)
+
+        print(f"{tamanho:>7} {grafo.number_of_edges():>9} {tempo_heap * 1000:>11.2f} "
+              f"{tempo_linear * 1000:>12.2f} {tempo_linear / tempo_heap:>7.1f}x {tempo_incremental * 1000:>17.3f} "
+              f"{tempo_dict * 1000:>15.2f} {tempo_csr * 1000:>14.2f} {tempo_dict / tempo_csr:>7.1f}x {memoria_dict:>11.0f} {memoria_csr:>10.0f}")
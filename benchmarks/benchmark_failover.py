@@ -0,0 +1,75 @@
+import os
+import sys
+import random
+import argparse
+
+# Permite importar o simulador.py (raiz do projeto)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from simulador import Simulador, carregar_conexoes, gerar_conexoes
+from benchmark_convergencia import resumir
+
+
+# Função para derrubar um roteador após a convergência inicial, retornando os tempos de failover medidos pelos seus vizinhos
+# A queda ocorre após a rede ficar estável, com a espera do SPF de volta ao atraso inicial (logo após a convergência ela ainda reflete a rajada inicial de LSAs)
+def medir_queda(conexoes: list[tuple[str, str, int]], router_id: str, semente: int, limite: float, bfd: tuple[float, int] | None, estabilizacao: float) -> list[dict]:
+    simulador = Simulador(conexoes, semente=semente, bfd=bfd)
+    if (simulador.executar_ate_convergir(limite) is None):
+        raise RuntimeError(f"A rede não convergiu em {limite:.0f} s")
+    simulador.executar_ate(simulador.loop.time() + estabilizacao)
+
+    instante_queda = simulador.loop.time()
+    simulador.derrubar(router_id)
+    simulador.executar_ate_convergir(instante_queda + limite, 0.1)
+    return [tempo for tempo in simulador.tempos_failover() if tempo["roteador"] == router_id]
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Compara o tempo de failover (da queda de um roteador até as novas rotas nos vizinhos) com e sem BFD, na rede simulada")
+    parser.add_argument("grafo", nargs="?", default=os.path.join(RAIZ, "grafos", "grafo15.csv"),
+                        help="Arquivo .csv com a topologia (Padrão: grafos/grafo15.csv)")
+    parser.add_argument("--gerar", type=int,
+                        help="Gera uma topologia aleatória com a quantidade de roteadores informada, no lugar do .csv")
+    parser.add_argument("--quedas", type=int, default=5,
+                        help="Quantidade de roteadores derrubados (um por simulação)")
+    parser.add_argument("--bfd", type=float, default=0.05,
+                        help="Intervalo (em segundos) entre os pacotes de controle do BFD")
+    parser.add_argument("--multiplicador", type=int, default=3,
+                        help="Multiplicador de detecção do BFD")
+    parser.add_argument("--meta", type=float, default=1.0,
+                        help="Failover máximo (em segundos) aceito com BFD. O script termina com erro caso seja ultrapassado")
+    parser.add_argument("--limite", type=float, default=300,
+                        help="Tempo (virtual, em segundos) máximo aguardado por cada convergência")
+    parser.add_argument("--estabilizacao", type=float, default=15,
+                        help="Tempo (virtual, em segundos) aguardado entre a convergência inicial e a queda")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente dos geradores aleatórios")
+    args = parser.parse_args()
+
+    random.seed(args.semente)
+    conexoes = gerar_conexoes(args.gerar) if (args.gerar) else carregar_conexoes(args.grafo)
+    roteadores = sorted({router_id for origem, destino, _ in conexoes for router_id in (origem, destino)})
+    derrubados = random.sample(roteadores, min(args.quedas, len(roteadores)))
+
+    print(f"{'detecção':>10} {'quedas':>7} {'medições':>9} {'detecção p50 (s)':>17} {'detecção máx. (s)':>18} "
+          f"{'failover p50 (s)':>17} {'failover máx. (s)':>18} {'reparo local':>13}")
+    maximo_bfd = 0.0
+    for nome, bfd in (("HELLO", None), ("BFD", (args.bfd, args.multiplicador))):
+        tempos = [tempo for router_id in derrubados
+                  for tempo in medir_queda(conexoes, router_id, args.semente, args.limite, bfd, args.estabilizacao)]
+        deteccao = resumir([tempo["deteccao"] for tempo in tempos])
+        failover = resumir([tempo["failover"] for tempo in tempos])
+        # Destinos que passaram para um alternativo (ECMP ou LFA) já na detecção, sem aguardar o recálculo das rotas
+        afetados = sum(tempo["destinos_afetados"] for tempo in tempos)
+        reparo = 100 * sum(tempo["destinos_reparados"] for tempo in tempos) / afetados if (afetados) else 0.0
+        print(f"{nome:>10} {len(derrubados):>7} {len(tempos):>9} {deteccao['p50']:>17.3f} {deteccao['max']:>18.3f} "
+              f"{failover['p50']:>17.3f} {failover['max']:>18.3f} {reparo:>12.1f}%")
+        if (bfd is not None):
+            maximo_bfd = failover["max"]
+
+    if (maximo_bfd >= args.meta):
+        print(f"Failover com BFD acima da meta de {args.meta:.3f} s")
+        sys.exit(1)
+    print(f"Failover com BFD abaixo da meta de {args.meta:.3f} s")
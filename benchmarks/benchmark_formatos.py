@@ -0,0 +1,185 @@
+import os
+import sys
+import time
+import random
+import argparse
+
+# Permite importar o roteador.py (pasta roteador)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "roteador"))
+
+from roteador import codificar_pacote, decodificar_pacote, FORMATO_BINARIO, FORMATO_JSON, FORMATOS_SUPORTADOS, BINARIO_TIPOS, CACHE_BINARIO
+
+
+# Função para criar um pacote HELLO com a quantidade de vizinhos informada
+def criar_hello(quant_vizinhos: int) -> dict:
+    return {
+        "type": "HELLO",
+        "router_id": "r1",
+        "timestamp": time.time(),
+        "ip_address": "10.10.1.2",
+        "known_neighbors": [f"r{i + 2}" for i in range(quant_vizinhos)],
+        "formats": [FORMATO_BINARIO, FORMATO_JSON],
+    }
+
+
+# Função para criar um pacote LSA com a quantidade de enlaces informada (um endereço ponto a ponto por enlace, mais a rede dos hosts)
+def criar_lsa(quant_enlaces: int) -> dict:
+    return {
+        "type": "LSA",
+        "router_id": "r1",
+        "timestamp": time.time(),
+        "addresses": [f"10.10.{i // 250 + 1}.{i % 250 + 2}" for i in range(quant_enlaces)] + ["192.168.200.0/24"],
+        "sequence_number": 1234,
+        "links": {f"r{i + 2}": (i % 10) + 1 for i in range(quant_enlaces)},
+    }
+
+
+# Função para medir quantas operações por segundo uma função consegue executar
+def operacoes_por_segundo(funcao, duracao: float) -> float:
+    quantidade = 0
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    while True:
+        for _ in range(100):
+            funcao()
+        quantidade += 100
+        agora = time.perf_counter()
+        if (agora >= fim):
+            return quantidade / (agora - inicio)
+
+
+# Função para decodificar um pacote sem aproveitar os blocos já decodificados anteriormente
+def decodificar_sem_cache(dados: bytes) -> dict:
+    CACHE_BINARIO.clear()
+    return decodificar_pacote(dados)
+
+
+# Função para encontrar a maior quantidade de enlaces de um LSA que cabe no buffer de recepção
+def maximo_enlaces(formato: str, buffer_size: int) -> int:
+    menor, maior = 0, 20000
+    while menor < maior:
+        meio = (menor + maior + 1) // 2
+        if (len(codificar_pacote(criar_lsa(meio), formato)) <= buffer_size):
+            menor = meio
+        else:
+            maior = meio - 1
+    return menor
+
+
+# Funções para sortear os campos dos pacotes aleatórios (IDs com caracteres não ASCII, endereços com e sem prefixo e listas vazias)
+def sortear_id() -> str:
+    return random.choice(["r", "roteador-", "nó"]) + str(random.randint(1, 100000))
+
+
+def sortear_endereco() -> str:
+    return ".".join(str(random.randint(0, 255)) for _ in range(4))
+
+
+def sortear_sequencias() -> dict[str, int]:
+    return {sortear_id(): random.getrandbits(32) for _ in range(random.choice([0, 1, random.randint(2, 200)]))}
+
+
+# Função para criar um pacote aleatório do tipo informado, com os campos na forma em que os roteadores os enviam (formatos na ordem de
+# FORMATOS_SUPORTADOS, intervalo de queda em milissegundos e custos dentro dos tamanhos dos campos binários)
+def criar_aleatorio(tipo: str) -> dict:
+    pacote = {"type": tipo, "router_id": sortear_id()}
+    if (tipo == "HELLO"):
+        pacote.update({
+            "timestamp": random.uniform(0, 2e9),
+            "ip_address": sortear_endereco(),
+            "known_neighbors": [sortear_id() for _ in range(random.randint(0, 50))],
+            "formats": [formato for formato in FORMATOS_SUPORTADOS if random.random() < 0.7],
+        })
+        if (random.random() < 0.7):
+            pacote["dead_interval"] = random.randint(1, 100000) / 1000
+    elif (tipo == "LSA"):
+        pacote.update({
+            "timestamp": random.uniform(0, 2e9),
+            "addresses": [sortear_endereco() + (f"/{random.randint(0, 31)}" if random.random() < 0.3 else "")
+                          for _ in range(random.randint(0, 50))],
+            "sequence_number": random.getrandbits(32),
+            "links": {sortear_id(): random.getrandbits(32) for _ in range(random.randint(0, 50))},
+        })
+        if (random.random() < 0.3):
+            pacote["resumos"] = {f"{sortear_endereco()}/{random.randint(0, 32)}": random.getrandbits(32)
+                                 for _ in range(random.randint(1, 20))}
+    elif (tipo == "LSACK"):
+        pacote["acks"] = sortear_sequencias()
+    elif (tipo == "DBD"):
+        pacote.update({"parte": random.randint(0, 65535), "partes": random.randint(0, 65535), "solicitar": random.random() < 0.5,
+                       "resumo": sortear_sequencias()})
+    else:
+        pacote.update({"parte": random.randint(0, 65535), "pedidos": sortear_sequencias()})
+    return pacote
+
+
+# Função para verificar a codificação de pacotes aleatórios: nos dois formatos, decodificados dos bytes ou de um memoryview do buffer de
+# recepção, com e sem os blocos em cache (alterar um pacote decodificado não pode alterar os próximos), o pacote deve voltar idêntico,
+# retornando a quantidade de divergências
+def verificar_formatos(quantidade: int) -> int:
+    divergencias = 0
+    for indice in range(quantidade):
+        pacote = criar_aleatorio(random.choice(list(BINARIO_TIPOS.keys())))
+        for formato in (FORMATO_JSON, FORMATO_BINARIO):
+            dados = codificar_pacote(pacote, formato)
+            if (indice % 2 == 0):
+                CACHE_BINARIO.clear()
+            decodificados = [decodificar_pacote(dados)]
+            for lista in decodificados[0].values():
+                if (isinstance(lista, list)):
+                    lista.append("alterado")
+            decodificados.append(decodificar_pacote(memoryview(bytearray(dados))))
+            decodificados.append(decodificar_pacote(dados))
+            if (any(decodificado != pacote for decodificado in decodificados[1:])):
+                divergencias += 1
+                if (divergencias == 1):
+                    print(f"  Divergência em {formato}: {pacote} -> {decodificados[1]}")
+    return divergencias
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Compara o tamanho e a velocidade de codificação/decodificação dos formatos json e binário")
+    parser.add_argument("--enlaces", type=int, nargs="+", default=[4, 32, 128, 256],
+                        help="Quantidades de vizinhos/enlaces dos pacotes gerados")
+    parser.add_argument("--duracao", type=float, default=0.5,
+                        help="Tempo (em segundos) de cada medição")
+    parser.add_argument("--buffer", type=int, default=4096,
+                        help="Tamanho do buffer de recepção do roteador")
+    parser.add_argument("--verificar", type=int, metavar="PACOTES",
+                        help="Em vez de medir, codifica e decodifica a quantidade informada de pacotes aleatórios (todos os tipos) nos dois "
+                             "formatos, terminando com erro caso algum pacote seja alterado")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente do gerador aleatório")
+    args = parser.parse_args()
+    random.seed(args.semente)
+
+    if (args.verificar):
+        divergencias = verificar_formatos(args.verificar)
+        print(f"{args.verificar} pacotes: {divergencias} divergências")
+        if (divergencias):
+            raise SystemExit(f"Pacotes alterados após a codificação em {divergencias} casos")
+        sys.exit(0)
+
+    # A decodificação é medida repetindo o mesmo pacote (caso comum nas inundações, aproveitando o cache) e sem o cache
+    print(f"{'pacote':>10} {'formato':>8} {'bytes':>7} {'codificação/s':>14} {'decodificação/s':>16} {'sem cache/s':>12}")
+    for quantidade in args.enlaces:
+        for nome, pacote in (("HELLO", criar_hello(quantidade)), ("LSA", criar_lsa(quantidade))):
+            for formato in (FORMATO_JSON, FORMATO_BINARIO):
+                dados = codificar_pacote(pacote, formato)
+                if (decodificar_pacote(dados) != pacote):
+                    raise RuntimeError(f"Pacote {nome} alterado após codificação em {formato}")
+
+                codificacao = operacoes_por_segundo(
+                    lambda: codificar_pacote(pacote, formato), args.duracao)
+                decodificacao = operacoes_por_segundo(
+                    lambda: decodificar_pacote(dados), args.duracao)
+                sem_cache = operacoes_por_segundo(
+                    lambda: decodificar_sem_cache(dados), args.duracao)
+                print(f"{f'{nome}/{quantidade}':>10} {formato:>8} {len(dados):>7} "
+                      f"{codificacao:>14.0f} {decodificacao:>16.0f} {sem_cache:>12.0f}")
+
+    print(f"\nMáximo de enlaces por LSA em {args.buffer} bytes:")
+    for formato in (FORMATO_JSON, FORMATO_BINARIO):
+        print(f"  {formato}: {maximo_enlaces(formato, args.buffer)}")
@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+
+# Permite importar o roteador.py (pasta roteador)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "roteador"))
+
+from roteador import CanalUDP, LIBC
+
+# Pacote que indica o fim da inundação ao receptor
+FIM = b"FIM"
+
+
+# Função para receber pacotes até a chegada do pacote de fim, guardando a quantidade recebida
+def receber(canal: CanalUDP, resultado: dict):
+    recebidos = 0
+    while True:
+        for dados, _, _ in canal.receber_lote():
+            if (dados == FIM):
+                resultado["recebidos"] = recebidos
+                return
+            recebidos += 1
+
+
+# Função para inundar um socket local com pacotes, retornando as estatísticas dos canais de envio e recepção
+def inundar(quantidade: int, tamanho_pacote: int, tamanho_lote: int, usar_mmsg: bool) -> tuple[float, dict, dict, int]:
+    sock_recepcao = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock_recepcao.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 24)
+    sock_recepcao.bind(("127.0.0.1", 0))
+    destino = sock_recepcao.getsockname()
+    sock_envio = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    recepcao = CanalUDP(sock_recepcao, tamanho_lote, usar_mmsg=usar_mmsg)
+    envio = CanalUDP(sock_envio, tamanho_lote, usar_mmsg=usar_mmsg)
+    resultado = {}
+    thread_receptor = threading.Thread(target=receber, args=(recepcao, resultado), daemon=True)
+    thread_receptor.start()
+
+    pacote = bytes(tamanho_pacote)
+    lote = [(pacote, destino)] * tamanho_lote
+    inicio = time.perf_counter()
+    for _ in range(quantidade // tamanho_lote):
+        envio.enviar_lote(lote)
+    # O pacote de fim é reenviado até ser recebido, pois pode ser descartado caso o buffer esteja cheio
+    while thread_receptor.is_alive():
+        sock_envio.sendto(FIM, destino)
+        thread_receptor.join(0.05)
+    duracao = time.perf_counter() - inicio
+
+    sock_recepcao.close()
+    sock_envio.close()
+    return duracao, envio.estatisticas(), recepcao.estatisticas(), resultado["recebidos"]
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Inunda um socket local e compara a recepção/envio de um datagrama por chamada com os lotes (recvmmsg/sendmmsg)")
+    parser.add_argument("--pacotes", type=int, default=200000,
+                        help="Quantidade de pacotes enviados em cada medição")
+    parser.add_argument("--tamanho", type=int, default=200,
+                        help="Tamanho (em bytes) de cada pacote")
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 8, 32, 64],
+                        help="Tamanhos de lote medidos")
+    args = parser.parse_args()
+
+    modos = [("mmsg", True), ("simples", False)] if (LIBC is not None) else [("simples", False)]
+    print(f"{'modo':>8} {'lote':>5} {'recebidos':>10} {'pacotes/s':>11} {'envio pac/chamada':>18} {'recepção pac/chamada':>21}")
+    for nome, usar_mmsg in modos:
+        for tamanho_lote in args.lotes:
+            duracao, envio, recepcao, recebidos = inundar(args.pacotes, args.tamanho, tamanho_lote, usar_mmsg)
+            print(f"{nome:>8} {tamanho_lote:>5} {recebidos:>10} {recebidos / duracao:>11.0f} "
+                  f"{envio['pacotes_por_chamada_envio']:>18.2f} {recepcao['pacotes_por_chamada_recepcao']:>21.2f}")
@@ -0,0 +1,224 @@
+import os
+import sys
+import time
+import random
+import socket
+import argparse
+
+# Permite importar o roteador.py (pasta roteador)
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "roteador"))
+
+from roteador import TrieRotas, comprimir_prefixos, faixa_ip
+
+
+# Função para gerar prefixos como os do plano de endereçamento: redes de hosts /24 (172.16.0.0/12), endereços de enlaces /32 e /31
+# (10.0.0.0/8) e alguns resumos /16, retornando o prefixo e um valor (gateway) para cada um
+def gerar_prefixos(quantidade: int) -> dict[str, str]:
+    prefixos = {}
+    while (len(prefixos) < quantidade):
+        sorteio = random.random()
+        if (sorteio < 0.3):
+            prefixo = f"172.{random.randint(16, 31)}.{random.randint(0, 255)}.0/24"
+        elif (sorteio < 0.98):
+            endereco = random.getrandbits(24)
+            prefixo = f"10.{endereco >> 16}.{(endereco >> 8) & 255}.{endereco & 255}"
+            if (random.random() < 0.3):
+                prefixo = f"10.{endereco >> 16}.{(endereco >> 8) & 255}.{endereco & 254}/31"
+        else:
+            prefixo = f"172.{random.randint(16, 31)}.0.0/16"
+        prefixos[prefixo] = f"10.0.0.{random.randint(1, 254)}"
+    return prefixos
+
+
+# Função para gerar endereços consultados: metade dentro de um dos prefixos e metade aleatória nas faixas usadas (com ou sem rota)
+def gerar_enderecos(prefixos: dict[str, str], quantidade: int) -> list[int]:
+    faixas = [faixa_ip(prefixo) for prefixo in prefixos]
+    enderecos = []
+    for _ in range(quantidade):
+        if (random.random() < 0.5):
+            chave, tamanho = random.choice(faixas)
+            enderecos.append(chave | random.getrandbits(32 - tamanho) if (tamanho < 32) else chave)
+        else:
+            enderecos.append(random.choice((0x0A000000, 0xAC100000)) | random.getrandbits(20))
+    return enderecos
+
+
+# Alternativa sem a árvore: um dicionário por tamanho de prefixo, consultados do maior para o menor tamanho presente
+class TabelaPorTamanho:
+    __slots__ = ["_tabelas"]
+
+    def __init__(self):
+        self._tabelas = {}
+
+    def inserir(self, prefixo: str, valor):
+        chave, tamanho = faixa_ip(prefixo)
+        if (tamanho not in self._tabelas):
+            self._tabelas = dict(sorted({**self._tabelas, tamanho: {}}.items(), reverse=True))
+        self._tabelas[tamanho][chave] = (prefixo, valor)
+
+    def buscar(self, endereco: int) -> tuple[str, object] | None:
+        for tamanho, tabela in self._tabelas.items():
+            encontrado = tabela.get(endereco & ~((1 << (32 - tamanho)) - 1) & 0xFFFFFFFF)
+            if (encontrado is not None):
+                return encontrado
+        return None
+
+
+# Função para medir a inserção dos prefixos e as consultas em uma estrutura, retornando os tempos e os resultados das consultas
+def medir(estrutura, prefixos: dict[str, str], enderecos: list) -> tuple[float, float, list]:
+    inicio = time.perf_counter()
+    for prefixo, valor in prefixos.items():
+        estrutura.inserir(prefixo, valor)
+    insercao = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    resultados = [estrutura.buscar(endereco) for endereco in enderecos]
+    return insercao, time.perf_counter() - inicio, resultados
+
+
+# Função para buscar o maior prefixo que contém um endereço percorrendo todas as rotas, usada como referência nas verificações
+def buscar_linear(rotas: dict, endereco: int) -> tuple[str, object] | None:
+    encontrado, maior = None, -1
+    for prefixo, valor in rotas.items():
+        chave, tamanho = faixa_ip(prefixo)
+        if (tamanho > maior and (endereco ^ chave) >> (32 - tamanho) == 0):
+            encontrado, maior = (prefixo, valor), tamanho
+    return encontrado
+
+
+# Função para sortear um prefixo em uma faixa pequena de endereços (10.0.0.0/20), onde os prefixos se sobrepõem com frequência, incluindo
+# endereços /32 sem o tamanho e, raramente, a rota padrão
+def sortear_prefixo() -> str:
+    tamanho = random.choice([0] + [16, 20, 22, 23, 24, 24, 25, 26, 28, 30, 31, 32, 32] * 3)
+    chave = (0x0A000000 | random.getrandbits(12)) & ~((1 << (32 - tamanho)) - 1) & 0xFFFFFFFF
+    endereco = socket.inet_ntoa(chave.to_bytes(4, "big"))
+    return endereco if (tamanho == 32 and random.random() < 0.5) else f"{endereco}/{tamanho}"
+
+
+# Função para gerar os endereços consultados nas verificações: o primeiro, o último e o do meio de cada prefixo, os vizinhos desses
+# endereços (fora do prefixo) e endereços aleatórios na mesma faixa
+def enderecos_limites(prefixos) -> list[int]:
+    enderecos = {0x0A000000 | random.getrandbits(12) for _ in range(16)}
+    for prefixo in prefixos:
+        chave, tamanho = faixa_ip(prefixo)
+        for endereco in (chave, chave + (1 << (32 - tamanho)) - 1, chave + (1 << (32 - tamanho)) // 2):
+            enderecos.update({endereco, (endereco - 1) & 0xFFFFFFFF, (endereco + 1) & 0xFFFFFFFF})
+    return sorted(enderecos)
+
+
+# Função para verificar a árvore de prefixos: após cada inserção, substituição ou remoção aleatória, as buscas (por inteiro e por texto),
+# o tamanho e os itens da árvore devem coincidir com uma busca linear nas mesmas rotas, retornando a quantidade de divergências
+def verificar_arvore(rodadas: int) -> int:
+    divergencias = 0
+    for _ in range(rodadas):
+        arvore, rotas = TrieRotas(), {}
+        for operacao in range(random.randint(1, 40)):
+            if (rotas and random.random() < 0.3):
+                prefixo = random.choice(list(rotas.keys()))
+                removido = arvore.remover(prefixo)
+                del rotas[prefixo]
+                falhou = not removido
+            else:
+                prefixo, valor = sortear_prefixo(), f"10.0.0.{random.randint(1, 254)}"
+                # Um mesmo prefixo é sempre escrito com o mesmo texto (como nas rotas calculadas)
+                prefixo = next((existente for existente in rotas if faixa_ip(existente) == faixa_ip(prefixo)), prefixo)
+                arvore.inserir(prefixo, valor)
+                rotas[prefixo] = valor
+                falhou = False
+            # A remoção de um prefixo ausente (ou apenas contido em uma rota) não altera a árvore
+            ausente = sortear_prefixo()
+            if (all(faixa_ip(prefixo) != faixa_ip(ausente) for prefixo in rotas) and arvore.remover(ausente)):
+                falhou = True
+
+            enderecos = enderecos_limites(rotas)
+            for endereco in enderecos:
+                esperado = buscar_linear(rotas, endereco)
+                if (arvore.buscar(endereco) != esperado or arvore.buscar(socket.inet_ntoa(endereco.to_bytes(4, "big"))) != esperado):
+                    falhou = True
+            if (len(arvore) != len(rotas) or sorted(arvore.itens()) != sorted(rotas.items())):
+                falhou = True
+            if (falhou):
+                divergencias += 1
+                if (divergencias == 1):
+                    print(f"  Divergência na árvore após a operação {operacao + 1}: {rotas}")
+                break
+    return divergencias
+
+
+# Função para verificar a compressão das rotas instaladas: a tabela comprimida não pode ser maior e deve encaminhar cada endereço pelos
+# mesmos próximos pulos (ou continuar sem rota), mantendo o texto dos prefixos originais, retornando a quantidade de divergências
+def verificar_compressao(rodadas: int) -> int:
+    divergencias = 0
+    for _ in range(rodadas):
+        rotas = {}
+        for _ in range(random.randint(1, 40)):
+            prefixo = sortear_prefixo()
+            if (all(faixa_ip(existente) != faixa_ip(prefixo) for existente in rotas)):
+                rotas[prefixo] = random.choice([("10.0.0.1",), ("10.0.0.2",), ("10.0.0.1", "10.0.0.2")])
+        comprimidas = comprimir_prefixos(rotas)
+
+        originais = {faixa_ip(prefixo): prefixo for prefixo in rotas}
+        falhou = len(comprimidas) > len(rotas) or any(
+            originais.get(faixa_ip(prefixo), prefixo) != prefixo for prefixo in comprimidas)
+        for endereco in enderecos_limites(list(rotas) + list(comprimidas)):
+            esperado, obtido = buscar_linear(rotas, endereco), buscar_linear(comprimidas, endereco)
+            if ((esperado and esperado[1]) != (obtido and obtido[1])):
+                falhou = True
+        if (falhou):
+            divergencias += 1
+            if (divergencias == 1):
+                print(f"  Divergência na compressão: {rotas} -> {comprimidas}")
+    return divergencias
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Mede a inserção e as consultas de maior prefixo (LPM) da árvore de prefixos (TrieRotas) usada na RIB e no simulador")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="Quantidades de prefixos das tabelas geradas")
+    parser.add_argument("--consultas", type=int, default=200000,
+                        help="Quantidade de endereços consultados em cada tabela")
+    parser.add_argument("--semente", type=int, default=1,
+                        help="Semente do gerador aleatório")
+    parser.add_argument("--verificar", type=int, metavar="RODADAS",
+                        help="Em vez de medir, compara as buscas da árvore com uma busca linear após inserções, substituições e remoções "
+                             "aleatórias, e o encaminhamento das rotas comprimidas com o das originais, na quantidade informada de tabelas, "
+                             "terminando com erro caso divirjam")
+    args = parser.parse_args()
+
+    if (args.verificar):
+        random.seed(args.semente)
+        divergencias = verificar_arvore(args.verificar)
+        print(f"árvore de prefixos: {divergencias} divergências em {args.verificar} tabelas")
+        if (divergencias):
+            raise SystemExit(f"Árvore de prefixos divergente da busca linear em {divergencias} tabelas")
+        divergencias = verificar_compressao(args.verificar)
+        print(f"compressão de prefixos: {divergencias} divergências em {args.verificar} tabelas")
+        if (divergencias):
+            raise SystemExit(f"Rotas comprimidas com encaminhamento diferente das originais em {divergencias} tabelas")
+        sys.exit(0)
+
+    print(f"{'prefixos':>9} {'estrutura':>22} {'inserção (µs/prefixo)':>22} {'consultas/s':>12} {'encontrados':>12}")
+    for tamanho in args.tamanhos:
+        random.seed(args.semente)
+        prefixos = gerar_prefixos(tamanho)
+        enderecos = gerar_enderecos(prefixos, args.consultas)
+        # Os prefixos já convertidos não entram nas medições de inserção (acima de CACHE_PREFIXOS_LIMITE prefixos, as conversões
+        # descartadas do cache são refeitas e entram nas medições)
+        for prefixo in prefixos:
+            faixa_ip(prefixo)
+
+        enderecos_texto = [socket.inet_ntoa(endereco.to_bytes(4, "big")) for endereco in enderecos]
+        medicoes = {
+            "árvore (inteiro)": medir(TrieRotas(), prefixos, enderecos),
+            "árvore (texto)": medir(TrieRotas(), prefixos, enderecos_texto),
+            "dicionário/tamanho": medir(TabelaPorTamanho(), prefixos, enderecos),
+        }
+        referencia = medicoes["dicionário/tamanho"][2]
+        for nome, (insercao, consultas, resultados) in medicoes.items():
+            # As estruturas devem encontrar as mesmas rotas para todos os endereços
+            if (resultados != referencia):
+                raise SystemExit(f"Resultados divergentes entre {nome} e dicionário/tamanho")
+            print(f"{tamanho:>9} {nome:>22} {1e6 * insercao / tamanho:>22.2f} {len(enderecos) / consultas:>12.0f} "
+                  f"{sum(resultado is not None for resultado in resultados):>12}")
@@ -1,11 +1,84 @@
 import yaml
 import csv
+import argparse
 from collections import defaultdict
 
+
+# Função para dividir a topologia em áreas (como no OSPF), retornando a área de cada enlace
+# O backbone (área 0) reúne as camadas de roteadores mais próximas do centro do grafo, até cerca de 1/N dos roteadores. Cada uma das outras
+# áreas é um dos maiores grupos de roteadores conectados entre si fora do backbone (as áreas precisam ser contíguas, como no OSPF), e os
+# grupos restantes passam a fazer parte do backbone
+# Os enlaces entre o backbone e as outras áreas pertencem à área de fora, tornando ABRs os roteadores da borda do backbone
+def definir_areas(conexoes: list[tuple[str, str, int]], quantidade: int) -> dict[tuple[str, str], int]:
+    vizinhos = defaultdict(set)
+    for origem, destino, _ in conexoes:
+        vizinhos[origem].add(destino)
+        vizinhos[destino].add(origem)
+    if (quantidade <= 1):
+        return {(origem, destino): 0 for origem, destino, _ in conexoes}
+
+    # Camadas da busca em largura a partir de um roteador (roteadores a 0, 1, 2... saltos)
+    def camadas(inicio: str) -> list[list[str]]:
+        visitados = {inicio}
+        resultado = [[inicio]]
+        while True:
+            proxima = sorted({vizinho for router_id in resultado[-1] for vizinho in vizinhos[router_id]} - visitados)
+            if (not proxima):
+                return resultado
+            visitados.update(proxima)
+            resultado.append(proxima)
+
+    # O centro é o roteador de menor excentricidade (em saltos)
+    roteadores = sorted(vizinhos)
+    camadas_centro = min((camadas(router_id) for router_id in roteadores), key=len)
+    alvo = len(roteadores) / quantidade
+    backbone = set(camadas_centro[0])
+    for indice, camada in enumerate(camadas_centro[1:]):
+        if (indice > 0 and len(backbone) + len(camada) > alvo):
+            break
+        backbone.update(camada)
+
+    # Roteadores conectados entre si fora do backbone, dos maiores grupos para os menores
+    grupos = []
+    restantes = set(roteadores) - backbone
+    while (restantes):
+        inicio = min(restantes)
+        grupo = {inicio}
+        pilha = [inicio]
+        while (pilha):
+            for vizinho in vizinhos[pilha.pop()]:
+                if (vizinho in restantes and vizinho not in grupo):
+                    grupo.add(vizinho)
+                    pilha.append(vizinho)
+        restantes -= grupo
+        grupos.append(grupo)
+    grupos.sort(key=lambda grupo: (-len(grupo), min(grupo)))
+
+    area_roteador = dict.fromkeys(backbone, 0)
+    for indice, grupo in enumerate(grupos):
+        area_roteador.update(dict.fromkeys(grupo, indice + 1 if (indice < quantidade - 1) else 0))
+
+    return {(origem, destino): max(area_roteador[origem], area_roteador[destino]) for origem, destino, _ in conexoes}
+
+
+# Função para obter a área própria de um roteador (a menor área, fora o backbone, entre as dos seus enlaces) e a área de cada um dos seus enlaces
+def areas_roteador(router_id: str, areas: dict[tuple[str, str], int]) -> tuple[int, dict[str, int]]:
+    enlaces = {}
+    for (origem, destino), area in areas.items():
+        if (origem == router_id):
+            enlaces[destino] = area
+        elif (destino == router_id):
+            enlaces[origem] = area
+    fora_backbone = [area for area in enlaces.values() if area != 0]
+    return (min(fora_backbone) if (fora_backbone) else 0), enlaces
+
+
 # Função para gerar o docker compose baseado em um arquivo csv
-def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml"):
+# Com mais de uma área (coluna "area" do csv ou quantidade informada), cada área recebe as suas próprias faixas de endereços, resumidas pelos ABRs
+def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml", quantidade_areas=1):
     conexoes = []
     roteadores = set()
+    areas = {}
 
     # Leitura do csv, definindo a estrutura inicial
     with open(caminho_csv, newline='') as csvfile:
@@ -15,6 +88,12 @@ def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml"):
                 row['peso'])
             conexoes.append((origem, destino, peso))
             roteadores.update([origem, destino])
+            if (row.get('area')):
+                areas[(origem, destino)] = int(row['area'])
+
+    if (quantidade_areas > 1):
+        areas = definir_areas(conexoes, quantidade_areas)
+    multiarea = len(set(areas.values())) > 1
 
     # Criação do grafo de conexões (quem está conectado a quem)
     conexoes_por_roteador = defaultdict(list)
@@ -36,15 +115,41 @@ def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml"):
     }
 
     subnet_cost = {}
+    subnet_area = {}
+    # Sub-redes de cada área: enlaces em 10.(10 + área).X.0/24 e hosts em um bloco alinhado de 192.168.0.0/16 (resumidos pelos ABRs)
+    enlaces_area = defaultdict(int)
+    area_propria = {r: areas_roteador(r, areas)[0] for r in roteadores} if (multiarea) else {}
+    hosts_area = defaultdict(int)
+    tamanho_bloco = 1
+    if (multiarea):
+        tamanho_bloco = 1 << (max(list(area_propria.values()).count(area) for area in set(area_propria.values())) - 1).bit_length()
+        if ((max(set(areas.values()) | set(area_propria.values())) + 1) * tamanho_bloco > 256):
+            raise ValueError("As redes de hosts das áreas não cabem em 192.168.0.0/16")
+
     # Criação das redes/conexões entre roteadores
     for origem, destino, peso in conexoes:
         net_name = f"{origem}_{destino}_net"
-        subnet = subnet_base.format(subnet_count)
-        ip_map[origem][net_name] = ip_base.format(subnet_count, 2)
-        ip_map[destino][net_name] = ip_base.format(subnet_count, 3)
+        if (multiarea):
+            area = areas[(origem, destino)]
+            enlaces_area[area] += 1
+            subnet = f"10.{10 + area}.{enlaces_area[area]}.0/24"
+            ip_map[origem][net_name] = f"10.{10 + area}.{enlaces_area[area]}.2"
+            ip_map[destino][net_name] = f"10.{10 + area}.{enlaces_area[area]}.3"
+            subnet_area[net_name] = area
+        else:
+            subnet = subnet_base.format(subnet_count)
+            ip_map[origem][net_name] = ip_base.format(subnet_count, 2)
+            ip_map[destino][net_name] = ip_base.format(subnet_count, 3)
+            subnet_count += 1
         networks[net_name] = subnet
         subnet_cost[net_name] = peso
-        subnet_count += 1
+
+    # Faixas de endereços de cada área, anunciadas pelos ABRs no lugar dos prefixos contidos nelas
+    bits_bloco = tamanho_bloco.bit_length() - 1
+    faixas_areas = ";".join(
+        f"{area}=10.{10 + area}.0.0/16,192.168.{area * tamanho_bloco}.0/{24 - bits_bloco}"
+        for area in sorted(set(areas.values()))
+    )
 
     # Criação dos serviços de roteadores 
     for r in sorted(roteadores):
@@ -66,6 +171,18 @@ def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml"):
             service['environment'][f"CUSTO_{net}"] = str(subnet_cost[net])
         service['cap_add'] = ['NET_ADMIN']
 
+        # Área própria do roteador e áreas dos enlaces em outras áreas (os ABRs também recebem as faixas de endereços das áreas)
+        if (multiarea):
+            area = area_propria[r]
+            service['environment']['AREA'] = str(area)
+            for net in ip_map[r]:
+                if (subnet_area[net] != area):
+                    service['environment'][f"AREA_{net}"] = str(subnet_area[net])
+            if (any(subnet_area[net] != area for net in ip_map[r])):
+                service['environment']['FAIXAS_AREAS'] = faixas_areas
+            subnet_count = area * tamanho_bloco + hosts_area[area]
+            hosts_area[area] += 1
+
         # Criação da rede dos hosts do roteador
         host_net = f"{r}_hosts_net"
         host_subnet = f"192.168.{subnet_count}.0/24"
@@ -109,4 +226,13 @@ def gerar_docker_compose(caminho_csv, caminho_saida="docker-compose.yml"):
 
 
 if (__name__ == '__main__'):
-    gerar_docker_compose("grafos/grafo.csv")
+    parser = argparse.ArgumentParser(description="Gera o docker-compose.yml da rede de roteadores a partir de um grafo salvo em .csv")
+    parser.add_argument("grafo", nargs="?", default="grafos/grafo.csv",
+                        help="Arquivo .csv com a topologia (Padrão: grafos/grafo.csv). Uma coluna \"area\" opcional define a área de cada enlace")
+    parser.add_argument("--areas", type=int, default=1,
+                        help="Divide a topologia na quantidade de áreas informada (backbone e demais áreas), no lugar da coluna \"area\"")
+    parser.add_argument("--saida", default="docker-compose.yml",
+                        help="Arquivo gerado (Padrão: docker-compose.yml)")
+    args = parser.parse_args()
+
+    gerar_docker_compose(args.grafo, args.saida, args.areas)
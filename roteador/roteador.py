@@ -7,422 +7,5574 @@ import os
 import subprocess
 import ipaddress
 import datetime
+import heapq
+import random
+import re
+import struct
+import ctypes
+import errno
+import asyncio
+import collections
+import types
+import array
+import itertools
+import sys
+import bisect
+import http.server
+import cProfile
+import pstats
+import marshal
+import functools
+import socketserver
+
+# Relógio dos instantes enviados nos pacotes ou gravados em disco (substituído por um relógio virtual no simulador)
+relogio = time.time
+# Relógio monotônico dos prazos (queda de vizinhos, envelhecimento dos LSAs, reinício gracioso) e dos tempos medidos localmente, imune a
+# ajustes do relógio do sistema (ex: NTP) (substituído pelo mesmo relógio virtual no simulador)
+relogio_monotonico = time.monotonic
+
+# Formatos de codificação dos pacotes, em ordem de preferência
+FORMATO_BINARIO = "binario"
+FORMATO_JSON = "json"
+FORMATOS_SUPORTADOS = [FORMATO_BINARIO, FORMATO_JSON]
+
+# Formato binário (em ordem de rede):
+# - Cabeçalho fixo: identificador "LS" (2 bytes), versão (1 byte) e tipo do pacote (1 byte)
+# - ID do roteador emissor: tamanho (1 byte) seguido do texto em UTF-8
+# - HELLO: timestamp (8 bytes), IP da interface (4 bytes), formatos suportados (1 byte, um bit por formato), intervalo de queda (4 bytes, em milissegundos)
+#   e lista de vizinhos conhecidos
+# - LSA: número de sequência (4 bytes), timestamp (8 bytes), quantidade de endereços (2 bytes), IPs (4 bytes cada), tamanhos dos prefixos (1 byte cada),
+#   lista de vizinhos dos enlaces e seus custos (4 bytes cada, na mesma ordem) e, opcionalmente (LSAs de um ABR), os prefixos resumidos de outras áreas:
+#   quantidade (2 bytes), redes (4 bytes cada), tamanhos dos prefixos (1 byte cada) e custos (4 bytes cada, na mesma ordem)
+# - LSACK: lista de roteadores de origem dos LSAs confirmados e seus números de sequência (4 bytes cada, na mesma ordem)
+# - DBD: parte e quantidade de partes da descrição da LSDB (2 bytes cada), pedido da descrição do vizinho (1 byte), lista de roteadores de origem e números de sequência (4 bytes cada, na mesma ordem)
+# - LSR: parte da descrição respondida (2 bytes), lista de roteadores de origem e números de sequência dos LSAs solicitados (4 bytes cada, na mesma ordem)
+# - Listas de IDs: tamanho total (2 bytes) seguido dos IDs em UTF-8 separados pelo byte nulo
+# A versão 1 usava 2 bytes para os custos dos enlaces; seus pacotes (de roteadores ou snapshots antigos) ainda são decodificados
+BINARIO_IDENTIFICADOR = b"LS"
+BINARIO_VERSAO = 2
+BINARIO_CUSTOS = {1: "H", 2: "I"}
+BINARIO_TIPOS = {"HELLO": 1, "LSA": 2, "LSACK": 3, "DBD": 4, "LSR": 5}
+BINARIO_NOMES = {codigo: tipo for tipo, codigo in BINARIO_TIPOS.items()}
+BINARIO_CABECALHO = struct.Struct("!2sBB")
+BINARIO_HELLO = struct.Struct("!d4sBI")
+BINARIO_LSA = struct.Struct("!IdH")
+BINARIO_TAMANHO = struct.Struct("!H")
+BINARIO_PARTE = struct.Struct("!H")
+BINARIO_DBD = struct.Struct("!HHB")
+
+# Área de backbone (OSPF): os roteadores de borda de área (ABR) ligam as demais áreas a ela, resumindo os prefixos de cada área nas outras
+AREA_BACKBONE = 0
+
+# Snapshot da LSDB gravado em disco (reinício gracioso):
+# - Cabeçalho: identificador "LSDB" (4 bytes), versão (1 byte), instante da gravação (8 bytes), quantidade de LSAs (4 bytes)
+# - LSAs: tamanho (2 bytes) seguido do LSA no formato binário dos pacotes
+# - Rotas instaladas: tamanho (4 bytes) seguido do prefixo, do roteador de destino e dos IPs dos gateways (separados por espaços) de cada rota,
+#   em UTF-8 separados pelo byte nulo
+SNAPSHOT_IDENTIFICADOR = b"LSDB"
+SNAPSHOT_VERSAO = 1
+SNAPSHOT_CABECALHO = struct.Struct("!4sBdI")
+SNAPSHOT_ROTAS = struct.Struct("!I")
+
+# Blocos de endereços e de IDs já decodificados, indexados pelos seus bytes (os LSAs de um roteador se repetem a cada inundação)
+CACHE_BINARIO = {}
+CACHE_BINARIO_LIMITE = 8192
+
+# Quantidade máxima de prefixos com as conversões mantidas (rede_ip e faixa_ip): os menos usados recentemente são descartados, sem
+# acumular todos os prefixos já vistos quando os endereços anunciados mudam
+CACHE_PREFIXOS_LIMITE = 65536
+
+# Redução aleatória máxima (fração do intervalo) dos intervalos entre HELLOs e entre pacotes do BFD (RFC 5880, seção 6.8.7)
+# Sem a variação, o prazo de queda no vizinho coincidiria com a chegada do último pacote tolerado, e uma perda a menos bastaria para derrubá-lo
+VARIACAO_ENVIOS = 0.25
+
+# Intervalo (em segundos) entre as verificações da sincronização com os vizinhos durante um reinício gracioso
+INTERVALO_REINICIO = 0.1
+
+# Quantidade máxima de confirmações em um único LSACK (e de entradas em um DBD ou LSR), mantendo o pacote dentro do buffer de recepção
+LIMITE_ACKS = 200
+
+# Níveis das mensagens do registro
+NIVEL_DEBUG = 10
+NIVEL_INFO = 20
+NIVEL_AVISO = 30
+NIVEL_ERRO = 40
+NIVEIS_REGISTRO = {"debug": NIVEL_DEBUG, "info": NIVEL_INFO, "aviso": NIVEL_AVISO, "erro": NIVEL_ERRO}
+
+
+def print2(mensagem: str, nivel: int = NIVEL_INFO):
+    """
+    Registra uma mensagem com o nível informado
+    Substituída pelo registro assíncrono ao executar o roteador e pelo simulador. Por padrão (ao importar o módulo, como nos benchmarks), as
+    mensagens a partir do nível info são escritas diretamente na saída
+    """
+    if (nivel >= NIVEL_INFO):
+        print(mensagem)
+
+
+def registrar_pacote() -> bool:
+    """
+    Indica se o próximo pacote enviado ou recebido deve ser registrado (nível debug, com amostragem)
+    Substituída pelo registro assíncrono ao executar o roteador e pelo simulador. Por padrão, os pacotes não são registrados
+    """
+    return False
+
+
+# Atraso inicial, espera e espera máxima (em segundos) entre os cálculos dos próximos pulos alternativos (LFA), no modelo do spf_throttle:
+# os cálculos do SPF de uma rajada de LSAs são seguidos de um único cálculo dos alternativos
+LFA_THROTTLE = (1, 2, 10)
+
+# Limites superiores (em segundos) dos intervalos dos histogramas de duração (cálculos do SPF, dos alternativos e programação das rotas)
+LIMITES_DURACAO = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Quantidade máxima de eventos mantidos pelo rastreamento dos LSAs (os mais antigos são descartados)
+CAPACIDADE_RASTREAMENTO = 100000
+
+# Modos do perfil de execução e intervalo (em segundos) entre as amostras das pilhas no modo "amostragem"
+MODOS_PERFIL = ("cprofile", "amostragem")
+INTERVALO_AMOSTRAGEM_PERFIL = 0.005
+# A partir do Python 3.12, o cProfile usa o sys.monitoring: um único perfil ativo por processo, que já recebe os eventos de todas as threads
+PERFIL_POR_PROCESSO = sys.version_info >= (3, 12)
+
+# Socket local (Unix) das consultas à RIB do roteador em execução
+CAMINHO_CONSULTAS = "/tmp/roteador.sock"
+
+# Tabela de tradução que inverte bytes 0 e 1 (roteadores presentes na topologia -> roteadores bloqueados no início do Dijkstra)
+INVERTER_BYTES = bytes.maketrans(b"\x00\x01", b"\x01\x00")
+
+# Pacote de controle do BFD (RFC 5880), enviado em uma porta própria (RFC 5881, salto único):
+# versão e diagnóstico (1 byte), estado e flags (1 byte), multiplicador de detecção (1 byte), tamanho (1 byte), discriminadores local e remoto (4 bytes cada)
+# e intervalos mínimos de envio desejado, de recepção e de recepção de eco (4 bytes cada, em microssegundos)
+PORTA_BFD = 3784
+BFD_VERSAO = 1
+BFD_CONTROLE = struct.Struct("!BBBBIIIII")
+BFD_ADMIN_DOWN, BFD_DOWN, BFD_INIT, BFD_UP = range(4)
+BFD_ESTADOS = {BFD_ADMIN_DOWN: "AdminDown", BFD_DOWN: "Down", BFD_INIT: "Init", BFD_UP: "Up"}
+# Diagnósticos: tempo de detecção expirado e queda sinalizada pelo vizinho
+BFD_DIAG_EXPIRADO = 1
+BFD_DIAG_VIZINHO = 3
+
+
+def escolher_formato(formatos_locais: list[str], formatos_vizinho: list[str]) -> str:
+    """
+    Escolhe o formato preferido pelo roteador que também seja suportado pelo vizinho (JSON, caso não haja nenhum em comum)
+    """
+    for formato in formatos_locais:
+        if (formato in formatos_vizinho):
+            return formato
+    return FORMATO_JSON
+
+
+def formato_dos_dados(dados: bytes) -> str:
+    """
+    Identifica o formato (binário ou JSON) de um pacote já codificado
+    """
+    return FORMATO_BINARIO if (dados[:2] == BINARIO_IDENTIFICADOR) else FORMATO_JSON
+
+
+def codificar_textos(textos: list[str]) -> bytes:
+    """
+    Codifica uma lista de IDs em um único bloco, precedido do seu tamanho em bytes
+    """
+    dados = "\0".join(textos).encode("utf-8")
+    return BINARIO_TAMANHO.pack(len(dados)) + dados
+
+
+def decodificar_textos(dados: bytes, posicao: int) -> tuple[list[str], int]:
+    """
+    Decodifica uma lista de IDs codificada por codificar_textos, retornando a lista e a posição seguinte
+    """
+    (tamanho,) = BINARIO_TAMANHO.unpack_from(dados, posicao)
+    inicio = posicao + BINARIO_TAMANHO.size
+    fim = inicio + tamanho
+    if (fim > len(dados)):
+        raise ValueError("Pacote binário incompleto")
+    if (tamanho == 0):
+        return [], fim
+
+    bloco = bytes(dados[inicio:fim])
+    textos = CACHE_BINARIO.get(bloco)
+    if (textos is None):
+        textos = str(bloco, "utf-8").split("\0")
+        if (len(CACHE_BINARIO) >= CACHE_BINARIO_LIMITE):
+            CACHE_BINARIO.clear()
+        CACHE_BINARIO[bloco] = textos
+    return list(textos), fim
+
+
+def codificar_sequencias(sequencias: dict[str, int]) -> bytes:
+    """
+    Codifica os pares (roteador de origem, número de sequência) de um LSACK, DBD ou LSR
+    """
+    return codificar_textos(list(sequencias.keys())) + struct.pack(f"!{len(sequencias)}I", *sequencias.values())
+
+
+def decodificar_sequencias(dados: bytes, posicao: int) -> dict[str, int]:
+    """
+    Decodifica os pares (roteador de origem, número de sequência) de um LSACK, DBD ou LSR
+    """
+    origens, posicao = decodificar_textos(dados, posicao)
+    return dict(zip(origens, struct.unpack_from(f"!{len(origens)}I", dados, posicao)))
+
+
+def codificar_pacote(pacote: dict, formato: str = FORMATO_JSON) -> bytes:
+    """
+    Converte um pacote (HELLO, LSA, LSACK, DBD ou LSR) no formato de dicionário para os bytes enviados pela rede
+
+    Args:
+        pacote (dict): Pacote no formato de dicionário
+        formato (str, opcional): Formato de codificação (FORMATO_BINARIO ou FORMATO_JSON) (Padrão: FORMATO_JSON)
+
+    Returns:
+        bytes: Pacote codificado
+    """
+    if (formato == FORMATO_JSON):
+        return json.dumps(pacote).encode("utf-8")
+
+    tipo = pacote["type"]
+    router_id = pacote["router_id"].encode("utf-8")
+    partes = [
+        BINARIO_CABECALHO.pack(BINARIO_IDENTIFICADOR, BINARIO_VERSAO, BINARIO_TIPOS[tipo]),
+        bytes((len(router_id),)), router_id
+    ]
+
+    if (tipo == "HELLO"):
+        formatos = pacote.get("formats", [FORMATO_JSON])
+        mascara = 0
+        for indice, nome in enumerate(FORMATOS_SUPORTADOS):
+            if (nome in formatos):
+                mascara |= 1 << indice
+        partes.append(BINARIO_HELLO.pack(
+            pacote["timestamp"], socket.inet_aton(pacote["ip_address"]), mascara,
+            round(pacote.get("dead_interval", 0) * 1000)))
+        partes.append(codificar_textos(pacote["known_neighbors"]))
+
+    elif (tipo == "LSA"):
+        enderecos = [endereco.partition("/") for endereco in pacote["addresses"]]
+        partes.append(BINARIO_LSA.pack(
+            pacote["sequence_number"], pacote["timestamp"], len(enderecos)))
+        partes.append(b"".join(map(socket.inet_aton, [ip for ip, _, _ in enderecos])))
+        partes.append(bytes([int(prefixo) if prefixo else 32 for _, _, prefixo in enderecos]))
+        links = pacote["links"]
+        partes.append(codificar_textos(list(links.keys())))
+        partes.append(struct.pack(f"!{len(links)}I", *links.values()))
+        resumos = pacote.get("resumos")
+        if (resumos):
+            redes = [prefixo.partition("/") for prefixo in resumos]
+            partes.append(BINARIO_TAMANHO.pack(len(redes)))
+            partes.append(b"".join(map(socket.inet_aton, [ip for ip, _, _ in redes])))
+            partes.append(bytes([int(tamanho) if tamanho else 32 for _, _, tamanho in redes]))
+            partes.append(struct.pack(f"!{len(resumos)}I", *resumos.values()))
+
+    elif (tipo == "LSACK"):
+        partes.append(codificar_sequencias(pacote["acks"]))
+
+    elif (tipo == "DBD"):
+        partes.append(BINARIO_DBD.pack(pacote["parte"], pacote["partes"], pacote["solicitar"]))
+        partes.append(codificar_sequencias(pacote["resumo"]))
+
+    elif (tipo == "LSR"):
+        partes.append(BINARIO_PARTE.pack(pacote["parte"]))
+        partes.append(codificar_sequencias(pacote["pedidos"]))
+
+    return b"".join(partes)
+
+
+def decodificar_pacote(dados: bytes) -> dict:
+    """
+    Converte os bytes recebidos pela rede em um pacote no formato de dicionário, identificando automaticamente o formato (binário ou JSON)
+
+    Args:
+        dados (bytes): Pacote codificado (aceita também um memoryview do buffer de recepção)
+
+    Returns:
+        dict: Pacote no formato de dicionário
+    """
+    if (dados[:2] != BINARIO_IDENTIFICADOR):
+        return json.loads(str(dados, "utf-8"))
+
+    _, versao, codigo = BINARIO_CABECALHO.unpack_from(dados, 0)
+    if (versao not in BINARIO_CUSTOS):
+        raise ValueError(f"Versão do formato binário não suportada: {versao}")
+    tipo = BINARIO_NOMES.get(codigo)
+    posicao = BINARIO_CABECALHO.size
+    tamanho = dados[posicao]
+    router_id = str(dados[posicao + 1:posicao + 1 + tamanho], "utf-8")
+    posicao += 1 + tamanho
+
+    if (tipo == "HELLO"):
+        timestamp, ip, mascara, intervalo_queda = BINARIO_HELLO.unpack_from(dados, posicao)
+        vizinhos, _ = decodificar_textos(dados, posicao + BINARIO_HELLO.size)
+        pacote = {
+            "type": tipo,
+            "router_id": router_id,
+            "timestamp": timestamp,
+            "ip_address": socket.inet_ntoa(ip),
+            "known_neighbors": vizinhos,
+            "formats": [nome for indice, nome in enumerate(FORMATOS_SUPORTADOS) if mascara & (1 << indice)],
+        }
+        # O intervalo zero indica um HELLO sem intervalo de queda anunciado
+        if (intervalo_queda):
+            pacote["dead_interval"] = intervalo_queda / 1000
+        return pacote
+
+    if (tipo == "LSA"):
+        sequence_number, timestamp, quantidade = BINARIO_LSA.unpack_from(dados, posicao)
+        posicao += BINARIO_LSA.size
+        fim = posicao + 4 * quantidade
+        bloco = bytes(dados[posicao:fim + quantidade])
+        enderecos = CACHE_BINARIO.get(bloco)
+        if (enderecos is None):
+            enderecos = list(map(socket.inet_ntoa, [dados[i:i + 4] for i in range(posicao, fim, 4)]))
+            # Endereços de rede recebem o tamanho do prefixo (endereços /32 são mantidos apenas como IP)
+            for indice, prefixo in enumerate(dados[fim:fim + quantidade]):
+                if (prefixo != 32):
+                    enderecos[indice] = f"{enderecos[indice]}/{prefixo}"
+            if (len(CACHE_BINARIO) >= CACHE_BINARIO_LIMITE):
+                CACHE_BINARIO.clear()
+            CACHE_BINARIO[bloco] = enderecos
+        enderecos = list(enderecos)
+        vizinhos, posicao = decodificar_textos(dados, fim + quantidade)
+        formato_custos = f"!{len(vizinhos)}{BINARIO_CUSTOS[versao]}"
+        custos = struct.unpack_from(formato_custos, dados, posicao)
+        pacote = {
+            "type": tipo,
+            "router_id": router_id,
+            "timestamp": timestamp,
+            "addresses": enderecos,
+            "sequence_number": sequence_number,
+            "links": dict(zip(vizinhos, custos)),
+        }
+        # Os prefixos resumidos ficam após os enlaces, apenas nos LSAs que os anunciam
+        posicao += struct.calcsize(formato_custos)
+        if (posicao < len(dados)):
+            (quantidade,) = BINARIO_TAMANHO.unpack_from(dados, posicao)
+            posicao += BINARIO_TAMANHO.size
+            fim = posicao + 4 * quantidade
+            redes = [socket.inet_ntoa(dados[i:i + 4]) for i in range(posicao, fim, 4)]
+            tamanhos = dados[fim:fim + quantidade]
+            custos = struct.unpack_from(f"!{quantidade}I", dados, fim + quantidade)
+            pacote["resumos"] = {f"{rede}/{tamanho}": custo for rede, tamanho, custo in zip(redes, tamanhos, custos)}
+        return pacote
+
+    if (tipo == "LSACK"):
+        return {
+            "type": tipo,
+            "router_id": router_id,
+            "acks": decodificar_sequencias(dados, posicao),
+        }
+
+    if (tipo == "DBD"):
+        parte, quantidade, solicitar = BINARIO_DBD.unpack_from(dados, posicao)
+        return {
+            "type": tipo,
+            "router_id": router_id,
+            "parte": parte,
+            "partes": quantidade,
+            "solicitar": bool(solicitar),
+            "resumo": decodificar_sequencias(dados, posicao + BINARIO_DBD.size),
+        }
+
+    if (tipo == "LSR"):
+        parte, = BINARIO_PARTE.unpack_from(dados, posicao)
+        return {
+            "type": tipo,
+            "router_id": router_id,
+            "parte": parte,
+            "pedidos": decodificar_sequencias(dados, posicao + BINARIO_PARTE.size),
+        }
+
+    raise ValueError(f"Tipo de pacote binário desconhecido: {codigo}")
+
+
+class Histograma:
+    """
+    Histograma de valores com intervalos fixos, no formato dos histogramas do Prometheus (contagem por limite superior, soma e quantidade)
+
+    Não usa travas: cada histograma é alimentado por uma única thread (ou pelo loop de eventos), e a exportação apenas lê os contadores
+    """
+
+    __slots__ = ["_limites", "_contagens", "_soma", "_quantidade"]
+
+    def __init__(self, limites: tuple[float, ...] = LIMITES_DURACAO):
+        """
+        Inicializa um histograma vazio
+
+        Args:
+            limites (tuple[float, ...], opcional): Limites superiores dos intervalos, em ordem crescente (Padrão: LIMITES_DURACAO)
+        """
+        self._limites = limites
+        # Um contador por intervalo, além do intervalo acima do último limite
+        self._contagens = [0] * (len(limites) + 1)
+        self._soma = 0.0
+        self._quantidade = 0
+
+    @property
+    def limites(self) -> tuple[float, ...]:
+        return self._limites
+
+    @property
+    def contagens(self) -> list[int]:
+        return self._contagens
+
+    @property
+    def soma(self) -> float:
+        return self._soma
+
+    @property
+    def quantidade(self) -> int:
+        return self._quantidade
+
+    def observar(self, valor: float):
+        """
+        Registra um valor no intervalo correspondente (o primeiro cujo limite superior é maior ou igual ao valor)
+        """
+        self._contagens[bisect.bisect_left(self._limites, valor)] += 1
+        self._soma += valor
+        self._quantidade += 1
+
+
+class NoTrie:
+    """
+    Nó da árvore de prefixos (TrieRotas): o prefixo (endereço como inteiro e tamanho), o valor associado (None em um nó apenas de
+    ramificação) e os dois filhos, que diferem no bit seguinte ao prefixo (0 em `zero` e 1 em `um`)
+
+    Os filhos ficam em atributos, e não em uma lista, para que cada nó seja um único objeto acompanhado pelo coletor de lixo
+    """
+
+    __slots__ = ["chave", "tamanho", "prefixo", "valor", "zero", "um"]
+
+    def __init__(self, chave: int, tamanho: int, prefixo: str | None = None, valor=None):
+        self.chave = chave
+        self.tamanho = tamanho
+        self.prefixo = prefixo
+        self.valor = valor
+        self.zero = None
+        self.um = None
+
+    def filho(self, lado: int) -> "NoTrie | None":
+        return self.um if (lado) else self.zero
+
+    def definir_filho(self, lado: int, no: "NoTrie | None"):
+        if (lado):
+            self.um = no
+        else:
+            self.zero = no
+
+
+class TrieRotas:
+    """
+    Árvore de prefixos comprimida (Patricia), com busca pelo maior prefixo que contém um endereço (longest prefix match), como no kernel
+
+    Os nós com um único filho e sem valor são eliminados: cada nó ramifica no primeiro bit em que os prefixos abaixo dele diferem, e uma
+    busca visita no máximo um nó por prefixo que contém o endereço (em vez de um nó por bit)
+
+    Os nós com valor também são indexados pelo prefixo, e a substituição do valor de um prefixo existente (ex: novos gateways) não percorre
+    a árvore
+    """
+
+    __slots__ = ["_raiz", "_nos"]
+
+    def __init__(self):
+        """
+        Inicializa uma árvore vazia
+        """
+        self._raiz = None
+        # Nós com valor, indexados pelo prefixo inserido
+        self._nos = {}
+
+    def __len__(self) -> int:
+        return len(self._nos)
+
+    @staticmethod
+    def endereco_inteiro(endereco: str | int) -> int:
+        """
+        Converte um endereço IPv4 (ex: "192.168.1.10") em inteiro, sem passar pelo ipaddress (mais lento nas buscas)
+        """
+        if (isinstance(endereco, int)):
+            return endereco
+        return int.from_bytes(socket.inet_aton(endereco), "big")
+
+    def inserir(self, prefixo: str, valor):
+        """
+        Insere ou substitui o valor de um prefixo
+
+        Args:
+            prefixo (str): Endereço ou prefixo (ex: "10.10.1.2" ou "192.168.1.0/24")
+            valor: Valor associado ao prefixo (não pode ser None)
+        """
+        no = self._nos.get(prefixo)
+        if (no is not None):
+            no.valor = valor
+            return
+
+        chave, tamanho = faixa_ip(prefixo)
+        novo = NoTrie(chave, tamanho, prefixo, valor)
+        pai, lado, no = None, 0, self._raiz
+        while (no is not None):
+            tamanho_no = no.tamanho
+            if (tamanho_no <= tamanho and not (chave ^ no.chave) >> (32 - tamanho_no)):
+                if (tamanho_no == tamanho):
+                    # Nó de ramificação (ou o mesmo prefixo escrito de outra forma, ex: "10.0.0.1" e "10.0.0.1/32")
+                    if (no.valor is not None):
+                        del self._nos[no.prefixo]
+                    no.prefixo, no.valor = prefixo, valor
+                    self._nos[prefixo] = no
+                    return
+                # O nó contém o prefixo inserido: desce pelo filho do próximo bit
+                pai, lado = no, (chave >> (31 - tamanho_no)) & 1
+                no = no.um if (lado) else no.zero
+                continue
+
+            # Bits iniciais em comum entre o prefixo inserido e o do nó (menos que o tamanho do nó)
+            comum = min(tamanho, 32 - (chave ^ no.chave).bit_length())
+            if (comum == tamanho):
+                # O prefixo inserido contém o nó, que passa a ser seu filho
+                novo.definir_filho((no.chave >> (31 - tamanho)) & 1, no)
+                substituto = novo
+            else:
+                # Os prefixos divergem: um nó de ramificação no primeiro bit diferente passa a ter os dois como filhos
+                substituto = NoTrie(chave & ~((1 << (32 - comum)) - 1) & 0xFFFFFFFF, comum)
+                substituto.definir_filho((chave >> (31 - comum)) & 1, novo)
+                substituto.definir_filho((no.chave >> (31 - comum)) & 1, no)
+            self.ligar(pai, lado, substituto)
+            self._nos[prefixo] = novo
+            return
+
+        self.ligar(pai, lado, novo)
+        self._nos[prefixo] = novo
+
+    def ligar(self, pai: NoTrie | None, lado: int, no: NoTrie | None):
+        """
+        Coloca o nó no lugar do filho informado do pai (ou da raiz, sem pai)
+        """
+        if (pai is None):
+            self._raiz = no
+        else:
+            pai.definir_filho(lado, no)
+
+    def remover(self, prefixo: str) -> bool:
+        """
+        Remove um prefixo, eliminando os nós de ramificação que deixam de ser necessários
+
+        Returns:
+            bool: Indica se o prefixo estava na árvore
+        """
+        chave, tamanho = faixa_ip(prefixo)
+        avo, lado_pai, pai, lado, no = None, 0, None, 0, self._raiz
+        while (no is not None and no.tamanho < tamanho and (chave ^ no.chave) >> (32 - no.tamanho) == 0):
+            avo, lado_pai, pai, lado = pai, lado, no, (chave >> (31 - no.tamanho)) & 1
+            no = no.filho(lado)
+        if (no is None or no.tamanho != tamanho or no.chave != chave or no.valor is None):
+            return False
+
+        del self._nos[no.prefixo]
+        no.prefixo, no.valor = None, None
+        filhos = [filho for filho in (no.zero, no.um) if filho is not None]
+        if (len(filhos) == 2):
+            # Continua como nó de ramificação
+            return True
+        self.ligar(pai, lado, filhos[0] if (filhos) else None)
+        # Sem o nó removido, um pai apenas de ramificação fica com um único filho e é eliminado
+        if (not filhos and pai is not None and pai.valor is None):
+            self.ligar(avo, lado_pai, pai.filho(1 - lado))
+        return True
+
+    def buscar(self, endereco: str | int) -> tuple[str, object] | None:
+        """
+        Busca o maior prefixo que contém o endereço
+
+        Args:
+            endereco (str | int): Endereço IPv4 (ex: "192.168.1.10" ou o inteiro equivalente)
+
+        Returns:
+            tuple[str, object] | None: Prefixo encontrado e seu valor, ou None caso nenhum prefixo contenha o endereço
+        """
+        if (not isinstance(endereco, int)):
+            endereco = int.from_bytes(socket.inet_aton(endereco), "big")
+        encontrado = None
+        no = self._raiz
+        while (no is not None):
+            tamanho = no.tamanho
+            if ((endereco ^ no.chave) >> (32 - tamanho)):
+                break
+            if (no.valor is not None):
+                encontrado = no
+            if (tamanho == 32):
+                break
+            no = no.um if ((endereco >> (31 - tamanho)) & 1) else no.zero
+        return (encontrado.prefixo, encontrado.valor) if (encontrado is not None) else None
+
+    def itens(self) -> list[tuple[str, object]]:
+        """
+        Prefixos da árvore e seus valores, em ordem de endereço (um prefixo aparece antes dos contidos nele)
+        """
+        itens = []
+        pilha = [self._raiz] if (self._raiz is not None) else []
+        while (pilha):
+            no = pilha.pop()
+            if (no.valor is not None):
+                itens.append((no.prefixo, no.valor))
+            pilha.extend(filho for filho in (no.um, no.zero) if filho is not None)
+        return itens
+
+
+class TabelaRotas:
+    """
+    Mantém o registro das rotas já instaladas no kernel (FIB), aplicando apenas as rotas adicionadas, alteradas e removidas, em lote, por meio de um único processo `ip -batch`
+
+    Destinos com vários menores caminhos de mesmo custo (ECMP) recebem rotas com múltiplos próximos pulos (`nexthop via ... nexthop via ...`),
+    limitadas à quantidade máxima de caminhos
+
+    Com a compressão, as rotas calculadas (um prefixo por endereço de cada destino) são reduzidas ao menor conjunto de prefixos com o mesmo
+    encaminhamento antes de serem instaladas (ver comprimir_prefixos)
+
+    As rotas calculadas também são mantidas em uma árvore de prefixos (RIB), consultada pelo maior prefixo que contém um endereço. A árvore
+    é construída na primeira consulta e, a partir dela, atualizada junto com as rotas calculadas
+    """
+
+    __slots__ = [
+        "_router_id", "_instaladas", "_desejadas", "_prefixos", "_alterados", "_escritas", "_escritas_evitadas", "_maximo_caminhos",
+        "_duracao_aplicacao", "_trava", "_comprimir", "_rib"
+    ]
+
+    def __init__(self, router_id: str, maximo_caminhos: int = 4, comprimir: bool = True):
+        """
+        Inicializa uma nova tabela de rotas
+
+        Args:
+            router_id (str): Identificador único do roteador
+            maximo_caminhos (int, opcional): Quantidade máxima de próximos pulos de uma rota (1 desativa o ECMP) (Padrão: 4)
+            comprimir (bool, opcional): Instala o menor conjunto de prefixos equivalente às rotas calculadas, no lugar de uma rota por prefixo (Padrão: True)
+        """
+        self._router_id = router_id
+        # Rotas instaladas no kernel: a chave é o prefixo e o valor é uma tupla (roteador de destino, IPs dos gateways)
+        self._instaladas = {}
+        # Rotas calculadas: a chave é o prefixo e o valor é uma tupla (roteador de destino, IPs dos gateways)
+        self._desejadas = {}
+        # Prefixos calculados para cada roteador de destino
+        self._prefixos = {}
+        # Prefixos calculados alterados desde a última aplicação no kernel
+        self._alterados = set()
+        # Rotas calculadas indexadas pelo prefixo, com o valor (roteador de destino, IPs dos gateways) (None até a primeira consulta)
+        self._rib = None
+        self._comprimir = comprimir
+        self._escritas = 0
+        self._escritas_evitadas = 0
+        self._maximo_caminhos = maximo_caminhos
+        # Duração de cada aplicação de um lote de rotas no kernel
+        self._duracao_aplicacao = Histograma()
+        # Protege as rotas, alteradas pelos cálculos e pelos reparos locais de uma ou mais LSDBs (uma por área)
+        self._trava = threading.Lock()
+
+    @property
+    def escritas(self) -> int:
+        return self._escritas
+
+    @property
+    def escritas_evitadas(self) -> int:
+        return self._escritas_evitadas
+
+    @property
+    def duracao_aplicacao(self) -> Histograma:
+        return self._duracao_aplicacao
+
+    @property
+    def destinos(self) -> set:
+        return set(self._prefixos.keys())
+
+    @property
+    def trava(self) -> threading.Lock:
+        return self._trava
+
+    @property
+    def instaladas(self) -> dict[str, tuple[str, tuple[str, ...]]]:
+        return dict(self._instaladas)
+
+    @property
+    def desejadas(self) -> dict[str, tuple[str, tuple[str, ...]]]:
+        return dict(self._desejadas)
+
+    @property
+    def rib(self) -> TrieRotas:
+        with self._trava:
+            return self.indexar()
+
+    @property
+    def comprimir(self) -> bool:
+        return self._comprimir
+
+    @comprimir.setter
+    def comprimir(self, comprimir: bool):
+        if (comprimir != self._comprimir):
+            self._comprimir = comprimir
+            # A próxima aplicação reescreve as rotas no novo formato
+            self._alterados.update(self._desejadas.keys(), self._instaladas.keys())
+
+    @property
+    def multicaminhos(self) -> int:
+        return sum(len(gateways) > 1 for _, gateways in self._instaladas.values())
+
+    @property
+    def maximo_caminhos(self) -> int:
+        return self._maximo_caminhos
+
+    @maximo_caminhos.setter
+    def maximo_caminhos(self, maximo_caminhos: int):
+        self._maximo_caminhos = maximo_caminhos
+
+    def carregar(self, rotas: dict[str, tuple[str, tuple[str, ...]]]):
+        """
+        Registra rotas já presentes no kernel (ex: instaladas antes de um reinício), que passam a ser alteradas apenas quando mudarem
+
+        Args:
+            rotas (dict[str, tuple[str, tuple[str, ...]]]): Rotas indexadas pelo prefixo, com a tupla (roteador de destino, IPs dos gateways)
+        """
+        for prefixo, (destino, gateways) in rotas.items():
+            self.registrar(prefixo, destino, gateways)
+            self.desejar(prefixo, destino, gateways)
+
+    def definir(self, destino: str, prefixos: list[str], gateways: tuple[str, ...] | None):
+        """
+        Define as rotas desejadas para um roteador de destino, registrando apenas as diferenças em relação às rotas já calculadas
+
+        Args:
+            destino (str): Roteador de destino
+            prefixos (list[str]): Endereços anunciados pelo destino
+            gateways (tuple[str, ...] | None): IPs dos próximos pulos, em ordem de preferência (apenas os primeiros até a quantidade máxima de caminhos são usados).
+                None remove todas as rotas do destino
+        """
+        if (gateways is not None):
+            gateways = tuple(gateways[:self._maximo_caminhos])
+        atuais = self._prefixos.get(destino, set())
+        novos = set(prefixos) if (gateways is not None) else set()
+
+        # Prefixos que deixaram de ser alcançáveis por este destino
+        # (um prefixo definido depois por outro destino passa a pertencer a ele, e não é removido aqui)
+        for prefixo in atuais - novos:
+            self.desejar(prefixo, destino, None)
+
+        for prefixo in novos:
+            if (self._desejadas.get(prefixo) == (destino, gateways)):
+                # A rota já foi calculada com os mesmos próximos pulos
+                self._escritas_evitadas += 1
+            else:
+                self.desejar(prefixo, destino, gateways)
+
+    def desejar(self, prefixo: str, destino: str, gateways: tuple[str, ...] | None):
+        """
+        Registra a rota calculada de um prefixo, a ser instalada na próxima aplicação
+
+        Args:
+            prefixo (str): Prefixo da rota
+            destino (str): Roteador de destino
+            gateways (tuple[str, ...] | None): IPs dos próximos pulos (None remove a rota)
+        """
+        anterior = self._desejadas.pop(prefixo, None)
+        if (anterior is not None):
+            self._prefixos[anterior[0]].discard(prefixo)
+            if (not self._prefixos[anterior[0]]):
+                del self._prefixos[anterior[0]]
+
+        if (gateways is not None):
+            self._desejadas[prefixo] = (destino, gateways)
+            self._prefixos.setdefault(destino, set()).add(prefixo)
+            if (self._rib is not None):
+                self._rib.inserir(prefixo, (destino, gateways))
+        elif (anterior is not None and self._rib is not None):
+            self._rib.remover(prefixo)
+        self._alterados.add(prefixo)
+
+    def indexar(self) -> TrieRotas:
+        """
+        Retorna a árvore de prefixos das rotas calculadas (RIB), construindo-a na primeira chamada (deve ser chamado com a trava)
+        """
+        if (self._rib is None):
+            self._rib = TrieRotas()
+            for prefixo, rota in self._desejadas.items():
+                self._rib.inserir(prefixo, rota)
+        return self._rib
+
+    def consultar(self, endereco: str) -> tuple[str, str, tuple[str, ...]] | None:
+        """
+        Busca na RIB a rota calculada de maior prefixo que contém o endereço
+
+        Args:
+            endereco (str): Endereço IPv4 (ex: "192.168.1.10")
+
+        Returns:
+            tuple[str, str, tuple[str, ...]] | None: Prefixo, roteador de destino e IPs dos gateways, ou None caso não haja rota
+        """
+        with self._trava:
+            encontrado = self.indexar().buscar(endereco)
+        if (encontrado is None):
+            return None
+        prefixo, (destino, gateways) = encontrado
+        return prefixo, destino, gateways
+
+    def ler_kernel(self) -> TrieRotas:
+        """
+        Lê as rotas da tabela principal do kernel (`ip -o route show`), incluindo as conectadas (sem gateways) e a rota padrão
+
+        Returns:
+            TrieRotas: Árvore com os IPs dos gateways de cada prefixo do kernel
+        """
+        kernel = TrieRotas()
+        try:
+            resultado = subprocess.run(["ip", "-o", "route", "show"], capture_output=True, text=True)
+        except OSError as e:
+            print2(f"[ERRO] Falha ao ler as rotas do kernel: {e}", NIVEL_ERRO)
+            return kernel
+        for linha in resultado.stdout.splitlines():
+            partes = linha.split()
+            if (not partes or partes[0] in ("broadcast", "local", "unreachable", "blackhole", "prohibit")):
+                continue
+            prefixo = "0.0.0.0/0" if (partes[0] == "default") else partes[0]
+            # Com vários caminhos, cada próximo pulo aparece como "nexthop via <gateway>" na mesma linha
+            kernel.inserir(prefixo, tuple(partes[indice + 1] for indice, parte in enumerate(partes) if parte == "via"))
+        return kernel
+
+    def verificar_kernel(self) -> list[dict]:
+        """
+        Compara o encaminhamento do kernel com o da RIB: o primeiro e o último endereço de cada prefixo calculado devem seguir pelos mesmos
+        gateways nas duas tabelas (com a compressão, pelo prefixo maior que os contém)
+
+        Returns:
+            list[dict]: Divergências encontradas, com o endereço, o prefixo e os gateways da RIB e do kernel
+        """
+        kernel = self.ler_kernel()
+        with self._trava:
+            rib = self.indexar()
+            rotas = rib.itens()
+            divergencias = []
+            for prefixo, _ in rotas:
+                chave, tamanho = faixa_ip(prefixo)
+                for endereco in {chave, chave | ((1 << (32 - tamanho)) - 1)}:
+                    prefixo_rib, (destino, gateways) = rib.buscar(endereco)
+                    encontrado = kernel.buscar(endereco)
+                    if (encontrado is None or set(encontrado[1]) != set(gateways)):
+                        divergencias.append({
+                            "endereco": str(ipaddress.IPv4Address(endereco)), "destino": destino,
+                            "rib": {"prefixo": prefixo_rib, "gateways": list(gateways)},
+                            "kernel": {"prefixo": encontrado[0], "gateways": list(encontrado[1])} if (encontrado is not None) else None,
+                        })
+        return divergencias
+
+    def registrar(self, prefixo: str, destino: str, gateways: tuple[str, ...] | None):
+        """
+        Registra o estado de um prefixo após ser aplicado no kernel
+
+        Args:
+            prefixo (str): Prefixo da rota
+            destino (str): Roteador de destino
+            gateways (tuple[str, ...] | None): IPs dos próximos pulos (None caso a rota tenha sido removida)
+        """
+        if (gateways is not None):
+            self._instaladas[prefixo] = (destino, gateways)
+        else:
+            self._instaladas.pop(prefixo, None)
+
+    def comprimidas(self) -> dict[str, tuple[str, tuple[str, ...]]]:
+        """
+        Reduz as rotas calculadas ao menor conjunto de prefixos com o mesmo encaminhamento
+
+        Returns:
+            dict[str, tuple[str, tuple[str, ...]]]: Rotas indexadas pelo prefixo, com a tupla (roteador de destino, IPs dos gateways). Um prefixo
+                que une vários destinos é associado ao primeiro deles com os mesmos gateways, que o remove quando deixar de ser alcançável
+        """
+        destinos = {}
+        for destino, gateways in sorted(self._desejadas.values()):
+            destinos.setdefault(gateways, destino)
+        rotas = {}
+        for prefixo, gateways in comprimir_prefixos({prefixo: gateways for prefixo, (_, gateways) in self._desejadas.items()}).items():
+            rota = self._desejadas.get(prefixo)
+            rotas[prefixo] = rota if (rota is not None and rota[1] == gateways) else (destinos[gateways], gateways)
+        return rotas
+
+    def pendentes(self) -> list[tuple[str, tuple[str, tuple[str, ...] | None]]]:
+        """
+        Alterações a serem escritas no kernel para que as rotas instaladas correspondam às calculadas (comprimidas ou não)
+
+        Returns:
+            list[tuple[str, tuple[str, tuple[str, ...] | None]]]: Prefixos com a tupla (roteador de destino, IPs dos gateways ou None para remoção)
+        """
+        alterados = self._alterados
+        self._alterados = set()
+        if (not self._comprimir):
+            itens = []
+            for prefixo in sorted(alterados):
+                rota = self._desejadas.get(prefixo)
+                instalada = self._instaladas.get(prefixo)
+                if (rota is None and instalada is not None):
+                    itens.append((prefixo, (instalada[0], None)))
+                elif (rota is not None and rota != instalada):
+                    itens.append((prefixo, rota))
+            return itens
+
+        # Com a compressão, uma alteração pode unir ou dividir prefixos já instalados: todas as rotas comprimidas são comparadas com as instaladas
+        rotas = self.comprimidas()
+        adicionadas = []
+        for prefixo, (destino, gateways) in rotas.items():
+            instalada = self._instaladas.get(prefixo)
+            if (instalada is None or instalada[1] != gateways):
+                adicionadas.append((prefixo, (destino, gateways)))
+            elif (instalada[0] != destino):
+                # Apenas o destino associado ao prefixo mudou, sem alterar o kernel
+                self.registrar(prefixo, destino, gateways)
+        # Os prefixos maiores são instalados antes da remoção dos prefixos que eles substituem, sem interromper o encaminhamento
+        removidas = [(prefixo, (destino, None)) for prefixo, (destino, _) in self._instaladas.items() if prefixo not in rotas]
+        return adicionadas + removidas
+
+    def aplicar(self):
+        """
+        Aplica no kernel, em um único lote, todas as alterações pendentes
+        """
+        if (not self._alterados):
+            return
+
+        itens = self.pendentes()
+        if (not itens):
+            return
+        linhas = []
+        for prefixo, (destino, gateways) in itens:
+            if (gateways is None):
+                linhas.append(f"route del {prefixo}")
+            elif (len(gateways) == 1):
+                linhas.append(f"route replace {prefixo} via {gateways[0]}")
+            else:
+                # Rota com múltiplos caminhos: o kernel distribui os fluxos entre os próximos pulos
+                linhas.append(f"route replace {prefixo} " + " ".join(f"nexthop via {ip_gateway}" for ip_gateway in gateways))
+
+        inicio = time.perf_counter()
+        falhas = self.executar_lote(linhas)
+        self._duracao_aplicacao.observar(time.perf_counter() - inicio)
+        self._escritas += len(linhas)
+
+        for indice, (prefixo, (destino, gateways)) in enumerate(itens):
+            if (gateways is None):
+                # Mesmo em caso de falha, a rota deixa de ser considerada instalada
+                self.registrar(prefixo, destino, None)
+                print2(f"Rota removida: {prefixo} [{destino}]", NIVEL_DEBUG)
+            elif (indice in falhas):
+                # Esquece a rota, para que ela seja reescrita na próxima aplicação
+                self.registrar(prefixo, destino, None)
+                self._alterados.add(prefixo)
+                print2(
+                    f"[ERRO] Falha ao adicionar rota: [{linhas[indice]}] ({self._router_id} -> {destino})", NIVEL_ERRO)
+            else:
+                self.registrar(prefixo, destino, gateways)
+                print2(f"Rota adicionada: {prefixo} -> {', '.join(gateways)} [{destino}]", NIVEL_DEBUG)
+
+        print2(
+            f"[FIB] {len(linhas)} rotas aplicadas em lote ({self._escritas_evitadas} escritas evitadas no total, "
+            f"{len(self._instaladas)} rotas instaladas para {len(self._desejadas)} calculadas)")
+
+    def executar_lote(self, linhas: list[str]) -> set[int]:
+        """
+        Executa os comandos em um único processo `ip -force -batch -`, que continua mesmo quando um dos comandos falha
+
+        Args:
+            linhas (list[str]): Comandos no formato aceito pelo `ip` (ex: "route replace 192.168.1.0/24 via 10.10.1.3")
+
+        Returns:
+            set[int]: Índices dos comandos que falharam
+        """
+        try:
+            resultado = subprocess.run(
+                ["ip", "-force", "-batch", "-"], input="\n".join(linhas) + "\n", capture_output=True, text=True)
+        except OSError as e:
+            print2(f"[ERRO] Falha ao executar o ip -batch: {e}", NIVEL_ERRO)
+            return set(range(len(linhas)))
+
+        if (resultado.returncode == 0):
+            return set()
+
+        # O ip informa as linhas com falha no formato "Command failed -:<linha>"
+        falhas = {int(linha) - 1 for linha in re.findall(
+            r"Command failed -:(\d+)", resultado.stderr)}
+        return falhas if falhas else set(range(len(linhas)))
+
+class AgendadorSPF:
+    """
+    Agenda as execuções do SPF (Dijkstra + instalação das rotas) em uma thread dedicada, agrupando rajadas de alterações em um único cálculo
+
+    Segue o modelo dos temporizadores "spf-throttle" do OSPF:
+    - Após um período sem alterações, o cálculo ocorre depois do atraso inicial
+    - Alterações seguidas respeitam um tempo de espera desde o último cálculo, dobrado a cada nova rajada (limitado pela espera máxima)
+    - A espera volta ao valor inicial quando a rede fica estável pelo dobro da espera atual
+    """
+
+    __slots__ = [
+        "_funcao", "_atraso_inicial", "_espera", "_espera_maxima", "_espera_atual", "_prazo", "_ultima_execucao",
+        "_condicao", "_pedidos", "_execucoes", "_iniciado"
+    ]
+
+    def __init__(self, funcao, atraso_inicial: float = 0.05, espera: float = 0.2, espera_maxima: float = 5):
+        """
+        Inicializa um novo agendador
+
+        Args:
+            funcao (Callable[[], None]): Função executada a cada cálculo
+            atraso_inicial (float, opcional): Atraso (em segundos) entre a primeira alteração e o cálculo (Padrão: 0.05)
+            espera (float, opcional): Tempo mínimo (em segundos) entre dois cálculos seguidos (Padrão: 0.2)
+            espera_maxima (float, opcional): Limite (em segundos) para o crescimento exponencial da espera (Padrão: 5)
+        """
+        self._funcao = funcao
+        self._atraso_inicial = atraso_inicial
+        self._espera = espera
+        self._espera_maxima = espera_maxima
+        self._espera_atual = espera
+        # Momento em que o próximo cálculo deve ocorrer (None caso não haja cálculo pendente)
+        self._prazo = None
+        self._ultima_execucao = None
+        self._condicao = threading.Condition()
+        # Quantidade de alterações recebidas e de cálculos efetivamente executados
+        self._pedidos = 0
+        self._execucoes = 0
+        self._iniciado = False
+
+    @property
+    def pedidos(self) -> int:
+        return self._pedidos
+
+    @property
+    def execucoes(self) -> int:
+        return self._execucoes
+
+    @property
+    def pendente(self) -> bool:
+        """
+        Indica se existe um cálculo agendado ainda não executado
+        """
+        return self._prazo is not None
+
+    def calcular_prazo(self, agora: float) -> float:
+        """
+        Calcula quando o próximo cálculo deve ocorrer, aplicando o atraso inicial e a espera exponencial
+
+        Args:
+            agora (float): Instante atual (time.monotonic)
+
+        Returns:
+            float: Instante do próximo cálculo
+        """
+        # Rede estável desde o último cálculo: volta para a espera inicial
+        if (self._ultima_execucao is None or (agora - self._ultima_execucao) >= 2 * self._espera_atual):
+            self._espera_atual = self._espera
+            return agora + self._atraso_inicial
+
+        prazo = max(agora + self._atraso_inicial,
+                    self._ultima_execucao + self._espera_atual)
+        self._espera_atual = min(self._espera_atual * 2, self._espera_maxima)
+        return prazo
+
+    def agendar(self):
+        """
+        Solicita um novo cálculo. Caso já exista um cálculo pendente, a alteração é agrupada a ele
+        """
+        with self._condicao:
+            self._pedidos += 1
+            if (self._prazo is None):
+                self._prazo = self.calcular_prazo(time.monotonic())
+                self._condicao.notify()
+
+    def executar(self):
+        """
+        Aguarda os prazos agendados e executa os cálculos
+        """
+        while True:
+            with self._condicao:
+                # Aguarda até existir um cálculo pendente e seu prazo ser atingido
+                while (self._prazo is None or time.monotonic() < self._prazo):
+                    if (self._prazo is None):
+                        self._condicao.wait()
+                    else:
+                        self._condicao.wait(self._prazo - time.monotonic())
+                self._prazo = None
+                self._ultima_execucao = time.monotonic()
+                self._execucoes += 1
+
+            try:
+                self._funcao()
+            except Exception as e:
+                print2(f"[ERRO] Falha ao calcular as rotas: {e}", NIVEL_ERRO)
+
+    def iniciar(self):
+        """
+        Inicia o funcionamento do agendador, caso não tenha sido iniciado:
+        - Inicializa a thread responsável pelos cálculos
+        """
+        if (not self._iniciado):
+            self._iniciado = True
+            thread_spf = threading.Thread(target=self.executar, daemon=True)
+            thread_spf.start()
+
+
+class AgendadorSPFLoop(AgendadorSPF):
+    """
+    Agendador do SPF executado em um loop de eventos (asyncio), sem thread própria
+
+    Os prazos são calculados da mesma forma que no AgendadorSPF, mas cada cálculo é agendado no próprio loop
+    """
+
+    __slots__ = ["_loop"]
+
+    def __init__(self, funcao, loop: asyncio.AbstractEventLoop, atraso_inicial: float = 0.05, espera: float = 0.2, espera_maxima: float = 5):
+        """
+        Inicializa um novo agendador
+
+        Args:
+            funcao (Callable[[], None]): Função executada a cada cálculo
+            loop (asyncio.AbstractEventLoop): Loop de eventos onde os cálculos são executados
+            atraso_inicial (float, opcional): Atraso (em segundos) entre a primeira alteração e o cálculo (Padrão: 0.05)
+            espera (float, opcional): Tempo mínimo (em segundos) entre dois cálculos seguidos (Padrão: 0.2)
+            espera_maxima (float, opcional): Limite (em segundos) para o crescimento exponencial da espera (Padrão: 5)
+        """
+        super().__init__(funcao, atraso_inicial, espera, espera_maxima)
+        self._loop = loop
+
+    def agendar(self):
+        """
+        Solicita um novo cálculo. Caso já exista um cálculo pendente, a alteração é agrupada a ele
+        """
+        self._pedidos += 1
+        if (self._prazo is None):
+            self._prazo = self.calcular_prazo(self._loop.time())
+            self._loop.call_at(self._prazo, self.executar)
+
+    def executar(self):
+        """
+        Executa o cálculo agendado
+        """
+        self._prazo = None
+        self._ultima_execucao = self._loop.time()
+        self._execucoes += 1
+        try:
+            self._funcao()
+        except Exception as e:
+            print2(f"[ERRO] Falha ao calcular as rotas: {e}", NIVEL_ERRO)
+
+    def iniciar(self):
+        """
+        Os cálculos são agendados diretamente no loop de eventos, sem thread a ser iniciada
+        """
+        self._iniciado = True
+
+
+def somar_contadores(contadores) -> dict:
+    """
+    Soma, chave a chave, dicionários de contadores (ex: os contadores das LSDBs de cada área de um ABR)
+    """
+    soma = {}
+    for contador in contadores:
+        for chave, valor in contador.items():
+            soma[chave] = soma.get(chave, 0) + valor
+    return soma
+
+
+def agregar_prefixos(componentes: list[tuple[ipaddress.IPv4Network, int]]) -> dict[str, int]:
+    """
+    Agrega redes contíguas (ex: 192.168.0.0/24 e 192.168.1.0/24 em 192.168.0.0/23) sem incluir endereços que não pertençam a nenhuma delas
+
+    Args:
+        componentes (list[tuple[ipaddress.IPv4Network, int]]): Redes e o custo até cada uma (redes repetidas podem aparecer com custos diferentes)
+
+    Returns:
+        dict[str, int]: Redes agregadas (ex: "192.168.0.0/23") com o maior custo entre as redes contidas em cada uma
+    """
+    if (not componentes):
+        return {}
+    componentes = sorted(componentes)
+    resumos = {}
+    posicao = 0
+    # As redes agregadas são disjuntas e ordenadas, e as redes contidas em cada uma são consecutivas na lista ordenada
+    for agregada in ipaddress.collapse_addresses(rede for rede, _ in componentes):
+        custo = 0
+        while (posicao < len(componentes) and componentes[posicao][0].subnet_of(agregada)):
+            custo = max(custo, componentes[posicao][1])
+            posicao += 1
+        resumos[str(agregada)] = custo
+    return resumos
+
+
+def comprimir_prefixos(rotas: dict[str, tuple]) -> dict[str, tuple]:
+    """
+    Encontra o menor conjunto de prefixos com o mesmo encaminhamento das rotas informadas, no estilo do ORTC (Optimal Routing Table Constructor):
+    prefixos contíguos com os mesmos próximos pulos são unidos em um prefixo maior, e prefixos contidos em outro com os mesmos próximos pulos são removidos
+
+    Diferente do ORTC, um prefixo só é instalado quando todos os seus endereços já eram encaminhados pelas rotas informadas: os endereços sem rota
+    continuam seguindo as demais rotas do kernel (conectadas, padrão), sem serem capturados por um prefixo maior
+
+    Args:
+        rotas (dict[str, tuple]): Próximos pulos de cada prefixo (ex: {"192.168.1.0/24": ("10.10.1.3",), "10.10.1.3": ("10.10.1.3",)})
+
+    Returns:
+        dict[str, tuple]: Próximos pulos de cada prefixo comprimido, que mantém o texto original quando coincide com um prefixo informado
+    """
+    originais = {}
+    for prefixo, pulos in rotas.items():
+        originais[faixa_ip(prefixo)] = (prefixo, pulos)
+    # Ordenados por endereço e tamanho, os prefixos aparecem na ordem de uma busca em profundidade na árvore binária dos endereços
+    ordenadas = sorted((endereco, tamanho, pulos) for (endereco, tamanho), (_, pulos) in originais.items())
+
+    def montar(inicio: int, fim: int, base: int, tamanho: int, herdado: tuple | None) -> tuple:
+        """
+        Monta o nó (base/tamanho) da árvore com as rotas ordenadas[inicio:fim] contidas nele, e os próximos pulos herdados da rota que o contém
+        Retorna (base, tamanho, próximos pulos possíveis, completo, filhos). Um nó é completo quando todos os seus endereços têm rota
+        """
+        if (inicio < fim and ordenadas[inicio][0] == base and ordenadas[inicio][1] == tamanho):
+            herdado = ordenadas[inicio][2]
+            inicio += 1
+        if (inicio == fim):
+            return (base, tamanho, {herdado}, herdado is not None, ())
+
+        if (herdado is None):
+            # Sem rota herdada, o nó é incompleto e pode descer direto até o menor prefixo que contém todas as rotas. Na ordem da busca em
+            # profundidade, as rotas entre a primeira e a última estão contidas no menor prefixo que contém as duas
+            ultimo = max(ordenadas[inicio][0] + (1 << (32 - ordenadas[inicio][1])), ordenadas[fim - 1][0] + (1 << (32 - ordenadas[fim - 1][1]))) - 1
+            comum = 32 - (ordenadas[inicio][0] ^ ultimo).bit_length()
+            if (comum > tamanho):
+                base_comum = ordenadas[inicio][0] & ~((1 << (32 - comum)) - 1)
+                return (base, tamanho, {None}, False, (montar(inicio, fim, base_comum, comum, None),))
+
+        # Divide o nó em duas metades, com as rotas de cada uma
+        meio = base + (1 << (31 - tamanho))
+        divisao = bisect.bisect_left(ordenadas, (meio,), inicio, fim)
+        filhos = (montar(inicio, divisao, base, tamanho + 1, herdado), montar(divisao, fim, meio, tamanho + 1, herdado))
+        completo = filhos[0][3] and filhos[1][3]
+        if (not completo):
+            return (base, tamanho, {None}, False, filhos)
+        # Próximos pulos possíveis: os comuns às duas metades ou, sem nenhum em comum, os de qualquer uma delas
+        possiveis = (filhos[0][2] & filhos[1][2]) or (filhos[0][2] | filhos[1][2])
+        return (base, tamanho, possiveis, True, filhos)
+
+    comprimidas = {}
+
+    def escolher(no: tuple, herdado: tuple | None):
+        """
+        Instala uma rota no nó apenas quando os próximos pulos herdados do prefixo instalado acima dele não estão entre os possíveis
+        """
+        base, tamanho, possiveis, completo, filhos = no
+        if (completo and herdado not in possiveis):
+            herdado = min(possiveis)
+            original = originais.get((base, tamanho))
+            prefixo = original[0] if (original is not None) else f"{ipaddress.IPv4Address(base)}/{tamanho}"
+            comprimidas[prefixo] = herdado
+        for filho in filhos:
+            escolher(filho, herdado)
+
+    if (ordenadas):
+        escolher(montar(0, len(ordenadas), 0, 0, None), None)
+    return comprimidas
+
+
+@functools.lru_cache(maxsize=CACHE_PREFIXOS_LIMITE)
+def rede_ip(prefixo: str) -> ipaddress.IPv4Network:
+    """
+    Converte um endereço ou prefixo anunciado (ex: "10.10.1.2" ou "192.168.1.0/24") em uma rede, mantendo as conversões mais recentes
+    """
+    return ipaddress.ip_network(prefixo, strict=False)
+
+
+@functools.lru_cache(maxsize=CACHE_PREFIXOS_LIMITE)
+def faixa_ip(prefixo: str) -> tuple[int, int]:
+    """
+    Converte um endereço ou prefixo anunciado no par (endereço da rede como inteiro, tamanho do prefixo), mantendo as conversões mais recentes
+    """
+    rede = rede_ip(prefixo)
+    return int(rede.network_address), rede.prefixlen
+
+
+def intervalo_com_variacao(intervalo: float, variacao: float) -> float:
+    """
+    Reduz o intervalo aleatoriamente em até a fração informada (sem variação, retorna o próprio intervalo)
+    """
+    if (not variacao):
+        return intervalo
+    return intervalo * random.uniform(1 - variacao, 1)
+
+
+class TemporizadorPeriodico:
+    """
+    Executa uma função periodicamente em um loop de eventos (asyncio), substituindo as threads com time.sleep
+    """
+
+    __slots__ = ["_loop", "_intervalo", "_funcao", "_handle", "_variacao"]
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, intervalo: float, funcao, variacao: float = 0.0):
+        """
+        Inicializa um novo temporizador
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop de eventos onde a função é executada
+            intervalo (float): Intervalo (em segundos) entre as execuções
+            funcao (Callable[[], None]): Função executada a cada intervalo
+            variacao (float, opcional): Redução aleatória máxima de cada intervalo, como fração do intervalo (Padrão: 0)
+        """
+        self._loop = loop
+        self._intervalo = intervalo
+        self._funcao = funcao
+        self._handle = None
+        self._variacao = variacao
+
+    def executar(self):
+        """
+        Executa a função e agenda a próxima execução
+        """
+        self._handle = self._loop.call_later(intervalo_com_variacao(self._intervalo, self._variacao), self.executar)
+        try:
+            self._funcao()
+        except Exception as e:
+            print2(f"[ERRO] Falha na execução periódica: {e}", NIVEL_ERRO)
+
+    def iniciar(self):
+        """
+        Agenda a primeira execução (imediata)
+        """
+        if (self._handle is None):
+            self._handle = self._loop.call_soon(self.executar)
+
+    def cancelar(self):
+        """
+        Cancela as próximas execuções
+        """
+        if (self._handle is not None):
+            self._handle.cancel()
+            self._handle = None
+
+
+class DetectorQuedas:
+    """
+    Detecta a queda de vizinhos por prazos (dead interval), mantidos em um heap e rearmados a cada HELLO recebido
+
+    Em vez de varrer periodicamente todos os vizinhos, a thread do detector dorme até o prazo mais próximo, declarando a queda exatamente quando ele expira
+    """
+
+    __slots__ = ["_funcao", "_prazos", "_fila", "_condicao", "_iniciado", "_deteccoes"]
+
+    def __init__(self, funcao):
+        """
+        Inicializa um novo detector
+
+        Args:
+            funcao (Callable[[list[str]], None]): Função chamada com os vizinhos cujos prazos expiraram
+        """
+        self._funcao = funcao
+        # Prazo atual de cada vizinho
+        self._prazos = {}
+        # Heap de tuplas (prazo, vizinho). Prazos substituídos por um HELLO mais recente são descartados ao chegarem no topo
+        self._fila = []
+        self._condicao = threading.Condition()
+        self._iniciado = False
+        self._deteccoes = 0
+
+    @property
+    def deteccoes(self) -> int:
+        return self._deteccoes
+
+    @property
+    def monitorados(self) -> list[str]:
+        return list(self._prazos.keys())
+
+    def agora(self) -> float:
+        """
+        Retorna o instante atual no relógio usado pelos prazos
+        """
+        return relogio_monotonico()
+
+    def registrar_prazo(self, chave: str, prazo: float):
+        """
+        Define o prazo de um vizinho, substituindo o anterior
+        """
+        self._prazos[chave] = prazo
+        heapq.heappush(self._fila, (prazo, chave))
+
+    def proximo_prazo(self) -> float | None:
+        """
+        Retorna o prazo válido mais próximo (None caso nenhum vizinho esteja sendo monitorado)
+        """
+        fila = self._fila
+        while (fila and self._prazos.get(fila[0][1]) != fila[0][0]):
+            heapq.heappop(fila)
+        return fila[0][0] if fila else None
+
+    def expirados(self, agora: float) -> list[str]:
+        """
+        Remove e retorna os vizinhos cujos prazos já expiraram
+        """
+        expirados = []
+        fila = self._fila
+        while (fila and fila[0][0] <= agora):
+            prazo, chave = heapq.heappop(fila)
+            if (self._prazos.get(chave) == prazo):
+                del self._prazos[chave]
+                expirados.append(chave)
+        self._deteccoes += len(expirados)
+        return expirados
+
+    def armar(self, chave: str, intervalo: float):
+        """
+        (Re)arma o prazo de um vizinho, que será declarado inativo caso não seja rearmado dentro do intervalo
+
+        Args:
+            chave (str): Identificador do vizinho
+            intervalo (float): Intervalo de queda (em segundos)
+        """
+        with self._condicao:
+            self.registrar_prazo(chave, self.agora() + intervalo)
+            # Acorda a thread apenas se o novo prazo for o mais próximo
+            if (self._fila[0][1] == chave):
+                self._condicao.notify()
+
+    def desarmar(self, chave: str):
+        """
+        Deixa de monitorar um vizinho
+        """
+        with self._condicao:
+            self._prazos.pop(chave, None)
+
+    def executar(self):
+        """
+        Aguarda os prazos e notifica os vizinhos cujos prazos expiraram
+        """
+        while True:
+            with self._condicao:
+                while True:
+                    prazo = self.proximo_prazo()
+                    agora = self.agora()
+                    if (prazo is not None and prazo <= agora):
+                        break
+                    self._condicao.wait(None if (prazo is None) else prazo - agora)
+                expirados = self.expirados(agora)
+
+            try:
+                self._funcao(expirados)
+            except Exception as e:
+                print2(f"[ERRO] Falha ao processar a queda de vizinhos: {e}", NIVEL_ERRO)
+
+    def iniciar(self):
+        """
+        Inicia o funcionamento do detector, caso não tenha sido iniciado:
+        - Inicializa a thread que aguarda os prazos
+        """
+        if (not self._iniciado):
+            self._iniciado = True
+            thread_detector = threading.Thread(target=self.executar, daemon=True)
+            thread_detector.start()
+
+
+class DetectorQuedasLoop(DetectorQuedas):
+    """
+    Detector de quedas executado em um loop de eventos (asyncio), com um único temporizador agendado para o prazo mais próximo
+    """
+
+    __slots__ = ["_loop", "_handle", "_agendado"]
+
+    def __init__(self, funcao, loop: asyncio.AbstractEventLoop):
+        """
+        Inicializa um novo detector
+
+        Args:
+            funcao (Callable[[list[str]], None]): Função chamada com os vizinhos cujos prazos expiraram
+            loop (asyncio.AbstractEventLoop): Loop de eventos onde os prazos são agendados
+        """
+        super().__init__(funcao)
+        self._loop = loop
+        self._handle = None
+        # Instante para o qual o temporizador está agendado
+        self._agendado = None
+
+    def agora(self) -> float:
+        return self._loop.time()
+
+    def agendar(self, prazo: float | None):
+        """
+        Agenda o temporizador para o prazo informado, substituindo o agendamento anterior
+        """
+        if (self._handle is not None):
+            self._handle.cancel()
+        self._handle = None if (prazo is None) else self._loop.call_at(prazo, self.executar)
+        self._agendado = prazo
+
+    def armar(self, chave: str, intervalo: float):
+        prazo = self.agora() + intervalo
+        self.registrar_prazo(chave, prazo)
+        # O temporizador só precisa ser antecipado (prazos adiados são tratados quando o temporizador dispara)
+        if (self._agendado is None or prazo < self._agendado):
+            self.agendar(prazo)
+
+    def desarmar(self, chave: str):
+        self._prazos.pop(chave, None)
+
+    def executar(self):
+        self._handle = None
+        self._agendado = None
+        expirados = self.expirados(self.agora())
+        if (expirados):
+            try:
+                self._funcao(expirados)
+            except Exception as e:
+                print2(f"[ERRO] Falha ao processar a queda de vizinhos: {e}", NIVEL_ERRO)
+        if (self._handle is None):
+            self.agendar(self.proximo_prazo())
+
+    def iniciar(self):
+        """
+        Os prazos são agendados diretamente no loop de eventos, sem thread a ser iniciada
+        """
+        self._iniciado = True
+
+
+class Metricas:
+    """
+    Registro das métricas do roteador, exportadas no formato de texto do Prometheus
+
+    Os componentes mantêm os próprios contadores e histogramas (sem travas), e as métricas apenas os leem durante a exportação,
+    por meio de funções de coleta: o processamento de cada pacote não faz nenhuma chamada adicional
+    """
+
+    __slots__ = ["_prefixo", "_metricas"]
+
+    def __init__(self, prefixo: str = "roteador"):
+        """
+        Inicializa um registro vazio
+
+        Args:
+            prefixo (str, opcional): Prefixo dos nomes das métricas (Padrão: "roteador")
+        """
+        self._prefixo = prefixo
+        # Métricas na ordem de registro: tuplas (nome, tipo, ajuda, rótulo, função de coleta ou histograma)
+        self._metricas = []
+
+    def registrar(self, nome: str, tipo: str, ajuda: str, coleta, rotulo: str | None = None):
+        """
+        Registra um contador ou medidor lido a cada exportação
+
+        Args:
+            nome (str): Nome da métrica (sem o prefixo)
+            tipo (str): Tipo da métrica no Prometheus ("counter" ou "gauge")
+            ajuda (str): Descrição da métrica
+            coleta (Callable[[], float | dict[str, float]]): Função que retorna o valor atual, ou um valor para cada valor do rótulo
+            rotulo (str | None, opcional): Nome do rótulo, quando a função de coleta retorna um dicionário (Padrão: None)
+        """
+        self._metricas.append((f"{self._prefixo}_{nome}", tipo, ajuda, rotulo, coleta))
+
+    def registrar_histograma(self, nome: str, ajuda: str, histograma: Histograma | dict[str, Histograma], rotulo: str | None = None):
+        """
+        Registra um histograma, exportado com os intervalos acumulados, a soma e a quantidade de valores
+
+        Args:
+            nome (str): Nome da métrica (sem o prefixo)
+            ajuda (str): Descrição da métrica
+            histograma (Histograma | dict[str, Histograma]): Histograma, ou um histograma para cada valor do rótulo
+            rotulo (str | None, opcional): Nome do rótulo, quando há um histograma para cada valor (Padrão: None)
+        """
+        self._metricas.append((f"{self._prefixo}_{nome}", "histogram", ajuda, rotulo, histograma))
+
+    @staticmethod
+    def escapar_rotulo(valor) -> str:
+        """
+        Converte o valor de um rótulo em texto, escapando a barra invertida, as aspas e as quebras de linha (formato de texto do Prometheus)
+        """
+        return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    def exportar(self) -> str:
+        """
+        Exporta todas as métricas no formato de texto do Prometheus (versão 0.0.4)
+        """
+        linhas = []
+        for nome, tipo, ajuda, rotulo, coleta in self._metricas:
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            if (tipo == "histogram"):
+                histogramas = {None: coleta} if (rotulo is None) else coleta
+                for valor_rotulo, histograma in histogramas.items():
+                    rotulos = f'{rotulo}="{self.escapar_rotulo(valor_rotulo)}",' if (rotulo is not None) else ""
+                    acumulado = 0
+                    for limite, contagem in zip(histograma.limites, histograma.contagens):
+                        acumulado += contagem
+                        linhas.append(f'{nome}_bucket{{{rotulos}le="{limite:g}"}} {acumulado}')
+                    linhas.append(f'{nome}_bucket{{{rotulos}le="+Inf"}} {histograma.quantidade}')
+                    sufixo = f"{{{rotulos[:-1]}}}" if (rotulos) else ""
+                    linhas.append(f"{nome}_sum{sufixo} {histograma.soma}")
+                    linhas.append(f"{nome}_count{sufixo} {histograma.quantidade}")
+                continue
+            try:
+                valor = coleta()
+            except Exception as e:
+                print2(f"[ERRO] Falha ao coletar a métrica {nome}: {e}", NIVEL_ERRO)
+                continue
+            if (rotulo is None):
+                linhas.append(f"{nome} {valor}")
+            else:
+                for valor_rotulo, valor_metrica in valor.items():
+                    linhas.append(f'{nome}{{{rotulo}="{self.escapar_rotulo(valor_rotulo)}"}} {valor_metrica}')
+        return "\n".join(linhas) + "\n"
+
+
+class ServidorMetricas:
+    """
+    Servidor HTTP local que expõe as métricas no formato de texto do Prometheus (GET /metrics)
+
+    Atende em uma thread própria ou, no modo asyncio, como um servidor do próprio loop de eventos
+    """
+
+    __slots__ = ["_metricas", "_endereco", "_servidor"]
+
+    def __init__(self, metricas: Metricas, endereco: tuple[str, int]):
+        """
+        Inicializa um novo servidor
+
+        Args:
+            metricas (Metricas): Registro das métricas exportadas
+            endereco (tuple[str, int]): Endereço (IP, porta) onde o servidor escuta
+        """
+        self._metricas = metricas
+        self._endereco = endereco
+        self._servidor = None
+
+    @property
+    def endereco(self) -> tuple[str, int]:
+        return self._endereco
+
+    def responder(self, caminho: str) -> tuple[int, str, bytes]:
+        """
+        Monta a resposta de uma requisição GET
+
+        Returns:
+            tuple[int, str, bytes]: Código de status, tipo do conteúdo e corpo da resposta
+        """
+        if (caminho.split("?", 1)[0] not in ("/metrics", "/")):
+            return 404, "text/plain; charset=utf-8", b"Caminho desconhecido (use /metrics)\n"
+        return 200, "text/plain; version=0.0.4; charset=utf-8", self._metricas.exportar().encode("utf-8")
+
+    def iniciar(self):
+        """
+        Inicia o servidor em uma thread própria
+        """
+        servidor_metricas = self
+
+        class Requisicao(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, tipo, corpo = servidor_metricas.responder(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", tipo)
+                self.send_header("Content-Length", str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, formato, *args):
+                # As requisições não são registradas, evitando uma mensagem a cada coleta
+                pass
+
+        self._servidor = http.server.ThreadingHTTPServer(self._endereco, Requisicao)
+        thread_metricas = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        thread_metricas.start()
+        print2(f"[MÉTRICAS] Métricas disponíveis em http://{self._endereco[0]}:{self._endereco[1]}/metrics")
+
+    async def iniciar_asyncio(self):
+        """
+        Inicia o servidor no loop de eventos em execução (modo asyncio), sem threads
+        """
+        self._servidor = await asyncio.start_server(self.atender, *self._endereco)
+        print2(f"[MÉTRICAS] Métricas disponíveis em http://{self._endereco[0]}:{self._endereco[1]}/metrics")
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """
+        Atende uma conexão HTTP no modo asyncio: lê a linha de requisição e os cabeçalhos, responde e encerra a conexão
+        """
+        try:
+            requisicao = (await leitor.readline()).decode("latin-1").split()
+            # Descarta os cabeçalhos, até a linha vazia
+            while (await leitor.readline()).strip():
+                pass
+            if (len(requisicao) >= 2 and requisicao[0] == "GET"):
+                status, tipo, corpo = self.responder(requisicao[1])
+            else:
+                status, tipo, corpo = 405, "text/plain; charset=utf-8", b"Apenas GET\n"
+            motivo = {200: "OK", 404: "Not Found", 405: "Method Not Allowed"}[status]
+            escritor.write(f"HTTP/1.0 {status} {motivo}\r\nContent-Type: {tipo}\r\nContent-Length: {len(corpo)}\r\n"
+                           f"Connection: close\r\n\r\n".encode("latin-1") + corpo)
+            await escritor.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            escritor.close()
+
+
+class ServidorConsultas:
+    """
+    Servidor local (socket Unix) das consultas à RIB do roteador: a rota de um endereço (prefixo, próximos pulos, custo e caminho) e a
+    verificação das rotas do kernel em relação às calculadas
+
+    Cada linha recebida é uma consulta ("rota <endereço>" ou "verificar"), respondida com uma linha em JSON
+    Atende em uma thread própria ou, no modo asyncio, como um servidor do próprio loop de eventos
+    """
+
+    __slots__ = ["_roteador", "_caminho", "_servidor"]
+
+    def __init__(self, roteador: "Roteador", caminho: str):
+        """
+        Inicializa um novo servidor
+
+        Args:
+            roteador (Roteador): Roteador consultado
+            caminho (str): Caminho do socket Unix onde o servidor escuta
+        """
+        self._roteador = roteador
+        self._caminho = caminho
+        self._servidor = None
+
+    @property
+    def caminho(self) -> str:
+        return self._caminho
+
+    def responder(self, consulta: str) -> dict:
+        """
+        Responde uma consulta
+
+        Args:
+            consulta (str): "rota <endereço>" (ou apenas o endereço) ou "verificar"
+
+        Returns:
+            dict: Rota encontrada, divergências entre o kernel e a RIB ou a mensagem de erro (chave "erro")
+        """
+        partes = consulta.split()
+        if (partes == ["verificar"]):
+            return {"divergencias": self._roteador.verificar_kernel()}
+        if (len(partes) == 2 and partes[0] == "rota"):
+            partes = partes[1:]
+        if (len(partes) != 1):
+            return {"erro": "Consulta desconhecida (use \"rota <endereço>\" ou \"verificar\")"}
+        try:
+            endereco = str(ipaddress.IPv4Address(partes[0]))
+        except ValueError:
+            return {"erro": f"Endereço IPv4 inválido: {partes[0]}"}
+        rota = self._roteador.consultar_rota(endereco)
+        return rota if (rota is not None) else {"endereco": endereco, "erro": "Nenhuma rota calculada contém o endereço"}
+
+    def remover_socket(self):
+        """
+        Remove o socket deixado por uma execução anterior, que impediria o bind
+        """
+        try:
+            os.unlink(self._caminho)
+        except FileNotFoundError:
+            pass
+
+    def iniciar(self):
+        """
+        Inicia o servidor em uma thread própria
+        """
+        servidor_consultas = self
+
+        class Consulta(socketserver.StreamRequestHandler):
+            def handle(self):
+                for linha in self.rfile:
+                    resposta = servidor_consultas.responder(linha.decode("utf-8", "replace"))
+                    self.wfile.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        self.remover_socket()
+        self._servidor = socketserver.ThreadingUnixStreamServer(self._caminho, Consulta)
+        self._servidor.daemon_threads = True
+        thread_consultas = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        thread_consultas.start()
+        print2(f"[CONSULTAS] Consultas à RIB disponíveis em {self._caminho}")
+
+    async def iniciar_asyncio(self):
+        """
+        Inicia o servidor no loop de eventos em execução (modo asyncio), sem threads
+        """
+        self.remover_socket()
+        self._servidor = await asyncio.start_unix_server(self.atender, path=self._caminho)
+        print2(f"[CONSULTAS] Consultas à RIB disponíveis em {self._caminho}")
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """
+        Atende uma conexão no modo asyncio, respondendo cada linha recebida até o cliente encerrar a conexão
+        """
+        try:
+            while True:
+                linha = await leitor.readline()
+                if (not linha):
+                    break
+                resposta = self.responder(linha.decode("utf-8", "replace"))
+                escritor.write(json.dumps(resposta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+
+def consultar_roteador(caminho: str, consulta: str, tempo_limite: float = 5) -> dict:
+    """
+    Envia uma consulta ao servidor de consultas de um roteador em execução e retorna a resposta
+
+    Args:
+        caminho (str): Caminho do socket Unix do servidor
+        consulta (str): "rota <endereço>" ou "verificar"
+        tempo_limite (float, opcional): Tempo máximo (em segundos) de espera pela resposta (Padrão: 5)
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(tempo_limite)
+        sock.connect(caminho)
+        sock.sendall(consulta.encode("utf-8") + b"\n")
+        with sock.makefile("rb") as arquivo:
+            return json.loads(arquivo.readline())
+
+
+class RegistroAssincrono:
+    """
+    Registro de mensagens com níveis (debug, info, aviso e erro), escrito de forma assíncrona
+
+    As mensagens são enfileiradas sem travas (uma deque limitada) e escritas em lotes por uma thread própria ou por um temporizador no loop de eventos,
+    sem que quem registra espere pela saída. Com a fila cheia, as mensagens mais antigas são descartadas (e contadas)
+    Os pacotes enviados e recebidos (nível debug) são amostrados: apenas 1 a cada `amostragem` pacotes é registrado
+    """
+
+    __slots__ = ["_prefixo", "_nivel", "_amostragem", "_amostras", "_fila", "_descartadas", "_intervalo", "_saida", "_loop", "_iniciado"]
+
+    def __init__(self, prefixo: str, nivel: int = NIVEL_INFO, amostragem: int = 1, capacidade: int = 10000, intervalo: float = 0.1, saida=None):
+        """
+        Inicializa um novo registro
+
+        Args:
+            prefixo (str): Texto exibido no início de cada mensagem (ex: o nome do container)
+            nivel (int, opcional): Nível mínimo das mensagens registradas (Padrão: NIVEL_INFO)
+            amostragem (int, opcional): Registra apenas 1 a cada N pacotes enviados e recebidos (Padrão: 1, todos os pacotes)
+            capacidade (int, opcional): Quantidade máxima de mensagens aguardando a escrita (Padrão: 10000)
+            intervalo (float, opcional): Intervalo (em segundos) entre as escritas dos lotes (Padrão: 0.1)
+            saida (TextIO | None, opcional): Arquivo onde as mensagens são escritas (Padrão: sys.stdout)
+        """
+        self._prefixo = prefixo
+        self._nivel = nivel
+        self._amostragem = max(1, amostragem)
+        self._amostras = 0
+        self._fila = collections.deque(maxlen=capacidade)
+        self._descartadas = 0
+        self._intervalo = intervalo
+        self._saida = saida if (saida is not None) else sys.stdout
+        # Loop de eventos que executa as escritas (None para usar uma thread própria)
+        self._loop = None
+        self._iniciado = False
+
+    @property
+    def pendentes(self) -> int:
+        return len(self._fila)
+
+    @property
+    def descartadas(self) -> int:
+        return self._descartadas
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+
+    def registrar(self, mensagem: str, nivel: int = NIVEL_INFO):
+        """
+        Enfileira uma mensagem, caso o nível dela esteja habilitado
+        """
+        if (nivel < self._nivel):
+            return
+        if (len(self._fila) == self._fila.maxlen):
+            self._descartadas += 1
+        self._fila.append(f"[{self._prefixo}] {mensagem}\n")
+
+    def registrar_pacote(self) -> bool:
+        """
+        Indica se o próximo pacote enviado ou recebido deve ser registrado (nível debug habilitado e pacote escolhido pela amostragem)
+        """
+        if (self._nivel > NIVEL_DEBUG):
+            return False
+        self._amostras += 1
+        return self._amostras % self._amostragem == 0
+
+    def descarregar(self):
+        """
+        Escreve em um único lote todas as mensagens enfileiradas
+        """
+        fila = self._fila
+        linhas = []
+        while fila:
+            linhas.append(fila.popleft())
+        if (linhas):
+            self._saida.write("".join(linhas))
+            self._saida.flush()
+
+    def escrever_periodicamente(self):
+        """
+        Escreve as mensagens enfileiradas a cada intervalo
+        """
+        while True:
+            time.sleep(self._intervalo)
+            self.descarregar()
+
+    def iniciar(self):
+        """
+        Inicia as escritas periódicas (thread própria ou temporizador no loop de eventos), caso não tenham sido iniciadas
+        """
+        if (self._iniciado):
+            return
+        self._iniciado = True
+        if (self._loop is not None):
+            TemporizadorPeriodico(self._loop, self._intervalo, self.descarregar).iniciar()
+            return
+
+        thread_registro = threading.Thread(target=self.escrever_periodicamente, daemon=True)
+        thread_registro.start()
+
+
+class RastreamentoLSA:
+    """
+    Rastreamento opcional do processamento dos LSAs, exportado no formato de eventos do Chrome (JSON aberto no chrome://tracing ou no Perfetto)
+
+    Cada etapa percorrida por um LSA (decodificação, atualização da LSDB, reenvio aos vizinhos e confirmação) e cada etapa dos cálculos
+    (SPF, programação das rotas e alternativos) é registrada com seu instante e duração em um buffer circular, mantendo apenas os eventos mais recentes
+    Cada LSA aceito também abre um intervalo assíncrono, encerrado quando as rotas calculadas a partir dele são aplicadas (incluindo a espera do SPF)
+    """
+
+    __slots__ = ["_router_id", "_pid", "_eventos", "_pendentes", "_caminho", "_intervalo", "_loop", "_ultimo_salvo", "_iniciado"]
+
+    def __init__(self, router_id: str, capacidade: int = CAPACIDADE_RASTREAMENTO, caminho: str | None = None, intervalo: float = 10, pid: int | None = None):
+        """
+        Inicializa um novo rastreamento
+
+        Args:
+            router_id (str): Identificador único do roteador, usado como nome do processo no rastreamento
+            capacidade (int, opcional): Quantidade máxima de eventos mantidos (Padrão: CAPACIDADE_RASTREAMENTO)
+            caminho (str | None, opcional): Arquivo .json onde os eventos são gravados periodicamente (Padrão: None, apenas em memória)
+            intervalo (float, opcional): Intervalo (em segundos) entre as gravações. Sem novos eventos, a gravação é ignorada (Padrão: 10)
+            pid (int | None, opcional): Identificador do processo nos eventos (Padrão: o PID do processo atual)
+        """
+        self._router_id = router_id
+        self._pid = pid if (pid is not None) else os.getpid()
+        # Eventos na forma de tuplas (fase, nome, início, duração, thread, LSA, argumentos), com o início e a duração em segundos (time.perf_counter)
+        self._eventos = collections.deque(maxlen=capacidade)
+        # Número de sequência dos LSAs aceitos de cada roteador que ainda aguardam a aplicação das rotas
+        self._pendentes = {}
+        self._caminho = caminho
+        self._intervalo = intervalo
+        self._loop = None
+        # Último evento gravado, evitando regravar o arquivo sem novos eventos
+        self._ultimo_salvo = None
+        self._iniciado = False
+
+    @property
+    def eventos(self) -> int:
+        return len(self._eventos)
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+
+    @staticmethod
+    def identificar(pacote: dict) -> str:
+        """
+        Retorna o identificador de um LSA nos eventos ("roteador#sequência")
+        """
+        return f"{pacote['router_id']}#{pacote['sequence_number']}"
+
+    def registrar(self, etapa: str, inicio: float, lsa: str | None = None, argumentos: dict | None = None) -> float:
+        """
+        Registra uma etapa concluída agora
+
+        Args:
+            etapa (str): Nome da etapa
+            inicio (float): Instante (time.perf_counter) do início da etapa
+            lsa (str | None, opcional): Identificador do LSA processado na etapa
+            argumentos (dict | None, opcional): Informações adicionais exibidas junto do evento
+
+        Returns:
+            float: Instante do fim da etapa, usado como início da etapa seguinte
+        """
+        fim = time.perf_counter()
+        self._eventos.append(("X", etapa, inicio, fim - inicio, threading.get_native_id(), lsa, argumentos))
+        return fim
+
+    def abrir(self, origem: str, sequence_number: int):
+        """
+        Abre o intervalo de um LSA aceito na LSDB (chamado com a trava da LSDB). Uma instância ainda pendente do mesmo roteador é encerrada como substituída
+        """
+        agora = time.perf_counter()
+        tid = threading.get_native_id()
+        anterior = self._pendentes.get(origem)
+        if (anterior is not None):
+            self._eventos.append(("e", f"LSA {origem}", agora, 0, tid, f"{origem}#{anterior}", {"substituido": True}))
+        self._pendentes[origem] = sequence_number
+        self._eventos.append(("b", f"LSA {origem}", agora, 0, tid, f"{origem}#{sequence_number}", None))
+
+    def capturar(self, alterados: set) -> list[tuple[str, int]]:
+        """
+        Retira os LSAs pendentes dos roteadores alterados, incluídos no cálculo que está começando (chamado com a trava da LSDB)
+        """
+        pendentes = self._pendentes
+        return [(origem, pendentes.pop(origem)) for origem in alterados if origem in pendentes]
+
+    def concluir(self, lsas: list[tuple[str, int]]):
+        """
+        Encerra os intervalos dos LSAs cujas rotas acabaram de ser aplicadas
+        """
+        agora = time.perf_counter()
+        tid = threading.get_native_id()
+        for origem, sequence_number in lsas:
+            self._eventos.append(("e", f"LSA {origem}", agora, 0, tid, f"{origem}#{sequence_number}", None))
+
+    def exportar(self) -> dict:
+        """
+        Exporta os eventos no formato do Chrome, com os instantes e as durações em microssegundos
+
+        Returns:
+            dict: Eventos ("traceEvents"), incluindo os nomes do processo (roteador) e das threads
+        """
+        nomes_threads = {thread.native_id: thread.name for thread in threading.enumerate()}
+        eventos = [{"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": self._router_id}}]
+        threads = set()
+        for fase, nome, inicio, duracao, tid, lsa, argumentos in list(self._eventos):
+            evento = {"name": nome, "cat": "lsa", "ph": fase, "ts": inicio * 1e6, "pid": self._pid, "tid": tid}
+            if (fase == "X"):
+                evento["dur"] = duracao * 1e6
+                evento["args"] = {"lsa": lsa, **(argumentos or {})} if (lsa is not None) else (argumentos or {})
+            else:
+                # Intervalos assíncronos: o início e o fim de cada LSA são ligados pelo identificador
+                evento["id"] = lsa
+                evento["args"] = argumentos or {}
+            eventos.append(evento)
+            threads.add(tid)
+        for tid in threads:
+            eventos.append({"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": nomes_threads.get(tid, str(tid))}})
+        return {"traceEvents": eventos, "displayTimeUnit": "ms"}
+
+    def salvar(self) -> bool:
+        """
+        Grava os eventos no arquivo (de forma atômica, com um arquivo temporário renomeado), caso haja novos eventos desde a última gravação
+
+        Returns:
+            bool: Indica se o arquivo foi gravado
+        """
+        ultimo = self._eventos[-1] if (self._eventos) else None
+        if (self._caminho is None or ultimo is self._ultimo_salvo):
+            return False
+
+        temporario = f"{self._caminho}.tmp"
+        try:
+            with open(temporario, "w") as arquivo:
+                json.dump(self.exportar(), arquivo)
+            os.replace(temporario, self._caminho)
+        except OSError as e:
+            print2(f"[ERRO] Falha ao gravar o rastreamento em {self._caminho}: {e}", NIVEL_ERRO)
+            return False
+
+        self._ultimo_salvo = ultimo
+        return True
+
+    def salvar_periodicamente(self):
+        """
+        Grava os eventos a cada intervalo
+        """
+        while True:
+            time.sleep(self._intervalo)
+            self.salvar()
+
+    def iniciar(self):
+        """
+        Inicia as gravações periódicas (thread própria ou temporizador no loop de eventos), caso exista um arquivo e elas não tenham sido iniciadas
+        """
+        if (self._iniciado or self._caminho is None):
+            return
+        self._iniciado = True
+        if (self._loop is not None):
+            TemporizadorPeriodico(self._loop, self._intervalo, self.salvar).iniciar()
+            return
+
+        thread_rastreamento = threading.Thread(target=self.salvar_periodicamente, daemon=True)
+        thread_rastreamento.start()
+
+
+class PerfilExecucao:
+    """
+    Perfil de execução de todo o processo, gravado periodicamente em arquivo
+
+    Dois modos:
+    - "cprofile": um cProfile por thread (ativado em cada thread criada após o início) ou, a partir do Python 3.12, um único cProfile
+      para todo o processo (ver PERFIL_POR_PROCESSO), gravados em um único arquivo do pstats (`python -m pstats arquivo`, snakeviz)
+    - "amostragem": captura a pilha de todas as threads a cada intervalo de amostragem, contando as pilhas no formato "collapsed"
+      (flamegraph.pl, speedscope). Mede o tempo de parede, incluindo as esperas, com custo proporcional apenas à frequência das amostras
+
+    As gravações (e as amostras) são feitas por uma thread própria, mesmo com o roteador em um loop de eventos, que não pode amostrar a si mesmo
+    """
+
+    __slots__ = ["_modo", "_caminho", "_intervalo", "_intervalo_amostragem", "_perfis", "_amostras", "_trava", "_iniciado"]
+
+    def __init__(self, modo: str, caminho: str, intervalo: float = 30, intervalo_amostragem: float = INTERVALO_AMOSTRAGEM_PERFIL):
+        """
+        Inicializa um novo perfil
+
+        Args:
+            modo (str): Modo do perfil ("cprofile" ou "amostragem")
+            caminho (str): Arquivo onde o perfil é gravado
+            intervalo (float, opcional): Intervalo (em segundos) entre as gravações (Padrão: 30)
+            intervalo_amostragem (float, opcional): Intervalo (em segundos) entre as amostras das pilhas, no modo "amostragem" (Padrão: INTERVALO_AMOSTRAGEM_PERFIL)
+        """
+        if (modo not in MODOS_PERFIL):
+            raise ValueError(f"Modo de perfil desconhecido: {modo} (modos suportados: {', '.join(MODOS_PERFIL)})")
+        self._modo = modo
+        self._caminho = caminho
+        self._intervalo = intervalo
+        self._intervalo_amostragem = intervalo_amostragem
+        # Perfis de cada thread (modo "cprofile") e contagem de cada pilha (modo "amostragem")
+        self._perfis = []
+        self._amostras = collections.Counter()
+        self._trava = threading.Lock()
+        self._iniciado = False
+
+    @property
+    def modo(self) -> str:
+        return self._modo
+
+    def ativar_thread(self, *_):
+        """
+        Ativa um cProfile na thread atual. Instalada com threading.setprofile (antes do Python 3.12), é chamada no primeiro evento de cada
+        nova thread e substituída pelo próprio cProfile
+        """
+        perfil = cProfile.Profile()
+        with self._trava:
+            self._perfis.append(perfil)
+        perfil.enable()
+
+    def amostrar(self):
+        """
+        Registra a pilha atual de cada thread (exceto a própria thread do perfil), da thread até a função em execução
+        """
+        propria = threading.get_ident()
+        nomes = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, quadro in sys._current_frames().items():
+            if (ident == propria):
+                continue
+            pilha = []
+            while quadro is not None:
+                codigo = quadro.f_code
+                pilha.append(f"{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})")
+                quadro = quadro.f_back
+            pilha.append(nomes.get(ident, str(ident)))
+            self._amostras[";".join(reversed(pilha))] += 1
+
+    def codificar(self) -> bytes:
+        """
+        Codifica o perfil atual no formato do modo: estatísticas do pstats (marshal) ou pilhas "collapsed" (uma pilha e sua contagem por linha)
+        """
+        if (self._modo == "amostragem"):
+            return "".join(f"{pilha} {contagem}\n" for pilha, contagem in self._amostras.most_common()).encode("utf-8")
+
+        # As estatísticas de cada thread são lidas sem desativar os perfis e somadas por função
+        estatisticas = {}
+        with self._trava:
+            perfis = list(self._perfis)
+        for perfil in perfis:
+            perfil.snapshot_stats()
+            for funcao, valores in perfil.stats.items():
+                estatisticas[funcao] = pstats.add_func_stats(estatisticas[funcao], valores) if (funcao in estatisticas) else valores
+        return marshal.dumps(estatisticas)
+
+    def salvar(self):
+        """
+        Grava o perfil atual no arquivo (de forma atômica, com um arquivo temporário renomeado)
+        """
+        temporario = f"{self._caminho}.tmp"
+        try:
+            dados = self.codificar()
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, self._caminho)
+        except OSError as e:
+            print2(f"[ERRO] Falha ao gravar o perfil em {self._caminho}: {e}", NIVEL_ERRO)
+
+    def executar(self):
+        """
+        Amostra as pilhas (modo "amostragem") e grava o perfil a cada intervalo
+        """
+        proxima_gravacao = time.monotonic() + self._intervalo
+        while True:
+            if (self._modo == "amostragem"):
+                time.sleep(self._intervalo_amostragem)
+                self.amostrar()
+            else:
+                time.sleep(max(0.0, proxima_gravacao - time.monotonic()))
+            if (time.monotonic() >= proxima_gravacao):
+                self.salvar()
+                proxima_gravacao += self._intervalo
+
+    def iniciar(self):
+        """
+        Inicia o perfil, caso não tenha sido iniciado. No modo "cprofile", deve ser chamado antes de as threads do roteador serem criadas
+
+        A partir do Python 3.12, ativar um segundo cProfile falha em cada nova thread (ValueError: Another profiling tool is already active),
+        encerrando a thread antes do seu alvo: o único cProfile do processo é ativado na thread atual, sem threading.setprofile
+        """
+        if (self._iniciado):
+            return
+        self._iniciado = True
+        # A thread do perfil é criada antes da ativação do cProfile, ficando fora do perfil
+        thread_perfil = threading.Thread(target=self.executar, daemon=True)
+        thread_perfil.start()
+        if (self._modo == "cprofile"):
+            if (not PERFIL_POR_PROCESSO):
+                threading.setprofile(self.ativar_thread)
+            self.ativar_thread()
+
+
+class VersaoLSDB:
+    """
+    Versão imutável da LSDB, publicada para os leitores (cálculo das rotas, reparo local, snapshots)
+
+    A tabela de uma versão nunca é alterada: a LSDB copia a tabela antes da primeira alteração feita após a publicação (copy-on-write),
+    de forma que uma rajada de LSAs entre dois cálculos gera no máximo uma cópia
+    """
+
+    __slots__ = ["_geracao", "_tabela"]
+
+    def __init__(self, geracao: int, tabela: dict):
+        """
+        Inicializa uma nova versão
+
+        Args:
+            geracao (int): Geração da LSDB (incrementada a cada alteração) representada pela versão
+            tabela (dict): Tabela da LSDB, que deixa de ser alterada pelos escritores
+        """
+        self._geracao = geracao
+        self._tabela = types.MappingProxyType(tabela)
+
+    @property
+    def geracao(self) -> int:
+        return self._geracao
+
+    @property
+    def tabela(self) -> types.MappingProxyType:
+        return self._tabela
+
+
+class TopologiaLSDB:
+    """
+    Representação compacta da topologia da LSDB, sobre a qual são executados os cálculos completos dos menores caminhos
+
+    Os IDs dos roteadores são convertidos em índices inteiros e os enlaces ficam em arrays contíguos (formato CSR): os enlaces do roteador i
+    ocupam as posições inicio[i] até inicio[i] + grau[i] dos arrays de vizinhos e custos. A linha de um roteador é reescrita no lugar quando
+    os novos enlaces cabem no espaço dela, ou movida para o fim dos arrays (que são compactados quando o espaço abandonado passa da metade)
+    """
+
+    __slots__ = ["_indices", "_nomes", "_presentes", "_inicio", "_grau", "_capacidade", "_vizinhos", "_custos", "_abandonados"]
+
+    def __init__(self):
+        """
+        Inicializa uma topologia vazia
+        """
+        # Índice de cada roteador e o ID de cada índice (os índices não são reaproveitados, mantendo a ordem de desempate do Dijkstra)
+        self._indices = {}
+        self._nomes = []
+        # Indica se o roteador possui uma entrada na LSDB (roteadores apenas citados nos enlaces de outros são ignorados no cálculo)
+        self._presentes = bytearray()
+        # Linha de cada roteador: posição do primeiro enlace, quantidade de enlaces e espaço reservado
+        self._inicio = array.array("I")
+        self._grau = array.array("I")
+        self._capacidade = array.array("I")
+        # Vizinho (índice) e custo de cada enlace
+        self._vizinhos = array.array("I")
+        self._custos = array.array("I")
+        # Posições dos arrays de enlaces que não pertencem mais a nenhuma linha
+        self._abandonados = 0
+
+    def __len__(self) -> int:
+        return len(self._nomes)
+
+    @property
+    def nomes(self) -> list[str]:
+        return self._nomes
+
+    @property
+    def enlaces(self) -> int:
+        return len(self._vizinhos) - self._abandonados
+
+    @property
+    def memoria(self) -> int:
+        """
+        Bytes ocupados pelos arrays e pelos índices (os IDs são compartilhados com a LSDB e não são contados)
+        """
+        return sum(sys.getsizeof(estrutura) for estrutura in (
+            self._indices, self._nomes, self._presentes, self._inicio, self._grau, self._capacidade, self._vizinhos, self._custos))
+
+    def indice(self, router_id: str) -> int | None:
+        """
+        Retorna o índice de um roteador (None caso ele nunca tenha aparecido na topologia)
+        """
+        return self._indices.get(router_id)
+
+    def internar(self, router_id: str) -> int:
+        """
+        Retorna o índice de um roteador, criando uma linha vazia para ele caso ainda não exista
+        """
+        indice = self._indices.get(router_id)
+        if (indice is None):
+            indice = len(self._nomes)
+            self._indices[router_id] = indice
+            self._nomes.append(router_id)
+            self._presentes.append(0)
+            self._inicio.append(0)
+            self._grau.append(0)
+            self._capacidade.append(0)
+        return indice
+
+    def definir(self, router_id: str, links: dict[str, int] | None):
+        """
+        Substitui os enlaces de um roteador
+
+        Args:
+            router_id (str): Identificador único do roteador
+            links (dict[str, int] | None): Custo até cada vizinho (None remove o roteador da topologia)
+        """
+        indice = self.internar(router_id)
+        if (links is None):
+            self._presentes[indice] = 0
+            self._grau[indice] = 0
+            return
+
+        self._presentes[indice] = 1
+        try:
+            vizinhos = array.array("I", map(self._indices.__getitem__, links))
+        except KeyError:
+            # Algum vizinho ainda não tem índice
+            vizinhos = array.array("I", map(self.internar, links))
+        custos = array.array("I", links.values())
+        quantidade = len(vizinhos)
+        if (quantidade <= self._capacidade[indice]):
+            # Reescreve a linha no lugar (o espaço que sobrar continua reservado para ela)
+            inicio = self._inicio[indice]
+            self._vizinhos[inicio:inicio + quantidade] = vizinhos
+            self._custos[inicio:inicio + quantidade] = custos
+        else:
+            # Move a linha para o fim dos arrays
+            self._abandonados += self._capacidade[indice]
+            self._inicio[indice] = len(self._vizinhos)
+            self._capacidade[indice] = quantidade
+            self._vizinhos.extend(vizinhos)
+            self._custos.extend(custos)
+        self._grau[indice] = quantidade
+
+        if (self._abandonados > 1024 and self._abandonados * 2 > len(self._vizinhos)):
+            self.compactar()
+
+    def compactar(self):
+        """
+        Reescreve os arrays de enlaces sem o espaço abandonado, mantendo as linhas na ordem dos índices
+        """
+        vizinhos = array.array("I")
+        custos = array.array("I")
+        for indice, (inicio, grau) in enumerate(zip(self._inicio, self._grau)):
+            self._inicio[indice] = len(vizinhos)
+            self._capacidade[indice] = grau
+            vizinhos.extend(self._vizinhos[inicio:inicio + grau])
+            custos.extend(self._custos[inicio:inicio + grau])
+        self._vizinhos = vizinhos
+        self._custos = custos
+        self._abandonados = 0
+
+    def reconstruir(self, tabela: dict):
+        """
+        Monta a topologia a partir de toda a tabela da LSDB (os índices seguem a ordem de inserção na tabela, usada como desempate)
+        """
+        self.__init__()
+        for router_id in tabela:
+            self.internar(router_id)
+        for router_id, entrada in tabela.items():
+            self.definir(router_id, entrada["links"])
+
+    def sincronizar(self, tabela: dict, alterados: set):
+        """
+        Aplica na topologia as entradas dos roteadores alterados desde a última sincronização
+
+        Args:
+            tabela (dict): Tabela da versão da LSDB usada no cálculo
+            alterados (set): Roteadores cujas entradas foram alteradas (ou removidas)
+        """
+        if (not self._nomes):
+            self.reconstruir(tabela)
+            return
+        for router_id in alterados:
+            entrada = tabela.get(router_id)
+            self.definir(router_id, entrada["links"] if (entrada is not None) else None)
+
+    def menores_caminhos(self, origem: str, ecmp: bool = False) -> tuple[list, list[int], list[tuple[str, ...]] | None]:
+        """
+        Executa o Dijkstra com fila de prioridade diretamente sobre os arrays, desempatando pela ordem dos índices
+
+        Com ECMP, também calcula os próximos pulos de cada destino: os custos são positivos, então os próximos pulos de um roteador já são
+        definitivos quando ele sai da fila, e cada enlace que o liga a um vizinho por um menor caminho propaga os seus próximos pulos
+
+        Args:
+            origem (str): Raiz dos menores caminhos
+            ecmp (bool, opcional): Calcula também os próximos pulos de cada destino (Padrão: False)
+
+        Returns:
+            tuple[list, list[int], list[tuple[str, ...]] | None]: Distância até cada índice, índice do roteador anterior (-1 sem anterior) e,
+                com ECMP, os vizinhos da origem que iniciam algum menor caminho até cada índice, em ordem
+        """
+        infinito = float('inf')
+        quantidade = len(self._nomes)
+        distancias = [infinito] * quantidade
+        anteriores = [-1] * quantidade
+        pulos = [()] * quantidade if (ecmp) else None
+        raiz = self._indices.get(origem)
+        if (raiz is None or not self._presentes[raiz]):
+            return distancias, anteriores, pulos
+
+        nomes = self._nomes
+        inicio = self._inicio
+        grau = self._grau
+        vizinhos = self._vizinhos
+        custos = self._custos
+        # Roteadores já marcados ou sem entrada na LSDB
+        bloqueados = self._presentes.translate(INVERTER_BYTES)
+        heappush = heapq.heappush
+        heappop = heapq.heappop
+
+        # Os itens da fila são inteiros (distância * quantidade + índice), mais rápidos de comparar do que tuplas e com o mesmo desempate
+        distancias[raiz] = 0
+        fila = [raiz]
+        while fila:
+            distancia, roteador = divmod(heappop(fila), quantidade)
+            if (bloqueados[roteador]):
+                continue
+            bloqueados[roteador] = 1
+            primeiro = inicio[roteador]
+            ultimo = primeiro + grau[roteador]
+            pulos_roteador = pulos[roteador] if (ecmp) else None
+
+            # Atualização dos menores caminhos
+            for vizinho, custo in zip(vizinhos[primeiro:ultimo], custos[primeiro:ultimo]):
+                if (bloqueados[vizinho]):
+                    continue
+                custo_total = distancia + custo
+                atual = distancias[vizinho]
+                if (custo_total < atual):
+                    distancias[vizinho] = custo_total
+                    anteriores[vizinho] = roteador
+                    heappush(fila, custo_total * quantidade + vizinho)
+                    if (ecmp):
+                        pulos[vizinho] = (nomes[vizinho],) if (roteador == raiz) else pulos_roteador
+                elif (ecmp and custo_total == atual):
+                    # Caminho de mesmo custo: une os próximos pulos (na maioria dos destinos, os anteriores compartilham os mesmos)
+                    pulos_anterior = (nomes[vizinho],) if (roteador == raiz) else pulos_roteador
+                    if (pulos_anterior != pulos[vizinho]):
+                        pulos[vizinho] = tuple(sorted(set(pulos[vizinho]).union(pulos_anterior)))
+
+        return distancias, anteriores, pulos
+
+    def para_dicionario(self, valores: list) -> dict:
+        """
+        Converte uma lista indexada pelos índices dos roteadores em um dicionário pelos seus IDs, apenas para os roteadores presentes na LSDB
+        """
+        return dict(itertools.compress(zip(self._nomes, valores), self._presentes))
+
 
 class LSDB:
     """
-    Representa o Banco de Dados de Estado de Enlace (Link State Database - LSDB), responsável por armazenar as informações recebidas via LSA (Link State Advertisement) e calcular os melhores caminhos na rede utilizando o algoritmo de Dijkstra
+    Representa o Banco de Dados de Estado de Enlace (Link State Database - LSDB), responsável por armazenar as informações recebidas via LSA (Link State Advertisement) e calcular os melhores caminhos na rede utilizando o algoritmo de Dijkstra
+    """
+
+    __slots__ = [
+        "_tabela", "_router_id", "_roteamento", "_neighbors_ip", "_tempo_inicio", "_quantidade_roteadores",
+        "_spf_incremental", "_alterados", "_distancias", "_caminhos", "_filhos", "_entrantes", "_links_spf", "_fib",
+        "_trava", "_agendador", "_revisar_rotas", "_quedas_pendentes", "_tempos_failover", "_idade_maxima", "_envelhecimento",
+        "_geracao", "_versao", "_compartilhada", "_geracao_calculada", "_calculos_evitados", "_calculos_suspensos", "_lfa", "_alternativos",
+        "_protegidos", "_distancias_vizinhos", "_tabela_alternativos", "_agendador_lfa", "_alterados_lfa", "_tabela_lfa", "_trava_fib", "_topologia", "_lsas_processados", "_execucoes_spf", "_duracao_spf", "_duracao_lfa", "_rastreamento",
+        "_area", "_usar_resumos", "_anunciantes", "_rotas_resumidas", "_prefixos_internos"
+    ]
+
+    def __init__(self, router_id: str, neighbors_ip: dict[str, str], spf_incremental: bool = True, fib: TabelaRotas | None = None, idade_maxima: float = 3600, lfa: bool = True, area: int | None = None, usar_resumos: bool = True):
+        """
+        Inicializa um novo LSDB
+
+        Args: 
+            router_id (str): Identificador único do roteador
+            neighbors_ip (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é seu IP
+            spf_incremental (bool, opcional): Recalcula apenas a parte afetada da árvore de menores caminhos a cada alteração (Padrão: True)
+            fib (TabelaRotas | None, opcional): Tabela responsável por instalar as rotas no kernel (Padrão: TabelaRotas do próprio roteador)
+            idade_maxima (float, opcional): Tempo (em segundos) sem atualizações após o qual o LSA de outro roteador é removido, como o MaxAge do OSPF (Padrão: 3600)
+            lfa (bool, opcional): Pré-calcula, após cada SPF, um próximo pulo alternativo livre de laços (LFA, RFC 5286) para cada destino,
+                instalado imediatamente quando o próximo pulo atual cai (Padrão: True)
+            area (int | None, opcional): Área da LSDB quando o roteador participa de mais de uma área, separando as suas rotas das rotas das
+                demais LSDBs na tabela de rotas compartilhada (Padrão: None, única LSDB do roteador)
+            usar_resumos (bool, opcional): Instala as rotas dos prefixos resumidos anunciados pelos ABRs da área. Um ABR usa apenas os resumos
+                do backbone (Padrão: True)
+        """
+        self._router_id = router_id
+        self._neighbors_ip = neighbors_ip
+        # Registro das informações recebidas pelo LSA
+        self._tabela = {}
+        # Dicionário que mantém registro dos roteadores de destino e os próximos saltos para alcançá-los (todos os vizinhos que iniciam um menor caminho)
+        self._roteamento = {}
+        self._tempo_inicio = relogio_monotonico()
+        self._quantidade_roteadores = 0
+
+        # Estado mantido entre execuções do SPF incremental
+        self._spf_incremental = spf_incremental
+        # Roteadores cujas entradas foram alteradas desde o último cálculo
+        self._alterados = set()
+        # Árvore de menores caminhos: distância e roteador anterior de cada destino
+        self._distancias = {}
+        self._caminhos = {}
+        # Roteadores que têm cada roteador como anterior na árvore
+        self._filhos = {}
+        # Índice reverso dos enlaces: para cada roteador, quem anuncia um enlace até ele e com qual custo
+        self._entrantes = {}
+        # Enlaces de cada roteador considerados no último cálculo
+        self._links_spf = {}
+        # Topologia em arrays (índices inteiros e enlaces em formato CSR), usada nos cálculos completos e nos alternativos
+        self._topologia = TopologiaLSDB()
+        # Rotas já instaladas no kernel
+        self._fib = fib if (fib is not None) else TabelaRotas(router_id)
+
+        # Protege a tabela, que é alterada pela thread de recepção enquanto o SPF é calculado em outra thread
+        self._trava = threading.Lock()
+        # Agendador dos cálculos (None calcula imediatamente, na própria thread que recebeu a alteração)
+        self._agendador = None
+        # Indica que todas as rotas devem ser revisadas no próximo cálculo (ex: um gateway passou a ser conhecido)
+        self._revisar_rotas = False
+        # Quedas de vizinhos aguardando o próximo cálculo: tuplas (roteador, último HELLO, instante da detecção)
+        self._quedas_pendentes = []
+        # Tempos medidos entre as últimas quedas e a instalação das novas rotas
+        self._tempos_failover = collections.deque(maxlen=100)
+        # Prazos de expiração dos LSAs dos outros roteadores, rearmados a cada nova instância recebida
+        self._idade_maxima = idade_maxima
+        self._envelhecimento = DetectorQuedas(self.remover_expirados)
+        # Geração da tabela, incrementada a cada alteração (permite saber se a LSDB mudou desde o último cálculo ou snapshot)
+        self._geracao = 0
+        # Última versão publicada para os leitores e se a tabela atual pertence a ela (precisa ser copiada antes de ser alterada)
+        self._versao = None
+        self._compartilhada = False
+        # Geração usada no último cálculo dos menores caminhos, e cálculos evitados por não haver alterações desde ele
+        self._geracao_calculada = None
+        self._calculos_evitados = 0
+        # LSAs recebidos por resultado (aceitos ou descartados por serem iguais ou mais antigos que a instância da LSDB)
+        self._lsas_processados = {"aceito": 0, "duplicado": 0, "antigo": 0}
+        # Cálculos do SPF por tipo e durações dos cálculos (apenas a árvore e os próximos pulos) e dos alternativos
+        self._execucoes_spf = {"completo": 0, "incremental": 0}
+        self._duracao_spf = Histograma()
+        self._duracao_lfa = Histograma()
+        # Rastreamento opcional das etapas dos cálculos e do intervalo entre a aceitação de cada LSA e a aplicação das rotas
+        self._rastreamento = None
+        # Cálculos adiados durante um reinício gracioso, mantendo as rotas já instaladas até a LSDB ser sincronizada
+        self._calculos_suspensos = False
+        # Próximo pulo alternativo livre de laços (LFA) de cada destino com um único próximo pulo, e destinos protegidos (por um LFA ou por ECMP)
+        self._lfa = lfa
+        self._alternativos = {}
+        self._protegidos = (0, 0)
+        # Menores caminhos a partir de cada vizinho e tabela do último cálculo dos alternativos, mantidos entre os cálculos: apenas as árvores
+        # dos vizinhos afetadas pelas alterações são recalculadas
+        self._distancias_vizinhos = {}
+        self._tabela_alternativos = None
+        # Agendador opcional dos cálculos dos alternativos, e roteadores alterados e tabela dos cálculos do SPF ainda sem os alternativos
+        # (sem agendador, os alternativos são calculados logo após cada cálculo do SPF)
+        self._agendador_lfa = None
+        self._alterados_lfa = set()
+        self._tabela_lfa = None
+        # Protege a tabela de rotas, alterada pelo cálculo das rotas e pelo reparo local após a queda de um vizinho (em threads diferentes)
+        # A trava é a da própria tabela, compartilhada pelas LSDBs de todas as áreas do roteador
+        self._trava_fib = self._fib.trava
+
+        # Áreas (OSPF): roteadores que anunciam prefixos resumidos de outras áreas (ABRs) e a rota escolhida para cada prefixo,
+        # com o custo total (distância até o ABR somada ao custo anunciado), os próximos pulos e o ABR
+        self._area = area
+        self._usar_resumos = usar_resumos
+        self._anunciantes = set()
+        self._rotas_resumidas = {}
+        # Prefixos alcançáveis dentro das demais áreas de um ABR, que não seguem pelos resumos desta área
+        self._prefixos_internos = frozenset()
+
+    @property
+    def agendador(self):
+        return self._agendador
+
+    @property
+    def agendador_lfa(self) -> AgendadorSPF | None:
+        return self._agendador_lfa
+
+    @property
+    def geracao(self) -> int:
+        return self._geracao
+
+    @property
+    def calculos_evitados(self) -> int:
+        return self._calculos_evitados
+
+    @property
+    def lsas_processados(self) -> dict[str, int]:
+        return self._lsas_processados
+
+    @property
+    def execucoes_spf(self) -> dict[str, int]:
+        return self._execucoes_spf
+
+    @property
+    def duracao_spf(self) -> Histograma:
+        return self._duracao_spf
+
+    @property
+    def duracao_lfa(self) -> Histograma:
+        return self._duracao_lfa
+
+    @property
+    def pendentes(self) -> int:
+        """
+        Quantidade de roteadores alterados aguardando o próximo cálculo das rotas
+        """
+        return len(self._alterados)
+
+    @property
+    def idade_maxima(self) -> float:
+        return self._idade_maxima
+
+    @property
+    def envelhecimento(self) -> DetectorQuedas:
+        return self._envelhecimento
+
+    @envelhecimento.setter
+    def envelhecimento(self, envelhecimento: DetectorQuedas):
+        self._envelhecimento = envelhecimento
+
+    @property
+    def fib(self) -> TabelaRotas:
+        return self._fib
+
+    @property
+    def topologia(self) -> TopologiaLSDB:
+        return self._topologia
+
+    @property
+    def tempos_failover(self) -> list[dict]:
+        return list(self._tempos_failover)
+
+    @property
+    def area(self) -> int | None:
+        return self._area
+
+    @property
+    def tamanho(self) -> int:
+        """
+        Quantidade de entradas (LSAs e roteadores apenas citados nos enlaces) da LSDB
+        """
+        return len(self._tabela)
+
+    @property
+    def rotas_resumidas(self) -> dict[str, int]:
+        """
+        Custo total até cada prefixo resumido com rota instalada
+        """
+        return {prefixo: custo for prefixo, (custo, _, _) in self._rotas_resumidas.items()}
+
+    @property
+    def usar_resumos(self) -> bool:
+        return self._usar_resumos
+
+    @usar_resumos.setter
+    def usar_resumos(self, usar_resumos: bool):
+        with self._trava:
+            if (usar_resumos != self._usar_resumos):
+                self._usar_resumos = usar_resumos
+                self._revisar_rotas = True
+
+    @property
+    def prefixos_internos(self) -> frozenset:
+        return self._prefixos_internos
+
+    @prefixos_internos.setter
+    def prefixos_internos(self, prefixos: frozenset):
+        """
+        Define os prefixos (normalizados por rede_ip) alcançáveis dentro das demais áreas do ABR: como no OSPF, as rotas internas de uma área
+        têm preferência sobre os resumos anunciados por outros ABRs, e as rotas dos resumos são revisadas no próximo cálculo
+        """
+        with self._trava:
+            if (prefixos != self._prefixos_internos):
+                self._prefixos_internos = prefixos
+                self._revisar_rotas = True
+
+    @property
+    def alternativos(self) -> dict[str, str]:
+        return dict(self._alternativos)
+
+    @property
+    def protegidos(self) -> tuple[int, int]:
+        """
+        Quantidade de destinos protegidos (com um LFA ou com mais de um próximo pulo) e de destinos alcançáveis no último cálculo
+        """
+        return self._protegidos
+
+    @agendador.setter
+    def agendador(self, agendador: AgendadorSPF | None):
+        self._agendador = agendador
+
+    @agendador_lfa.setter
+    def agendador_lfa(self, agendador: AgendadorSPF | None):
+        self._agendador_lfa = agendador
+
+    @property
+    def rastreamento(self) -> RastreamentoLSA | None:
+        return self._rastreamento
+
+    @rastreamento.setter
+    def rastreamento(self, rastreamento: RastreamentoLSA | None):
+        self._rastreamento = rastreamento
+
+    def registrar_queda(self, router_id: str, ultimo_hello: float, deteccao: float, reparo: tuple[int, int] = (0, 0)):
+        """
+        Registra a queda de um vizinho, medindo o tempo até a instalação das novas rotas no próximo cálculo
+
+        Args:
+            router_id (str): Identificador único do vizinho
+            ultimo_hello (float): Instante do último HELLO recebido do vizinho (estimativa do instante da falha)
+            deteccao (float): Instante em que a queda foi detectada
+            reparo (tuple[int, int], opcional): Destinos que usavam o vizinho como próximo pulo e quantos deles foram reparados na detecção (Padrão: (0, 0))
+        """
+        with self._trava:
+            self._quedas_pendentes.append((router_id, ultimo_hello, deteccao, reparo))
+
+    def versao(self) -> VersaoLSDB:
+        """
+        Retorna a versão atual da LSDB, publicando uma nova versão caso a tabela tenha sido alterada desde a última publicação
+        """
+        with self._trava:
+            return self.publicar()
+
+    def publicar(self) -> VersaoLSDB:
+        """
+        Publica a tabela atual em uma versão imutável, reaproveitando a última versão caso não haja alterações (chamado com a trava)
+        """
+        if (self._versao is None or self._versao.geracao != self._geracao):
+            self._versao = VersaoLSDB(self._geracao, self._tabela)
+            self._compartilhada = True
+        return self._versao
+
+    def alterar_tabela(self) -> dict:
+        """
+        Retorna a tabela para uma alteração, incrementando a geração (chamado com a trava)
+        A tabela de uma versão já publicada é copiada antes de ser alterada, mantendo a versão intacta para os leitores
+        """
+        if (self._compartilhada):
+            self._tabela = dict(self._tabela)
+            self._compartilhada = False
+        self._geracao += 1
+        return self._tabela
+
+    def criar_entrada(self, sequence_number: int, timestamp: float, addresses: list[str], links: dict[str, int], resumos: dict[str, int] | None = None) -> dict:
+        """
+        Cria uma entrada na tabela baseado nas informações do pacote
+
+        Args:
+            sequence_number (int): Número de sequência
+            timestamp (float): Tempo de criação do pacote
+            addresses (list[str]): Lista com todos os endereços IP das interfaces
+            links (dict[str, int]): Dicionário onde a chave é o ID do vizinho e o valor é o custo para alcançá-lo
+            resumos (dict[str, int] | None, opcional): Prefixos resumidos de outras áreas anunciados por um ABR e o custo até cada um
+
+        Returns: 
+            dict: Dicionário com os dados da entrada
+        """
+
+        entrada = {
+            "sequence_number": sequence_number,
+            "timestamp": timestamp,
+            "addresses": addresses,
+            "links": links,
+        }
+        if (resumos):
+            entrada["resumos"] = resumos
+        return entrada
+
+    def registrar_entrada(self, tabela: dict, router_id: str, pacote: dict):
+        """
+        Registra na tabela a entrada de um LSA, acompanhando os roteadores que anunciam prefixos resumidos (chamado com a trava)
+        """
+        entrada = tabela[router_id] = self.criar_entrada(
+            pacote["sequence_number"], pacote["timestamp"], pacote["addresses"], pacote["links"], pacote.get("resumos"))
+        if ("resumos" in entrada):
+            self._anunciantes.add(router_id)
+        else:
+            self._anunciantes.discard(router_id)
+
+    def atualizar(self, pacote: dict) -> bool:
+        """
+        Atualiza a tabela de roteamento após receber um pacote LSA válido
+
+        Args:
+            pacote (dict): Pacote LSA no formato de dicionário
+
+        Returns:
+            bool: Um booleano indicando se a tabela foi atualizada ou não
+        """
+        # Extrai o ID do emissor e número de sequência do pacote
+        router_id = pacote["router_id"]
+        sequence_number = pacote["sequence_number"]
+
+        with self._trava:
+            # Retorna a entrada (caso exista) do emissor na LSDB
+            entrada = self._tabela.get(router_id)
+
+            # O pacote é inválido quando já há uma entrada "igual ou mais antiga" do que o pacote recém-chegado
+            if (entrada and sequence_number <= entrada["sequence_number"]):
+                self._lsas_processados["duplicado" if (sequence_number == entrada["sequence_number"]) else "antigo"] += 1
+                return False
+            self._lsas_processados["aceito"] += 1
+
+            # Cria uma entrada na tabela
+            self.registrar_entrada(self.alterar_tabela(), router_id, pacote)
+            self._alterados.add(router_id)
+            if (self._rastreamento is not None):
+                self._rastreamento.abrir(router_id, sequence_number)
+
+        # O LSA expira caso o roteador não o atualize dentro da idade máxima (o próprio LSA é atualizado pelo emissor de LSA)
+        if (router_id != self._router_id):
+            self._envelhecimento.armar(router_id, self._idade_maxima)
+
+        self.recalcular_rotas(pacote["links"].keys())
+
+        return True
+
+    def resumo(self) -> dict[str, int]:
+        """
+        Resume a LSDB pelos números de sequência dos LSAs de cada roteador (descrição enviada a um vizinho recém-reconhecido)
+        Roteadores apenas citados nos enlaces de outros, sem LSA recebido, não são incluídos
+        """
+        with self._trava:
+            return {
+                router_id: entrada["sequence_number"]
+                for router_id, entrada in self._tabela.items() if entrada["sequence_number"] >= 0
+            }
+
+    def montar_pacote(self, router_id: str, entrada: dict) -> dict:
+        """
+        Reconstrói o pacote LSA de uma entrada da LSDB
+        """
+        pacote = {
+            "type": "LSA", "router_id": router_id, "timestamp": entrada["timestamp"], "addresses": entrada["addresses"],
+            "sequence_number": entrada["sequence_number"], "links": entrada["links"]
+        }
+        if ("resumos" in entrada):
+            pacote["resumos"] = entrada["resumos"]
+        return pacote
+
+    def pacote(self, router_id: str) -> dict | None:
+        """
+        Retorna o pacote LSA atual de um roteador (None caso nenhum LSA dele tenha sido recebido)
+        """
+        with self._trava:
+            entrada = self._tabela.get(router_id)
+            if (entrada is None or entrada["sequence_number"] < 0):
+                return None
+            return self.montar_pacote(router_id, entrada)
+
+    def sequencia(self, router_id: str) -> int | None:
+        """
+        Retorna o número de sequência do LSA atual de um roteador (None caso nenhum LSA dele tenha sido recebido)
+        """
+        with self._trava:
+            entrada = self._tabela.get(router_id)
+            if (entrada is None or entrada["sequence_number"] < 0):
+                return None
+            return entrada["sequence_number"]
+
+    def remover_expirados(self, roteadores: list[str]):
+        """
+        Remove os LSAs que atingiram a idade máxima sem serem atualizados (chamado pelo detector de prazos), recalculando as rotas
+
+        Args:
+            roteadores (list[str]): Roteadores cujos LSAs expiraram
+        """
+        for router_id in roteadores:
+            print2(f"[LSDB] LSA de {router_id} removido: idade máxima atingida")
+            self.remover(router_id)
+        self.recalcular_rotas([])
+
+    def verificar_convergencia(self, tabela: types.MappingProxyType):
+        """
+        Registra o tempo de convergência sempre que são conhecidas rotas para todos os roteadores conhecidos (incluindo algum roteador novo)
+
+        Args:
+            tabela (types.MappingProxyType): Tabela da versão da LSDB usada no cálculo
+        """
+        quantidade_roteadores = len(tabela)
+        # Verifica se algum roteador novo foi conhecido
+        if (quantidade_roteadores > self._quantidade_roteadores):
+            # Verifica se há caminhos conhecidos para todos os roteadores
+            if (quantidade_roteadores == (len(self._roteamento) + 1)):
+                # Atualiza a quantidade de roteadores conhecidos
+                self._quantidade_roteadores = quantidade_roteadores
+                tempo_convergencia = relogio_monotonico() - self._tempo_inicio
+                data_formatada = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+
+                try:
+                    with open("/compartilhado/convergencia.txt", "a") as file:
+                        file.write(
+                            f"[{data_formatada}] {self._router_id}: {tempo_convergencia:.2f} segundos [{quantidade_roteadores} roteadores]\n")
+                except Exception as e:
+                    print2(
+                        f"[ERRO] Falha ao escrever tempo de convergência: {e}", NIVEL_ERRO)
+
+    def remover(self, router_id: str):
+        """
+        Remove a entrada de um roteador da LSDB (ex: após ser considerado inativo)
+
+        Args:
+            router_id (str): Identificador único do roteador
+        """
+        with self._trava:
+            if (router_id in self._tabela):
+                del self.alterar_tabela()[router_id]
+                self._alterados.add(router_id)
+                self._anunciantes.discard(router_id)
+        self._envelhecimento.desarmar(router_id)
+
+    def carregar(self, pacotes: list[dict]):
+        """
+        Carrega os LSAs de um snapshot na LSDB, sem calcular as rotas (o cálculo ocorre quando os cálculos forem retomados)
+
+        Args:
+            pacotes (list[dict]): Pacotes LSA no formato de dicionário
+        """
+        with self._trava:
+            tabela = self.alterar_tabela()
+            for pacote in pacotes:
+                router_id = pacote["router_id"]
+                self.registrar_entrada(tabela, router_id, pacote)
+                self._alterados.add(router_id)
+        # Os LSAs carregados também expiram caso não sejam atualizados (ex: o roteador de origem saiu da rede durante o reinício)
+        for pacote in pacotes:
+            if (pacote["router_id"] != self._router_id):
+                self._envelhecimento.armar(pacote["router_id"], self._idade_maxima)
+
+    def suspender_calculos(self):
+        """
+        Adia os cálculos de rotas (reinício gracioso): as rotas instaladas antes do reinício são mantidas
+        """
+        self._calculos_suspensos = True
+
+    def retomar_calculos(self):
+        """
+        Retoma os cálculos de rotas, revisando todas as rotas instaladas em relação à LSDB sincronizada
+        """
+        self._calculos_suspensos = False
+        self.vizinhos_alterados()
+
+    def vizinhos_alterados(self):
+        """
+        Solicita a revisão de todas as rotas, já que um vizinho passou a ser (ou deixou de ser) um gateway conhecido
+        """
+        with self._trava:
+            self._revisar_rotas = True
+        self.recalcular_rotas([])
+
+    def dijkstra(self) -> dict:
+        """
+        Calcula o caminho com menor custo entre o roteador atual e todos os demais roteadores conhecidos, utilizando uma fila de prioridade (heap) - O((V + E) log V)
+
+        Em caso de empate no custo, é escolhido primeiro o roteador inserido há mais tempo na LSDB (mesmo critério da busca linear)
+
+        Returns:
+            dict: Dicionário com a chave sendo o roteador de destino e o valor sendo o roteador anterior a ele
+        """
+        return self.dijkstra_completo(self._tabela)[1]
+
+    def dijkstra_completo(self, tabela: dict, origem: str | None = None) -> tuple[dict, dict]:
+        """
+        Executa o Dijkstra com fila de prioridade sobre toda a LSDB
+
+        Args:
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+            origem (str | None, opcional): Raiz dos menores caminhos (Padrão: o próprio roteador)
+
+        Returns:
+            tuple[dict, dict]: Distâncias até cada roteador e o roteador anterior a cada destino
+        """
+        origem = origem if (origem is not None) else self._router_id
+        distancias = {}
+        caminhos = {}
+        # Ordem de inserção na LSDB, usada como critério de desempate na fila
+        ordem = {}
+        marcados = set()
+
+        # Inicializando os dicionários
+        for indice, roteador in enumerate(tabela.keys()):
+            distancias[roteador] = float('inf')
+            caminhos[roteador] = None
+            ordem[roteador] = indice
+
+        distancias[origem] = 0
+        fila = [(0, ordem.get(origem, -1), origem)]
+
+        while fila:
+            # Retira o menor roteador não marcado
+            distancia, _, roteador = heapq.heappop(fila)
+            if (roteador in marcados):
+                continue
+
+            marcados.add(roteador)
+            entrada = tabela.get(roteador)
+            if (entrada is None):
+                continue
+
+            # Atualização dos menores caminhos
+            for vizinho, custo in entrada["links"].items():
+                # Ignora roteadores já marcados ou ainda não registrados na LSDB
+                if (vizinho in marcados or vizinho not in distancias):
+                    continue
+                custo_total = custo + distancia
+                if (custo_total < distancias[vizinho]):
+                    distancias[vizinho] = custo_total
+                    caminhos[vizinho] = roteador
+                    heapq.heappush(fila, (custo_total, ordem[vizinho], vizinho))
+
+        return distancias, caminhos
+
+    def dijkstra_topologia(self) -> tuple[dict, dict]:
+        """
+        Executa o Dijkstra com ECMP sobre a topologia em arrays, estabelecendo os próximos pulos de todos os destinos
+
+        Returns:
+            tuple[dict, dict]: Distâncias até cada roteador e o roteador anterior a cada destino
+        """
+        topologia = self._topologia
+        nomes = topologia.nomes
+        distancias, anteriores, pulos = topologia.menores_caminhos(self._router_id, ecmp=True)
+        roteamento = topologia.para_dicionario(pulos)
+        roteamento.pop(self._router_id, None)
+        self._roteamento = roteamento
+        caminhos = topologia.para_dicionario([nomes[anterior] if (anterior >= 0) else None for anterior in anteriores])
+        return topologia.para_dicionario(distancias), caminhos
+
+    def dijkstra_linear(self) -> dict:
+        """
+        Versão original do Dijkstra, que busca o próximo roteador percorrendo todas as distâncias a cada iteração - O(V²)
+
+        Mantida como referência para comparação de desempenho e resultado (ver benchmarks/benchmark_dijkstra.py)
+
+        Returns:
+            dict: Dicionário com a chave sendo o roteador de destino e o valor sendo o roteador anterior a ele
+        """
+        distancias = {}
+        caminhos = {}
+        marcados = {}
+
+        # Inicializando os dicionários
+        for roteador in self._tabela.keys():
+            distancias[roteador] = float('inf')
+            caminhos[roteador] = None
+
+        distancias[self._router_id] = 0
+
+        while len(marcados) < len(self._tabela):
+            roteador = None
+            menor = float('inf')
+            # Busca pelo menor roteador não marcado
+            for no, custo in distancias.items():
+                if (no not in marcados and custo < menor):
+                    roteador = no
+                    menor = custo
+
+            if (roteador is None):
+                break
+
+            marcados[roteador] = True
+            vizinhos = self._tabela[roteador]["links"]
+
+            # Atualização dos menores caminhos
+            for vizinho, custo in vizinhos.items():
+                if (vizinho not in marcados):
+                    custo_total = custo + distancias[roteador]
+                    if (custo_total < distancias[vizinho]):
+                        distancias[vizinho] = custo_total
+                        caminhos[vizinho] = roteador
+
+        return caminhos
+
+    def calcular_pulos(self, destino: str, distancias: dict, entrantes: dict) -> tuple[str, ...]:
+        """
+        Calcula os próximos pulos de um destino: a união dos próximos pulos dos roteadores anteriores a ele em algum menor caminho
+        (ou o próprio destino, quando ele é um vizinho em um menor caminho). Os anteriores precisam estar com os próximos pulos atualizados
+
+        Args:
+            destino (str): Roteador de destino
+            distancias (dict): Distância até cada roteador
+            entrantes (dict): Para cada roteador, quem anuncia um enlace até ele e com qual custo
+
+        Returns:
+            tuple[str, ...]: Vizinhos que iniciam algum menor caminho até o destino, em ordem (vazia caso o destino esteja inalcançável)
+        """
+        infinito = float('inf')
+        distancia = distancias[destino]
+        if (distancia == infinito):
+            return ()
+        pulos = None
+        for anterior, custo in entrantes.get(destino, {}).items():
+            if (distancias.get(anterior, infinito) + custo != distancia):
+                continue
+            pulos_anterior = (destino,) if (anterior == self._router_id) else self._roteamento.get(anterior, ())
+            if (pulos is None):
+                pulos = pulos_anterior
+            elif (pulos_anterior != pulos):
+                # Caminhos de mesmo custo por próximos pulos diferentes (na maioria dos destinos, todos os anteriores compartilham os mesmos)
+                pulos = tuple(sorted(set(pulos).union(pulos_anterior)))
+        return pulos or ()
+
+    def atualizar_proximo_pulo(self, distancias: dict, entrantes: dict):
+        """
+        Estabelece os próximos pulos de cada destino: todos os vizinhos que iniciam algum menor caminho até ele (ECMP)
+        Os destinos são percorridos em ordem de distância, de forma que os anteriores de cada destino já foram calculados
+
+        Args:
+            distancias (dict): Distância até cada roteador
+            entrantes (dict): Para cada roteador, quem anuncia um enlace até ele e com qual custo
+        """
+        self._roteamento = {}
+        for destino in sorted(distancias.keys(), key=distancias.__getitem__):
+            if (destino != self._router_id):
+                self._roteamento[destino] = self.calcular_pulos(destino, distancias, entrantes)
+
+    @staticmethod
+    def indexar_entrantes(tabela: dict) -> dict:
+        """
+        Monta o índice reverso dos enlaces da tabela: para cada roteador, quem anuncia um enlace até ele e com qual custo
+        """
+        entrantes = {}
+        for roteador, entrada in tabela.items():
+            for vizinho, custo in entrada["links"].items():
+                entrantes.setdefault(vizinho, {})[roteador] = custo
+        return entrantes
+
+    def reconstruir_arvore(self, distancias: dict, caminhos: dict, tabela: dict):
+        """
+        Guarda a árvore calculada por um Dijkstra completo, servindo de ponto de partida para os próximos cálculos incrementais
+
+        Args:
+            distancias (dict): Distância até cada roteador
+            caminhos (dict): Dicionário com a chave sendo o roteador de destino e o valor sendo o roteador anterior a ele
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+        """
+        self._distancias = distancias
+        self._caminhos = caminhos
+        self._filhos = {}
+        for destino, anterior in caminhos.items():
+            if (anterior is not None):
+                self._filhos.setdefault(anterior, set()).add(destino)
+
+        self._entrantes = self.indexar_entrantes(tabela)
+        self._links_spf = {roteador: entrada["links"] for roteador, entrada in tabela.items()}
+
+    def definir_anterior(self, destino: str, anterior: str | None):
+        """
+        Altera o roteador anterior de um destino na árvore de menores caminhos, mantendo o registro de filhos coerente
+
+        Args:
+            destino (str): Roteador de destino
+            anterior (str | None): Novo roteador anterior (None caso o destino esteja inalcançável)
+        """
+        antigo = self._caminhos.get(destino)
+        if (antigo is not None and antigo in self._filhos):
+            self._filhos[antigo].discard(destino)
+        self._caminhos[destino] = anterior
+        if (anterior is not None):
+            self._filhos.setdefault(anterior, set()).add(destino)
+
+    def spf_incremental(self, alterados: set, tabela: dict) -> set:
+        """
+        Atualiza a árvore de menores caminhos considerando apenas os roteadores alterados desde o último cálculo
+
+        - Aumentos de custo (ou remoções) em enlaces da árvore invalidam somente a subárvore abaixo do enlace
+        - Reduções de custo (ou novos enlaces) propagam as novas distâncias a partir do roteador beneficiado
+        - O Dijkstra é executado apenas sobre os roteadores cuja distância pode ter mudado
+
+        Args:
+            alterados (set): Roteadores cujas entradas foram alteradas desde o último cálculo
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+
+        Returns:
+            set: Destinos cujos próximos pulos (ou endereços) podem ter mudado
+        """
+        distancias = self._distancias
+        infinito = float('inf')
+
+        raizes_invalidas = set()
+        novos_roteadores = set()
+        removidos = set()
+        reducoes = []
+        # Roteadores alcançados por enlaces alterados que faziam parte de um menor caminho, e enlaces novos ou com novo custo
+        # (o roteador alcançado pode ganhar ou perder um caminho de mesmo custo, mesmo sem mudar de distância)
+        enlaces_alterados = set()
+        enlaces_novos = []
+
+        for roteador in alterados:
+            entrada = tabela.get(roteador)
+            links_antigos = self._links_spf.get(roteador, {})
+            links_novos = entrada["links"] if entrada else {}
+
+            if (entrada is None):
+                # Roteador removido da LSDB: a subárvore abaixo dele deixa de ser válida
+                if (roteador in distancias):
+                    removidos.add(roteador)
+                    raizes_invalidas.add(roteador)
+                self._links_spf.pop(roteador, None)
+            else:
+                if (roteador not in distancias):
+                    novos_roteadores.add(roteador)
+                self._links_spf[roteador] = links_novos
+
+            # Enlaces removidos ou com custo alterado
+            for vizinho, custo in links_antigos.items():
+                custo_novo = links_novos.get(vizinho)
+                if (custo_novo == custo):
+                    continue
+                # O enlace fazia parte de um menor caminho (as distâncias ainda são as anteriores às alterações)
+                if (distancias.get(roteador, infinito) + custo == distancias.get(vizinho)):
+                    enlaces_alterados.add(vizinho)
+                if (custo_novo is None):
+                    self._entrantes.get(vizinho, {}).pop(roteador, None)
+                if ((custo_novo is None or custo_novo > custo) and self._caminhos.get(vizinho) == roteador):
+                    raizes_invalidas.add(vizinho)
+
+            # Enlaces novos ou com custo alterado
+            for vizinho, custo in links_novos.items():
+                custo_antigo = links_antigos.get(vizinho)
+                if (custo_antigo == custo):
+                    continue
+                enlaces_novos.append((roteador, vizinho, custo))
+                self._entrantes.setdefault(vizinho, {})[roteador] = custo
+                if (custo_antigo is None or custo < custo_antigo):
+                    reducoes.append((roteador, vizinho, custo))
+
+        # Invalida as subárvores afetadas por aumentos de custo
+        invalidados = set()
+        pilha = list(raizes_invalidas)
+        while pilha:
+            roteador = pilha.pop()
+            if (roteador in invalidados):
+                continue
+            invalidados.add(roteador)
+            pilha.extend(self._filhos.get(roteador, ()))
+
+        for roteador in invalidados:
+            distancias[roteador] = infinito
+            self.definir_anterior(roteador, None)
+
+        for roteador in removidos:
+            invalidados.discard(roteador)
+            del distancias[roteador]
+            self._caminhos.pop(roteador, None)
+            self._filhos.pop(roteador, None)
+            self._roteamento.pop(roteador, None)
+
+        for roteador in novos_roteadores:
+            distancias[roteador] = infinito
+            self._caminhos[roteador] = None
+            invalidados.add(roteador)
+
+        afetados = set(invalidados)
+        fila = []
+
+        # Reconecta os roteadores invalidados (ou novos) a partir dos enlaces vindos de roteadores não afetados
+        for roteador in invalidados:
+            for anterior, custo in self._entrantes.get(roteador, {}).items():
+                if (anterior in invalidados or anterior not in distancias):
+                    continue
+                custo_total = distancias[anterior] + custo
+                if (custo_total < distancias[roteador]):
+                    distancias[roteador] = custo_total
+                    self.definir_anterior(roteador, anterior)
+            if (distancias[roteador] < infinito):
+                heapq.heappush(fila, (distancias[roteador], roteador))
+
+        # Enlaces que ficaram mais baratos podem encurtar caminhos já existentes
+        for roteador, vizinho, custo in reducoes:
+            if (roteador not in distancias or vizinho not in distancias):
+                continue
+            custo_total = distancias[roteador] + custo
+            if (custo_total < distancias[vizinho]):
+                distancias[vizinho] = custo_total
+                self.definir_anterior(vizinho, roteador)
+                afetados.add(vizinho)
+                heapq.heappush(fila, (custo_total, vizinho))
+
+        # Dijkstra restrito aos roteadores cuja distância mudou
+        while fila:
+            distancia, roteador = heapq.heappop(fila)
+            if (distancia > distancias[roteador]):
+                continue
+            for vizinho, custo in self._links_spf.get(roteador, {}).items():
+                if (vizinho not in distancias):
+                    continue
+                custo_total = distancia + custo
+                if (custo_total < distancias[vizinho]):
+                    distancias[vizinho] = custo_total
+                    self.definir_anterior(vizinho, roteador)
+                    afetados.add(vizinho)
+                    heapq.heappush(fila, (custo_total, vizinho))
+
+        # Os próximos pulos podem mudar para os roteadores afetados, para os vizinhos deles (um caminho de mesmo custo através de um roteador
+        # afetado pode ter surgido ou deixado de existir) e para os alcançados por enlaces alterados que fazem ou faziam parte de um menor caminho
+        revisar = afetados | enlaces_alterados
+        for roteador in afetados:
+            revisar.update(self._links_spf.get(roteador, {}).keys())
+        for roteador, vizinho, custo in enlaces_novos:
+            if (distancias.get(roteador, infinito) + custo == distancias.get(vizinho)):
+                revisar.add(vizinho)
+
+        return self.atualizar_proximo_pulo_parcial(revisar) | alterados
+
+    def atualizar_proximo_pulo_parcial(self, destinos: set) -> set:
+        """
+        Recalcula os próximos pulos apenas dos destinos informados, reaproveitando os próximos pulos já conhecidos dos demais roteadores
+        Quando os próximos pulos de um destino mudam, os roteadores alcançados a partir dele por menores caminhos também são recalculados
+
+        Args:
+            destinos (set): Destinos cujos caminhos podem ter sido alterados
+
+        Returns:
+            set: Destinos cujos próximos pulos mudaram
+        """
+        distancias = self._distancias
+        infinito = float('inf')
+        fila = [(distancias[destino], destino) for destino in destinos if destino in distancias and destino != self._router_id]
+        heapq.heapify(fila)
+        calculados = set()
+        alterados = set()
+        while fila:
+            distancia, destino = heapq.heappop(fila)
+            if (destino in calculados):
+                continue
+            calculados.add(destino)
+            pulos = self.calcular_pulos(destino, distancias, self._entrantes)
+            if (pulos == self._roteamento.get(destino)):
+                continue
+            self._roteamento[destino] = pulos
+            alterados.add(destino)
+            if (distancia == infinito):
+                continue
+            # Os custos são positivos: os roteadores seguintes estão mais distantes e ainda não foram calculados
+            for vizinho, custo in self._links_spf.get(destino, {}).items():
+                if (distancias.get(vizinho) == distancia + custo):
+                    heapq.heappush(fila, (distancia + custo, vizinho))
+        return alterados
+
+    def atualizar_rotas(self, tabela: dict, destinos: set | None = None):
+        """
+        Atualiza as rotas na tabela de roteamento, baseado nos próximos pulos encontrados pela função atualizar_proximo_pulo
+
+        Apenas as rotas adicionadas, alteradas ou removidas são escritas no kernel, em um único lote
+
+        Args:
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+            destinos (set | None, opcional): Atualiza apenas as rotas destes destinos (Padrão: todos os destinos conhecidos)
+        """
+        with self._trava_fib:
+            self.definir_rotas(tabela, destinos)
+
+    def chave_fib(self, destino: str) -> str:
+        """
+        Chave das rotas de um destino (roteador ou prefixo resumido) na tabela de rotas, identificando a área quando a tabela é compartilhada
+        pelas LSDBs de várias áreas (um roteador de outra área aparece nelas sem endereços, e não pode remover as rotas da sua própria área)
+        """
+        return destino if (self._area is None) else f"{destino}@{self._area}"
+
+    def destinos_fib(self) -> set:
+        """
+        Roteadores de destino desta LSDB com rotas instaladas (os prefixos resumidos são acompanhados à parte)
+        """
+        if (self._area is None):
+            return {destino for destino in self._fib.destinos if destino not in self._rotas_resumidas}
+        sufixo = f"@{self._area}"
+        return {
+            destino[:-len(sufixo)] for destino in self._fib.destinos
+            if destino.endswith(sufixo) and "/" not in destino
+        }
+
+    def definir_rotas(self, tabela: dict, destinos: set | None):
+        """
+        Define na tabela de rotas as rotas dos destinos e as aplica no kernel (chamado com a trava da tabela de rotas)
+        """
+        if (destinos is None):
+            # Inclui os destinos com rotas instaladas, para remover as que deixaram de existir
+            destinos = set(self._roteamento.keys()) | self.destinos_fib()
+
+        for roteador_destino in destinos:
+            # Caso não seja o próprio roteador
+            if (roteador_destino == self._router_id):
+                continue
+
+            entrada = tabela.get(roteador_destino)
+            roteadores_gateway = self._roteamento.get(roteador_destino)
+            # Apenas os próximos pulos já reconhecidos como vizinhos (com IP conhecido) são usados
+            gateways = tuple(self._neighbors_ip[roteador] for roteador in roteadores_gateway or () if roteador in self._neighbors_ip)
+            if (entrada is None or not roteadores_gateway):
+                # Destino removido ou inalcançável
+                self._fib.definir(self.chave_fib(roteador_destino), [], None)
+            elif (not gateways):
+                # Ignora o roteador caso o caminho não seja conhecido
+                print2(
+                    f"[LSDB] Ignorando rota para {roteador_destino} via {', '.join(roteadores_gateway)}: gateway não conhecido ainda", NIVEL_AVISO)
+                self._fib.definir(self.chave_fib(roteador_destino), [], None)
+            else:
+                # Associa todos os ips do destino aos próximos pulos
+                self._fib.definir(self.chave_fib(roteador_destino), entrada["addresses"], gateways)
+
+        if (self._anunciantes or self._rotas_resumidas):
+            self.definir_resumos(tabela)
+        self._fib.aplicar()
+
+    def definir_resumos(self, tabela: dict):
+        """
+        Define as rotas dos prefixos resumidos anunciados pelos ABRs da área (chamado com a trava da tabela de rotas)
+
+        Como nas rotas entre áreas do OSPF, cada prefixo segue pelos próximos pulos do ABR com o menor custo total (distância até ele somada
+        ao custo anunciado), unindo os próximos pulos dos ABRs empatados. Os prefixos que o próprio roteador anuncia na área e os alcançáveis
+        dentro da área (ou das outras áreas do ABR) são ignorados: as rotas internas têm preferência, e cada prefixo tem uma única rota
+
+        Args:
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+        """
+        infinito = float('inf')
+        rotas = {}
+        entrada = tabela.get(self._router_id)
+        proprios = entrada.get("resumos", {}) if (entrada is not None) else {}
+        internos = self._prefixos_internos
+        if (self._usar_resumos):
+            internos = internos.union(
+                str(rede_ip(endereco)) for router_id, entrada in tabela.items()
+                if router_id == self._router_id or self._roteamento.get(router_id) for endereco in entrada["addresses"])
+        for anunciante in sorted(self._anunciantes) if (self._usar_resumos) else ():
+            entrada = tabela.get(anunciante)
+            pulos = self._roteamento.get(anunciante)
+            distancia = self._distancias.get(anunciante, infinito)
+            if (entrada is None or not pulos or distancia == infinito):
+                continue
+            for prefixo, custo in entrada.get("resumos", {}).items():
+                if (prefixo in proprios or prefixo in internos):
+                    continue
+                rota = rotas.get(prefixo)
+                if (rota is None or distancia + custo < rota[0]):
+                    rotas[prefixo] = (distancia + custo, pulos, anunciante)
+                elif (distancia + custo == rota[0] and pulos != rota[1]):
+                    rotas[prefixo] = (rota[0], tuple(sorted(set(rota[1]).union(pulos))), rota[2])
+
+        for prefixo in self._rotas_resumidas.keys() - rotas.keys():
+            self._fib.definir(self.chave_fib(prefixo), [], None)
+        for prefixo, (_, pulos, _) in rotas.items():
+            gateways = tuple(self._neighbors_ip[pulo] for pulo in pulos if pulo in self._neighbors_ip)
+            self._fib.definir(self.chave_fib(prefixo), [prefixo], gateways or None)
+        self._rotas_resumidas = rotas
+
+    def prefixos_alcancaveis(self) -> dict[str, int]:
+        """
+        Endereços anunciados pelos roteadores alcançáveis da área (incluindo o próprio), com a menor distância até cada um
+        Usados por um ABR para resumir a área nas demais
+        """
+        infinito = float('inf')
+        distancias = self._distancias
+        prefixos = {}
+        for router_id, entrada in self.versao().tabela.items():
+            distancia = distancias.get(router_id, infinito)
+            if (distancia == infinito):
+                continue
+            for endereco in entrada["addresses"]:
+                if (distancia < prefixos.get(endereco, infinito)):
+                    prefixos[endereco] = distancia
+        return prefixos
+
+    def consultar_destino(self, destino: str) -> dict:
+        """
+        Informações da rota até um roteador de destino ou até um prefixo resumido (pelo ABR escolhido), segundo o último cálculo
+
+        Args:
+            destino (str): Roteador de destino ou prefixo resumido (ex: "10.11.0.0/16")
+
+        Returns:
+            dict: Custo total, próximos pulos (roteadores), alternativo livre de laços (LFA), ABR anunciante (apenas nos prefixos resumidos)
+                e caminho (roteadores da árvore de menores caminhos, do próprio roteador até o destino ou o ABR, ou None sem a árvore)
+        """
+        rota_resumida = self._rotas_resumidas.get(destino)
+        if (rota_resumida is not None):
+            custo, pulos, anunciante = rota_resumida
+            alvo = anunciante
+        else:
+            custo, pulos, anunciante = self._distancias.get(destino), self._roteamento.get(destino), None
+            alvo = destino
+
+        # Percorre a árvore de menores caminhos (mantida pelo SPF incremental) a partir do destino, até o próprio roteador
+        caminho = [alvo]
+        while (caminho[-1] != self._router_id and len(caminho) <= len(self._caminhos)):
+            anterior = self._caminhos.get(caminho[-1])
+            if (anterior is None):
+                break
+            caminho.append(anterior)
+        return {
+            "custo": custo,
+            "proximos_pulos": list(pulos or ()),
+            "alternativo": self._alternativos.get(destino),
+            "anunciante": anunciante,
+            "caminho": caminho[::-1] if (caminho[-1] == self._router_id) else None,
+        }
+
+    def recalcular_rotas(self, roteadores_observados: list[str]):
+        """
+        Recalcula as rotas com dijkstra e aplica na tabela de roteamento
+
+        Caso exista um agendador, o cálculo é apenas agendado (agrupando rajadas de alterações), sem bloquear quem chamou
+
+        Args:
+            roteadores_observados (list[str]): Lista de roteadores observados
+        """
+
+        with self._trava:
+            # Verifica se há um roteador "desconhecido" presente nos roteadores observados, criando uma entrada para o mesmo
+            for vizinho in roteadores_observados:
+                if (vizinho not in self._tabela):
+                    print2(
+                        f"[LSDB] Descoberto novo roteador: {vizinho}")
+                    self.alterar_tabela()[vizinho] = self.criar_entrada(-1, 0, [], {})
+                    self._alterados.add(vizinho)
+
+        if (self._calculos_suspensos):
+            return
+        if (self._agendador is not None):
+            self._agendador.agendar()
+        else:
+            self.calcular_rotas()
+
+    def calcular_rotas(self):
+        """
+        Calcula os menores caminhos (de forma completa ou incremental) sobre uma cópia da tabela e aplica as rotas no kernel
+        """
+        # Obtém a versão publicada da tabela (sem cópia), permitindo que novos LSAs sejam aceitos durante o cálculo
+        with self._trava:
+            alterados = self._alterados
+            self._alterados = set()
+            revisar_rotas = self._revisar_rotas
+            self._revisar_rotas = False
+            versao = self.publicar()
+            # LSAs incluídos neste cálculo, cujos intervalos são encerrados com a aplicação das rotas
+            rastreamento = self._rastreamento
+            lsas = rastreamento.capturar(alterados) if (rastreamento is not None) else None
+        tabela = versao.tabela
+
+        # Sem alterações desde o último cálculo, a árvore e os alternativos continuam válidos
+        if (versao.geracao == self._geracao_calculada):
+            self._calculos_evitados += 1
+            if (revisar_rotas):
+                self.atualizar_rotas(tabela)
+            self.medir_failover()
+            if (rastreamento is not None):
+                rastreamento.concluir(lsas)
+            return
+        self._geracao_calculada = versao.geracao
+        # Aplica na topologia em arrays as entradas alteradas desde o último cálculo
+        self._topologia.sincronizar(tabela, alterados)
+
+        inicio = time.perf_counter()
+        # Com a árvore já calculada, recalcula apenas a parte afetada pelas alterações
+        if (self._spf_incremental and self._distancias):
+            destinos = self.spf_incremental(alterados, tabela)
+            distancias = self._distancias
+            # Atualiza apenas as rotas que podem ter mudado
+            destinos = None if (revisar_rotas) else destinos
+            tipo = "incremental"
+        else:
+            # Calcula o menor caminho e os próximos pulos para se chegar em cada um dos outros roteadores, sobre a topologia em arrays
+            distancias, caminhos = self.dijkstra_topologia()
+            if (self._spf_incremental):
+                self.reconstruir_arvore(distancias, caminhos, tabela)
+            else:
+                # As distâncias também são usadas pelas rotas dos prefixos resumidos
+                self._distancias = distancias
+            destinos = None
+            tipo = "completo"
+        self._execucoes_spf[tipo] += 1
+        self._duracao_spf.observar(time.perf_counter() - inicio)
+        if (rastreamento is not None):
+            inicio = rastreamento.registrar("spf", inicio, argumentos={"tipo": tipo, "lsas": len(lsas)})
+            escritas = self._fib.escritas
+        # Atualiza as rotas na tabela de roteamento
+        self.atualizar_rotas(tabela, destinos)
+        if (rastreamento is not None):
+            rastreamento.registrar("rotas", inicio, argumentos={"escritas": self._fib.escritas - escritas})
+            rastreamento.concluir(lsas)
+
+        self.verificar_convergencia(tabela)
+        self.medir_failover()
+        # Os alternativos são calculados após a instalação das rotas, sem atrasá-la. Com um agendador, os cálculos seguidos do SPF (ex: os LSAs
+        # dos vizinhos de um roteador que caiu) são agrupados em um único cálculo dos alternativos, sobre a tabela mais recente
+        if (self._lfa):
+            self._alterados_lfa |= alterados
+            self._tabela_lfa = tabela
+            if (self._agendador_lfa is not None):
+                self._agendador_lfa.agendar()
+            else:
+                self.atualizar_alternativos()
+
+    def atualizar_alternativos(self):
+        """
+        Calcula os alternativos pendentes, sobre a tabela e as distâncias do último cálculo do SPF
+
+        Com um agendador, não pode ser executado ao mesmo tempo que o cálculo das rotas (ver Roteador.calcular_alternativos)
+        """
+        tabela = self._tabela_lfa
+        if (tabela is None):
+            return
+        alterados = self._alterados_lfa
+        self._alterados_lfa = set()
+        self._tabela_lfa = None
+
+        inicio = time.perf_counter()
+        self.calcular_alternativos(tabela, self._distancias, alterados)
+        self._duracao_lfa.observar(time.perf_counter() - inicio)
+        if (self._rastreamento is not None):
+            self._rastreamento.registrar("lfa", inicio)
+
+    def alteracoes_enlaces(self, alterados: set, tabela: dict) -> tuple[list, list] | None:
+        """
+        Compara os enlaces dos roteadores alterados na tabela do último cálculo dos alternativos com os da tabela atual
+
+        Args:
+            alterados (set): Roteadores cujas entradas foram alteradas (ou removidas) desde o último cálculo dos alternativos
+            tabela (dict): Tabela da LSDB usada no cálculo atual
+
+        Returns:
+            tuple[list, list] | None: Enlaces novos ou mais baratos e enlaces removidos ou mais caros (origem, destino e custo, com os índices
+                da topologia em arrays; os roteadores removidos da LSDB têm o destino -1), ou None quando algum roteador entrou na LSDB
+        """
+        infinito = float('inf')
+        anterior = self._tabela_alternativos
+        indice = self._topologia.indice
+        mais_baratos = []
+        mais_caros = []
+        for router_id in alterados:
+            entrada_anterior = anterior.get(router_id)
+            entrada = tabela.get(router_id)
+            if (entrada_anterior is None):
+                if (entrada is not None):
+                    return None
+                continue
+            origem = indice(router_id)
+            if (entrada is None):
+                mais_caros.append((origem, -1, 0))
+                continue
+            links_anteriores = entrada_anterior["links"]
+            links = entrada["links"]
+            for vizinho, custo in links.items():
+                if (custo < links_anteriores.get(vizinho, infinito)):
+                    mais_baratos.append((origem, indice(vizinho), custo))
+            for vizinho, custo in links_anteriores.items():
+                if (links.get(vizinho, infinito) > custo):
+                    mais_caros.append((origem, indice(vizinho), custo))
+        return mais_baratos, mais_caros
+
+    @staticmethod
+    def arvore_afetada(distancias_vizinho: list, mais_baratos: list, mais_caros: list) -> bool:
+        """
+        Verifica se as alterações dos enlaces (ver alteracoes_enlaces) podem mudar as distâncias a partir de um vizinho, como no SPF incremental,
+        mas sem manter a árvore de cada vizinho
+
+        Um enlace X -> Y novo ou mais barato afeta a árvore quando encurta o caminho até Y, e um enlace removido ou mais caro quando pode fazer
+        parte de um menor caminho até Y. Um roteador que deixa a LSDB afeta a árvore quando era alcançável
+
+        Args:
+            distancias_vizinho (list): Distâncias a partir do vizinho, indexadas pelos índices da topologia em arrays
+            mais_baratos (list): Enlaces novos ou mais baratos (origem, destino e custo)
+            mais_caros (list): Enlaces removidos ou mais caros (origem, destino e custo anterior)
+
+        Returns:
+            bool: Indica se a árvore do vizinho deve ser recalculada
+        """
+        infinito = float('inf')
+        quantidade = len(distancias_vizinho)
+        for origem, destino, custo in mais_baratos:
+            distancia = distancias_vizinho[origem] if (origem < quantidade) else infinito
+            if (distancia < infinito and distancia + custo < (distancias_vizinho[destino] if (destino < quantidade) else infinito)):
+                return True
+        for origem, destino, custo in mais_caros:
+            distancia = distancias_vizinho[origem] if (origem < quantidade) else infinito
+            if (distancia < infinito and (destino < 0 or (destino < quantidade and distancia + custo == distancias_vizinho[destino]))):
+                return True
+        return False
+
+    def calcular_alternativos(self, tabela: dict, distancias: dict, alterados: set):
+        """
+        Pré-calcula um próximo pulo alternativo livre de laços (LFA, RFC 5286) para cada destino com um único próximo pulo
+
+        Um vizinho N é um LFA para o destino D quando dist(N, D) < dist(N, S) + dist(S, D): o tráfego enviado a ele não volta ao roteador atual (S)
+        São preferidos os alternativos que também protegem contra a queda do próximo pulo P (dist(N, D) < dist(N, P) + dist(P, D)) e, entre eles,
+        o de menor custo total. Destinos com mais de um próximo pulo (ECMP) já são protegidos pelos demais caminhos
+
+        Os menores caminhos a partir dos vizinhos são mantidos entre os cálculos, e apenas os afetados pelos roteadores alterados são
+        recalculados (ver arvore_afetada): sem isso, cada cálculo do SPF (mesmo incremental) seria seguido de um Dijkstra completo por vizinho
+
+        Args:
+            tabela (dict): Cópia da tabela da LSDB usada no cálculo
+            distancias (dict): Distância do roteador atual até cada roteador
+            alterados (set): Roteadores cujas entradas foram alteradas (ou removidas) desde o último cálculo
+        """
+        infinito = float('inf')
+        entrada = tabela.get(self._router_id)
+        custos = entrada["links"] if (entrada is not None) else {}
+        # Menores caminhos a partir de cada vizinho alcançável (listas indexadas pelos índices da topologia em arrays)
+        topologia = self._topologia
+        quantidade = len(topologia)
+        alteracoes = self.alteracoes_enlaces(alterados, tabela) if (self._tabela_alternativos is not None) else None
+        anteriores = self._distancias_vizinhos if (alteracoes is not None) else {}
+        distancias_vizinhos = {}
+        for vizinho in custos:
+            if (vizinho not in tabela or distancias.get(vizinho, infinito) == infinito):
+                continue
+            distancias_vizinho = anteriores.get(vizinho)
+            if (distancias_vizinho is None or self.arvore_afetada(distancias_vizinho, *alteracoes)):
+                distancias_vizinho = topologia.menores_caminhos(vizinho)[0]
+            elif (len(distancias_vizinho) < quantidade):
+                # Roteadores que passaram a ser citados nos enlaces, ainda sem entrada na LSDB, continuam inalcançáveis
+                distancias_vizinho.extend([infinito] * (quantidade - len(distancias_vizinho)))
+            distancias_vizinhos[vizinho] = distancias_vizinho
+        self._distancias_vizinhos = distancias_vizinhos
+        self._tabela_alternativos = tabela
+        proprio = topologia.indice(self._router_id)
+
+        alternativos = {}
+        alcancaveis = 0
+        protegidos = 0
+        for destino, pulos in self._roteamento.items():
+            distancia = distancias.get(destino, infinito)
+            if (not pulos or distancia == infinito):
+                continue
+            alcancaveis += 1
+            if (len(pulos) > 1):
+                protegidos += 1
+                continue
+
+            principal = pulos[0]
+            indice = topologia.indice(destino)
+            indice_principal = topologia.indice(principal)
+            distancias_principal = distancias_vizinhos.get(principal)
+            principal_destino = distancias_principal[indice] if (distancias_principal is not None) else infinito
+            melhor = None
+            for vizinho, distancias_vizinho in distancias_vizinhos.items():
+                distancia_vizinho = distancias_vizinho[indice]
+                if (vizinho == principal or distancia_vizinho >= distancias_vizinho[proprio] + distancia):
+                    continue
+                # Protege contra a queda do roteador do próximo pulo (não apenas do enlace até ele)
+                protege_no = (destino != principal and
+                              distancia_vizinho < distancias_vizinho[indice_principal] + principal_destino)
+                candidato = (not protege_no, custos[vizinho] + distancia_vizinho, vizinho)
+                if (melhor is None or candidato < melhor):
+                    melhor = candidato
+            if (melhor is not None):
+                alternativos[destino] = melhor[2]
+                protegidos += 1
+
+        self._alternativos = alternativos
+        self._protegidos = (protegidos, alcancaveis)
+        if (alcancaveis):
+            print2(f"[LFA] {protegidos} de {alcancaveis} destinos ({100 * protegidos / alcancaveis:.0f}%) com próximo pulo alternativo", NIVEL_DEBUG)
+
+    def reparar_rotas(self, vizinho: str) -> tuple[int, int]:
+        """
+        Reparo local após a queda de um vizinho: as rotas que o usavam como próximo pulo passam imediatamente para os demais caminhos
+        de mesmo custo ou para o LFA pré-calculado, antes do novo cálculo do SPF (que depois revisa todas as rotas)
+
+        Deve ser chamado antes da remoção da entrada do vizinho da LSDB (os endereços dele também são reparados)
+
+        Args:
+            vizinho (str): Identificador único do vizinho que caiu
+
+        Returns:
+            tuple[int, int]: Quantidade de destinos que usavam o vizinho como próximo pulo e quantos deles foram reparados
+        """
+        tabela = self.versao().tabela
+
+        afetados = 0
+        reparados = 0
+        with self._trava_fib:
+            # Os prefixos resumidos seguem pelos alternativos dos seus ABRs
+            destinos = [(destino, pulos, destino, tabela[destino]["addresses"]) for destino, pulos in list(self._roteamento.items()) if destino in tabela]
+            destinos += [(prefixo, pulos, anunciante, [prefixo]) for prefixo, (_, pulos, anunciante) in self._rotas_resumidas.items()]
+            for destino, pulos, alvo, enderecos in destinos:
+                if (vizinho not in pulos):
+                    continue
+                afetados += 1
+                restantes = tuple(pulo for pulo in pulos if pulo != vizinho and pulo in self._neighbors_ip)
+                if (not restantes):
+                    alternativo = self._alternativos.get(alvo)
+                    if (alternativo is None or alternativo == vizinho or alternativo not in self._neighbors_ip):
+                        continue
+                    restantes = (alternativo,)
+                self._fib.definir(self.chave_fib(destino), enderecos, tuple(self._neighbors_ip[pulo] for pulo in restantes))
+                reparados += 1
+            self._fib.aplicar()
+
+        if (afetados):
+            print2(f"[LFA] {reparados} de {afetados} destinos via {vizinho} reparados antes do recálculo das rotas")
+        return afetados, reparados
+
+    def medir_failover(self):
+        """
+        Registra, para as quedas pendentes, o tempo entre o último HELLO do vizinho, a detecção da queda e a instalação das novas rotas
+        """
+        with self._trava:
+            quedas = self._quedas_pendentes
+            self._quedas_pendentes = []
+
+        agora = relogio_monotonico()
+        for router_id, ultimo_hello, deteccao, (afetados, reparados) in quedas:
+            self._tempos_failover.append({
+                "roteador": router_id,
+                "deteccao": deteccao - ultimo_hello,
+                "rotas": agora - deteccao,
+                "failover": agora - ultimo_hello,
+                # Destinos que usavam o vizinho e quantos deles já seguiam por um alternativo desde a detecção
+                "destinos_afetados": afetados,
+                "destinos_reparados": reparados,
+            })
+            print2(
+                f"[QUEDA] Rotas recalculadas {agora - deteccao:.3f} s após a detecção da queda de {router_id} ({agora - ultimo_hello:.3f} s após o último HELLO)")
+
+
+class SnapshotLSDB:
+    """
+    Grava periodicamente a LSDB e as rotas instaladas em disco, permitindo que o roteador reinicie sem reaprender toda a topologia
+
+    Cada gravação é atômica: o snapshot é escrito em um arquivo temporário no mesmo diretório, sincronizado com o disco (fsync) e renomeado
+    sobre o anterior, de forma que uma queda durante a gravação mantém o snapshot anterior intacto
+    """
+
+    __slots__ = ["_caminho", "_lsdb", "_intervalo", "_loop", "_estado_salvo", "_gravacoes", "_iniciado"]
+
+    def __init__(self, caminho: str, lsdb: LSDB, intervalo: float = 30):
+        """
+        Inicializa um novo gravador de snapshots
+
+        Args:
+            caminho (str): Arquivo onde o snapshot é gravado
+            lsdb (LSDB): LSDB gravada, junto das rotas instaladas pela sua tabela de rotas
+            intervalo (float, opcional): Intervalo (em segundos) entre as gravações. Sem alterações na LSDB ou nas rotas, a gravação é ignorada (Padrão: 30)
+        """
+        self._caminho = caminho
+        self._lsdb = lsdb
+        self._intervalo = intervalo
+        self._loop = None
+        # Contadores de alterações da LSDB e de escritas de rotas na última gravação
+        self._estado_salvo = None
+        self._gravacoes = 0
+        self._iniciado = False
+
+    @property
+    def caminho(self) -> str:
+        return self._caminho
+
+    @property
+    def gravacoes(self) -> int:
+        return self._gravacoes
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+
+    def codificar(self) -> bytes:
+        """
+        Codifica a LSDB e as rotas instaladas no formato do snapshot
+        """
+        # A versão publicada é percorrida sem travar a LSDB durante a codificação
+        versao = self._lsdb.versao()
+        partes = [b""]
+        quantidade = 0
+        for router_id, entrada in versao.tabela.items():
+            if (entrada["sequence_number"] < 0):
+                continue
+            dados = codificar_pacote(self._lsdb.montar_pacote(router_id, entrada), FORMATO_BINARIO)
+            partes.append(BINARIO_TAMANHO.pack(len(dados)))
+            partes.append(dados)
+            quantidade += 1
+        partes[0] = SNAPSHOT_CABECALHO.pack(SNAPSHOT_IDENTIFICADOR, SNAPSHOT_VERSAO, relogio(), quantidade)
+
+        rotas = "\0".join(
+            f"{prefixo}\0{destino}\0{' '.join(gateways)}" for prefixo, (destino, gateways) in self._lsdb.fib.instaladas.items()).encode("utf-8")
+        partes.append(SNAPSHOT_ROTAS.pack(len(rotas)))
+        partes.append(rotas)
+        return b"".join(partes)
+
+    @staticmethod
+    def decodificar(dados: bytes) -> tuple[float, list[dict], dict[str, tuple[str, tuple[str, ...]]]]:
+        """
+        Decodifica um snapshot
+
+        Args:
+            dados (bytes): Conteúdo do arquivo do snapshot
+
+        Returns:
+            tuple[float, list[dict], dict[str, tuple[str, tuple[str, ...]]]]: Instante da gravação, pacotes LSA e rotas instaladas
+            (indexadas pelo prefixo, com a tupla (roteador de destino, IPs dos gateways))
+        """
+        identificador, versao, instante, quantidade = SNAPSHOT_CABECALHO.unpack_from(dados, 0)
+        if (identificador != SNAPSHOT_IDENTIFICADOR or versao != SNAPSHOT_VERSAO):
+            raise ValueError("Arquivo não é um snapshot da LSDB em uma versão suportada")
+
+        visao = memoryview(dados)
+        posicao = SNAPSHOT_CABECALHO.size
+        pacotes = []
+        for _ in range(quantidade):
+            tamanho, = BINARIO_TAMANHO.unpack_from(dados, posicao)
+            posicao += BINARIO_TAMANHO.size
+            pacotes.append(decodificar_pacote(visao[posicao:posicao + tamanho]))
+            posicao += tamanho
+
+        tamanho, = SNAPSHOT_ROTAS.unpack_from(dados, posicao)
+        posicao += SNAPSHOT_ROTAS.size
+        textos = str(visao[posicao:posicao + tamanho], "utf-8").split("\0") if (tamanho) else []
+        if (posicao + tamanho != len(dados) or len(textos) % 3):
+            raise ValueError("Snapshot da LSDB incompleto")
+        rotas = {textos[i]: (textos[i + 1], tuple(textos[i + 2].split(" "))) for i in range(0, len(textos), 3)}
+        return instante, pacotes, rotas
+
+    def salvar(self) -> bool:
+        """
+        Grava o snapshot de forma atômica, caso a LSDB ou as rotas tenham mudado desde a última gravação
+
+        Returns:
+            bool: Indica se o snapshot foi gravado
+        """
+        estado = (self._lsdb.geracao, self._lsdb.fib.escritas)
+        if (estado == self._estado_salvo):
+            return False
+
+        temporario = f"{self._caminho}.tmp"
+        try:
+            dados = self.codificar()
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(dados)
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self._caminho)
+            # Sincroniza também o diretório, tornando a renomeação durável
+            diretorio = os.open(os.path.dirname(os.path.abspath(self._caminho)), os.O_RDONLY)
+            try:
+                os.fsync(diretorio)
+            finally:
+                os.close(diretorio)
+        # Erros de codificação (como um custo fora da faixa do formato binário) também não interrompem as gravações periódicas
+        except (OSError, ValueError, struct.error) as e:
+            print2(f"[ERRO] Falha ao gravar o snapshot da LSDB em {self._caminho}: {e}", NIVEL_ERRO)
+            return False
+
+        self._estado_salvo = estado
+        self._gravacoes += 1
+        return True
+
+    def carregar(self) -> tuple[float, list[dict], dict[str, tuple[str, tuple[str, ...]]]] | None:
+        """
+        Lê o último snapshot gravado
+
+        Returns:
+            tuple[float, list[dict], dict[str, tuple[str, tuple[str, ...]]]] | None: Instante da gravação, pacotes LSA e rotas instaladas
+            (None caso não exista snapshot ou ele seja inválido)
+        """
+        try:
+            with open(self._caminho, "rb") as arquivo:
+                dados = arquivo.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            print2(f"[ERRO] Falha ao ler o snapshot da LSDB em {self._caminho}: {e}", NIVEL_ERRO)
+            return None
+
+        try:
+            return self.decodificar(dados)
+        except (ValueError, struct.error, UnicodeDecodeError) as e:
+            print2(f"[ERRO] Snapshot da LSDB inválido em {self._caminho}: {e}", NIVEL_ERRO)
+            return None
+
+    def salvar_periodicamente(self):
+        """
+        Grava o snapshot a cada intervalo
+        """
+        while True:
+            time.sleep(self._intervalo)
+            self.salvar()
+
+    def iniciar(self):
+        """
+        Inicia as gravações periódicas (thread própria ou temporizador no loop de eventos), caso não tenham sido iniciadas
+        """
+        if (self._iniciado):
+            return
+        self._iniciado = True
+        if (self._loop is not None):
+            self._loop.call_later(self._intervalo, TemporizadorPeriodico(self._loop, self._intervalo, self.salvar).iniciar)
+            return
+
+        thread_snapshot = threading.Thread(target=self.salvar_periodicamente, daemon=True)
+        thread_snapshot.start()
+
+
+# Estruturas da libc usadas pelo recvmmsg/sendmmsg (Linux), permitindo receber e enviar vários datagramas em uma única chamada de sistema
+class IOVec(ctypes.Structure):
+    _fields_ = [("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t)]
+
+
+class MsgHdr(ctypes.Structure):
+    _fields_ = [
+        ("msg_name", ctypes.c_void_p), ("msg_namelen", ctypes.c_uint32),
+        ("msg_iov", ctypes.POINTER(IOVec)), ("msg_iovlen", ctypes.c_size_t),
+        ("msg_control", ctypes.c_void_p), ("msg_controllen", ctypes.c_size_t),
+        ("msg_flags", ctypes.c_int)
+    ]
+
+
+class MMsgHdr(ctypes.Structure):
+    _fields_ = [("msg_hdr", MsgHdr), ("msg_len", ctypes.c_uint)]
+
+
+class SockAddrIn(ctypes.Structure):
+    _fields_ = [
+        ("sin_family", ctypes.c_ushort), ("sin_port", ctypes.c_uint16),
+        ("sin_addr", ctypes.c_uint32), ("sin_zero", ctypes.c_uint8 * 8)
+    ]
+
+
+try:
+    LIBC = ctypes.CDLL(None, use_errno=True)
+    LIBC.recvmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_void_p]
+    LIBC.recvmmsg.restype = ctypes.c_int
+    LIBC.sendmmsg.argtypes = [ctypes.c_int, ctypes.c_void_p, ctypes.c_uint, ctypes.c_int]
+    LIBC.sendmmsg.restype = ctypes.c_int
+except (OSError, AttributeError):
+    # Sistemas sem recvmmsg/sendmmsg usam a recepção/envio de um datagrama por chamada
+    LIBC = None
+
+# Retorna assim que ao menos uma mensagem for recebida (linux/socket.h)
+MSG_WAITFORONE = 0x10000
+
+# Campos das estruturas lidos e escritos diretamente na memória dos arrays (sem criar objetos do ctypes por mensagem)
+MMSG_TAMANHO = struct.Struct("@I")
+MMSG_FLAGS = struct.Struct("@i")
+MMSG_NOME = struct.Struct("@P")
+MMSG_IOV = struct.Struct("@PN")
+# Porta e endereço (em ordem de rede) de um sockaddr_in, a partir do campo sin_port
+SOCKADDR_PORTA_ENDERECO = struct.Struct("=HI")
+# Quantidade máxima de endereços convertidos mantidos por canal (emissores dos pacotes recebidos e destinos dos enviados)
+CACHE_ENDERECOS_LIMITE = 1024
+
+
+class CanalUDP:
+    """
+    Camada de entrada e saída em lote sobre um socket UDP
+
+    No Linux utiliza recvmmsg/sendmmsg, recebendo e enviando vários datagramas por chamada de sistema. Nos demais sistemas, a recepção esvazia o socket em modo não bloqueante após o primeiro datagrama
+    """
+
+    __slots__ = [
+        "_sock", "_tamanho_lote", "_BUFFER_SIZE", "_usar_mmsg", "_buffer", "_visao", "_buffer_c",
+        "_mensagens_recepcao", "_enderecos_recepcao", "_iovs_recepcao", "_visao_mensagens_recepcao", "_visao_enderecos_recepcao",
+        "_emissores", "_mensagens_envio", "_iovs_envio", "_buffer_envio", "_visao_envio", "_visao_mensagens_envio", "_visao_iovs_envio",
+        "_destinos", "_trava_envio", "_pacotes_recebidos", "_chamadas_recepcao", "_pacotes_enviados", "_chamadas_envio"
+    ]
+
+    def __init__(self, sock: socket.socket, tamanho_lote: int = 32, BUFFER_SIZE: int = 4096, usar_mmsg: bool = True):
+        """
+        Inicializa um novo canal
+
+        Args:
+            sock (socket.socket): Socket UDP (bloqueante) utilizado pelo canal
+            tamanho_lote (int, opcional): Quantidade máxima de datagramas por chamada de sistema (Padrão: 32)
+            BUFFER_SIZE (int, opcional): Tamanho máximo de cada datagrama recebido (Padrão: 4096)
+            usar_mmsg (bool, opcional): Utiliza recvmmsg/sendmmsg, quando disponíveis (Padrão: True)
+        """
+        self._sock = sock
+        self._tamanho_lote = tamanho_lote
+        self._BUFFER_SIZE = BUFFER_SIZE
+        self._usar_mmsg = usar_mmsg and (LIBC is not None)
+        # Um único buffer para todo o lote, dividido em espaços de BUFFER_SIZE bytes (criado apenas quando o canal recebe pacotes)
+        self._buffer = None
+        self._visao = None
+        self._trava_envio = threading.Lock()
+        self._mensagens_envio = None
+        # Endereços (IP, porta) dos emissores, indexados pela porta e pelo IP em ordem de rede (convertidos uma vez por emissor)
+        self._emissores = {}
+        # sockaddr_in de cada destino (IP, porta), apontado diretamente pelas mensagens enviadas
+        self._destinos = {}
+        self._pacotes_recebidos = 0
+        self._chamadas_recepcao = 0
+        self._pacotes_enviados = 0
+        self._chamadas_envio = 0
+
+    @property
+    def sock(self) -> socket.socket:
+        return self._sock
+
+    @property
+    def tamanho_lote(self) -> int:
+        return self._tamanho_lote
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de pacotes e de chamadas de sistema do canal
+
+        Returns:
+            dict: Pacotes recebidos/enviados, chamadas realizadas e a média de pacotes por chamada
+        """
+        return {
+            "pacotes_recebidos": self._pacotes_recebidos,
+            "chamadas_recepcao": self._chamadas_recepcao,
+            "pacotes_por_chamada_recepcao": self._pacotes_recebidos / max(self._chamadas_recepcao, 1),
+            "pacotes_enviados": self._pacotes_enviados,
+            "chamadas_envio": self._chamadas_envio,
+            "pacotes_por_chamada_envio": self._pacotes_enviados / max(self._chamadas_envio, 1),
+        }
+
+    def preparar_recepcao(self):
+        """
+        Cria o buffer de recepção e, no Linux, as estruturas do recvmmsg apontando para ele
+        """
+        self._buffer = bytearray(self._tamanho_lote * self._BUFFER_SIZE)
+        self._visao = memoryview(self._buffer)
+        if (not self._usar_mmsg):
+            return
+
+        self._buffer_c = (ctypes.c_char * len(self._buffer)).from_buffer(self._buffer)
+        inicio = ctypes.addressof(self._buffer_c)
+        self._mensagens_recepcao = (MMsgHdr * self._tamanho_lote)()
+        self._enderecos_recepcao = (SockAddrIn * self._tamanho_lote)()
+        self._iovs_recepcao = (IOVec * self._tamanho_lote)()
+        for indice in range(self._tamanho_lote):
+            self._iovs_recepcao[indice].iov_base = inicio + indice * self._BUFFER_SIZE
+            self._iovs_recepcao[indice].iov_len = self._BUFFER_SIZE
+            cabecalho = self._mensagens_recepcao[indice].msg_hdr
+            cabecalho.msg_name = ctypes.addressof(self._enderecos_recepcao[indice])
+            # O kernel escreve o tamanho do endereço (sempre um sockaddr_in) e as flags de cada mensagem recebida: não são redefinidos a cada lote
+            cabecalho.msg_namelen = ctypes.sizeof(SockAddrIn)
+            cabecalho.msg_iov = ctypes.pointer(self._iovs_recepcao[indice])
+            cabecalho.msg_iovlen = 1
+        self._visao_mensagens_recepcao = memoryview(self._mensagens_recepcao).cast("B")
+        self._visao_enderecos_recepcao = memoryview(self._enderecos_recepcao).cast("B")
+
+    def preparar_envio(self):
+        """
+        Cria o buffer de envio e as estruturas do sendmmsg, com o espaço de cada mensagem no buffer
+        """
+        self._buffer_envio = (ctypes.c_char * (self._tamanho_lote * self._BUFFER_SIZE))()
+        self._visao_envio = memoryview(self._buffer_envio).cast("B")
+        self._mensagens_envio = (MMsgHdr * self._tamanho_lote)()
+        self._iovs_envio = (IOVec * self._tamanho_lote)()
+        for indice in range(self._tamanho_lote):
+            cabecalho = self._mensagens_envio[indice].msg_hdr
+            cabecalho.msg_namelen = ctypes.sizeof(SockAddrIn)
+            cabecalho.msg_iov = ctypes.pointer(self._iovs_envio[indice])
+            cabecalho.msg_iovlen = 1
+        self._visao_mensagens_envio = memoryview(self._mensagens_envio).cast("B")
+        self._visao_iovs_envio = memoryview(self._iovs_envio).cast("B")
+
+    def preparar_destino(self, endereco: tuple[str, int]) -> SockAddrIn:
+        """
+        Cria e mantém o sockaddr_in de um destino
+
+        Os destinos mantidos são descartados apenas entre as chamadas do sendmmsg (ver enviar_lote): os endereços já colocados no msg_name
+        das mensagens de uma chamada devem continuar válidos até o envio
+        """
+        ip, porta = endereco
+        (ip_empacotado,) = struct.unpack("=I", socket.inet_aton(ip))
+        destino = self._destinos[endereco] = SockAddrIn(socket.AF_INET, socket.htons(porta), ip_empacotado)
+        return destino
+
+    def receber_lote(self) -> list[tuple[memoryview, tuple[str, int], bool]]:
+        """
+        Aguarda ao menos um datagrama e retorna todos os que já estiverem disponíveis (até o tamanho do lote)
+
+        Os dados apontam para o buffer do canal e são válidos apenas até a próxima chamada
+
+        Returns:
+            list[tuple[memoryview, tuple[str, int], bool]]: Lista de tuplas (dados, endereço do emissor, datagrama truncado)
+        """
+        if (self._buffer is None):
+            self.preparar_recepcao()
+
+        if (not self._usar_mmsg):
+            return self.receber_lote_simples()
+
+        quantidade = LIBC.recvmmsg(self._sock.fileno(), ctypes.addressof(self._mensagens_recepcao),
+                                   self._tamanho_lote, MSG_WAITFORONE, None)
+        self._chamadas_recepcao += 1
+        if (quantidade < 0):
+            codigo = ctypes.get_errno()
+            if (codigo == errno.EINTR):
+                return []
+            raise OSError(codigo, os.strerror(codigo))
+
+        self._pacotes_recebidos += quantidade
+        # Os campos são lidos diretamente da memória dos arrays: o acesso pelas estruturas do ctypes criaria vários objetos por mensagem
+        lote = []
+        visao = self._visao
+        mensagens = self._visao_mensagens_recepcao
+        enderecos = self._visao_enderecos_recepcao
+        emissores = self._emissores
+        tamanho_mensagem = ctypes.sizeof(MMsgHdr)
+        tamanho_endereco = ctypes.sizeof(SockAddrIn)
+        deslocamento_tamanho = MMsgHdr.msg_len.offset
+        deslocamento_flags = MMsgHdr.msg_hdr.offset + MsgHdr.msg_flags.offset
+        for indice in range(quantidade):
+            (tamanho,) = MMSG_TAMANHO.unpack_from(mensagens, indice * tamanho_mensagem + deslocamento_tamanho)
+            (flags,) = MMSG_FLAGS.unpack_from(mensagens, indice * tamanho_mensagem + deslocamento_flags)
+            chave = SOCKADDR_PORTA_ENDERECO.unpack_from(enderecos, indice * tamanho_endereco + SockAddrIn.sin_port.offset)
+            endereco = emissores.get(chave)
+            if (endereco is None):
+                if (len(emissores) >= CACHE_ENDERECOS_LIMITE):
+                    emissores.clear()
+                endereco = emissores[chave] = (socket.inet_ntoa(struct.pack("=I", chave[1])), socket.ntohs(chave[0]))
+            inicio = indice * self._BUFFER_SIZE
+            lote.append((visao[inicio:inicio + tamanho], endereco, bool(flags & socket.MSG_TRUNC)))
+        return lote
+
+    def receber_lote_simples(self) -> list[tuple[memoryview, tuple[str, int], bool]]:
+        """
+        Recepção em lote sem recvmmsg: aguarda o primeiro datagrama e esvazia o socket sem bloquear
+        """
+        lote = []
+        for indice in range(self._tamanho_lote):
+            inicio = indice * self._BUFFER_SIZE
+            espaco = self._visao[inicio:inicio + self._BUFFER_SIZE]
+            try:
+                # Apenas o primeiro datagrama do lote bloqueia a thread
+                tamanho, _, flags, endereco = self._sock.recvmsg_into(
+                    [espaco], 0, 0 if (indice == 0) else socket.MSG_DONTWAIT)
+            except BlockingIOError:
+                self._chamadas_recepcao += 1
+                break
+            self._chamadas_recepcao += 1
+            self._pacotes_recebidos += 1
+            lote.append((espaco[:tamanho], endereco, bool(flags & socket.MSG_TRUNC)))
+        return lote
+
+    def enviar(self, dados: bytes, endereco: tuple[str, int]):
+        """
+        Envia um único datagrama
+
+        Args:
+            dados (bytes): Dados do datagrama
+            endereco (tuple[str, int]): Tupla (IP, porta) de destino
+        """
+        falhas = self.enviar_lote([(dados, endereco)])
+        if (falhas):
+            raise falhas[0]
+
+    def enviar_lote(self, mensagens: list[tuple[bytes, tuple[str, int]]]) -> dict[int, OSError]:
+        """
+        Envia vários datagramas, agrupados em chamadas de até tamanho_lote mensagens
+
+        Args:
+            mensagens (list[tuple[bytes, tuple[str, int]]]): Lista de tuplas (dados, (IP, porta) de destino)
+
+        Returns:
+            dict[int, OSError]: Erros ocorridos, indexados pela posição da mensagem na lista
+        """
+        falhas = {}
+        if (not self._usar_mmsg):
+            for indice, (dados, endereco) in enumerate(mensagens):
+                try:
+                    self._sock.sendto(dados, endereco)
+                    self._pacotes_enviados += 1
+                except OSError as e:
+                    falhas[indice] = e
+                self._chamadas_envio += 1
+            return falhas
+
+        with self._trava_envio:
+            if (self._mensagens_envio is None):
+                self.preparar_envio()
+
+            visao_envio = self._visao_envio
+            mensagens_envio = self._visao_mensagens_envio
+            iovs_envio = self._visao_iovs_envio
+            inicio_buffer = ctypes.addressof(self._buffer_envio)
+            tamanho_mensagem = ctypes.sizeof(MMsgHdr)
+            tamanho_iov = ctypes.sizeof(IOVec)
+            deslocamento_nome = MMsgHdr.msg_hdr.offset + MsgHdr.msg_name.offset
+            for inicio in range(0, len(mensagens), self._tamanho_lote):
+                # Descarta os destinos mantidos ao atingir o limite, antes de preparar as mensagens da chamada
+                if (len(self._destinos) >= CACHE_ENDERECOS_LIMITE):
+                    self._destinos.clear()
+                # Mantém vivos até o fim do envio os destinos e as cópias dos dados maiores que o espaço de cada mensagem no buffer de envio
+                referencias = []
+                # Posições (na lista original) das mensagens preparadas para esta chamada
+                posicoes = []
+                for posicao in range(inicio, min(inicio + self._tamanho_lote, len(mensagens))):
+                    dados, endereco = mensagens[posicao]
+                    destino = self._destinos.get(endereco)
+                    if (destino is None):
+                        try:
+                            destino = self.preparar_destino(endereco)
+                        except OSError as e:
+                            falhas[posicao] = e
+                            continue
+                    referencias.append(destino)
+                    indice = len(posicoes)
+                    posicoes.append(posicao)
+                    tamanho = len(dados)
+                    if (tamanho <= self._BUFFER_SIZE):
+                        # Copia os dados para o espaço da mensagem no buffer de envio, sem criar objetos do ctypes por mensagem
+                        base = indice * self._BUFFER_SIZE
+                        visao_envio[base:base + tamanho] = dados
+                        base += inicio_buffer
+                    else:
+                        copia = (ctypes.c_char * tamanho).from_buffer_copy(dados)
+                        referencias.append(copia)
+                        base = ctypes.addressof(copia)
+                    MMSG_IOV.pack_into(iovs_envio, indice * tamanho_iov, base, tamanho)
+                    MMSG_NOME.pack_into(mensagens_envio, indice * tamanho_mensagem + deslocamento_nome, ctypes.addressof(destino))
+
+                enviados = 0
+                while (enviados < len(posicoes)):
+                    quantidade = LIBC.sendmmsg(
+                        self._sock.fileno(),
+                        ctypes.addressof(self._mensagens_envio) + enviados * tamanho_mensagem,
+                        len(posicoes) - enviados, 0)
+                    self._chamadas_envio += 1
+                    if (quantidade < 0):
+                        # A primeira mensagem restante falhou: registra o erro e segue com as demais
+                        codigo = ctypes.get_errno()
+                        falhas[posicoes[enviados]] = OSError(codigo, os.strerror(codigo))
+                        enviados += 1
+                    else:
+                        enviados += quantidade
+                        self._pacotes_enviados += quantidade
+                del referencias
+
+        return falhas
+
+
+class CanalTransporte:
+    """
+    Canal de envio sobre um transporte UDP do asyncio, com a mesma interface de envio do CanalUDP
+
+    Os erros de envio são reportados pelo transporte ao protocolo (error_received)
+    """
+
+    __slots__ = ["_transporte", "_pacotes_enviados", "_chamadas_envio"]
+
+    def __init__(self, transporte: asyncio.DatagramTransport):
+        """
+        Inicializa um novo canal
+
+        Args:
+            transporte (asyncio.DatagramTransport): Transporte UDP criado pelo loop de eventos
+        """
+        self._transporte = transporte
+        self._pacotes_enviados = 0
+        self._chamadas_envio = 0
+
+    @property
+    def sock(self) -> socket.socket:
+        return self._transporte.get_extra_info("socket")
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de pacotes e de chamadas de envio do canal
+        """
+        return {
+            "pacotes_enviados": self._pacotes_enviados,
+            "chamadas_envio": self._chamadas_envio,
+            "pacotes_por_chamada_envio": self._pacotes_enviados / max(self._chamadas_envio, 1),
+        }
+
+    def enviar(self, dados: bytes, endereco: tuple[str, int]):
+        """
+        Envia um único datagrama
+        """
+        self.enviar_lote([(dados, endereco)])
+
+    def enviar_lote(self, mensagens: list[tuple[bytes, tuple[str, int]]]) -> dict[int, OSError]:
+        """
+        Envia vários datagramas pelo transporte
+
+        Args:
+            mensagens (list[tuple[bytes, tuple[str, int]]]): Lista de tuplas (dados, (IP, porta) de destino)
+
+        Returns:
+            dict[int, OSError]: Erros ocorridos, indexados pela posição da mensagem na lista
+        """
+        falhas = {}
+        for indice, (dados, endereco) in enumerate(mensagens):
+            try:
+                self._transporte.sendto(dados, endereco)
+                self._pacotes_enviados += 1
+            except OSError as e:
+                falhas[indice] = e
+            self._chamadas_envio += 1
+        return falhas
+
+
+class ProtocoloRoteador(asyncio.DatagramProtocol):
+    """
+    Protocolo UDP do asyncio que entrega os pacotes recebidos ao roteador, no próprio loop de eventos
+    """
+
+    def __init__(self, roteador: "Roteador"):
+        """
+        Inicializa o protocolo
+
+        Args:
+            roteador (Roteador): Roteador que processa os pacotes recebidos
+        """
+        self._roteador = roteador
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]):
+        self._roteador.processar_pacote(memoryview(data), addr, len(data) > self._roteador.BUFFER_SIZE)
+
+    def error_received(self, exc: OSError):
+        print2(f"Erro no socket do roteador: {exc}", NIVEL_ERRO)
+
+
+class HelloSender:
+    """
+    Classe responsável por criar e enviar pacotes HELLO periodicamente para vizinhos em uma rede
+    """
+
+    __slots__ = [
+        "_router_id", "_interfaces", "_neighbors", "_interval", "_PORTA", "_neighbors_formats", "_formatos", "_canal", "_loop",
+        "_dead_interval", "_intervalos", "_hellos_enviados"
+    ]
+
+    def __init__(self, router_id: str, interfaces: list[dict[str, str]], neighbors: dict[str, str], interval: float = 10, PORTA: int = 5000, neighbors_formats: dict[str, list[str]] | None = None, formatos: list[str] = FORMATOS_SUPORTADOS, canal: CanalUDP | None = None, dead_interval: float | None = None, intervalos: dict[str, tuple[float, float]] | None = None):
+        """
+        Inicializa um novo emissor
+
+        Args:
+            router_id (str): Identificador único do roteador
+            interfaces (list[dict[str, str]]): Lista de dicionários representando as interfaces de rede. Cada dicionário deve conter:
+                - "address": IP da interface
+                - "broadcast": IP de broadcast (se aplicável) 
+            neighbors (dict[str, str]): Dicionário com os roteadores vizinhos conhecidos. A chave é o ID do vizinho e o valor é seu IP
+            interval (int, opcional): Tempo de intervalo para o envio periódico dos pacotes HELLO
+            PORTA (int, opcional): Porta UDP onde o roteador irá escutar os pacotes (Padrão: 5000)
+            neighbors_formats (dict[str, list[str]] | None, opcional): Formatos de pacote suportados por cada vizinho, anunciados em seus HELLOs
+            formatos (list[str], opcional): Formatos de pacote suportados pelo roteador, em ordem de preferência (Padrão: FORMATOS_SUPORTADOS)
+            canal (CanalUDP | None, opcional): Canal de envio compartilhado pelo roteador (Padrão: um canal próprio)
+            dead_interval (float | None, opcional): Intervalo sem HELLOs após o qual os vizinhos devem considerar o roteador inativo, anunciado nos HELLOs (Padrão: 3 intervalos)
+            intervalos (dict[str, tuple[float, float]] | None, opcional): Intervalos (HELLO, queda) específicos de cada interface, indexados pelo IP da interface
+        """
+        self._router_id = router_id
+        self._interfaces = interfaces
+        self._neighbors = neighbors
+        self._interval = interval
+        self._dead_interval = dead_interval if (dead_interval is not None) else 3 * interval
+        self._intervalos = intervalos if (intervalos is not None) else {}
+        self._PORTA = PORTA
+        self._neighbors_formats = neighbors_formats if (neighbors_formats is not None) else {}
+        self._formatos = formatos
+        self._canal = canal if (canal is not None) else CanalUDP(create_socket())
+        self.configurar_broadcast()
+        # Loop de eventos que executa os envios periódicos (None para usar uma thread própria)
+        self._loop = None
+        self._hellos_enviados = 0
+
+    @property
+    def canal(self) -> CanalUDP:
+        return self._canal
+
+    @canal.setter
+    def canal(self, canal: CanalUDP):
+        self._canal = canal
+        self.configurar_broadcast()
+
+    @property
+    def hellos_enviados(self) -> int:
+        return self._hellos_enviados
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+
+    def configurar_broadcast(self):
+        """
+        Configura o socket do canal para envio de broadcast (canais sem socket, como os do simulador, não precisam de configuração)
+        """
+        sock = self._canal.sock
+        if (sock is not None):
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+
+    def intervalos_interface(self, ip_address: str) -> tuple[float, float]:
+        """
+        Retorna os intervalos de HELLO e de queda (em segundos) usados em uma interface
+        """
+        return self._intervalos.get(ip_address, (self._interval, self._dead_interval))
+
+    def criar_pacote(self, ip_address: str) -> dict:
+        """
+        Cria um pacote HELLO
+
+        Args:
+            ip_address (str): Endereço IP da interface local
+
+        Returns: 
+            dict: Dicionário com os dados do pacote HELLO
+        """
+        return {
+            "type": "HELLO",
+            "router_id": self._router_id,
+            "timestamp": relogio(),
+            "ip_address": ip_address,
+            "known_neighbors": list(self._neighbors.keys()),
+            "formats": self._formatos,
+            "dead_interval": self.intervalos_interface(ip_address)[1],
+        }
+
+    def formato_broadcast(self) -> str:
+        """
+        Escolhe o formato dos HELLOs enviados por broadcast: o formato binário só é usado quando todos os vizinhos detectados o suportam
+
+        Returns:
+            str: Formato de codificação dos pacotes
+        """
+        formatos = {escolher_formato(self._formatos, self._neighbors_formats.get(neighbor_id, [FORMATO_JSON]))
+                    for neighbor_id in list(self._neighbors.keys())}
+        # Sem vizinhos detectados, usa o JSON, que pode ser lido por qualquer roteador
+        if (len(formatos) == 1):
+            return formatos.pop()
+        return FORMATO_JSON
+
+    def grupos_interfaces(self) -> dict[float, list[dict[str, str]]]:
+        """
+        Agrupa as interfaces com endereço de broadcast pelo seu intervalo de HELLO
+
+        Returns:
+            dict[float, list[dict[str, str]]]: Interfaces de cada intervalo de HELLO
+        """
+        grupos = {}
+        for interface_info in self._interfaces:
+            if ("broadcast" in interface_info):
+                intervalo = self.intervalos_interface(interface_info["address"])[0]
+                grupos.setdefault(intervalo, []).append(interface_info)
+        return grupos
+
+    def enviar_rodada(self, interfaces: list[dict[str, str]] | None = None):
+        """
+        Envia um pacote HELLO por broadcast em cada interface
+
+        Args:
+            interfaces (list[dict[str, str]] | None, opcional): Interfaces onde os pacotes são enviados (Padrão: todas as interfaces)
+        """
+        formato = self.formato_broadcast()
+        mensagens = []
+        # Apenas as interfaces que possuem endereço de broadcast
+        for interface_info in (self._interfaces if (interfaces is None) else interfaces):
+            if ("broadcast" not in interface_info):
+                continue
+            ip_address = interface_info["address"]
+            broadcast_ip = interface_info["broadcast"]
+
+            # Cria o pacote
+            pacote = self.criar_pacote(ip_address)
+            # Converte no formato necessário
+            message = codificar_pacote(pacote, formato)
+            mensagens.append((message, (broadcast_ip, self._PORTA)))
+
+        # Envia os pacotes de todas as interfaces de uma só vez
+        falhas = self._canal.enviar_lote(mensagens)
+        self._hellos_enviados += len(mensagens) - len(falhas)
+        for indice, (_, (broadcast_ip, _)) in enumerate(mensagens):
+            if (indice in falhas):
+                print2(
+                    f"Erro ao enviar para {broadcast_ip}: {falhas[indice]}", NIVEL_ERRO)
+            elif (registrar_pacote()):
+                print2(
+                    f"Pacote HELLO enviado para {broadcast_ip} [broadcast]", NIVEL_DEBUG)
+
+    def enviar_broadcast(self, intervalo: float, interfaces: list[dict[str, str]]):
+        """
+        Inicia o envio periódico de pacotes HELLO por meio do broadcast
+
+        Args:
+            intervalo (float): Intervalo (em segundos) entre os envios
+            interfaces (list[dict[str, str]]): Interfaces onde os pacotes são enviados
+        """
+        while True:
+            self.enviar_rodada(interfaces)
+            # Timer para envio de um novo pacote HELLO (com variação, evitando que o prazo de queda no vizinho coincida com o próximo HELLO)
+            time.sleep(intervalo_com_variacao(intervalo, VARIACAO_ENVIOS))
+
+    def iniciar(self):
+        """
+        Inicia o funcionamento do emissor de HELLO:
+        - Inicializa uma thread (ou um temporizador no loop de eventos) para cada intervalo de HELLO, responsável por enviar os pacotes por broadcast nas interfaces com aquele intervalo
+        """
+        for intervalo, interfaces in self.grupos_interfaces().items():
+            if (self._loop is not None):
+                TemporizadorPeriodico(self._loop, intervalo, lambda interfaces=interfaces: self.enviar_rodada(interfaces), VARIACAO_ENVIOS).iniciar()
+                continue
+
+            thread_emissor = threading.Thread(
+                target=self.enviar_broadcast, args=(intervalo, interfaces), daemon=True)
+            thread_emissor.start()
+
+class LSASender:
+    """
+    Classe responsável por criar, enviar e encaminhar pacotes LSA (Link State Advertisement) na rede
+
+    Origina um novo LSA sempre que os vizinhos ou as interfaces mudam (respeitando um intervalo mínimo entre originações, como o MinLSInterval do OSPF),
+    reenviando-o apenas a cada intervalo de atualização (LSRefreshTime) enquanto nada muda, e encaminha os pacotes recebidos para outros vizinhos
+
+    A inundação é confiável: cada LSA enviado a um vizinho fica em sua lista de retransmissão até ser confirmado por um LSACK (ou implicitamente,
+    quando o vizinho envia a mesma instância), sendo reenviado a cada intervalo de retransmissão. As confirmações são atrasadas e agrupadas por vizinho
+
+    Ao reconhecer um vizinho, as LSDBs são sincronizadas em uma ida e volta: cada lado descreve sua LSDB em pacotes DBD (pares origem/sequência),
+    o outro solicita em um LSR apenas os LSAs ausentes ou desatualizados, e os LSAs solicitados seguem pela inundação confiável
     """
 
-    __slots__ = [
-        "_tabela", "_router_id", "_roteamento", "_neighbors_ip", "_tempo_inicio", "_quantidade_roteadores"
-    ]
+    __slots__ = [
+        "_router_id", "_neighbors_ip", "_neighbors_cost", "_interval", "_PORTA", "_sequence_number", "_iniciado", "_lsdb", "_interfaces",
+        "_neighbors_formats", "_formatos", "_canal", "_loop", "_lsas_enviados", "_intervalo_minimo", "_agendador", "_lsas_originados",
+        "_intervalo_retransmissao", "_atraso_ack", "_retransmissoes", "_retransmissor", "_acks_pendentes", "_agendador_acks", "_trava",
+        "_lsas_retransmitidos", "_acks_enviados", "_descricoes", "_sincronizador", "_lsas_solicitados", "_descricoes_recebidas",
+        "_solicitacoes", "_originacao_suspensa", "_pacotes_controle", "_resumos"
+    ]
+
+    def __init__(self, router_id: str, neighbors_ip: dict[str, str], neighbors_cost: dict[str, int], interfaces: list[dict[str, str]], lsdb: LSDB, interval: float = 1800, PORTA: int = 5000, neighbors_formats: dict[str, list[str]] | None = None, formatos: list[str] = FORMATOS_SUPORTADOS, canal: CanalUDP | None = None, intervalo_minimo: float = 1, intervalo_retransmissao: float = 1, atraso_ack: float = 0.1):
+        """
+        Inicializa um novo emissor
+
+        Args:
+            router_id (str): Identificador único do roteador
+            neighbors_ip (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é seu IP
+            neighbors_cost (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é o custo para alcançá-lo
+            interfaces (list[dict[str, str]]): Lista de dicionários representando as interfaces de rede. Cada dicionário deve conter:
+                - "address": IP da interface
+                - "broadcast": IP de broadcast (se aplicável) 
+            interval (float, opcional): Intervalo (em segundos) de atualização do LSA quando nada muda, evitando que ele envelheça nas LSDBs dos outros roteadores (Padrão: 1800)
+            PORTA (int, opcional): Porta UDP onde o roteador irá escutar os pacotes (Padrão: 5000)
+            neighbors_formats (dict[str, list[str]] | None, opcional): Formatos de pacote suportados por cada vizinho, anunciados em seus HELLOs
+            formatos (list[str], opcional): Formatos de pacote suportados pelo roteador, em ordem de preferência (Padrão: FORMATOS_SUPORTADOS)
+            canal (CanalUDP | None, opcional): Canal de envio compartilhado pelo roteador, usado por todo o tempo de vida do emissor (Padrão: um canal próprio)
+            intervalo_minimo (float, opcional): Intervalo mínimo (em segundos) entre duas originações. Alterações dentro do intervalo são agrupadas em um único LSA (Padrão: 1)
+            intervalo_retransmissao (float, opcional): Tempo (em segundos) sem confirmação após o qual um LSA é reenviado ao vizinho, como o RxmtInterval do OSPF (Padrão: 1)
+            atraso_ack (float, opcional): Atraso (em segundos) das confirmações, agrupando em um único LSACK os LSAs recebidos de cada vizinho nesse intervalo (Padrão: 0.1)
+        """
+
+        self._router_id = router_id
+        self._neighbors_ip = neighbors_ip
+        self._neighbors_cost = neighbors_cost
+        self._interval = interval
+        self._PORTA = PORTA
+        self._sequence_number = 0
+        # Quantidade de pacotes LSA enviados (originados e encaminhados)
+        self._lsas_enviados = 0
+        self._iniciado = False
+        self._lsdb = lsdb
+        self._interfaces = interfaces
+        self._neighbors_formats = neighbors_formats if (neighbors_formats is not None) else {}
+        self._formatos = formatos
+        self._canal = canal if (canal is not None) else CanalUDP(create_socket())
+        # Loop de eventos que executa os envios periódicos (None para usar uma thread própria)
+        self._loop = None
+        # As originações usam o mesmo limitador dos cálculos do SPF, sem atraso inicial e com espera fixa igual ao intervalo mínimo
+        self._intervalo_minimo = intervalo_minimo
+        self._agendador = AgendadorSPF(self.enviar_rodada, 0, intervalo_minimo, intervalo_minimo)
+        self._lsas_originados = 0
+
+        # Listas de retransmissão: LSAs enviados a cada vizinho e ainda não confirmados, indexados pelo roteador de origem
+        self._intervalo_retransmissao = intervalo_retransmissao
+        self._retransmissoes = {}
+        # Prazos de retransmissão, indexados por (vizinho, roteador de origem)
+        self._retransmissor = DetectorQuedas(self.retransmitir)
+        # Confirmações aguardando o envio, indexadas por (IP do vizinho, formato): roteador de origem e número de sequência de cada LSA
+        self._atraso_ack = atraso_ack
+        self._acks_pendentes = {}
+        self._agendador_acks = AgendadorSPF(self.enviar_acks, atraso_ack, atraso_ack, atraso_ack)
+        # Protege as listas de retransmissão e as confirmações, acessadas pelas threads de recepção, de originação e de retransmissão
+        self._trava = threading.Lock()
+        self._lsas_retransmitidos = 0
+        self._acks_enviados = 0
+
+        # Partes das descrições (DBD) enviadas a cada vizinho e ainda não respondidas por um LSR, indexadas pelo número da parte
+        self._descricoes = {}
+        # Prazos de reenvio das descrições, indexados por (vizinho, parte)
+        self._sincronizador = DetectorQuedas(self.retransmitir_descricoes)
+        self._lsas_solicitados = 0
+        # Pacotes de sincronização (DBD e LSR) enviados
+        self._pacotes_controle = {"DBD": 0, "LSR": 0}
+        # Partes das descrições recebidas de cada vizinho (e a quantidade total de partes) e LSAs solicitados a ele ainda não recebidos
+        self._descricoes_recebidas = {}
+        self._solicitacoes = {}
+
+        # Originações adiadas durante um reinício gracioso, até a LSDB ser sincronizada com os vizinhos
+        self._originacao_suspensa = False
+
+        # Prefixos resumidos de outras áreas anunciados no LSA (apenas em um ABR) e o custo até cada um
+        self._resumos = {}
+
+    @property
+    def canal(self) -> CanalUDP:
+        return self._canal
+
+    @canal.setter
+    def canal(self, canal: CanalUDP):
+        self._canal = canal
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop | None):
+        self._loop = loop
+        # As originações, as retransmissões, as descrições e as confirmações passam a ser agendadas no loop
+        self._agendador = AgendadorSPFLoop(self.enviar_rodada, loop, 0, self._intervalo_minimo, self._intervalo_minimo)
+        self._retransmissor = DetectorQuedasLoop(self.retransmitir, loop)
+        self._sincronizador = DetectorQuedasLoop(self.retransmitir_descricoes, loop)
+        self._agendador_acks = AgendadorSPFLoop(self.enviar_acks, loop, self._atraso_ack, self._atraso_ack, self._atraso_ack)
+
+    @property
+    def lsas_enviados(self) -> int:
+        return self._lsas_enviados
+
+    @property
+    def lsas_originados(self) -> int:
+        return self._lsas_originados
+
+    @property
+    def lsas_retransmitidos(self) -> int:
+        return self._lsas_retransmitidos
+
+    @property
+    def acks_enviados(self) -> int:
+        return self._acks_enviados
+
+    @property
+    def lsas_solicitados(self) -> int:
+        return self._lsas_solicitados
+
+    @property
+    def pacotes_controle(self) -> dict[str, int]:
+        return self._pacotes_controle
+
+    @property
+    def acks_pendentes(self) -> int:
+        """
+        Quantidade de confirmações aguardando o envio em um LSACK
+        """
+        with self._trava:
+            return sum(len(acks) for acks in self._acks_pendentes.values())
+
+    @property
+    def pendentes(self) -> int:
+        """
+        Quantidade de LSAs aguardando confirmação em todas as listas de retransmissão
+        """
+        with self._trava:
+            return sum(len(lista) for lista in self._retransmissoes.values())
+
+    @property
+    def neighbors_ip(self):
+        return self._neighbors_ip
+
+    @property
+    def neighbors_cost(self):
+        return self._neighbors_cost
+
+    @property
+    def neighbors_formats(self):
+        return self._neighbors_formats
+
+    @property
+    def lsdb(self) -> LSDB:
+        return self._lsdb
+
+    @property
+    def resumos(self) -> dict[str, int]:
+        return self._resumos
+
+    def definir_resumos(self, resumos: dict[str, int]) -> bool:
+        """
+        Define os prefixos resumidos anunciados no LSA, originando um novo LSA caso tenham mudado
+
+        Args:
+            resumos (dict[str, int]): Custo até cada prefixo resumido (vazio deixa de anunciar resumos)
+
+        Returns:
+            bool: Indica se os resumos mudaram
+        """
+        if (resumos == self._resumos):
+            return False
+        self._resumos = resumos
+        self.originar()
+        return True
+
+    def codificar_para(self, pacote: dict, neighbor_id: str, mensagens: dict[str, bytes]) -> bytes:
+        """
+        Codifica o pacote no formato negociado com o vizinho, reaproveitando codificações já feitas para outros vizinhos
+
+        Args:
+            pacote (dict): Pacote LSA no formato de dicionário
+            neighbor_id (str): Identificador único do vizinho
+            mensagens (dict[str, bytes]): Codificações já realizadas do pacote, indexadas pelo formato
+
+        Returns:
+            bytes: Pacote codificado
+        """
+        formato = escolher_formato(
+            self._formatos, self._neighbors_formats.get(neighbor_id, [FORMATO_JSON]))
+        if (formato not in mensagens):
+            mensagens[formato] = codificar_pacote(pacote, formato)
+        return mensagens[formato]
+
+    def criar_pacote(self) -> dict:
+        """
+        Cria um pacote LSA
+
+        Returns: 
+            dict: Dicionário com os dados do pacote LSA
+        """
+
+        self._sequence_number += 1
+        pacote = {
+            "type": "LSA",
+            "router_id": self._router_id,
+            "timestamp": relogio(),
+            "addresses": [item["address"] for item in self._interfaces],
+            "sequence_number": self._sequence_number,
+            # Cópia atômica dos vizinhos, que podem mudar em outra thread durante a montagem do pacote
+            "links": dict(self._neighbors_cost)
+        }
+        if (self._resumos):
+            pacote["resumos"] = self._resumos
+        return pacote
+
+    def enviar_rodada(self):
+        """
+        Cria um novo pacote LSA e o envia para todos os seus vizinhos diretos
+        """
+        # Cria o pacote
+        pacote = self.criar_pacote()
+        self._lsas_originados += 1
+        # Atualiza a LSDB com os próprios dados
+        self._lsdb.atualizar(pacote)
+        # Envia o LSA para todos os seus vizinhos diretos
+        self.enviar_lote(pacote, list(self._neighbors_ip.items()), {}, "enviado", "enviar")
+
+    def originar(self):
+        """
+        Solicita a originação de um novo LSA (após uma alteração dos vizinhos ou das interfaces), respeitando o intervalo mínimo entre originações
+        Durante um reinício gracioso, a originação é adiada até a sincronização com os vizinhos
+        """
+        if (self._originacao_suspensa):
+            return
+        self._agendador.agendar()
+
+    def suspender_originacao(self):
+        """
+        Adia as originações (reinício gracioso): os vizinhos continuam usando o último LSA originado antes do reinício
+        """
+        self._originacao_suspensa = True
+
+    def retomar_originacao(self):
+        """
+        Volta a originar LSAs, originando imediatamente um novo LSA, que substitui o anunciado antes do reinício
+        """
+        self._originacao_suspensa = False
+        self.originar()
+
+    def retomar_sequencia(self, sequence_number: int):
+        """
+        Trata uma cópia de um LSA próprio recebida de outro roteador: caso seja mais recente que o último LSA originado (ex: anterior a um reinício),
+        a numeração continua a partir dela e um novo LSA é originado, substituindo a cópia antiga nas LSDBs dos outros roteadores
+
+        Args:
+            sequence_number (int): Número de sequência da cópia recebida
+        """
+        if (sequence_number >= self._sequence_number):
+            self._sequence_number = sequence_number
+            self.originar()
+
+    def vizinho_por_ip(self, ip: str) -> str | None:
+        """
+        Retorna o ID do vizinho reconhecido com o IP informado (None caso não seja um vizinho reconhecido)
+        """
+        for neighbor_id, neighbor_ip in list(self._neighbors_ip.items()):
+            if (neighbor_ip == ip):
+                return neighbor_id
+        return None
+
+    def confirmar(self, ip: str, formato: str, origem: str, sequence_number: int):
+        """
+        Agenda a confirmação de um LSA recebido, enviada em um único LSACK com as demais confirmações para o mesmo vizinho
+
+        Args:
+            ip (str): IP do vizinho que enviou o LSA
+            formato (str): Formato do LSA recebido, também usado no LSACK
+            origem (str): Roteador de origem do LSA
+            sequence_number (int): Número de sequência do LSA
+        """
+        with self._trava:
+            self._acks_pendentes.setdefault((ip, formato), {})[origem] = sequence_number
+        self._agendador_acks.agendar()
+
+    def enviar_acks(self):
+        """
+        Envia as confirmações pendentes, em um LSACK por vizinho (divididos em blocos de até LIMITE_ACKS confirmações)
+        """
+        with self._trava:
+            pendentes = self._acks_pendentes
+            self._acks_pendentes = {}
+
+        mensagens = []
+        for (ip, formato), acks in pendentes.items():
+            origens = list(acks.keys())
+            for inicio in range(0, len(origens), LIMITE_ACKS):
+                pacote = {
+                    "type": "LSACK",
+                    "router_id": self._router_id,
+                    "acks": {origem: acks[origem] for origem in origens[inicio:inicio + LIMITE_ACKS]},
+                }
+                mensagens.append((codificar_pacote(pacote, formato), (ip, self._PORTA)))
+
+        falhas = self._canal.enviar_lote(mensagens)
+        self._acks_enviados += len(mensagens) - len(falhas)
+        for indice, erro in falhas.items():
+            print2(f"Erro ao enviar LSACK para {mensagens[indice][1][0]}: {erro}", NIVEL_ERRO)
 
-    def __init__(self, router_id: str, neighbors_ip: dict[str, str]):
+    def remover_confirmado(self, neighbor_id: str, origem: str, sequence_number: int) -> bool:
         """
-        Inicializa um novo LSDB
+        Remove um LSA da lista de retransmissão do vizinho, caso a instância confirmada seja igual ou mais recente que a da lista
 
-        Args: 
-            router_id (str): Identificador único do roteador
-            neighbors_ip (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é seu IP
+        Returns:
+            bool: Indica se o LSA estava na lista de retransmissão
+        """
+        with self._trava:
+            lista = self._retransmissoes.get(neighbor_id)
+            pacote = lista.get(origem) if (lista is not None) else None
+            if (pacote is None or pacote["sequence_number"] > sequence_number):
+                return False
+            del lista[origem]
+        self._retransmissor.desarmar((neighbor_id, origem))
+        return True
 
+    def processar_ack(self, pacote: dict):
         """
-        self._router_id = router_id
-        self._neighbors_ip = neighbors_ip
-        # Registro das informações recebidas pelo LSA
-        self._tabela = {}
-        # Dicionário que mantém registro dos roteadores de destino e os próximos saltos para alcançá-los
-        self._roteamento = {}
-        self._tempo_inicio = time.time()
-        self._quantidade_roteadores = 0
+        Processa um LSACK, removendo os LSAs confirmados da lista de retransmissão do vizinho
 
-    def criar_entrada(self, sequence_number: int, timestamp: float, addresses: list[str], links: dict[str, int]) -> dict:
+        Args:
+            pacote (dict): Pacote LSACK no formato de dicionário
         """
-        Cria uma entrada na tabela baseado nas informações do pacote
+        neighbor_id = pacote["router_id"]
+        for origem, sequence_number in pacote["acks"].items():
+            self.remover_confirmado(neighbor_id, origem, sequence_number)
+
+    def retransmitir(self, chaves: list[tuple[str, str]]):
+        """
+        Reenvia os LSAs cujos prazos de confirmação expiraram (chamado pelo detector de prazos)
 
         Args:
-            sequence_number (int): Número de sequência
-            timestamp (float): Tempo de criação do pacote
-            addresses (list[str]): Lista com todos os endereços IP das interfaces
-            links (dict[str, int]): Dicionário onde a chave é o ID do vizinho e o valor é o custo para alcançá-lo
+            chaves (list[tuple[str, str]]): Tuplas (vizinho, roteador de origem) dos LSAs não confirmados
+        """
+        for neighbor_id, origem in chaves:
+            with self._trava:
+                lista = self._retransmissoes.get(neighbor_id)
+                pacote = lista.get(origem) if (lista is not None) else None
+            ip = self._neighbors_ip.get(neighbor_id)
+            if (pacote is None or ip is None):
+                continue
+            self._lsas_retransmitidos += 1
+            self.enviar_lote(pacote, [(neighbor_id, ip)], {}, "retransmitido", "retransmitir")
 
-        Returns: 
-            dict: Dicionário com os dados da entrada
+    def remover_vizinho(self, neighbor_id: str):
         """
+        Descarta a lista de retransmissão e o estado da sincronização de um vizinho removido
+        """
+        with self._trava:
+            lista = self._retransmissoes.pop(neighbor_id, {})
+            descricoes = self._descricoes.pop(neighbor_id, {})
+            self._descricoes_recebidas.pop(neighbor_id, None)
+            self._solicitacoes.pop(neighbor_id, None)
+        for origem in lista:
+            self._retransmissor.desarmar((neighbor_id, origem))
+        for parte in descricoes:
+            self._sincronizador.desarmar((neighbor_id, parte))
 
-        return {
-            "sequence_number": sequence_number,
-            "timestamp": timestamp,
-            "addresses": addresses,
-            "links": links,
-        }
+    def enviar_instancia(self, neighbor_id: str, ip: str, origem: str):
+        """
+        Envia a um vizinho a instância atual do LSA de um roteador (ex: após o vizinho enviar uma instância mais antiga)
+        """
+        pacote = self._lsdb.pacote(origem)
+        if (pacote is not None):
+            self.enviar_lote(pacote, [(neighbor_id, ip)], {}, "enviado", "enviar")
 
-    def atualizar(self, pacote: dict) -> bool:
+    def enviar_controle(self, pacotes: list[dict], neighbor_id: str, ip: str):
         """
-        Atualiza a tabela de roteamento após receber um pacote LSA válido
+        Envia pacotes de controle (DBD ou LSR) a um vizinho, no formato negociado com ele, em um único lote de datagramas
+        """
+        mensagens = []
+        for pacote in pacotes:
+            mensagens.append((self.codificar_para(pacote, neighbor_id, {}), (ip, self._PORTA)))
+        falhas = self._canal.enviar_lote(mensagens)
+        for indice, pacote in enumerate(pacotes):
+            if (indice in falhas):
+                print2(f"Erro ao enviar {pacote['type']} para [{neighbor_id}]: {falhas[indice]}", NIVEL_ERRO)
+                continue
+            self._pacotes_controle[pacote["type"]] += 1
+            if (registrar_pacote()):
+                print2(f"Pacote {pacote['type']} enviado para {ip} [{neighbor_id}]", NIVEL_DEBUG)
+
+    def sincronizar_vizinho(self, neighbor_id: str, ip: str):
+        """
+        Descreve a LSDB para um vizinho recém-reconhecido, em pacotes DBD com o número de sequência do LSA de cada roteador
+        O vizinho responde cada parte com um LSR, solicitando apenas os LSAs que não possui ou que possui em uma instância mais antiga
+        Enquanto a descrição do vizinho não foi recebida, ela também é solicitada (o vizinho pode não ter notado um reinício do roteador e manter a adjacência)
 
         Args:
-            pacote (dict): Pacote LSA no formato de dicionário
+            neighbor_id (str): Identificador único do vizinho
+            ip (str): IP do vizinho
+        """
+        resumo = self._lsdb.resumo()
+        origens = list(resumo.keys())
+        with self._trava:
+            solicitar = neighbor_id not in self._descricoes_recebidas
+        # Mesmo uma LSDB vazia é descrita, para que o vizinho responda e ambos saibam que a sincronização terminou
+        inicios = range(0, max(len(origens), 1), LIMITE_ACKS)
+        pacotes = [
+            {"type": "DBD", "router_id": self._router_id, "parte": parte, "partes": len(inicios), "solicitar": solicitar,
+             "resumo": {origem: resumo[origem] for origem in origens[inicio:inicio + LIMITE_ACKS]}}
+            for parte, inicio in enumerate(inicios)
+        ]
+        with self._trava:
+            self._descricoes[neighbor_id] = {pacote["parte"]: pacote for pacote in pacotes}
+        for pacote in pacotes:
+            self._sincronizador.armar((neighbor_id, pacote["parte"]), self._intervalo_retransmissao)
+        self.enviar_controle(pacotes, neighbor_id, ip)
 
-        Returns:
-            bool: Um booleano indicando se a tabela foi atualizada ou não
+    def retransmitir_descricoes(self, chaves: list[tuple[str, int]]):
         """
-        # Extrai o ID do emissor e número de sequência do pacote
-        router_id = pacote["router_id"]
-        sequence_number = pacote["sequence_number"]
+        Reenvia as partes das descrições que não foram respondidas por um LSR (chamado pelo detector de prazos)
 
-        # Retorna a entrada (caso exista) do emissor na LSDB
-        entrada = self._tabela.get(router_id)
+        Args:
+            chaves (list[tuple[str, int]]): Tuplas (vizinho, parte) das descrições sem resposta
+        """
+        for neighbor_id, parte in chaves:
+            with self._trava:
+                pacote = self._descricoes.get(neighbor_id, {}).get(parte)
+            ip = self._neighbors_ip.get(neighbor_id)
+            if (pacote is None or ip is None):
+                continue
+            self._sincronizador.armar((neighbor_id, parte), self._intervalo_retransmissao)
+            self.enviar_controle([pacote], neighbor_id, ip)
 
-        # O pacote é inválido quando já há uma entrada "igual ou mais antiga" do que o pacote recém-chegado
-        if (entrada and sequence_number <= entrada["sequence_number"]):
-            return False
+    def processar_descricao(self, pacote: dict, ip: str):
+        """
+        Processa uma parte da descrição da LSDB de um vizinho (DBD), respondendo com um LSR com os LSAs ausentes ou desatualizados na LSDB local
+        O LSR é enviado mesmo vazio, confirmando o recebimento da parte. Caso o vizinho solicite a descrição da LSDB local e ela não esteja
+        em andamento, ela é enviada em seguida
 
-        # Cria uma entrada na tabela
-        self._tabela[router_id] = self.criar_entrada(
-            sequence_number, pacote["timestamp"], pacote["addresses"], pacote["links"])
+        Args:
+            pacote (dict): Pacote DBD no formato de dicionário
+            ip (str): IP do vizinho
+        """
+        neighbor_id = pacote["router_id"]
+        pedidos = {}
+        for origem, sequence_number in pacote["resumo"].items():
+            atual = self._lsdb.sequencia(origem)
+            if (origem == self._router_id):
+                # O vizinho conhece um LSA próprio mais recente (ex: originado antes de um reinício)
+                if (atual is None or sequence_number > atual):
+                    self.retomar_sequencia(sequence_number)
+            elif (atual is None or sequence_number > atual):
+                pedidos[origem] = sequence_number
 
-        # Verificação se a rede convergiu (são conhecidas rotas para todos os roteadores conhecidos)
-        quantidade_roteadores = len(self._tabela.keys())
-        # Verifica se algum roteador novo foi conhecido
-        if (quantidade_roteadores > self._quantidade_roteadores):
-            # Verifica se há caminhos conhecidos para todos os roteadores
-            if (quantidade_roteadores == (len(self._roteamento) + 1)):
-                # Atualiza a quantidade de roteadores conhecidos
-                self._quantidade_roteadores = quantidade_roteadores
-                tempo_convergencia = time.time() - self._tempo_inicio
-                data_formatada = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        with self._trava:
+            recebidas = self._descricoes_recebidas.setdefault(neighbor_id, (set(), pacote.get("partes", 1)))
+            recebidas[0].add(pacote["parte"])
+            if (pedidos):
+                self._solicitacoes.setdefault(neighbor_id, {}).update(pedidos)
+            descrever = pacote.get("solicitar", False) and not self._descricoes.get(neighbor_id)
 
-                try:
-                    with open("/compartilhado/convergencia.txt", "a") as file:
-                        file.write(
-                            f"[{data_formatada}] {self._router_id}: {tempo_convergencia:.2f} segundos [{quantidade_roteadores} roteadores]\n")
-                except Exception as e:
-                    print2(
-                        f"[ERRO] Falha ao escrever tempo de convergência: {e}")
+        resposta = {"type": "LSR", "router_id": self._router_id, "parte": pacote["parte"], "pedidos": pedidos}
+        self.enviar_controle([resposta], neighbor_id, ip)
+        if (descrever):
+            self.sincronizar_vizinho(neighbor_id, ip)
 
-        self.recalcular_rotas(pacote["links"].keys())
+    def atender_pedidos(self, origem: str, sequence_number: int):
+        """
+        Marca como recebido um LSA solicitado aos vizinhos (instância igual ou mais recente que a solicitada)
+        """
+        with self._trava:
+            for neighbor_id in [neighbor_id for neighbor_id, pedidos in self._solicitacoes.items() if origem in pedidos]:
+                pedidos = self._solicitacoes[neighbor_id]
+                if (pedidos[origem] <= sequence_number):
+                    del pedidos[origem]
+                    if (not pedidos):
+                        del self._solicitacoes[neighbor_id]
 
-        return True
+    def sincronizado(self, neighbor_id: str) -> bool:
+        """
+        Indica se a LSDB já foi sincronizada com o vizinho: todas as partes da sua descrição foram recebidas e todos os LSAs solicitados chegaram
+        """
+        with self._trava:
+            recebidas = self._descricoes_recebidas.get(neighbor_id)
+            return (recebidas is not None and len(recebidas[0]) >= recebidas[1] and neighbor_id not in self._solicitacoes)
 
-    def dijkstra(self) -> dict:
+    def processar_pedido(self, pacote: dict, ip: str):
         """
-        Calcula o caminho com menor custo entre o roteador atual e todos os demais roteadores conhecidos
+        Processa um LSR: a parte da descrição respondida deixa de ser reenviada e os LSAs solicitados são enviados ao vizinho
+        (ficando em sua lista de retransmissão até serem confirmados)
 
-        Returns:
-            dict: Dicionário com a chave sendo o roteador de destino e o valor sendo o roteador anterior a ele
+        Args:
+            pacote (dict): Pacote LSR no formato de dicionário
+            ip (str): IP do vizinho
         """
-        distancias = {}
-        caminhos = {}
-        marcados = {}
+        neighbor_id = pacote["router_id"]
+        with self._trava:
+            descricoes = self._descricoes.get(neighbor_id, {})
+            respondida = descricoes.pop(pacote["parte"], None)
+            if (not descricoes):
+                self._descricoes.pop(neighbor_id, None)
+        if (respondida is not None):
+            self._sincronizador.desarmar((neighbor_id, pacote["parte"]))
 
-        # Inicializando os dicionários
-        for roteador in self._tabela.keys():
-            distancias[roteador] = float('inf')
-            caminhos[roteador] = None
+        for origem in pacote["pedidos"]:
+            if (self._lsdb.sequencia(origem) is not None):
+                self._lsas_solicitados += 1
+                self.enviar_instancia(neighbor_id, ip, origem)
 
-        distancias[self._router_id] = 0
+    def atualizar_periodicamente(self):
+        """
+        Origina um novo LSA a cada intervalo de atualização, mesmo sem alterações
+        """
+        while True:
+            # Timer para a atualização do LSA
+            time.sleep(self._interval)
+            self.originar()
 
-        while len(marcados) < len(self._tabela):
-            roteador = None
-            menor = float('inf')
-            # Busca pelo menor roteador não marcado
-            for no, custo in distancias.items():
-                if (no not in marcados and custo < menor):
-                    roteador = no
-                    menor = custo
+    def encaminhar_para_vizinhos(self, pacote: dict, sender_ip: str, dados: bytes | None = None):
+        """
+        Encaminha os pacotes LSA recebidos para todos os vizinhos (com exceção do remetente original do pacote)
 
-            if (roteador is None):
-                break
+        Os bytes originais do pacote são reenviados sem nova codificação para os vizinhos que usam o mesmo formato
 
-            marcados[roteador] = True
-            vizinhos = self._tabela[roteador]["links"]
+        Args: 
+            pacote (dict): Pacote LSA no formato de dicionário
+            sender_ip (str): IP do roteador emissor do pacote
+            dados (bytes | None, opcional): Bytes originais do pacote recebido (válidos apenas durante o processamento do pacote)
+        """
 
-            # Atualização dos menores caminhos
-            for vizinho, custo in vizinhos.items():
-                if (vizinho not in marcados):
-                    custo_total = custo + distancias[roteador]
-                    if (custo_total < distancias[vizinho]):
-                        distancias[vizinho] = custo_total
-                        caminhos[vizinho] = roteador
+        mensagens = {}
+        if (dados is not None):
+            mensagens[formato_dos_dados(dados)] = dados
 
-        return caminhos
+        # Cria uma lista de tuplas (ID, IP) com os vizinhos que receberão o pacote
+        neighbors_list = [
+            (neighbor_id, ip) for neighbor_id, ip in list(self._neighbors_ip.items()) if ip != sender_ip]
+
+        # Encaminha o pacote para seus vizinhos
+        self.enviar_lote(pacote, neighbors_list, mensagens, "encaminhado", "encaminhar")
 
-    def atualizar_proximo_pulo(self, caminhos: dict):
+    def enviar_lote(self, pacote: dict, neighbors_list: list[tuple[str, str]], mensagens: dict[str, bytes], acao: str, verbo: str):
         """
-        Percorre os menores caminhos encontrados para estabelecer quem será o próximo pulo para cada roteador, partindo do roteador atual
+        Envia o pacote LSA para os vizinhos informados, em um único lote de datagramas
 
         Args:
-            caminhos (dict): Dicionário com a chave sendo o roteador de destino e o valor sendo o roteador anterior a ele
+            pacote (dict): Pacote LSA no formato de dicionário
+            neighbors_list (list[tuple[str, str]]): Lista de tuplas (ID, IP) dos vizinhos de destino
+            mensagens (dict[str, bytes]): Codificações já realizadas do pacote, indexadas pelo formato
+            acao (str): Ação exibida no registro de sucesso ("enviado" ou "encaminhado")
+            verbo (str): Verbo exibido no registro de erro ("enviar" ou "encaminhar")
         """
-        for destino in caminhos.keys():
-            if (destino != self._router_id):
-                pulo = destino
-                while (pulo is not None and caminhos[pulo] != self._router_id):
-                    pulo = caminhos[pulo]
-                self._roteamento[destino] = pulo
+        lote = []
+        destinos = []
+        for neighbor_id, ip in neighbors_list:
+            try:
+                # Converte no formato negociado com o vizinho
+                message = self.codificar_para(pacote, neighbor_id, mensagens)
+            except Exception as e:
+                print2(
+                    f"Erro ao {verbo} para [{neighbor_id}]: {e}", NIVEL_ERRO)
+                continue
+            lote.append((message, (ip, self._PORTA)))
+            destinos.append((neighbor_id, ip))
 
-        self._roteamento = dict(sorted(self._roteamento.items()))
+        falhas = self._canal.enviar_lote(lote)
+        self._lsas_enviados += len(lote) - len(falhas)
+
+        # Os LSAs ficam nas listas de retransmissão dos vizinhos (substituindo instâncias anteriores do mesmo roteador) até serem confirmados
+        origem = pacote["router_id"]
+        with self._trava:
+            for neighbor_id, _ in destinos:
+                self._retransmissoes.setdefault(neighbor_id, {})[origem] = pacote
+        for neighbor_id, _ in destinos:
+            self._retransmissor.armar((neighbor_id, origem), self._intervalo_retransmissao)
+
+        for indice, (neighbor_id, ip) in enumerate(destinos):
+            if (indice in falhas):
+                print2(
+                    f"Erro ao {verbo} para [{neighbor_id}]: {falhas[indice]}", NIVEL_ERRO)
+            elif (registrar_pacote()):
+                print2(
+                    f"Pacote LSA {acao} para {ip} [{neighbor_id}]", NIVEL_DEBUG)
 
-    def atualizar_rotas(self):
+    def iniciar(self):
         """
-        Atualiza as rotas na tabela de roteamento, baseado no próximo pulo encontrado pela função atualizar_proximo_pulo
+        Inicia o funcionamento do emissor de LSA, caso não tenha sido iniciado:
+        - Origina o primeiro LSA, com as interfaces do roteador
+        - Inicializa as threads (ou o temporizador no loop de eventos) responsáveis pelas originações e atualizações periódicas
         """
-        for roteador_destino, roteador_gateway in list(self._roteamento.items()):
-            # Caso não seja o próprio roteador
-            if (roteador_destino != self._router_id):
-                # Ignora o roteador caso o caminho não seja conhecido
-                if (roteador_gateway not in self._neighbors_ip):
-                    print2(
-                        f"[LSDB] Ignorando rota para {roteador_destino} via {roteador_gateway}: gateway não conhecido ainda")
-                else:
-                    # Atualiza a rota associando todos os ips do vizinho ao próximo pulo
-                    for ip_destino in self._tabela[roteador_destino]["addresses"]:
-                        ip_gateway = self._neighbors_ip[roteador_gateway]
-
-                        comando = ["ip", "route", "replace",
-                                   ip_destino, "via", ip_gateway]
-                        try:
-                            subprocess.run(comando, check=True)
-                            print2(
-                                f"Rota adicionada: {ip_destino} -> {ip_gateway} [{roteador_gateway}]")
-                        except subprocess.CalledProcessError as e:
-                            print2(
-                                f"[ERRO] Falha ao adicionar rota: [{comando}] -> [{e}] ({self._router_id} -> {roteador_gateway})")
+        if (not self._iniciado):
+            self._iniciado = True
+            self._agendador.iniciar()
+            self._retransmissor.iniciar()
+            self._sincronizador.iniciar()
+            self._agendador_acks.iniciar()
+            self.originar()
+            if (self._loop is not None):
+                self._loop.call_later(self._interval, TemporizadorPeriodico(self._loop, self._interval, self.originar).iniciar)
+                return
 
-    def recalcular_rotas(self, roteadores_observados: list[str]):
+            thread_atualizacao = threading.Thread(
+                target=self.atualizar_periodicamente, daemon=True)
+            thread_atualizacao.start()
+
+
+class SessaoBFD:
+    """
+    Estado de uma sessão BFD com um vizinho
+    """
+
+    __slots__ = [
+        "router_id", "ip", "estado", "diagnostico", "discriminador_local", "discriminador_remoto", "multiplicador_remoto",
+        "intervalo_envio_remoto", "intervalo_recepcao_remoto", "ultimo_pacote"
+    ]
+
+    def __init__(self, router_id: str, ip: str, discriminador_local: int):
         """
-        Recalcula as rotas com dijkstra e aplica na tabela de roteamento
+        Inicializa uma nova sessão, no estado Down
 
         Args:
-            roteadores_observados (list[str]): Lista de roteadores observados
+            router_id (str): Identificador único do vizinho
+            ip (str): IP do vizinho no enlace
+            discriminador_local (int): Identificador (não nulo) da sessão no roteador atual
         """
+        self.router_id = router_id
+        self.ip = ip
+        self.estado = BFD_DOWN
+        self.diagnostico = 0
+        self.discriminador_local = discriminador_local
+        self.discriminador_remoto = 0
+        self.multiplicador_remoto = 0
+        # Intervalos (em segundos) anunciados pelo vizinho
+        self.intervalo_envio_remoto = 0.0
+        self.intervalo_recepcao_remoto = 0.0
+        # Instante (no relógio monotônico local) do último pacote recebido do vizinho
+        self.ultimo_pacote = None
 
-        # Verifica se há um roteador "desconhecido" presente nos roteadores observados, criando uma entrada para o mesmo
-        for vizinho in roteadores_observados:
-            if (vizinho not in self._tabela):
-                print2(
-                    f"[LSDB] Descoberto novo roteador: {vizinho}")
-                self._tabela[vizinho] = self.criar_entrada(-1, 0, [], {})
-
-        # Calcula o menor caminho para se chegar em cada um dos outros roteadores
-        caminhos = self.dijkstra()
-        # Percorre os menores caminhos encontrados para estabelecer quem será o próximo pulo
-        self.atualizar_proximo_pulo(caminhos)
-        # Atualiza as rotas na tabela de roteamento
-        self.atualizar_rotas()
 
-class HelloSender:
+class MonitorBFD:
     """
-    Classe responsável por criar e enviar pacotes HELLO periodicamente para vizinhos em uma rede
+    Detecção rápida de falhas dos enlaces (BFD), com uma sessão bidirecional por vizinho em uma porta UDP própria
+
+    Cada sessão troca pacotes de controle a cada poucos milissegundos e é declarada inativa quando nenhum pacote chega dentro do tempo de detecção
+    (multiplicador do vizinho vezes o intervalo negociado), removendo o vizinho sem aguardar o intervalo de queda dos HELLOs
     """
 
     __slots__ = [
-        "_router_id", "_interfaces", "_neighbors", "_interval", "_PORTA"
+        "_router_id", "_funcao", "_intervalo", "_multiplicador", "_PORTA", "_canal", "_loop", "_sessoes", "_discriminadores",
+        "_proximo_discriminador", "_detector", "_iniciado", "_pacotes_enviados", "_pacotes_recebidos", "_quedas"
     ]
 
-    def __init__(self, router_id: str, interfaces: list[dict[str, str]], neighbors: dict[str, str], interval: int = 10, PORTA: int = 5000):
+    def __init__(self, router_id: str, funcao, intervalo: float = 0.05, multiplicador: int = 3, PORTA: int = PORTA_BFD, canal: CanalUDP | None = None):
         """
-        Inicializa um novo emissor
+        Inicializa um novo monitor
 
         Args:
             router_id (str): Identificador único do roteador
-            interfaces (list[dict[str, str]]): Lista de dicionários representando as interfaces de rede. Cada dicionário deve conter:
-                - "address": IP da interface
-                - "broadcast": IP de broadcast (se aplicável) 
-            neighbors (dict[str, str]): Dicionário com os roteadores vizinhos conhecidos. A chave é o ID do vizinho e o valor é seu IP
-            interval (int, opcional): Tempo de intervalo para o envio periódico dos pacotes HELLO
-            PORTA (int, opcional): Porta UDP onde o roteador irá escutar os pacotes (Padrão: 5000)
+            funcao (Callable[[list[str], dict[str, float]], None]): Função chamada com os vizinhos cujas sessões caíram e o instante do último pacote recebido de cada um
+            intervalo (float, opcional): Intervalo (em segundos) entre os pacotes de controle enviados e mínimo aceito na recepção (Padrão: 0.05)
+            multiplicador (int, opcional): Quantidade de intervalos sem pacotes após a qual o vizinho considera a sessão inativa (Padrão: 3)
+            PORTA (int, opcional): Porta UDP das sessões (Padrão: PORTA_BFD)
+            canal (CanalUDP | None, opcional): Canal de envio dos pacotes (Padrão: o canal criado junto da thread receptora)
         """
         self._router_id = router_id
-        self._interfaces = interfaces
-        self._neighbors = neighbors
-        self._interval = interval
+        self._funcao = funcao
+        self._intervalo = intervalo
+        self._multiplicador = multiplicador
         self._PORTA = PORTA
+        self._canal = canal
+        # Loop de eventos que executa os envios e os prazos (None para usar threads próprias)
+        self._loop = None
+        # Sessões indexadas pelo IP do vizinho e pelo discriminador local
+        self._sessoes = {}
+        self._discriminadores = {}
+        self._proximo_discriminador = 1
+        # Prazos de detecção das sessões, rearmados a cada pacote recebido (no relógio monotônico, como os prazos dos HELLOs)
+        self._detector = DetectorQuedas(self.sessoes_expiradas)
+        self._iniciado = False
+        self._pacotes_enviados = 0
+        self._pacotes_recebidos = 0
+        self._quedas = 0
 
-    def criar_pacote(self, ip_address: str) -> dict:
-        """
-        Cria um pacote HELLO
+    @property
+    def canal(self) -> CanalUDP | None:
+        return self._canal
 
-        Args:
-            ip_address (str): Endereço IP da interface local
+    @canal.setter
+    def canal(self, canal: CanalUDP):
+        self._canal = canal
 
-        Returns: 
-            dict: Dicionário com os dados do pacote HELLO
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop | None:
+        return self._loop
+
+    @loop.setter
+    def loop(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        # Os prazos de detecção passam a ser agendados no loop
+        self._detector = DetectorQuedasLoop(self.sessoes_expiradas, loop)
+
+    @property
+    def sessoes(self) -> dict[str, str]:
         """
-        return {
-            "type": "HELLO",
-            "router_id": self._router_id,
-            "timestamp": time.time(),
-            "ip_address": ip_address,
-            "known_neighbors": list(self._neighbors.keys()),
-        }
+        Estado de cada sessão, indexado pelo ID do vizinho
+        """
+        return {sessao.router_id: BFD_ESTADOS[sessao.estado] for sessao in list(self._sessoes.values())}
 
-    def enviar_broadcast(self):
+    def estatisticas(self) -> dict:
         """
-        Inicia o envio periódico de pacotes HELLO por meio do broadcast
+        Retorna os contadores de pacotes de controle e de quedas detectadas
         """
-        # Filtra apenas as interfaces que possuem endereço de broadcast
-        interfaces = [item for item in self._interfaces if "broadcast" in item]
+        return {
+            "pacotes_enviados": self._pacotes_enviados,
+            "pacotes_recebidos": self._pacotes_recebidos,
+            "quedas": self._quedas,
+        }
 
-        sock = create_socket()
-        # Configura o socket para envio de broadcast
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    def adicionar_vizinho(self, router_id: str, ip: str):
+        """
+        Cria uma sessão com um vizinho (reconhecido pelos HELLOs), caso ainda não exista
 
-        while True:
-            for interface_info in interfaces:
-                ip_address = interface_info["address"]
-                broadcast_ip = interface_info["broadcast"]
+        Args:
+            router_id (str): Identificador único do vizinho
+            ip (str): IP do vizinho no enlace
+        """
+        if (ip in self._sessoes):
+            return
+        sessao = SessaoBFD(router_id, ip, self._proximo_discriminador)
+        self._proximo_discriminador += 1
+        self._sessoes[ip] = sessao
+        self._discriminadores[sessao.discriminador_local] = sessao
+        # Inicia a negociação sem aguardar o próximo envio periódico
+        self.enviar_lote([sessao])
 
-                # Cria o pacote
-                pacote = self.criar_pacote(ip_address)
-                # Converte no formato necessário
-                message = json.dumps(pacote).encode("utf-8")
+    def remover_vizinho(self, router_id: str):
+        """
+        Encerra as sessões com um vizinho (removido pelos HELLOs ou pelo próprio BFD)
+        """
+        for sessao in [sessao for sessao in list(self._sessoes.values()) if sessao.router_id == router_id]:
+            self._sessoes.pop(sessao.ip, None)
+            self._discriminadores.pop(sessao.discriminador_local, None)
+            self._detector.desarmar(sessao.ip)
 
-                try:
-                    # Envia o pacote
-                    sock.sendto(message, (broadcast_ip, self._PORTA))
-                    print2(
-                        f"Pacote HELLO enviado para {broadcast_ip} [broadcast]")
-                except Exception as e:
-                    print2(
-                        f"Erro ao enviar para {broadcast_ip}: {e}")
+    def codificar(self, sessao: SessaoBFD) -> bytes:
+        """
+        Cria o pacote de controle de uma sessão
 
-            # Timer para envio de um novo pacote HELLO
-            time.sleep(self._interval)
+        Returns:
+            bytes: Pacote no formato da RFC 5880
+        """
+        intervalo = round(self._intervalo * 1_000_000)
+        return BFD_CONTROLE.pack(
+            (BFD_VERSAO << 5) | sessao.diagnostico, sessao.estado << 6, self._multiplicador, BFD_CONTROLE.size,
+            sessao.discriminador_local, sessao.discriminador_remoto, intervalo, intervalo, 0
+        )
 
-    def iniciar(self):
+    def enviar_lote(self, sessoes: list[SessaoBFD]):
         """
-        Inicia o funcionamento do emissor de HELLO:
-        - Inicializa uma thread responsável por enviar os pacotes por broadcast para cada interface
+        Envia um pacote de controle para cada sessão em uma única chamada de envio
         """
-        thread_emissor = threading.Thread(
-            target=self.enviar_broadcast, daemon=True)
-        thread_emissor.start()
-
-class LSASender:
-    """
-    Classe responsável por criar, enviar e encaminhar pacotes LSA (Link State Advertisement) na rede
+        mensagens = [(self.codificar(sessao), (sessao.ip, self._PORTA)) for sessao in sessoes]
+        if (not mensagens or self._canal is None):
+            return
+        falhas = self._canal.enviar_lote(mensagens)
+        self._pacotes_enviados += len(mensagens) - len(falhas)
+        for indice, erro in falhas.items():
+            print2(f"[BFD] Erro ao enviar para {mensagens[indice][1][0]}: {erro}", NIVEL_ERRO)
 
-    Envia periodicamente pacotes LSA para vizinhos diretos e também encaminha os pacotes recebidos para outros vizinhos
-    """
+    def enviar_rodada(self):
+        """
+        Envia os pacotes de controle periódicos de todas as sessões
+        """
+        self.enviar_lote(list(self._sessoes.values()))
 
-    __slots__ = [
-        "_router_id", "_neighbors_ip", "_neighbors_cost", "_interval", "_PORTA", "_sequence_number", "_iniciado", "_lsdb", "_interfaces"
-    ]
+    def tempo_deteccao(self, sessao: SessaoBFD) -> float:
+        """
+        Retorna o tempo de detecção da sessão: multiplicador do vizinho vezes o maior entre o intervalo de envio do vizinho e o de recepção local
+        """
+        return sessao.multiplicador_remoto * max(sessao.intervalo_envio_remoto, self._intervalo)
 
-    def __init__(self, router_id: str, neighbors_ip: dict[str, str], neighbors_cost: dict[str, int], interfaces: list[dict[str, str]], lsdb: LSDB, interval: int = 30, PORTA: int = 5000):
+    def processar_pacote(self, data: memoryview, address: tuple[str, int]):
         """
-        Inicializa um novo emissor
+        Processa um pacote de controle recebido, atualizando o estado da sessão com o vizinho (máquina de estados da RFC 5880)
 
         Args:
-            router_id (str): Identificador único do roteador
-            neighbors_ip (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é seu IP
-            neighbors_cost (dict[str, str]): Dicionário onde a chave é o ID do vizinho e o valor é o custo para alcançá-lo
-            interfaces (list[dict[str, str]]): Lista de dicionários representando as interfaces de rede. Cada dicionário deve conter:
-                - "address": IP da interface
-                - "broadcast": IP de broadcast (se aplicável) 
-            interval (int, opcional): Tempo de intervalo para o envio periódico dos pacotes HELLO
-            PORTA (int, opcional): Porta UDP onde o roteador irá escutar os pacotes (Padrão: 5000)
+            data (memoryview): Bytes do pacote
+            address (tuple[str, int]): Tupla (IP, porta) do emissor
         """
+        if (len(data) < BFD_CONTROLE.size):
+            return
+        (versao_diagnostico, estado_flags, multiplicador, tamanho, discriminador_remoto, discriminador_local,
+         intervalo_envio, intervalo_recepcao, _) = BFD_CONTROLE.unpack_from(data)
+        # Descarta pacotes inválidos (RFC 5880, seção 6.8.6)
+        if ((versao_diagnostico >> 5) != BFD_VERSAO or tamanho > len(data) or multiplicador == 0 or discriminador_remoto == 0):
+            return
 
-        self._router_id = router_id
-        self._neighbors_ip = neighbors_ip
-        self._neighbors_cost = neighbors_cost
-        self._interval = interval
-        self._PORTA = PORTA
-        self._sequence_number = 0
-        self._iniciado = False
-        self._lsdb = lsdb
-        self._interfaces = interfaces
+        # Sessões são identificadas pelo discriminador, ou pelo IP do vizinho enquanto o discriminador ainda não é conhecido
+        if (discriminador_local):
+            sessao = self._discriminadores.get(discriminador_local)
+        else:
+            sessao = self._sessoes.get(address[0])
+        # Vizinhos ainda não reconhecidos pelos HELLOs não possuem sessão
+        if (sessao is None):
+            return
 
-    @property
-    def neighbors_ip(self):
-        return self._neighbors_ip
+        self._pacotes_recebidos += 1
+        sessao.discriminador_remoto = discriminador_remoto
+        sessao.multiplicador_remoto = multiplicador
+        sessao.intervalo_envio_remoto = intervalo_envio / 1_000_000
+        sessao.intervalo_recepcao_remoto = intervalo_recepcao / 1_000_000
+        sessao.ultimo_pacote = relogio_monotonico()
 
-    @property
-    def neighbors_cost(self):
-        return self._neighbors_cost
+        estado_remoto = estado_flags >> 6
+        estado = sessao.estado
+        if (estado_remoto == BFD_ADMIN_DOWN or (estado == BFD_UP and estado_remoto == BFD_DOWN)):
+            if (estado != BFD_DOWN):
+                self.derrubar_sessoes([sessao], BFD_DIAG_VIZINHO)
+            return
+        if (estado == BFD_DOWN):
+            if (estado_remoto == BFD_DOWN):
+                sessao.estado = BFD_INIT
+            elif (estado_remoto == BFD_INIT):
+                sessao.estado = BFD_UP
+        elif (estado == BFD_INIT and estado_remoto in (BFD_INIT, BFD_UP)):
+            sessao.estado = BFD_UP
 
-    def criar_pacote(self) -> dict:
-        """
-        Cria um pacote LSA
+        if (sessao.estado != BFD_DOWN):
+            self._detector.armar(sessao.ip, self.tempo_deteccao(sessao))
+        if (sessao.estado != estado):
+            if (sessao.estado == BFD_UP):
+                sessao.diagnostico = 0
+                print2(f"[BFD] Sessão com {sessao.router_id} ({sessao.ip}) ativa, detecção em {self.tempo_deteccao(sessao) * 1000:.0f} ms")
+            # Informa a mudança de estado ao vizinho sem aguardar o próximo envio periódico
+            self.enviar_lote([sessao])
 
-        Returns: 
-            dict: Dicionário com os dados do pacote LSA
+    def derrubar_sessoes(self, sessoes: list[SessaoBFD], diagnostico: int):
         """
+        Leva as sessões ao estado Down, removendo os vizinhos das sessões que estavam ativas
+        """
+        caidos = {}
+        for sessao in sessoes:
+            if (sessao.estado == BFD_UP):
+                caidos[sessao.router_id] = sessao.ultimo_pacote
+                print2(f"[BFD] Sessão com {sessao.router_id} ({sessao.ip}) inativa: "
+                       f"{'tempo de detecção expirado' if diagnostico == BFD_DIAG_EXPIRADO else 'queda sinalizada pelo vizinho'}")
+            sessao.estado = BFD_DOWN
+            sessao.diagnostico = diagnostico
+            sessao.discriminador_remoto = 0
+            self._detector.desarmar(sessao.ip)
+
+        if (caidos):
+            self._quedas += len(caidos)
+            self._funcao(list(caidos.keys()), caidos)
 
-        self._sequence_number += 1
-        return {
-            "type": "LSA",
-            "router_id": self._router_id,
-            "timestamp": time.time(),
-            "addresses": [item["address"] for item in self._interfaces],
-            "sequence_number": self._sequence_number,
-            "links": {neighbor_id: custo for (neighbor_id, custo) in self._neighbors_cost.items()}
-        }
+    def sessoes_expiradas(self, ips: list[str]):
+        """
+        Derruba as sessões cujo tempo de detecção expirou (chamado pelo detector de prazos)
+        """
+        self.derrubar_sessoes([self._sessoes[ip] for ip in ips if ip in self._sessoes], BFD_DIAG_EXPIRADO)
 
-    def enviar_para_vizinhos(self):
+    def receber_pacotes(self):
         """
-        Inicia o envio periódico de pacotes LSA para todos os seus vizinhos diretos
+        Escuta os pacotes de controle na porta do BFD, usando o mesmo socket para os envios
         """
         sock = create_socket()
+        sock.bind(("", self._PORTA))
+        canal = CanalUDP(sock, BUFFER_SIZE=BFD_CONTROLE.size * 2)
+        if (self._canal is None):
+            self._canal = canal
+
         while True:
-            # Cria o pacote
-            pacote = self.criar_pacote()
-            # Atualiza a LSDB com os próprios dados
-            self._lsdb.atualizar(pacote)
-            # Converte no formato necessário
-            message = json.dumps(pacote).encode("utf-8")
+            try:
+                lote = canal.receber_lote()
+            except Exception as e:
+                print2(f"[BFD] Erro ao receber pacote: {e}", NIVEL_ERRO)
+                continue
 
-            # Envia o LSA para cada um de seus vizinhos diretos
-            for neighbor_id, ip in self._neighbors_ip.items():
+            for data, address, _ in lote:
                 try:
-                    sock.sendto(message, (ip, self._PORTA))
-                    print2(
-                        f"Pacote LSA enviado para {ip} [{neighbor_id}]")
+                    self.processar_pacote(data, address)
                 except Exception as e:
-                    print2(
-                        f"Erro ao enviar para [{neighbor_id}]: {e}")
-
-            # Timer para envio de um novo pacote LSA
-            time.sleep(self._interval)
+                    print2(f"[BFD] Erro ao processar pacote: {e}", NIVEL_ERRO)
 
-    def encaminhar_para_vizinhos(self, pacote: dict, sender_ip: str):
+    def enviar_periodicamente(self):
         """
-        Encaminha os pacotes LSA recebidos para todos os vizinhos (com exceção do remetente original do pacote)
+        Envia os pacotes de controle a cada intervalo (reduzido aleatoriamente em até VARIACAO_ENVIOS)
+        """
+        while True:
+            self.enviar_rodada()
+            time.sleep(intervalo_com_variacao(self._intervalo, VARIACAO_ENVIOS))
 
-        Args: 
-            pacote (dict): Pacote LSA no formato de dicionário
-            sender_ip (str): IP do roteador emissor do pacote
+    def iniciar(self):
+        """
+        Inicia o funcionamento do monitor, caso não tenha sido iniciado:
+        - Inicializa as threads de recepção e de envio periódico (ou um temporizador no loop de eventos, que entrega os pacotes ao método processar_pacote)
+        - Inicia a detecção das quedas
         """
+        if (self._iniciado):
+            return
+        self._iniciado = True
+        self._detector.iniciar()
+        if (self._loop is not None):
+            TemporizadorPeriodico(self._loop, self._intervalo, self.enviar_rodada, VARIACAO_ENVIOS).iniciar()
+            return
 
-        sock = create_socket()
-        message = json.dumps(pacote).encode("utf-8")
+        thread_receptor = threading.Thread(target=self.receber_pacotes, daemon=True)
+        thread_receptor.start()
+        thread_emissor = threading.Thread(target=self.enviar_periodicamente, daemon=True)
+        thread_emissor.start()
 
-        # Cria uma lista de tuplas (ID, IP) com os vizinhos que receberão o pacote
-        neighbors_list = [
-            (neighbor_id, ip) for neighbor_id, ip in self._neighbors_ip.items() if ip != sender_ip]
 
-        # Encaminha o pacote para seus vizinhos
-        for neighbor_id, ip in neighbors_list:
-            try:
-                sock.sendto(message, (ip, self._PORTA))
-                print2(
-                    f"Pacote LSA encaminhado para {ip} [{neighbor_id}]")
-            except Exception as e:
-                print2(
-                    f"Erro ao encaminhar para [{neighbor_id}]: {e}")
+class ProtocoloBFD(asyncio.DatagramProtocol):
+    """
+    Protocolo UDP do asyncio que entrega os pacotes de controle recebidos ao monitor BFD
+    """
+
+    def __init__(self, monitor: MonitorBFD):
+        self._monitor = monitor
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]):
+        try:
+            self._monitor.processar_pacote(memoryview(data), addr)
+        except Exception as e:
+            print2(f"[BFD] Erro ao processar pacote: {e}", NIVEL_ERRO)
+
+    def error_received(self, exc: OSError):
+        print2(f"[BFD] Erro no socket: {exc}", NIVEL_ERRO)
 
-    def iniciar(self):
-        """
-        Inicia o funcionamento do emissor de LSA, caso não tenha sido iniciado:
-        - Inicializa uma thread responsável por enviar os pacotes
-        """
-        if (not self._iniciado):
-            self._iniciado = True
-            thread_emissor = threading.Thread(
-                target=self.enviar_para_vizinhos, daemon=True)
-            thread_emissor.start()
 
 class Roteador:
     """
@@ -430,10 +5582,14 @@ class Roteador:
     """
 
     __slots__ = [
-        "_router_id", "_interfaces", "_PORTA", "_hello", "_lsa", "_lsdb", "_BUFFER_SIZE", "_neighbors_detected", "_neighbors_recognized", "_gerenciador_vizinhos"
+        "_router_id", "_interfaces", "_PORTA", "_hello", "_lsa", "_lsdb", "_BUFFER_SIZE", "_neighbors_detected", "_neighbors_recognized", "_gerenciador_vizinhos",
+        "_agendador_spf", "_agendador_lfa", "_trava_calculos", "_neighbors_formats", "_canal_envio", "_canal_recepcao", "_tamanho_lote", "_spf_throttle",
+        "_pacotes_recebidos", "_bfd", "_interfaces_sistema", "_snapshot", "_reinicio_gracioso", "_intervalo_queda", "_reinicio",
+        "_temporizador_reinicio", "_pacotes_descartados", "_metricas", "_servidor_metricas", "_servidor_consultas", "_rastreamento", "_area", "_lsdbs", "_emissores",
+        "_abr", "_faixas"
     ]
 
-    def __init__(self, router_id: str, PORTA: int = 5000, BUFFER_SIZE: int = 4096):
+    def __init__(self, router_id: str, PORTA: int = 5000, BUFFER_SIZE: int = 4096, spf_throttle: tuple[float, float, float] = (0.05, 0.2, 5), formatos: list[str] = FORMATOS_SUPORTADOS, tamanho_lote: int = 32, interfaces: list[dict[str, str]] | None = None, custos: dict[str, int] | None = None, fib: TabelaRotas | None = None, canal: CanalUDP | None = None, intervalo_hello: float = 10, intervalo_queda: float = 30, intervalos: dict[str, tuple[float, float]] | None = None, bfd: tuple[float, int] | None = None, temporizadores_lsa: tuple[float, float, float] = (1, 1800, 3600), snapshot: str | None = None, intervalo_snapshot: float = 30, reinicio_gracioso: float | None = None, maximo_caminhos: int = 4, comprimir_fib: bool = True, lfa: bool = True, endereco_metricas: tuple[str, int] | None = None, caminho_consultas: str | None = None, rastreamento: RastreamentoLSA | None = None, area: int = AREA_BACKBONE, areas: dict[str, int] | None = None, faixas: dict[int, list[str]] | None = None):
         """
         Inicializa um novo roteador
 
@@ -441,63 +5597,478 @@ class Roteador:
             router_id (str): Identificador único do roteador
             PORTA (int, opcional): Porta UDP onde o roteador irá escutar os pacotes (Padrão: 5000)
             BUFFER_SIZE (int, opcional): Tamanho máximo do buffer de recepção (Padrão: 4096)
+            spf_throttle (tuple[float, float, float], opcional): Atraso inicial, espera e espera máxima (em segundos) entre cálculos do SPF (Padrão: (0.05, 0.2, 5))
+            formatos (list[str], opcional): Formatos de pacote suportados, em ordem de preferência (Padrão: FORMATOS_SUPORTADOS)
+            tamanho_lote (int, opcional): Quantidade máxima de datagramas recebidos/enviados por chamada de sistema (Padrão: 32)
+            interfaces (list[dict[str, str]] | None, opcional): Interfaces do roteador (Padrão: interfaces do sistema, obtidas por listar_enderecos)
+            custos (dict[str, int] | None, opcional): Custo do enlace até cada vizinho (Padrão: variáveis de ambiente CUSTO_*)
+            fib (TabelaRotas | None, opcional): Tabela responsável por instalar as rotas (Padrão: TabelaRotas no kernel)
+            canal (CanalUDP | None, opcional): Canal de envio dos pacotes (Padrão: um CanalUDP próprio)
+            intervalo_hello (float, opcional): Intervalo (em segundos) entre os HELLOs (Padrão: 10)
+            intervalo_queda (float, opcional): Intervalo (em segundos) sem HELLOs após o qual os vizinhos consideram o roteador inativo (Padrão: 30)
+            intervalos (dict[str, tuple[float, float]] | None, opcional): Intervalos (HELLO, queda) específicos de cada interface, indexados pelo IP da interface
+            bfd (tuple[float, int] | None, opcional): Intervalo (em segundos) e multiplicador de detecção das sessões BFD com os vizinhos (Padrão: None, sem BFD)
+            temporizadores_lsa (tuple[float, float, float], opcional): Intervalo mínimo entre originações, intervalo de atualização e idade máxima (em segundos) dos LSAs (Padrão: (1, 1800, 3600))
+            snapshot (str | None, opcional): Arquivo onde a LSDB e as rotas instaladas são gravadas periodicamente (Padrão: None, sem snapshots)
+            intervalo_snapshot (float, opcional): Intervalo (em segundos) entre as gravações do snapshot (Padrão: 30)
+            reinicio_gracioso (float | None, opcional): Ativa o reinício gracioso a partir do snapshot, com o prazo máximo (em segundos) para a sincronização
+                com os vizinhos anteriores ao reinício (Padrão: None, a LSDB começa vazia)
+            maximo_caminhos (int, opcional): Quantidade máxima de próximos pulos de mesmo custo (ECMP) instalados em cada rota (Padrão: 4)
+            comprimir_fib (bool, opcional): Instala o menor conjunto de prefixos com o mesmo encaminhamento das rotas calculadas (Padrão: True)
+            lfa (bool, opcional): Pré-calcula próximos pulos alternativos livres de laços (LFA), instalados assim que a queda de um vizinho é detectada (Padrão: True)
+            endereco_metricas (tuple[str, int] | None, opcional): Endereço (IP, porta) do servidor HTTP que expõe as métricas no formato do Prometheus (Padrão: None, sem servidor)
+            caminho_consultas (str | None, opcional): Caminho do socket Unix do servidor de consultas à RIB (Padrão: None, sem servidor)
+            rastreamento (RastreamentoLSA | None, opcional): Rastreamento das etapas de processamento dos LSAs recebidos e dos cálculos de rotas (Padrão: None, sem rastreamento)
+            area (int, opcional): Área própria do roteador, onde são anunciados os seus endereços (Padrão: AREA_BACKBONE)
+            areas (dict[str, int] | None, opcional): Área do enlace até cada vizinho, quando diferente da área própria. Um roteador com enlaces no
+                backbone e em outras áreas é um ABR, que resume os prefixos de cada área nas demais (Padrão: None, todos na área própria)
+            faixas (dict[int, list[str]] | None, opcional): Faixas de endereços (ex: "10.11.0.0/16") de cada área, anunciadas pelo ABR no lugar
+                dos prefixos contidos nelas (Padrão: None, apenas os prefixos contíguos são agregados)
         """
+        intervalo_minimo_lsa, intervalo_atualizacao_lsa, idade_maxima_lsa = temporizadores_lsa
         self._router_id = router_id
-        self._interfaces = self.listar_enderecos()
+        # Interfaces obtidas do sistema são verificadas periodicamente, originando um novo LSA quando mudam
+        self._interfaces_sistema = interfaces is None
+        self._interfaces = interfaces if (interfaces is not None) else self.listar_enderecos()
         self._PORTA = PORTA
         self._BUFFER_SIZE = BUFFER_SIZE
         # Vizinhos detectados pelo HELLO
         self._neighbors_detected = {}
         # Vizinhos reconhecidos bidirecionalmente
         self._neighbors_recognized = {}
+        # Formatos de pacote anunciados por cada vizinho
+        self._neighbors_formats = {}
+        self._tamanho_lote = tamanho_lote
+        self._spf_throttle = spf_throttle
+        # Quantidade de pacotes recebidos de outros roteadores, por tipo
+        self._pacotes_recebidos = {"HELLO": 0, "LSA": 0, "LSACK": 0, "DBD": 0, "LSR": 0}
+        # Pacotes descartados na recepção, por motivo
+        self._pacotes_descartados = {"truncado": 0, "invalido": 0}
+        # Canal único de envio, compartilhado pelos emissores durante todo o funcionamento do roteador
+        self._canal_envio = canal if (canal is not None) else CanalUDP(create_socket(), tamanho_lote)
+        # O canal de recepção é criado junto da thread receptora
+        self._canal_recepcao = None
         self._hello = HelloSender(
-            self._router_id, self._interfaces, self._neighbors_detected
+            self._router_id, self._interfaces, self._neighbors_detected, intervalo_hello,
+            neighbors_formats=self._neighbors_formats, formatos=formatos, canal=self._canal_envio,
+            dead_interval=intervalo_queda, intervalos=intervalos
         )
 
-        self._lsdb = LSDB(router_id, self._neighbors_recognized)
-        self._lsa = LSASender(
-            self._router_id, self._neighbors_recognized,
-            self._neighbors_detected, self._interfaces, self._lsdb
-        )
-        self._gerenciador_vizinhos = GerenciadorVizinhos(
-            self._router_id, self._lsa, self._lsdb
-        )
+        # Áreas do roteador (como no OSPF): a própria e as dos enlaces até os vizinhos
+        self._area = area
+        areas = dict(areas) if (areas) else {}
+        areas_roteador = {area} | set(areas.values())
+        self._abr = len(areas_roteador) > 1
+        self._faixas = {area_faixa: [rede_ip(faixa) for faixa in faixas_area] for area_faixa, faixas_area in (faixas or {}).items()}
+        if (self._abr and AREA_BACKBONE not in areas_roteador):
+            raise ValueError(f"Um roteador em mais de uma área deve participar do backbone (área {AREA_BACKBONE}): {sorted(areas_roteador)}")
+        if (self._abr and snapshot):
+            raise ValueError("Os snapshots da LSDB ainda não suportam roteadores em mais de uma área")
+
+        # Os cálculos de rotas são feitos em uma thread própria, sem bloquear a recepção de pacotes. Os alternativos (LFA) são calculados em
+        # outra thread, agrupando vários cálculos do SPF, e a trava impede que os dois cálculos usem a topologia ao mesmo tempo
+        self._agendador_spf = AgendadorSPF(self.calcular_rotas, *spf_throttle)
+        self._agendador_lfa = AgendadorSPF(self.calcular_alternativos, *LFA_THROTTLE)
+        self._trava_calculos = threading.Lock()
+        if (not self._abr):
+            self._lsdb = LSDB(router_id, self._neighbors_recognized, fib=fib, idade_maxima=idade_maxima_lsa, lfa=lfa)
+            self._lsdb.fib.maximo_caminhos = maximo_caminhos
+            self._lsdb.fib.comprimir = comprimir_fib
+            self._lsdb.agendador = self._agendador_spf
+            self._lsdb.agendador_lfa = self._agendador_lfa
+            self._lsa = LSASender(
+                self._router_id, self._neighbors_recognized,
+                self._neighbors_detected, self._interfaces, self._lsdb, intervalo_atualizacao_lsa,
+                neighbors_formats=self._neighbors_formats, formatos=formatos, canal=self._canal_envio,
+                intervalo_minimo=intervalo_minimo_lsa
+            )
+            self._lsdbs = {area: self._lsdb}
+            self._emissores = {area: self._lsa}
+            self._gerenciador_vizinhos = GerenciadorVizinhos(
+                self._router_id, self._lsa, self._lsdb, custos, intervalo_queda
+            )
+        else:
+            # Um ABR mantém uma LSDB e um emissor de LSA por área, com uma única tabela de rotas e um único agendador dos cálculos
+            # O backbone é calculado por último, já conhecendo os prefixos internos das demais áreas
+            self._lsdbs = {}
+            self._emissores = {}
+            for area_lsdb in sorted(areas_roteador, key=lambda area_lsdb: (area_lsdb == AREA_BACKBONE, area_lsdb)):
+                # Vizinhos reconhecidos da área, que são os gateways das suas rotas
+                neighbors_ip = {}
+                lsdb = LSDB(router_id, neighbors_ip, fib=fib, idade_maxima=idade_maxima_lsa, lfa=lfa, area=area_lsdb,
+                            usar_resumos=(area_lsdb == AREA_BACKBONE))
+                fib = lsdb.fib
+                lsdb.agendador = self._agendador_spf
+                lsdb.agendador_lfa = self._agendador_lfa
+                # Os endereços do roteador são anunciados apenas na área própria (e resumidos nas demais)
+                self._emissores[area_lsdb] = LSASender(
+                    self._router_id, neighbors_ip, {}, self._interfaces if (area_lsdb == area) else [], lsdb,
+                    intervalo_atualizacao_lsa, neighbors_formats=self._neighbors_formats, formatos=formatos, canal=self._canal_envio,
+                    intervalo_minimo=intervalo_minimo_lsa
+                )
+                self._lsdbs[area_lsdb] = lsdb
+            fib.maximo_caminhos = maximo_caminhos
+            fib.comprimir = comprimir_fib
+            self._lsdb = self._lsdbs[area]
+            self._lsa = self._emissores[area]
+            self._gerenciador_vizinhos = GerenciadorVizinhos(
+                self._router_id, self._lsa, self._lsdb, custos, intervalo_queda, emissores=self._emissores, areas=areas,
+                neighbors_detected=self._neighbors_detected, neighbors_recognized=self._neighbors_recognized
+            )
+        # As quedas detectadas pelo BFD removem os vizinhos diretamente, sem aguardar o intervalo de queda dos HELLOs
+        self._bfd = None
+        if (bfd is not None):
+            self._bfd = MonitorBFD(self._router_id, self._gerenciador_vizinhos.remover_vizinhos, *bfd)
+            self._gerenciador_vizinhos.bfd = self._bfd
+
+        self._snapshot = SnapshotLSDB(snapshot, self._lsdb, intervalo_snapshot) if (snapshot) else None
+        self._rastreamento = rastreamento
+        for lsdb in self._lsdbs.values():
+            lsdb.rastreamento = rastreamento
+        self._reinicio_gracioso = reinicio_gracioso
+        self._intervalo_queda = intervalo_queda
+        # Reinício gracioso em andamento: prazo final e vizinhos anteriores ao reinício (None fora de um reinício)
+        self._reinicio = None
+        self._temporizador_reinicio = None
+
+        # Métricas lidas dos contadores dos componentes, expostas (opcionalmente) por um servidor HTTP local
+        self._metricas = Metricas()
+        self.registrar_metricas()
+        self._servidor_metricas = ServidorMetricas(self._metricas, endereco_metricas) if (endereco_metricas is not None) else None
+        # Consultas locais à RIB (rota de um endereço e verificação do kernel)
+        self._servidor_consultas = ServidorConsultas(self, caminho_consultas) if (caminho_consultas) else None
+
+    @property
+    def router_id(self) -> str:
+        return self._router_id
+
+    @property
+    def metricas(self) -> Metricas:
+        return self._metricas
+
+    @property
+    def BUFFER_SIZE(self) -> int:
+        return self._BUFFER_SIZE
+
+    @property
+    def lsdb(self) -> LSDB:
+        return self._lsdb
+
+    @property
+    def lsdbs(self) -> dict[int, LSDB]:
+        """
+        LSDB de cada área do roteador (apenas a da área própria, fora de um ABR)
+        """
+        return dict(self._lsdbs)
+
+    @property
+    def abr(self) -> bool:
+        return self._abr
+
+    @property
+    def agendador_spf(self) -> AgendadorSPF:
+        return self._agendador_spf
+
+    @property
+    def agendador_lfa(self) -> AgendadorSPF:
+        return self._agendador_lfa
+
+    @property
+    def bfd(self) -> MonitorBFD | None:
+        return self._bfd
+
+    @property
+    def snapshot(self) -> SnapshotLSDB | None:
+        return self._snapshot
+
+    @property
+    def rastreamento(self) -> RastreamentoLSA | None:
+        return self._rastreamento
+
+    @property
+    def em_reinicio(self) -> bool:
+        return self._reinicio is not None
+
+    def sincronizado(self, neighbor_id: str) -> bool:
+        """
+        Indica se a LSDB já foi sincronizada com o vizinho (na área do enlace até ele, em um ABR)
+        """
+        return any(emissor.sincronizado(neighbor_id) for emissor in self._emissores.values())
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os contadores de funcionamento do roteador
+
+        Returns:
+            dict: Pacotes HELLO e LSA recebidos, LSAs enviados, cálculos do SPF (e os evitados, sem alterações na LSDB), escritas de rotas e rotas
+                calculadas e instaladas (menos que as calculadas com a compressão)
+                (somados entre as áreas de um ABR)
+        """
+        emissores = self._emissores.values()
+        lsdbs = self._lsdbs.values()
+        return {
+            "hellos_recebidos": self._pacotes_recebidos["HELLO"],
+            "lsas_recebidos": self._pacotes_recebidos["LSA"],
+            "lsas_enviados": sum(lsa.lsas_enviados for lsa in emissores),
+            "lsas_originados": sum(lsa.lsas_originados for lsa in emissores),
+            "lsas_retransmitidos": sum(lsa.lsas_retransmitidos for lsa in emissores),
+            "acks_recebidos": self._pacotes_recebidos["LSACK"],
+            "lsas_solicitados": sum(lsa.lsas_solicitados for lsa in emissores),
+            "execucoes_spf": self._agendador_spf.execucoes,
+            "spf_evitados": sum(lsdb.calculos_evitados for lsdb in lsdbs),
+            "escritas_rotas": self._lsdb.fib.escritas,
+            "rotas_multicaminho": self._lsdb.fib.multicaminhos,
+            "rotas_calculadas": len(self._lsdb.fib.desejadas),
+            "rotas_instaladas": len(self._lsdb.fib.instaladas),
+            "destinos_protegidos": sum(lsdb.protegidos[0] for lsdb in lsdbs),
+            "destinos_alcancaveis": sum(lsdb.protegidos[1] for lsdb in lsdbs),
+            "entradas_lsdb": sum(lsdb.tamanho for lsdb in lsdbs),
+            "pacotes_bfd": self._bfd.estatisticas()["pacotes_enviados"] if (self._bfd is not None) else 0,
+            "snapshots_gravados": self._snapshot.gravacoes if (self._snapshot is not None) else 0,
+        }
+
+    def registrar_metricas(self):
+        """
+        Registra as métricas do roteador: pacotes enviados e recebidos por tipo, resultados dos LSAs recebidos, cálculos do SPF,
+        durações do SPF, dos alternativos e da programação das rotas, e filas de trabalho pendente
+
+        Os contadores das LSDBs e dos emissores de LSA de um ABR são somados entre as áreas, e os histogramas do SPF são separados por área
+        """
+        metricas = self._metricas
+        lsdbs = self._lsdbs.values()
+        emissores = self._emissores.values()
+        fib = self._lsdb.fib
+        metricas.registrar("pacotes_recebidos_total", "counter", "Pacotes recebidos de outros roteadores, por tipo",
+                           lambda: self._pacotes_recebidos, "tipo")
+        metricas.registrar("pacotes_enviados_total", "counter", "Pacotes enviados, por tipo (LSAs originados, encaminhados e retransmitidos)",
+                           lambda: somar_contadores([{"HELLO": self._hello.hellos_enviados}] +
+                                                    [{"LSA": lsa.lsas_enviados, "LSACK": lsa.acks_enviados, **lsa.pacotes_controle} for lsa in emissores]), "tipo")
+        metricas.registrar("pacotes_descartados_total", "counter", "Pacotes descartados na recepção, por motivo",
+                           lambda: self._pacotes_descartados, "motivo")
+        metricas.registrar("lsas_processados_total", "counter", "LSAs recebidos, por resultado (aceito ou descartado por ser igual ou mais antigo que o da LSDB)",
+                           lambda: somar_contadores(lsdb.lsas_processados for lsdb in lsdbs), "resultado")
+        metricas.registrar("lsas_retransmitidos_total", "counter", "LSAs reenviados por falta de confirmação",
+                           lambda: sum(lsa.lsas_retransmitidos for lsa in emissores))
+        metricas.registrar("spf_total", "counter", "Cálculos do SPF, por tipo (evitado: sem alterações na LSDB desde o último cálculo)",
+                           lambda: somar_contadores({**lsdb.execucoes_spf, "evitado": lsdb.calculos_evitados} for lsdb in lsdbs), "tipo")
+        if (self._abr):
+            metricas.registrar_histograma("spf_duracao_segundos", "Duração dos cálculos do SPF (árvore de menores caminhos e próximos pulos)",
+                                          {area: lsdb.duracao_spf for area, lsdb in self._lsdbs.items()}, "area")
+            metricas.registrar_histograma("lfa_duracao_segundos", "Duração dos cálculos dos próximos pulos alternativos (LFA)",
+                                          {area: lsdb.duracao_lfa for area, lsdb in self._lsdbs.items()}, "area")
+        else:
+            metricas.registrar_histograma("spf_duracao_segundos", "Duração dos cálculos do SPF (árvore de menores caminhos e próximos pulos)", self._lsdb.duracao_spf)
+            metricas.registrar_histograma("lfa_duracao_segundos", "Duração dos cálculos dos próximos pulos alternativos (LFA)", self._lsdb.duracao_lfa)
+        metricas.registrar_histograma("programacao_rotas_segundos", "Duração da aplicação de cada lote de rotas no kernel", fib.duracao_aplicacao)
+        metricas.registrar("rotas_escritas_total", "counter", "Rotas escritas no kernel", lambda: fib.escritas)
+        metricas.registrar("rotas_instaladas", "gauge", "Rotas instaladas no kernel", lambda: len(fib.instaladas))
+        metricas.registrar("rotas_calculadas", "gauge", "Rotas calculadas, antes da compressão", lambda: len(fib.desejadas))
+        metricas.registrar("vizinhos", "gauge", "Vizinhos reconhecidos", lambda: len(self._neighbors_recognized))
+        metricas.registrar("entradas_lsdb", "gauge", "Entradas das LSDBs de todas as áreas do roteador", lambda: sum(lsdb.tamanho for lsdb in lsdbs))
+        metricas.registrar("fila_spf", "gauge", "Roteadores alterados aguardando o próximo cálculo do SPF", lambda: sum(lsdb.pendentes for lsdb in lsdbs))
+        metricas.registrar("fila_retransmissao", "gauge", "LSAs aguardando confirmação nas listas de retransmissão", lambda: sum(lsa.pendentes for lsa in emissores))
+        metricas.registrar("fila_confirmacoes", "gauge", "Confirmações aguardando o envio em um LSACK", lambda: sum(lsa.acks_pendentes for lsa in emissores))
+
+    @property
+    def tempos_failover(self) -> list[dict]:
+        """
+        Tempos medidos nas últimas quedas de vizinhos: do último HELLO até a detecção, da detecção até as novas rotas e o total (em segundos)
+        """
+        if (not self._abr):
+            return self._lsdb.tempos_failover
+        return [tempo for lsdb in self._lsdbs.values() for tempo in lsdb.tempos_failover]
+
+    def consultar_rota(self, endereco: str) -> dict | None:
+        """
+        Consulta na RIB a rota de maior prefixo que contém o endereço, com o custo e o caminho do último cálculo da área da rota
+
+        Args:
+            endereco (str): Endereço IPv4 (ex: "192.168.2.10")
+
+        Returns:
+            dict | None: Endereço, prefixo, destino (roteador ou prefixo resumido), área, gateways (IPs), próximos pulos (roteadores), custo,
+                alternativo (LFA), ABR anunciante e caminho, ou None caso nenhuma rota calculada contenha o endereço
+        """
+        encontrado = self._lsdb.fib.consultar(endereco)
+        if (encontrado is None):
+            return None
+        prefixo, chave, gateways = encontrado
+        # Em um ABR, a chave identifica a área da rota (ver LSDB.chave_fib)
+        destino, _, area = chave.rpartition("@") if (self._abr) else (chave, "", "")
+        lsdb = self._lsdbs[int(area)] if (area) else self._lsdb
+        return {
+            "endereco": endereco,
+            "prefixo": prefixo,
+            "destino": destino,
+            "area": lsdb.area if (lsdb.area is not None) else self._area,
+            "gateways": list(gateways),
+            **lsdb.consultar_destino(destino),
+        }
+
+    def verificar_kernel(self) -> list[dict]:
+        """
+        Compara as rotas do kernel com as calculadas (ver TabelaRotas.verificar_kernel), retornando as divergências
+        """
+        return self._lsdb.fib.verificar_kernel()
+
+    def calcular_rotas(self):
+        """
+        Calcula as rotas de todas as áreas do roteador e, em um ABR, atualiza os prefixos resumidos anunciados em cada área
+
+        O backbone de um ABR é calculado por último: os prefixos alcançáveis dentro das demais áreas seguem pelas rotas internas delas,
+        e não pelos resumos anunciados no backbone por outros ABRs
+
+        Sem vizinhos no backbone, o roteador deixa de atuar como ABR (RFC 3509): não anuncia resumos e usa os resumos das demais áreas
+        """
+        with self._trava_calculos:
+            if (not self._abr):
+                self._lsdb.calcular_rotas()
+                return
+
+            backbone_ativo = bool(self._emissores[AREA_BACKBONE].neighbors_ip)
+            for area, lsdb in self._lsdbs.items():
+                lsdb.usar_resumos = (area == AREA_BACKBONE or not backbone_ativo)
+
+            internos = {}
+            for area, lsdb in self._lsdbs.items():
+                if (area == AREA_BACKBONE):
+                    lsdb.prefixos_internos = frozenset(
+                        str(rede_ip(prefixo)) for prefixos in internos.values() for prefixo in prefixos)
+                lsdb.calcular_rotas()
+                internos[area] = lsdb.prefixos_alcancaveis()
+            if (backbone_ativo):
+                self.atualizar_resumos(internos)
+            else:
+                for emissor in self._emissores.values():
+                    emissor.definir_resumos({})
+
+    def calcular_alternativos(self):
+        """
+        Calcula os próximos pulos alternativos (LFA) pendentes de todas as áreas, fora dos cálculos das rotas
+        """
+        with self._trava_calculos:
+            for lsdb in self._lsdbs.values():
+                lsdb.atualizar_alternativos()
+
+    def atualizar_resumos(self, internos: dict[int, dict[str, int]]):
+        """
+        Atualiza os prefixos resumidos que o ABR anuncia em cada área, como os LSAs de resumo (tipo 3) do OSPF:
+        - No backbone, os prefixos internos das demais áreas
+        - Nas demais áreas, os prefixos internos das outras áreas (incluindo o backbone) e os resumos recebidos pelo backbone,
+          exceto os que se sobrepõem aos prefixos da própria área
+
+        Os prefixos contidos em uma faixa configurada para a sua área são substituídos pela faixa, e os prefixos contíguos são agregados,
+        com o maior custo entre os agregados. As faixas de uma área sem vizinhos reconhecidos não são usadas (o ABR isolado da área anuncia
+        apenas os próprios prefixos, e os demais prefixos da faixa seguem pelos outros ABRs, como em um ABR inativo na área da RFC 3509)
+
+        Args:
+            internos (dict[int, dict[str, int]]): Prefixos alcançáveis dentro de cada área, com a distância até cada um
+        """
+        resumidos = self._lsdbs[AREA_BACKBONE].rotas_resumidas
+        for area, emissor in self._emissores.items():
+            componentes = []
+            for origem, prefixos in internos.items():
+                if (origem == area):
+                    continue
+                faixas = self._faixas.get(origem, ()) if (self._emissores[origem].neighbors_ip) else ()
+                for prefixo, custo in prefixos.items():
+                    rede = rede_ip(prefixo)
+                    faixa = next((faixa for faixa in faixas if rede.subnet_of(faixa)), None)
+                    componentes.append((faixa if (faixa is not None) else rede, custo))
+            if (area != AREA_BACKBONE):
+                redes_area = [rede_ip(prefixo) for prefixo in internos[area]]
+                for prefixo, custo in resumidos.items():
+                    rede = rede_ip(prefixo)
+                    if (not any(rede.overlaps(rede_area) for rede_area in redes_area)):
+                        componentes.append((rede, custo))
+            emissor.definir_resumos(agregar_prefixos(componentes))
+
+    @property
+    def canal_envio(self) -> CanalUDP:
+        return self._canal_envio
+
+    @property
+    def canal_recepcao(self) -> CanalUDP | None:
+        return self._canal_recepcao
 
     def receber_pacotes(self):
         """
-        Inicia a escuta de pacotes UDP na porta definida
-        Trata pacotes do tipo HELLO e LSA
+        Inicia a escuta de pacotes UDP na porta definida, recebendo-os em lotes
+        Trata pacotes do tipo HELLO, LSA, LSACK, DBD e LSR
         """
         sock = create_socket()
         # Escuta em todas as interfaces
         sock.bind(("", self._PORTA))
+        # Os buffers de recepção do canal são reaproveitados a cada lote, evitando cópias
+        self._canal_recepcao = CanalUDP(sock, self._tamanho_lote, self._BUFFER_SIZE)
 
         while True:
             try:
-                # Recebe o pacote, convertendo-o em json
-                data, address = sock.recvfrom(self._BUFFER_SIZE)
-                mensagem = data.decode("utf-8")
-                pacote = json.loads(mensagem)
-                # Retorna o tipo do pacote e o id do roteador emissor
-                tipo_pacote = pacote.get("type")
-                sender_id = pacote.get("router_id")
-                # Caso o pacote tenha sido enviado por outro roteador
-                if (sender_id != self._router_id):
-                    # Recebe o ip do emissor
-                    sender_ip = address[0]
+                lote = self._canal_recepcao.receber_lote()
+            except Exception as e:
+                print2(f"Erro ao receber pacote: {e}", NIVEL_ERRO)
+                continue
+
+            for data, address, truncado in lote:
+                self.processar_pacote(data, address, truncado)
+
+    def processar_pacote(self, data: memoryview, address: tuple[str, int], truncado: bool = False):
+        """
+        Processa um pacote recebido, de acordo com seu tipo
+
+        Args:
+            data (memoryview): Bytes do pacote (válidos apenas durante o processamento)
+            address (tuple[str, int]): Tupla (IP, porta) do emissor
+            truncado (bool, opcional): Indica se o pacote era maior que o buffer de recepção
+        """
+        try:
+            # Descarta pacotes maiores que o buffer, que chegariam incompletos
+            if (truncado):
+                self._pacotes_descartados["truncado"] += 1
+                print2(
+                    f"[ERRO] Pacote de {address[0]} descartado: maior que o buffer de {self._BUFFER_SIZE} bytes", NIVEL_ERRO)
+                return
+            rastreamento = self._rastreamento
+            inicio = time.perf_counter() if (rastreamento is not None) else 0.0
+            # Converte o pacote em dicionário (formato binário ou json)
+            pacote = decodificar_pacote(data)
+            # Retorna o tipo do pacote e o id do roteador emissor
+            tipo_pacote = pacote.get("type")
+            sender_id = pacote.get("router_id")
+            # Caso o pacote tenha sido enviado por outro roteador
+            if (sender_id != self._router_id):
+                # Recebe o ip do emissor
+                sender_ip = address[0]
+                if (registrar_pacote()):
                     print2(
-                        f"Pacote {tipo_pacote} recebido de {sender_ip} [{sender_id}]")
+                        f"Pacote {tipo_pacote} recebido de {sender_ip} [{sender_id}]", NIVEL_DEBUG)
 
-                    # Processa o pacote baseado em seu tipo
-                    if (tipo_pacote == "HELLO"):
-                        self._gerenciador_vizinhos.processar_hello(
-                            pacote, sender_ip)
-                    elif (tipo_pacote == "LSA"):
-                        self._gerenciador_vizinhos.processar_lsa(
-                            pacote, sender_ip)
+                if (tipo_pacote in self._pacotes_recebidos):
+                    self._pacotes_recebidos[tipo_pacote] += 1
 
-            except Exception as e:
-                print2(f"Erro ao receber pacote: {e}")
+                # Processa o pacote baseado em seu tipo
+                if (tipo_pacote == "HELLO"):
+                    self._gerenciador_vizinhos.processar_hello(
+                        pacote, sender_ip)
+                elif (tipo_pacote == "LSA"):
+                    if (rastreamento is not None):
+                        rastreamento.registrar("decodificar", inicio, RastreamentoLSA.identificar(pacote), {"formato": formato_dos_dados(data)})
+                    self._gerenciador_vizinhos.processar_lsa(
+                        pacote, sender_ip, data)
+                elif (tipo_pacote == "LSACK"):
+                    self._gerenciador_vizinhos.emissor(sender_id).processar_ack(pacote)
+                elif (tipo_pacote == "DBD"):
+                    self._gerenciador_vizinhos.emissor(sender_id).processar_descricao(pacote, sender_ip)
+                elif (tipo_pacote == "LSR"):
+                    self._gerenciador_vizinhos.emissor(sender_id).processar_pedido(pacote, sender_ip)
+            elif (tipo_pacote == "LSA"):
+                # Cópia de um LSA próprio recebida de um vizinho (ex: originada antes de um reinício), que também precisa ser confirmada
+                self._gerenciador_vizinhos.emissor_por_ip(address[0]).retomar_sequencia(pacote["sequence_number"])
+                self._gerenciador_vizinhos.confirmar_lsa(pacote, address[0], data)
+
+        except Exception as e:
+            self._pacotes_descartados["invalido"] += 1
+            print2(f"Erro ao receber pacote: {e}", NIVEL_ERRO)
 
     def listar_enderecos(self) -> list[dict]:
         """
@@ -531,6 +6102,111 @@ class Roteador:
                             )
         return interfaces_list
 
+    def restaurar_snapshot(self) -> bool:
+        """
+        Inicia um reinício gracioso a partir do snapshot, caso ativado e exista um snapshot válido:
+        - Carrega a LSDB e registra as rotas instaladas antes do reinício, que continuam no kernel
+        - Retoma a numeração dos LSAs próprios e volta a anunciar nos HELLOs os vizinhos anteriores, que mantêm a adjacência
+        - Adia as originações e os cálculos de rotas até a sincronização com os vizinhos anteriores (ou até o prazo do reinício)
+
+        Returns:
+            bool: Indica se o reinício gracioso foi iniciado
+        """
+        if (self._snapshot is None or self._reinicio_gracioso is None):
+            return False
+        restaurado = self._snapshot.carregar()
+        if (restaurado is None):
+            return False
+
+        instante, pacotes, rotas = restaurado
+        # Um snapshot mais antigo que a idade máxima teria todos os LSAs expirados
+        if (relogio() - instante > self._lsdb.idade_maxima):
+            print2(f"[REINÍCIO] Snapshot da LSDB descartado: gravado há {relogio() - instante:.0f} s")
+            return False
+
+        self._lsdb.suspender_calculos()
+        self._lsa.suspender_originacao()
+        self._lsdb.carregar(pacotes)
+        self._lsdb.fib.carregar(rotas)
+
+        vizinhos = {}
+        for pacote in pacotes:
+            if (pacote["router_id"] == self._router_id):
+                self._lsa.retomar_sequencia(pacote["sequence_number"])
+                vizinhos = pacote["links"]
+        # Os vizinhos anteriores são considerados detectados até o prazo de queda, como se seus HELLOs tivessem acabado de chegar
+        for neighbor_id, custo in vizinhos.items():
+            self._neighbors_detected[neighbor_id] = custo
+            self._gerenciador_vizinhos.detector.armar(neighbor_id, self._intervalo_queda)
+
+        self._reinicio = (relogio_monotonico() + self._reinicio_gracioso, list(vizinhos.keys()))
+        print2(
+            f"[REINÍCIO] {len(pacotes)} LSAs e {len(rotas)} rotas restaurados do snapshot. Aguardando a sincronização com {len(vizinhos)} vizinhos")
+        return True
+
+    def verificar_reinicio(self):
+        """
+        Conclui o reinício gracioso quando a LSDB está sincronizada com todos os vizinhos anteriores ainda ativos, ou quando o prazo termina
+        """
+        if (self._reinicio is None):
+            return
+        prazo, vizinhos = self._reinicio
+        # Vizinhos que caíram durante o reinício deixam de ser aguardados
+        pendentes = [
+            neighbor_id for neighbor_id in vizinhos
+            if (neighbor_id in self._neighbors_detected and
+                (neighbor_id not in self._neighbors_recognized or not self.sincronizado(neighbor_id)))
+        ]
+        if (not pendentes):
+            self.concluir_reinicio("LSDB sincronizada com os vizinhos")
+        elif (relogio_monotonico() >= prazo):
+            self.concluir_reinicio(f"prazo esgotado sem a sincronização com {', '.join(pendentes)}")
+
+    def concluir_reinicio(self, motivo: str):
+        """
+        Conclui o reinício gracioso: origina o LSA próprio e recalcula as rotas, alterando no kernel apenas as que mudaram
+        """
+        self._reinicio = None
+        if (self._temporizador_reinicio is not None):
+            self._temporizador_reinicio.cancelar()
+            self._temporizador_reinicio = None
+        print2(f"[REINÍCIO] Reinício gracioso concluído: {motivo}")
+        self._lsa.retomar_originacao()
+        self._lsdb.retomar_calculos()
+
+    def acompanhar_reinicio(self):
+        """
+        Verifica periodicamente a conclusão do reinício gracioso (modo com threads)
+        """
+        while (self._reinicio is not None):
+            time.sleep(INTERVALO_REINICIO)
+            self.verificar_reinicio()
+
+    def verificar_interfaces(self):
+        """
+        Atualiza as interfaces obtidas do sistema, originando um novo LSA caso algum endereço tenha mudado
+        """
+        interfaces = self.listar_enderecos()
+        if (interfaces != self._interfaces):
+            print2("[INTERFACES] Endereços das interfaces alterados")
+            # A lista é compartilhada com os emissores de HELLO e LSA
+            self._interfaces[:] = interfaces
+            self._lsa.originar()
+
+    def monitorar_interfaces(self, intervalo: float = 5):
+        """
+        Verifica as interfaces do sistema periodicamente
+
+        Args:
+            intervalo (float, opcional): Intervalo (em segundos) entre as verificações (Padrão: 5)
+        """
+        while True:
+            time.sleep(intervalo)
+            try:
+                self.verificar_interfaces()
+            except Exception as e:
+                print2(f"[ERRO] Falha ao verificar as interfaces: {e}", NIVEL_ERRO)
+
     def iniciar(self):
         """
         Inicia o funcionamento do roteador:
@@ -538,6 +6214,16 @@ class Roteador:
         - Inicia o envio periódico de pacotes HELLO
         - Mantém o processo ativo com um looping infinito
         """
+        # Threads para os cálculos de rotas e dos alternativos
+        self._agendador_spf.iniciar()
+        self._agendador_lfa.iniciar()
+
+        # Servidores das métricas e das consultas
+        if (self._servidor_metricas is not None):
+            self._servidor_metricas.iniciar()
+        if (self._servidor_consultas is not None):
+            self._servidor_consultas.iniciar()
+
         # Thread para recepção de pacotes
         thread_receptor = threading.Thread(
             target=self.receber_pacotes, daemon=True)
@@ -546,42 +6232,205 @@ class Roteador:
         # Inicia o envio de pacotes HELLO
         self._hello.iniciar()
 
-        thread_quedas = threading.Thread(
-            target=self._gerenciador_vizinhos.verificar_quedas, daemon=True)
-        thread_quedas.start()
+        # Inicia a detecção de quedas dos vizinhos
+        self._gerenciador_vizinhos.detector.iniciar()
+        if (self._bfd is not None):
+            self._bfd.iniciar()
+
+        # Restaura a LSDB do snapshot (reinício gracioso), antes da primeira originação
+        if (self.restaurar_snapshot()):
+            thread_reinicio = threading.Thread(target=self.acompanhar_reinicio, daemon=True)
+            thread_reinicio.start()
+
+        # Inicia a originação de LSAs, o envelhecimento dos LSAs recebidos e as gravações do snapshot e do rastreamento
+        for lsa in self._emissores.values():
+            lsa.iniciar()
+            lsa.lsdb.envelhecimento.iniciar()
+        if (self._snapshot is not None):
+            self._snapshot.iniciar()
+        if (self._rastreamento is not None):
+            self._rastreamento.iniciar()
+        if (self._interfaces_sistema):
+            thread_interfaces = threading.Thread(
+                target=self.monitorar_interfaces, daemon=True)
+            thread_interfaces.start()
 
         # Loop para manter o processo vivo
         while True:
             time.sleep(1)
 
+    async def executar_asyncio(self):
+        """
+        Executa o roteador em um único loop de eventos (asyncio), sem threads:
+        - A recepção de pacotes é feita por um DatagramProtocol
+        - Os envios de HELLO/LSA, a verificação de quedas e os cálculos do SPF são temporizadores do loop
+
+        Todas as alterações de estado (vizinhos, LSDB e rotas) ocorrem no próprio loop, sem concorrência entre threads
+        """
+        loop = asyncio.get_running_loop()
+
+        # Um único socket, usado para recepção e envio (inclusive por broadcast)
+        sock = create_socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+        sock.bind(("", self._PORTA))
+        transporte, _ = await loop.create_datagram_endpoint(
+            lambda: ProtocoloRoteador(self), sock=sock)
+
+        # As sessões BFD usam um socket próprio, na porta do BFD
+        canal_bfd = None
+        if (self._bfd is not None):
+            transporte_bfd, _ = await loop.create_datagram_endpoint(
+                lambda: ProtocoloBFD(self._bfd), local_addr=("0.0.0.0", PORTA_BFD))
+            canal_bfd = CanalTransporte(transporte_bfd)
+
+        # Os servidores das métricas e das consultas atendem no próprio loop
+        if (self._servidor_metricas is not None):
+            await self._servidor_metricas.iniciar_asyncio()
+        if (self._servidor_consultas is not None):
+            await self._servidor_consultas.iniciar_asyncio()
+
+        # O canal criado na inicialização é substituído pelo transporte do loop
+        self._canal_envio.sock.close()
+        self.iniciar_loop(loop, CanalTransporte(transporte), canal_bfd)
+
+        # Mantém o loop ativo
+        await loop.create_future()
+
+    def iniciar_loop(self, loop: asyncio.AbstractEventLoop, canal: CanalUDP, canal_bfd: CanalUDP | None = None):
+        """
+        Inicia o funcionamento do roteador em um loop de eventos, com os envios, a verificação de quedas e o SPF agendados como temporizadores
+        Os pacotes recebidos devem ser entregues pelo loop ao método processar_pacote (e os da porta do BFD ao método processar_pacote do monitor BFD)
+
+        Args:
+            loop (asyncio.AbstractEventLoop): Loop de eventos (ou qualquer objeto com time, call_soon, call_later e call_at, como o loop do simulador)
+            canal (CanalUDP): Canal de envio dos pacotes
+            canal_bfd (CanalUDP | None, opcional): Canal de envio dos pacotes do BFD (Padrão: o mesmo canal dos demais pacotes)
+        """
+        self._canal_envio = canal
+        self._hello.canal = canal
+        self._hello.loop = loop
+        for lsa in self._emissores.values():
+            lsa.canal = canal
+            lsa.loop = loop
+
+        self._agendador_spf = AgendadorSPFLoop(self.calcular_rotas, loop, *self._spf_throttle)
+        self._agendador_lfa = AgendadorSPFLoop(self.calcular_alternativos, loop, *LFA_THROTTLE)
+        for lsdb in self._lsdbs.values():
+            lsdb.agendador = self._agendador_spf
+            lsdb.agendador_lfa = self._agendador_lfa
+            # Os prazos de expiração dos LSAs passam a ser agendados no loop
+            lsdb.envelhecimento = DetectorQuedasLoop(lsdb.remover_expirados, loop)
+
+        # Os prazos de queda dos vizinhos passam a ser agendados no loop
+        self._gerenciador_vizinhos.detector = DetectorQuedasLoop(self._gerenciador_vizinhos.remover_vizinhos, loop)
+
+        # Restaura a LSDB do snapshot (reinício gracioso), antes da primeira originação
+        if (self.restaurar_snapshot()):
+            self._temporizador_reinicio = TemporizadorPeriodico(loop, INTERVALO_REINICIO, self.verificar_reinicio)
+            self._temporizador_reinicio.iniciar()
+
+        # Inicia a originação de LSAs e as gravações do snapshot e do rastreamento
+        for lsa in self._emissores.values():
+            lsa.iniciar()
+        if (self._snapshot is not None):
+            self._snapshot.loop = loop
+            self._snapshot.iniciar()
+        if (self._rastreamento is not None):
+            self._rastreamento.loop = loop
+            self._rastreamento.iniciar()
+        if (self._interfaces_sistema):
+            TemporizadorPeriodico(loop, 5, self.verificar_interfaces).iniciar()
+
+        # Inicia o envio de pacotes HELLO
+        self._hello.iniciar()
+
+        # Inicia as sessões BFD, que são criadas à medida que os vizinhos são reconhecidos
+        if (self._bfd is not None):
+            self._bfd.loop = loop
+            self._bfd.canal = canal_bfd if (canal_bfd is not None) else canal
+            self._bfd.iniciar()
+
+
 class GerenciadorVizinhos:
     """
     Classe responsável por processar pacotes HELLO e LSA, além de gerenciar os vizinhos do roteador
+
+    Em um roteador com enlaces em mais de uma área, cada área tem o seu emissor de LSA e a sua LSDB: os pacotes de cada vizinho
+    (LSA, LSACK, DBD e LSR) são tratados pelo emissor da área do enlace até ele
     """
 
     __slots__ = [
-        "_router_id", "_lsa", "_lsdb", "_neighbors_detected", "_neighbors_recognized", "_neighbors_hello"
+        "_router_id", "_lsa", "_lsdb", "_neighbors_detected", "_neighbors_recognized", "_neighbors_hello", "_neighbors_formats", "_custos",
+        "_detector", "_dead_interval", "_bfd", "_emissores", "_areas", "_ips"
     ]
 
-    def __init__(self, router_id: str, lsa: LSASender, lsdb: LSDB):
+    def __init__(self, router_id: str, lsa: LSASender, lsdb: LSDB, custos: dict[str, int] | None = None, dead_interval: float = 30, emissores: dict[int, LSASender] | None = None, areas: dict[str, int] | None = None, neighbors_detected: dict[str, int] | None = None, neighbors_recognized: dict[str, str] | None = None):
         """
         Inicializa o gerenciador
 
         Args: 
             router_id (str): Identificador único do roteador
-            lsa (LSASender): Emissor de pacotes LSA
+            lsa (LSASender): Emissor de pacotes LSA (da área própria do roteador, quando há mais de uma área)
             lsdb (LSDB): Banco de dados de estado de enlace
+            custos (dict[str, int] | None, opcional): Custo do enlace até cada vizinho (Padrão: variáveis de ambiente CUSTO_*)
+            dead_interval (float, opcional): Intervalo de queda usado para vizinhos cujos HELLOs não anunciam o próprio intervalo (Padrão: 30)
+            emissores (dict[int, LSASender] | None, opcional): Emissor de LSA de cada área do roteador (Padrão: None, uma única área)
+            areas (dict[str, int] | None, opcional): Área do enlace até cada vizinho (Padrão: None, todos na área própria)
+            neighbors_detected (dict[str, int] | None, opcional): Vizinhos detectados em todas as áreas (Padrão: os vizinhos do emissor)
+            neighbors_recognized (dict[str, str] | None, opcional): Vizinhos reconhecidos em todas as áreas (Padrão: os vizinhos do emissor)
         """
         self._router_id = router_id
         self._lsa = lsa
         self._lsdb = lsdb
-        self._neighbors_detected = lsa.neighbors_cost
-        self._neighbors_recognized = lsa.neighbors_ip
+        self._neighbors_detected = neighbors_detected if (neighbors_detected is not None) else lsa.neighbors_cost
+        self._neighbors_recognized = neighbors_recognized if (neighbors_recognized is not None) else lsa.neighbors_ip
+        self._neighbors_formats = lsa.neighbors_formats
+        self._emissores = emissores if (emissores is not None) else {}
+        self._areas = areas if (areas is not None) else {}
+        # Vizinho de cada IP (dos HELLOs recebidos), identificando a área dos LSAs recebidos
+        self._ips = {}
+        # Instante (local) do último HELLO recebido de cada vizinho
         self._neighbors_hello = {}
+        self._custos = custos
+        self._dead_interval = dead_interval
+        # Prazos de queda dos vizinhos, rearmados a cada HELLO
+        self._detector = DetectorQuedas(self.remover_vizinhos)
+        # Monitor BFD opcional, com uma sessão para cada vizinho reconhecido
+        self._bfd = None
+
+    @property
+    def detector(self) -> DetectorQuedas:
+        return self._detector
+
+    @detector.setter
+    def detector(self, detector: DetectorQuedas):
+        self._detector = detector
+
+    @property
+    def bfd(self) -> MonitorBFD | None:
+        return self._bfd
+
+    @bfd.setter
+    def bfd(self, bfd: MonitorBFD | None):
+        self._bfd = bfd
+
+    def emissor(self, neighbor_id: str | None) -> LSASender:
+        """
+        Retorna o emissor de LSA da área do enlace até o vizinho (o da área própria para vizinhos sem área definida)
+        """
+        return self._emissores.get(self._areas.get(neighbor_id), self._lsa)
+
+    def emissor_por_ip(self, ip: str) -> LSASender:
+        """
+        Retorna o emissor de LSA da área do vizinho com o IP informado (o da área própria para IPs desconhecidos)
+        """
+        if (not self._emissores):
+            return self._lsa
+        return self.emissor(self._ips.get(ip))
 
     def processar_hello(self, pacote: dict, sender_ip: str):
         """
-        Processa um pacote HELLO, reconhecendo vizinhos diretos e iniciando a emissão de pacotes LSA para eles, caso aplicável
+        Processa um pacote HELLO, reconhecendo vizinhos diretos e originando um novo LSA caso algum enlace tenha mudado
 
         Args: 
         pacote (dict): Pacote HELLO no formato de dicionário
@@ -590,31 +6439,102 @@ class GerenciadorVizinhos:
         # Retorna o nome do roteador emissor
         sender_id = pacote.get("router_id")
         # Retorna o custo da troca de pacotes entre o roteador e seu vizinho
-        self._neighbors_detected[sender_id] = self.get_custo(
-            self._router_id, sender_id)
+        custo = self.get_custo(self._router_id, sender_id)
+        # Emissor de LSA da área do enlace até o vizinho
+        lsa = self.emissor(sender_id)
+        self._ips[sender_ip] = sender_id
+        # Um vizinho novo (ou com outro custo) altera os enlaces anunciados pelo LSA
+        if (self._neighbors_detected.get(sender_id) != custo):
+            self._neighbors_detected[sender_id] = custo
+            # Com uma única área, os vizinhos do emissor são os próprios vizinhos detectados
+            lsa.neighbors_cost[sender_id] = custo
+            lsa.originar()
         # Retorna os vizinhos conhecidos do roteador emissor
         neighbors = pacote.get("known_neighbors")
+        # Registra os formatos de pacote suportados pelo emissor (roteadores sem o campo entendem apenas json)
+        self._neighbors_formats[sender_id] = pacote.get("formats", [FORMATO_JSON])
 
-        self._neighbors_hello[sender_id] = pacote.get("timestamp")
+        # Rearma o prazo de queda do vizinho com o intervalo anunciado por ele
+        self._neighbors_hello[sender_id] = relogio_monotonico()
+        self._detector.armar(sender_id, pacote.get("dead_interval", self._dead_interval))
 
         # Caso o emissor tenha reconhecido o roteador atual e ainda não tenha sido registrado como vizinhos conhecidos
         if ((self._router_id in neighbors) and (sender_id not in self._neighbors_recognized)):
             # Registra o IP do emissor
             self._neighbors_recognized[sender_id] = sender_ip
-            # Inicia o envio de pacotes LSA com ele
-            self._lsa.iniciar()
+            lsa.neighbors_ip[sender_id] = sender_ip
+            # Inicia a sessão BFD com ele, que passa a detectar sua queda em milissegundos
+            if (self._bfd is not None):
+                self._bfd.adicionar_vizinho(sender_id, sender_ip)
+            # Rotas que dependiam deste vizinho como gateway já podem ser instaladas
+            lsa.lsdb.vizinhos_alterados()
+            # Descreve a ele a LSDB, para que solicite os LSAs que não conhece (as inundações anteriores não serão repetidas)
+            lsa.sincronizar_vizinho(sender_id, sender_ip)
+
+        # Caso o emissor tenha deixado de reconhecer o roteador atual (ex: após considerá-lo inativo), a adjacência é desfeita
+        # Ela é refeita, com uma nova sincronização das LSDBs, quando o emissor voltar a reconhecê-lo
+        elif ((self._router_id not in neighbors) and (sender_id in self._neighbors_recognized)):
+            print2(f"[HELLO] Roteador {sender_id} deixou de reconhecer o roteador atual")
+            del self._neighbors_recognized[sender_id]
+            lsa.neighbors_ip.pop(sender_id, None)
+            lsa.remover_vizinho(sender_id)
+            if (self._bfd is not None):
+                self._bfd.remover_vizinho(sender_id)
+            lsa.lsdb.vizinhos_alterados()
 
-    def processar_lsa(self, pacote: dict, sender_ip: str):
+    def processar_lsa(self, pacote: dict, sender_ip: str, dados: bytes | None = None):
         """
         Processa o pacote LSA, atualizando a LSDB e, caso seja um pacote válido, encaminhando ele para seus vizinhos
 
         Args: 
             pacote (dict): Pacote LSA no formato de dicionário
             sender_ip (str): IP do roteador emissor do pacote
+            dados (bytes | None, opcional): Bytes originais do pacote, reenviados sem nova codificação
         """
-        pacote_valido = self._lsdb.atualizar(pacote)
+        # O LSA pertence à área do enlace por onde chegou
+        emissor = self.emissor_por_ip(sender_ip)
+        rastreamento = self._lsdb.rastreamento
+        if (rastreamento is not None):
+            lsa = RastreamentoLSA.identificar(pacote)
+            inicio = time.perf_counter()
+        pacote_valido = emissor.lsdb.atualizar(pacote)
+        if (rastreamento is not None):
+            inicio = rastreamento.registrar("lsdb.atualizar", inicio, lsa, {"aceito": pacote_valido})
         if (pacote_valido):
-            self._lsa.encaminhar_para_vizinhos(pacote, sender_ip)
+            emissor.encaminhar_para_vizinhos(pacote, sender_ip, dados)
+            if (rastreamento is not None):
+                inicio = rastreamento.registrar("encaminhar", inicio, lsa)
+        self.confirmar_lsa(pacote, sender_ip, dados)
+        if (rastreamento is not None):
+            rastreamento.registrar("confirmar", inicio, lsa)
+
+    def confirmar_lsa(self, pacote: dict, sender_ip: str, dados: bytes | None = None):
+        """
+        Confirma ao emissor o recebimento de um LSA igual ou mais recente que o da LSDB, ou responde com a instância da LSDB caso o LSA recebido seja mais antigo
+
+        Args:
+            pacote (dict): Pacote LSA no formato de dicionário
+            sender_ip (str): IP do roteador emissor do pacote
+            dados (bytes | None, opcional): Bytes originais do pacote, usados para responder no mesmo formato
+        """
+        origem = pacote["router_id"]
+        sequence_number = pacote["sequence_number"]
+        emissor = self.emissor_por_ip(sender_ip)
+        neighbor_id = emissor.vizinho_por_ip(sender_ip)
+        atual = emissor.lsdb.sequencia(origem)
+
+        if (atual is not None and sequence_number < atual):
+            if (neighbor_id is not None):
+                emissor.enviar_instancia(neighbor_id, sender_ip, origem)
+            return
+
+        # Receber do vizinho a mesma instância que estava sendo retransmitida a ele também a confirma (confirmação implícita)
+        if (neighbor_id is not None):
+            emissor.remover_confirmado(neighbor_id, origem, sequence_number)
+        # O LSA também pode ter sido solicitado na sincronização com algum vizinho
+        emissor.atender_pedidos(origem, sequence_number)
+        formato = formato_dos_dados(dados) if (dados is not None) else FORMATO_JSON
+        emissor.confirmar(sender_ip, formato, origem, sequence_number)
 
     def get_custo(self, router_id: str, neighbor_id: str) -> int:
         """
@@ -627,41 +6547,58 @@ class GerenciadorVizinhos:
         Returns:
             int: Custo da rota
         """
+        if (self._custos is not None and neighbor_id in self._custos):
+            return self._custos[neighbor_id]
+
         custo = os.getenv(f"CUSTO_{router_id}_{neighbor_id}_net")
         # Caso não esteja no formato r2_r1, está no formato r1_r2
         if (custo == None):
             custo = os.getenv(f"CUSTO_{neighbor_id}_{router_id}_net")
         return int(custo)
 
-    def verificar_quedas(self, intervalo_hello: int = 10, tolerancia: int = 3):
+    def remover_vizinhos(self, roteadores_caidos: list[str], ultimos_contatos: dict[str, float] | None = None):
         """
-        Verifica periodicamente se algum vizinho deixou de enviar pacotes HELLO, detectando uma possível queda de roteador
+        Remove os vizinhos considerados inativos (pelo detector de quedas dos HELLOs ou pelo BFD), recalculando as rotas
 
         Args:
-            intervalo_hello (int, opcional): Intervalo (em segundos) esperado entre pacotes HELLO (Padrão: 10)
-            tolerancia (int, opcional): Quantidade de intervalos sem HELLO antes de declarar o roteador como inativo (Padrão: 3)
+            roteadores_caidos (list[str]): Vizinhos considerados inativos
+            ultimos_contatos (dict[str, float] | None, opcional): Instante do último pacote recebido de cada vizinho (Padrão: instante do último HELLO)
         """
-        while True:
-            agora = time.time()
-            roteadores_caidos = [
-                router_id for router_id, tempo in self._neighbors_hello.items() if (agora - tempo) > (intervalo_hello * tolerancia)
-            ]
+        deteccao = relogio_monotonico()
+        # Vizinhos removidos de cada área
+        caidos_por_area = {}
+        for router_id in roteadores_caidos:
+            print2(f"[QUEDA] Roteador {router_id} considerado inativo")
+            lsa = self.emissor(router_id)
+            caidos_por_area.setdefault(lsa, []).append(router_id)
 
-            for router_id in roteadores_caidos:
-                print2(f"[QUEDA] Roteador {router_id} considerado inativo")
+            if (router_id in self._neighbors_detected):
+                del self._neighbors_detected[router_id]
+            lsa.neighbors_cost.pop(router_id, None)
 
-                if (router_id in self._neighbors_detected):
-                    del self._neighbors_detected[router_id]
+            if (router_id in self._neighbors_recognized):
+                del self._neighbors_recognized[router_id]
+            lsa.neighbors_ip.pop(router_id, None)
 
-                if (router_id in self._neighbors_recognized):
-                    del self._neighbors_recognized[router_id]
+            # Volta a ser monitorado apenas quando enviar um novo HELLO
+            ultimo_contato = self._neighbors_hello.pop(router_id, deteccao)
+            if (ultimos_contatos is not None):
+                ultimo_contato = ultimos_contatos.get(router_id) or ultimo_contato
+            self._detector.desarmar(router_id)
+            lsa.remover_vizinho(router_id)
+            if (self._bfd is not None):
+                self._bfd.remover_vizinho(router_id)
 
-                if (router_id in self._lsdb._tabela):
-                    del self._lsdb._tabela[router_id]
+            # As rotas que usavam o vizinho passam imediatamente para os caminhos alternativos, antes do recálculo
+            reparo = lsa.lsdb.reparar_rotas(router_id)
+            lsa.lsdb.remover(router_id)
+            lsa.lsdb.registrar_queda(router_id, ultimo_contato, deteccao, reparo)
 
-            self._lsdb.recalcular_rotas(roteadores_caidos)
-
-            time.sleep(1)
+        for lsa, caidos in caidos_por_area.items():
+            lsa.lsdb.vizinhos_alterados()
+            lsa.lsdb.recalcular_rotas(caidos)
+            # Os enlaces até os vizinhos removidos deixam de ser anunciados
+            lsa.originar()
 
 
 def create_socket():
@@ -672,22 +6609,154 @@ def create_socket():
 
 
 if (__name__ == "__main__"):
+    # Consulta ao roteador em execução pelo socket local, no lugar de iniciar um novo roteador
+    # (ex: docker exec r1 python3 roteador.py rota 192.168.2.10, ou docker exec r1 python3 roteador.py verificar)
+    if (len(sys.argv) > 1):
+        caminho_consultas = os.getenv("CONSULTAS", CAMINHO_CONSULTAS)
+        try:
+            resposta = consultar_roteador(caminho_consultas, " ".join(sys.argv[1:]))
+        except OSError as e:
+            print(f"Falha ao consultar o roteador em {caminho_consultas}: {e}")
+            sys.exit(2)
+        print(json.dumps(resposta, indent=2, ensure_ascii=False))
+        sys.exit(1 if ("erro" in resposta or resposta.get("divergencias")) else 0)
+
     # Retorna o nome do roteador, definido por uma variável de ambiente
     router_id = os.getenv("CONTAINER_NAME")
     if (not router_id):
         raise ValueError(
             "CONTAINER_NAME não definido nas variáveis de ambiente")
 
-    # Cria um bloqueio de print, para evitar concorrência e exibição de várias mensagens de uma vez
-    print_lock = threading.Lock()
+    # Registro assíncrono das mensagens, com o nome do container no início de cada uma: as threads apenas enfileiram as mensagens, sem disputar
+    # uma trava nem esperar pela saída. Nível mínimo das mensagens ("debug", "info", "aviso" ou "erro") e amostragem dos pacotes enviados e
+    # recebidos (registrados apenas no nível debug, 1 a cada N pacotes)
+    nivel_registro = NIVEIS_REGISTRO[os.getenv("NIVEL_REGISTRO", "info")]
+    amostragem_pacotes = int(os.getenv("AMOSTRAGEM_PACOTES", "100"))
+    registro = RegistroAssincrono(router_id, nivel_registro, amostragem_pacotes)
+    print2 = registro.registrar
+    registrar_pacote = registro.registrar_pacote
 
-    def print2(string: str):
-        """
-        Função para exibição de uma mensagem, padronizando o formato com o nome do container sendo exibido no início 
-        """
-        with print_lock:
-            print(f"[{router_id}] {string}")
+    # Temporizadores do SPF no formato "atraso_inicial,espera,espera_maxima" (em segundos)
+    spf_throttle = os.getenv("SPF_THROTTLE")
+    if (spf_throttle):
+        spf_throttle = tuple(float(valor) for valor in spf_throttle.split(","))
+    else:
+        spf_throttle = (0.05, 0.2, 5)
+
+    # Formato preferido dos pacotes ("binario" ou "json"). O json é sempre aceito, garantindo a comunicação com qualquer vizinho
+    formato = os.getenv("FORMATO_PACOTES", FORMATO_BINARIO)
+    formatos = [FORMATO_JSON] if (formato == FORMATO_JSON) else FORMATOS_SUPORTADOS
+
+    # Quantidade máxima de datagramas recebidos/enviados por chamada de sistema
+    tamanho_lote = int(os.getenv("TAMANHO_LOTE", "32"))
+
+    # Intervalos de HELLO e de queda no formato "hello/queda" (em segundos), opcionalmente por interface: "10/30,10.10.1.2=0.1/0.4"
+    intervalo_hello, intervalo_queda = 10, 30
+    intervalos = {}
+    for item in filter(None, os.getenv("INTERVALOS_HELLO", "").split(",")):
+        interface, _, valores = item.rpartition("=")
+        hello, queda = (float(valor) for valor in valores.split("/"))
+        if (interface):
+            intervalos[interface] = (hello, queda)
+        else:
+            intervalo_hello, intervalo_queda = hello, queda
+
+    # Temporizadores dos LSAs no formato "intervalo_minimo,atualizacao,idade_maxima" (em segundos)
+    temporizadores_lsa = os.getenv("LSA_TEMPORIZADORES")
+    if (temporizadores_lsa):
+        temporizadores_lsa = tuple(float(valor) for valor in temporizadores_lsa.split(","))
+    else:
+        temporizadores_lsa = (1, 1800, 3600)
+
+    # Sessões BFD com os vizinhos no formato "intervalo,multiplicador" (em segundos, por exemplo "0.05,3"). Vazio desativa o BFD
+    bfd = None
+    if (os.getenv("BFD")):
+        intervalo_bfd, multiplicador_bfd = os.getenv("BFD").split(",")
+        bfd = (float(intervalo_bfd), int(multiplicador_bfd))
+
+    # Snapshot da LSDB no formato "caminho,intervalo" (em segundos, por exemplo "/compartilhado/lsdb_r1.bin,30"). Vazio desativa os snapshots
+    snapshot, intervalo_snapshot = None, 30
+    if (os.getenv("SNAPSHOT_LSDB")):
+        snapshot, _, intervalo = os.getenv("SNAPSHOT_LSDB").partition(",")
+        if (intervalo):
+            intervalo_snapshot = float(intervalo)
+
+    # Prazo máximo (em segundos) do reinício gracioso a partir do snapshot. Vazio reinicia com a LSDB vazia
+    reinicio_gracioso = float(os.getenv("REINICIO_GRACIOSO")) if (os.getenv("REINICIO_GRACIOSO")) else None
+
+    # Quantidade máxima de próximos pulos de mesmo custo (ECMP) em cada rota. 1 instala apenas um caminho por destino
+    maximo_caminhos = int(os.getenv("MAXIMO_CAMINHOS", "4"))
+
+    # Compressão das rotas instaladas no kernel (prefixos contíguos com os mesmos próximos pulos unidos em um prefixo maior). "0" desativa
+    comprimir_fib = os.getenv("COMPRIMIR_FIB", "1") != "0"
+
+    # Pré-cálculo dos próximos pulos alternativos livres de laços (LFA). "0" desativa
+    lfa = os.getenv("LFA", "1") != "0"
+
+    # Endereço do servidor das métricas (formato do Prometheus) no formato "porta" ou "ip:porta" (por padrão, apenas local). Vazio desativa o servidor
+    endereco_metricas = None
+    if (os.getenv("METRICAS")):
+        ip_metricas, _, porta_metricas = os.getenv("METRICAS").rpartition(":")
+        endereco_metricas = (ip_metricas or "127.0.0.1", int(porta_metricas))
+
+    # Caminho do socket local das consultas à RIB ("rota <endereço>" e "verificar"). "0" desativa o servidor
+    caminho_consultas = os.getenv("CONSULTAS", CAMINHO_CONSULTAS)
+    caminho_consultas = None if (caminho_consultas == "0") else caminho_consultas
+
+    # Rastreamento das etapas de processamento dos LSAs no formato "caminho,intervalo" (em segundos, por exemplo "/compartilhado/rastreamento_r1.json,10"),
+    # gravado no formato de eventos do Chrome (chrome://tracing, Perfetto). Vazio desativa o rastreamento
+    rastreamento = None
+    if (os.getenv("RASTREAMENTO")):
+        caminho_rastreamento, _, intervalo = os.getenv("RASTREAMENTO").partition(",")
+        rastreamento = RastreamentoLSA(router_id, caminho=caminho_rastreamento, intervalo=float(intervalo) if (intervalo) else 10)
+
+    # Áreas (OSPF): área própria do roteador, área de cada enlace (variáveis AREA_<roteador>_<vizinho>_net, como as de custo, apenas quando
+    # diferente da área própria) e faixas de endereços de cada área resumidas por um ABR no formato "0=10.10.0.0/16,192.168.0.0/22;1=10.11.0.0/16"
+    area = int(os.getenv("AREA", str(AREA_BACKBONE)))
+    areas = {}
+    for variavel, valor in os.environ.items():
+        if (not (variavel.startswith("AREA_") and variavel.endswith("_net"))):
+            continue
+        enlace = variavel[len("AREA_"):-len("_net")]
+        if (enlace.startswith(f"{router_id}_")):
+            areas[enlace[len(router_id) + 1:]] = int(valor)
+        elif (enlace.endswith(f"_{router_id}")):
+            areas[enlace[:-len(router_id) - 1]] = int(valor)
+    faixas = {}
+    for item in filter(None, os.getenv("FAIXAS_AREAS", "").split(";")):
+        area_faixas, _, redes = item.partition("=")
+        faixas[int(area_faixas)] = [rede for rede in redes.split(",") if rede]
+
+    # Perfil de execução no formato "modo,caminho[,intervalo]" (modo "cprofile" ou "amostragem", intervalo entre as gravações em segundos,
+    # por exemplo "cprofile,/compartilhado/perfil_r1.prof"). Vazio desativa o perfil
+    perfil = None
+    if (os.getenv("PERFIL")):
+        modo_perfil, caminho_perfil, *intervalo = os.getenv("PERFIL").split(",")
+        perfil = PerfilExecucao(modo_perfil, caminho_perfil, float(intervalo[0]) if (intervalo) else 30)
+
+    # Modelo de execução: "threads" (uma thread por tarefa) ou "asyncio" (um único loop de eventos)
+    modo_execucao = os.getenv("MODO_EXECUCAO", "threads")
 
     # Executa o algoritmo de roteador
-    roteador = Roteador(router_id)
-    roteador.iniciar()
+    roteador = Roteador(router_id, spf_throttle=spf_throttle, formatos=formatos, tamanho_lote=tamanho_lote,
+                        intervalo_hello=intervalo_hello, intervalo_queda=intervalo_queda, intervalos=intervalos, bfd=bfd, temporizadores_lsa=temporizadores_lsa,
+                        snapshot=snapshot, intervalo_snapshot=intervalo_snapshot, reinicio_gracioso=reinicio_gracioso, maximo_caminhos=maximo_caminhos, comprimir_fib=comprimir_fib, lfa=lfa,
+                        endereco_metricas=endereco_metricas, caminho_consultas=caminho_consultas, rastreamento=rastreamento, area=area, areas=areas, faixas=faixas)
+    roteador.metricas.registrar("registro_fila", "gauge", "Mensagens aguardando a escrita do registro", lambda: registro.pendentes)
+    roteador.metricas.registrar("registro_descartadas_total", "counter", "Mensagens descartadas com a fila do registro cheia", lambda: registro.descartadas)
+
+    # O perfil é iniciado antes das threads do roteador (e do registro), que passam a ser perfiladas desde a criação
+    if (perfil is not None):
+        perfil.iniciar()
+
+    if (modo_execucao == "asyncio"):
+        async def executar_asyncio():
+            # As mensagens passam a ser escritas por um temporizador do próprio loop
+            registro.loop = asyncio.get_running_loop()
+            registro.iniciar()
+            await roteador.executar_asyncio()
+
+        asyncio.run(executar_asyncio())
+    else:
+        registro.iniciar()
+        roteador.iniciar()
@@ -0,0 +1,946 @@
+import os
+import sys
+import csv
+import json
+import time
+import heapq
+import random
+import argparse
+import tempfile
+import ipaddress
+
+# Permite importar o roteador.py (pasta roteador)
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(RAIZ, "roteador"))
+
+import roteador as modulo_roteador
+from roteador import Roteador, TabelaRotas, TrieRotas, RastreamentoLSA, FORMATOS_SUPORTADOS, FORMATO_JSON, PORTA_BFD, NIVEL_INFO
+
+
+class Evento:
+    """
+    Evento agendado no loop simulado (compatível com o asyncio.Handle usado pelos temporizadores do roteador)
+    """
+
+    __slots__ = ["quando", "funcao", "args", "dono", "cancelado"]
+
+    def __init__(self, quando: float, funcao, args: tuple, dono: str | None):
+        self.quando = quando
+        self.funcao = funcao
+        self.args = args
+        self.dono = dono
+        self.cancelado = False
+
+    def cancel(self):
+        self.cancelado = True
+
+
+class LoopSimulado:
+    """
+    Loop de eventos discretos com relógio virtual, compartilhado por todos os roteadores da simulação
+
+    O tempo avança diretamente para o próximo evento, permitindo simular minutos de funcionamento da rede em poucos segundos
+    """
+
+    __slots__ = ["_agora", "_fila", "_sequencia", "_eventos", "_roteador_atual", "_parados"]
+
+    def __init__(self):
+        self._agora = 0.0
+        # Heap de tuplas (instante, sequência, evento). A sequência mantém a ordem de agendamento nos empates
+        self._fila = []
+        self._sequencia = 0
+        self._eventos = 0
+        # Roteador dono do evento em execução
+        self._roteador_atual = None
+        # Roteadores parados (seus eventos são descartados)
+        self._parados = set()
+
+    @property
+    def eventos(self) -> int:
+        return self._eventos
+
+    @property
+    def roteador_atual(self) -> str | None:
+        return self._roteador_atual
+
+    def time(self) -> float:
+        return self._agora
+
+    def agendar(self, quando: float, funcao, args: tuple, dono: str | None) -> Evento:
+        """
+        Agenda a execução de uma função em um instante do relógio virtual
+
+        Args:
+            quando (float): Instante da execução
+            funcao (Callable): Função executada
+            args (tuple): Argumentos da função
+            dono (str | None): Roteador ao qual o evento pertence
+
+        Returns:
+            Evento: Evento agendado, que pode ser cancelado
+        """
+        evento = Evento(max(quando, self._agora), funcao, args, dono)
+        self._sequencia += 1
+        heapq.heappush(self._fila, (evento.quando, self._sequencia, evento))
+        return evento
+
+    def parar(self, router_id: str):
+        """
+        Para um roteador, descartando todos os seus eventos pendentes e futuros
+        """
+        self._parados.add(router_id)
+
+    def parado(self, router_id: str) -> bool:
+        return router_id in self._parados
+
+    def retomar(self, router_id: str):
+        """
+        Volta a executar os eventos de um roteador parado (ex: após um reinício). Os eventos agendados antes da parada continuam descartados
+        """
+        for _, _, evento in self._fila:
+            if (evento.dono == router_id):
+                evento.cancelado = True
+        self._parados.discard(router_id)
+
+    def executar_ate(self, instante: float):
+        """
+        Executa os eventos em ordem até o instante informado, avançando o relógio virtual
+
+        Args:
+            instante (float): Instante final da execução
+        """
+        fila = self._fila
+        while (fila and fila[0][0] <= instante):
+            quando, _, evento = heapq.heappop(fila)
+            if (evento.cancelado or evento.dono in self._parados):
+                continue
+            self._agora = quando
+            self._roteador_atual = evento.dono
+            self._eventos += 1
+            evento.funcao(*evento.args)
+        self._roteador_atual = None
+        self._agora = max(self._agora, instante)
+
+
+class LoopRoteador:
+    """
+    Visão do loop simulado para um único roteador: os eventos agendados pelo roteador passam a pertencer a ele
+
+    Implementa a parte da interface do asyncio.AbstractEventLoop usada pelos temporizadores do roteador
+    """
+
+    __slots__ = ["_loop", "_router_id"]
+
+    def __init__(self, loop: LoopSimulado, router_id: str):
+        self._loop = loop
+        self._router_id = router_id
+
+    def time(self) -> float:
+        return self._loop.time()
+
+    def call_soon(self, funcao, *args) -> Evento:
+        return self._loop.agendar(self._loop.time(), funcao, args, self._router_id)
+
+    def call_later(self, atraso: float, funcao, *args) -> Evento:
+        return self._loop.agendar(self._loop.time() + atraso, funcao, args, self._router_id)
+
+    def call_at(self, quando: float, funcao, *args) -> Evento:
+        return self._loop.agendar(quando, funcao, args, self._router_id)
+
+
+class RedeSimulada:
+    """
+    Transporte em memória entre os roteadores simulados, com latência e perda de pacotes configuráveis
+
+    Os pacotes são entregues apenas entre roteadores de um mesmo enlace (unicast para o IP do vizinho ou broadcast do enlace)
+    """
+
+    __slots__ = [
+        "_loop", "_latencia", "_variacao", "_perda", "_aleatorio", "_roteadores", "_destinos", "_ip_origem",
+        "_enviados", "_entregues", "_perdidos"
+    ]
+
+    def __init__(self, loop: LoopSimulado, latencia: float = 0.005, variacao: float = 0.0, perda: float = 0.0, semente: int | None = None):
+        """
+        Inicializa uma nova rede
+
+        Args:
+            loop (LoopSimulado): Loop onde as entregas são agendadas
+            latencia (float, opcional): Latência (em segundos) de cada enlace (Padrão: 0.005)
+            variacao (float, opcional): Variação máxima (em segundos) somada aleatoriamente à latência (Padrão: 0)
+            perda (float, opcional): Probabilidade de perda de cada pacote, entre 0 e 1 (Padrão: 0)
+            semente (int | None, opcional): Semente do gerador aleatório, tornando a simulação reproduzível
+        """
+        self._loop = loop
+        self._latencia = latencia
+        self._variacao = variacao
+        self._perda = perda
+        self._aleatorio = random.Random(semente)
+        # Roteador de cada ID
+        self._roteadores = {}
+        # Roteadores alcançados por cada IP de destino (IP de interface ou broadcast de um enlace)
+        self._destinos = {}
+        # IP de origem usado por cada roteador ao enviar para um IP de destino: chave (roteador, IP de destino)
+        self._ip_origem = {}
+        self._enviados = 0
+        self._entregues = 0
+        self._perdidos = 0
+
+    @property
+    def enviados(self) -> int:
+        return self._enviados
+
+    @property
+    def entregues(self) -> int:
+        return self._entregues
+
+    @property
+    def perdidos(self) -> int:
+        return self._perdidos
+
+    def registrar_roteador(self, roteador: Roteador):
+        self._roteadores[roteador.router_id] = roteador
+
+    def conectar(self, origem: str, ip_origem: str, destino: str, ip_destino: str, broadcast: str):
+        """
+        Registra um enlace ponto a ponto entre dois roteadores
+
+        Args:
+            origem (str): ID do primeiro roteador
+            ip_origem (str): IP do primeiro roteador no enlace
+            destino (str): ID do segundo roteador
+            ip_destino (str): IP do segundo roteador no enlace
+            broadcast (str): Endereço de broadcast do enlace
+        """
+        self._destinos[ip_origem] = [origem]
+        self._destinos[ip_destino] = [destino]
+        self._destinos[broadcast] = [origem, destino]
+        self._ip_origem[(origem, ip_destino)] = ip_origem
+        self._ip_origem[(origem, broadcast)] = ip_origem
+        self._ip_origem[(destino, ip_origem)] = ip_destino
+        self._ip_origem[(destino, broadcast)] = ip_destino
+
+    def enviar(self, remetente: str, dados: bytes, endereco: tuple[str, int]):
+        """
+        Envia um pacote, agendando sua entrega para cada roteador alcançado pelo IP de destino
+
+        Args:
+            remetente (str): ID do roteador emissor
+            dados (bytes): Dados do pacote
+            endereco (tuple[str, int]): Tupla (IP, porta) de destino
+        """
+        ip, porta = endereco
+        ip_origem = self._ip_origem.get((remetente, ip))
+        # Destino fora dos enlaces do roteador
+        if (ip_origem is None):
+            return
+
+        for destino in self._destinos[ip]:
+            if (destino == remetente):
+                continue
+            self._enviados += 1
+            if (self._perda and self._aleatorio.random() < self._perda):
+                self._perdidos += 1
+                continue
+            atraso = self._latencia
+            if (self._variacao):
+                atraso += self._aleatorio.random() * self._variacao
+            self._loop.agendar(self._loop.time() + atraso, self.entregar,
+                               (destino, dados, (ip_origem, porta)), destino)
+
+    def entregar(self, destino: str, dados: bytes, endereco: tuple[str, int]):
+        """
+        Entrega um pacote ao roteador de destino (os pacotes da porta do BFD são entregues ao seu monitor BFD)
+        """
+        self._entregues += 1
+        roteador = self._roteadores[destino]
+        if (endereco[1] == PORTA_BFD):
+            if (roteador.bfd is not None):
+                roteador.bfd.processar_pacote(memoryview(dados), endereco)
+            return
+        roteador.processar_pacote(memoryview(dados), endereco)
+
+
+class CanalSimulado:
+    """
+    Canal de envio de um roteador simulado, com a mesma interface de envio do CanalUDP
+    """
+
+    __slots__ = ["_rede", "_router_id", "_loop", "_pacotes_enviados", "_chamadas_envio"]
+
+    def __init__(self, rede: RedeSimulada, router_id: str, loop: LoopSimulado):
+        self._rede = rede
+        self._router_id = router_id
+        self._loop = loop
+        self._pacotes_enviados = 0
+        self._chamadas_envio = 0
+
+    @property
+    def sock(self) -> None:
+        # Não há socket real na simulação
+        return None
+
+    def estatisticas(self) -> dict:
+        return {
+            "pacotes_enviados": self._pacotes_enviados,
+            "chamadas_envio": self._chamadas_envio,
+            "pacotes_por_chamada_envio": self._pacotes_enviados / max(self._chamadas_envio, 1),
+        }
+
+    def enviar(self, dados: bytes, endereco: tuple[str, int]):
+        self.enviar_lote([(dados, endereco)])
+
+    def enviar_lote(self, mensagens: list[tuple[bytes, tuple[str, int]]]) -> dict[int, OSError]:
+        # Roteadores parados não enviam pacotes
+        if (self._loop.parado(self._router_id)):
+            return {}
+        self._chamadas_envio += 1
+        for dados, endereco in mensagens:
+            # Os dados podem apontar para o buffer do pacote recebido, sendo copiados antes da entrega
+            self._rede.enviar(self._router_id, bytes(dados), endereco)
+            self._pacotes_enviados += 1
+        return {}
+
+
+class TabelaRotasSimulada(TabelaRotas):
+    """
+    Tabela de rotas que registra as rotas em memória, no lugar do `ip route` do kernel
+
+    As rotas "instaladas" também são mantidas em uma árvore de prefixos, o plano de dados da simulação: os pacotes de cada roteador
+    seguem a rota de maior prefixo, como no kernel
+    """
+
+    __slots__ = ["_rotas", "_plano_dados", "_loop", "_ultima_escrita"]
+
+    def __init__(self, router_id: str, loop: LoopSimulado):
+        super().__init__(router_id)
+        self._loop = loop
+        # Rotas "instaladas": a chave é o prefixo e o valor é a tupla com os IPs dos gateways
+        self._rotas = {}
+        self._plano_dados = TrieRotas()
+        self._ultima_escrita = None
+
+    @property
+    def rotas(self) -> dict[str, tuple[str, ...]]:
+        return self._rotas
+
+    @property
+    def plano_dados(self) -> TrieRotas:
+        return self._plano_dados
+
+    def restaurar(self, rotas: dict[str, tuple[str, ...]]):
+        """
+        Restaura as rotas "instaladas" no kernel (ex: mantidas durante o reinício do roteador)
+        """
+        for prefixo, gateways in rotas.items():
+            self._rotas[prefixo] = gateways
+            self._plano_dados.inserir(prefixo, gateways)
+
+    def ler_kernel(self) -> TrieRotas:
+        return self._plano_dados
+
+    @property
+    def ultima_escrita(self) -> float | None:
+        return self._ultima_escrita
+
+    def executar_lote(self, linhas: list[str]) -> set[int]:
+        for linha in linhas:
+            partes = linha.split()
+            if (partes[1] == "del"):
+                self._rotas.pop(partes[2], None)
+                self._plano_dados.remover(partes[2])
+            else:
+                # "route replace <prefixo> via <gateway>" ou, com vários caminhos, "... nexthop via <gateway> nexthop via <gateway>"
+                self._rotas[partes[2]] = tuple(partes[indice + 1] for indice, parte in enumerate(partes) if parte == "via")
+                self._plano_dados.inserir(partes[2], self._rotas[partes[2]])
+        self._ultima_escrita = self._loop.time()
+        return set()
+
+
+class Simulador:
+    """
+    Executa vários roteadores em um único processo, com rede, relógio e tabelas de rotas simulados
+    """
+
+    __slots__ = [
+        "_loop", "_rede", "_conexoes", "_roteadores", "_fibs", "_dono_ip", "_prefixo_hosts", "_vizinhos", "_ativos", "_verbose",
+        "_distancias", "_parametros", "_multiarea", "_enderecos_hosts"
+    ]
+
+    def __init__(self, conexoes: list[tuple[str, str, int]], latencia: float = 0.005, variacao: float = 0.0, perda: float = 0.0, semente: int | None = None, formatos: list[str] = FORMATOS_SUPORTADOS, spf_throttle: tuple[float, float, float] = (0.05, 0.2, 5), intervalo_hello: float = 10, intervalo_queda: float = 30, bfd: tuple[float, int] | None = None, intervalo_snapshot: float | None = None, reinicio_gracioso: float | None = None, maximo_caminhos: int = 4, comprimir_fib: bool = True, lfa: bool = True, rastreamento: bool = False, verbose: bool = False, areas: dict[tuple[str, str], int] | None = None):
+        """
+        Inicializa a simulação, criando os roteadores e enlaces da topologia
+
+        Args:
+            conexoes (list[tuple[str, str, int]]): Lista de tuplas (roteador de origem, roteador de destino, custo) da topologia
+            latencia (float, opcional): Latência (em segundos) de cada enlace (Padrão: 0.005)
+            variacao (float, opcional): Variação máxima (em segundos) somada aleatoriamente à latência (Padrão: 0)
+            perda (float, opcional): Probabilidade de perda de cada pacote, entre 0 e 1 (Padrão: 0)
+            semente (int | None, opcional): Semente dos geradores aleatórios, tornando a simulação reproduzível
+            formatos (list[str], opcional): Formatos de pacote suportados pelos roteadores (Padrão: FORMATOS_SUPORTADOS)
+            spf_throttle (tuple[float, float, float], opcional): Temporizadores do SPF de cada roteador (Padrão: (0.05, 0.2, 5))
+            intervalo_hello (float, opcional): Intervalo (em segundos) entre os HELLOs de cada roteador (Padrão: 10)
+            intervalo_queda (float, opcional): Intervalo (em segundos) sem HELLOs após o qual um vizinho é considerado inativo (Padrão: 30)
+            bfd (tuple[float, int] | None, opcional): Intervalo (em segundos) e multiplicador de detecção das sessões BFD (Padrão: None, sem BFD)
+            intervalo_snapshot (float | None, opcional): Intervalo (em segundos) entre os snapshots da LSDB de cada roteador, gravados em um diretório temporário (Padrão: None, sem snapshots)
+            reinicio_gracioso (float | None, opcional): Prazo (em segundos) do reinício gracioso dos roteadores reiniciados, a partir dos snapshots (Padrão: None, reinício com a LSDB vazia)
+            maximo_caminhos (int, opcional): Quantidade máxima de próximos pulos de mesmo custo (ECMP) em cada rota (Padrão: 4)
+            comprimir_fib (bool, opcional): Instala em cada roteador o menor conjunto de prefixos equivalente às rotas calculadas (Padrão: True)
+            lfa (bool, opcional): Pré-calcula os próximos pulos alternativos livres de laços (LFA) de cada roteador (Padrão: True)
+            rastreamento (bool, opcional): Rastreia as etapas de processamento dos LSAs em cada roteador, mantendo os eventos em memória (Padrão: False)
+            verbose (bool, opcional): Exibe as mensagens dos roteadores (Padrão: False)
+            areas (dict[tuple[str, str], int] | None, opcional): Área de cada enlace (origem, destino), como as definidas pelo compose.py.
+                Com mais de uma área, cada área recebe faixas próprias de endereços, resumidas pelos ABRs (Padrão: None, uma única área)
+        """
+        self._loop = LoopSimulado()
+        self._rede = RedeSimulada(self._loop, latencia, variacao, perda, semente)
+        self._conexoes = conexoes
+        self._verbose = verbose
+        self._roteadores = {}
+        self._fibs = {}
+        # Roteador dono de cada IP de interface
+        self._dono_ip = {}
+        # Rede de hosts de cada roteador
+        self._prefixo_hosts = {}
+        # Endereço (inteiro) da rede de hosts de cada roteador, buscado no plano de dados
+        self._enderecos_hosts = {}
+        # Vizinhos de cada roteador e o custo do enlace até eles
+        self._vizinhos = {}
+        self._distancias = None
+        # Parâmetros de criação de cada roteador, reaproveitados quando ele é reiniciado
+        self._parametros = {}
+        diretorio_snapshots = tempfile.mkdtemp(prefix="lsdb_") if (intervalo_snapshot) else None
+
+        # Os roteadores passam a usar o relógio virtual e as mensagens identificam o roteador em execução
+        modulo_roteador.relogio = self._loop.time
+        modulo_roteador.relogio_monotonico = self._loop.time
+        modulo_roteador.print2 = self.print2
+        modulo_roteador.registrar_pacote = self.registrar_pacote
+
+        # Plano de endereçamento (igual ao do compose.py, estendido para mais de 255 redes):
+        # enlace k em 10.x.y.0/24 (.2 e .3) e rede de hosts do roteador n em 172.16.0.0/12
+        # Com mais de uma área, os dois blocos são divididos em faixas alinhadas, uma por área
+        self._multiarea = bool(areas) and len(set(areas.values())) > 1
+        bits_areas = max(1, max(areas.values()).bit_length()) if (self._multiarea) else 0
+        blocos_enlaces = list(ipaddress.ip_network("10.0.0.0/8").subnets(prefixlen_diff=bits_areas))
+        blocos_hosts = list(ipaddress.ip_network("172.16.0.0/12").subnets(prefixlen_diff=bits_areas))
+        redes_enlaces = [bloco.subnets(new_prefix=24) for bloco in blocos_enlaces]
+        redes_hosts = [bloco.subnets(new_prefix=24) for bloco in blocos_hosts]
+        faixas = {area: [str(blocos_enlaces[area]), str(blocos_hosts[area])] for area in set(areas.values())} if (self._multiarea) else None
+
+        interfaces = {}
+        for origem, destino, custo in conexoes:
+            rede = next(redes_enlaces[areas[(origem, destino)] if (self._multiarea) else 0])
+            ip_origem, ip_destino = str(rede.network_address + 2), str(rede.network_address + 3)
+            broadcast = str(rede.broadcast_address)
+            interfaces.setdefault(origem, []).append({"address": ip_origem, "broadcast": broadcast})
+            interfaces.setdefault(destino, []).append({"address": ip_destino, "broadcast": broadcast})
+            self._vizinhos.setdefault(origem, {})[destino] = custo
+            self._vizinhos.setdefault(destino, {})[origem] = custo
+            self._dono_ip[ip_origem] = origem
+            self._dono_ip[ip_destino] = destino
+            self._rede.conectar(origem, ip_origem, destino, ip_destino, broadcast)
+
+        for indice, router_id in enumerate(sorted(interfaces.keys()), 1):
+            parametros_areas = {}
+            if (self._multiarea):
+                from compose import areas_roteador
+
+                # A rede de hosts pertence à área própria do roteador
+                area, enlaces = areas_roteador(router_id, areas)
+                parametros_areas = {
+                    "area": area, "faixas": faixas,
+                    "areas": {vizinho: area_enlace for vizinho, area_enlace in enlaces.items() if area_enlace != area},
+                }
+            prefixo = str(next(redes_hosts[parametros_areas.get("area", 0)]))
+            self._prefixo_hosts[router_id] = prefixo
+            interfaces[router_id].append({"address": prefixo})
+
+            self._parametros[router_id] = {
+                "spf_throttle": spf_throttle, "formatos": formatos, "interfaces": interfaces[router_id], "custos": self._vizinhos[router_id],
+                "intervalo_hello": intervalo_hello, "intervalo_queda": intervalo_queda, "bfd": bfd,
+                "snapshot": os.path.join(diretorio_snapshots, f"{router_id}.lsdb") if (diretorio_snapshots) else None,
+                "intervalo_snapshot": intervalo_snapshot or 30, "reinicio_gracioso": reinicio_gracioso, "maximo_caminhos": maximo_caminhos,
+                "comprimir_fib": comprimir_fib, "lfa": lfa,
+                # Cada roteador é um processo no rastreamento, mantido quando ele é reiniciado
+                "rastreamento": RastreamentoLSA(router_id, pid=indice) if (rastreamento) else None,
+                **parametros_areas,
+            }
+            self.criar_roteador(router_id, TabelaRotasSimulada(router_id, self._loop))
+
+        # Os roteadores são iniciados em instantes aleatórios do primeiro segundo, evitando que todos enviem HELLOs ao mesmo tempo
+        aleatorio = random.Random(semente)
+        for router_id, roteador in self._roteadores.items():
+            loop_roteador = LoopRoteador(self._loop, router_id)
+            loop_roteador.call_at(aleatorio.random(), roteador.iniciar_loop,
+                                  loop_roteador, roteador.canal_envio)
+
+    @property
+    def loop(self) -> LoopSimulado:
+        return self._loop
+
+    @property
+    def rede(self) -> RedeSimulada:
+        return self._rede
+
+    @property
+    def roteadores(self) -> dict[str, Roteador]:
+        return self._roteadores
+
+    @property
+    def fibs(self) -> dict[str, TabelaRotasSimulada]:
+        return self._fibs
+
+    @property
+    def ativos(self) -> list[str]:
+        return [router_id for router_id in self._roteadores if not self._loop.parado(router_id)]
+
+    def print2(self, string: str, nivel: int = NIVEL_INFO):
+        """
+        Exibe as mensagens dos roteadores (apenas no modo verbose, em todos os níveis), com o instante virtual e o roteador em execução
+        """
+        if (self._verbose):
+            print(f"{self._loop.time():10.3f} [{self._loop.roteador_atual}] {string}")
+
+    def registrar_pacote(self) -> bool:
+        """
+        Indica se os pacotes enviados e recebidos são exibidos (todos no modo verbose, sem amostragem)
+        """
+        return self._verbose
+
+    def executar_ate(self, instante: float):
+        """
+        Executa a simulação até o instante (virtual) informado
+        """
+        self._loop.executar_ate(instante)
+
+    def criar_roteador(self, router_id: str, fib: TabelaRotasSimulada) -> Roteador:
+        """
+        Cria um roteador da topologia, com a tabela de rotas informada, e o registra na rede simulada
+        """
+        canal = CanalSimulado(self._rede, router_id, self._loop)
+        roteador = Roteador(router_id, fib=fib, canal=canal, **self._parametros[router_id])
+        self._roteadores[router_id] = roteador
+        self._fibs[router_id] = fib
+        self._rede.registrar_roteador(roteador)
+        return roteador
+
+    def reiniciar(self, router_id: str):
+        """
+        Simula o reinício de um roteador parado: um novo processo é iniciado, enquanto as rotas do kernel permanecem instaladas
+        (com reinício gracioso, o novo processo parte do último snapshot da LSDB)
+        """
+        self._loop.retomar(router_id)
+        self._distancias = None
+        fib = TabelaRotasSimulada(router_id, self._loop)
+        fib.restaurar(self._fibs[router_id].rotas)
+        roteador = self.criar_roteador(router_id, fib)
+        loop_roteador = LoopRoteador(self._loop, router_id)
+        loop_roteador.call_soon(roteador.iniciar_loop, loop_roteador, roteador.canal_envio)
+
+    def derrubar(self, router_id: str):
+        """
+        Simula a queda de um roteador: seus eventos são descartados e seus pacotes deixam de ser enviados/entregues
+        """
+        self._loop.parar(router_id)
+        self._distancias = None
+
+    def distancias_ate(self, destino: str) -> dict[str, int]:
+        """
+        Calcula a distância de cada roteador ativo até o destino, considerando apenas os roteadores ativos (os enlaces são simétricos)
+        """
+        distancias = {destino: 0}
+        fila = [(0, destino)]
+        while fila:
+            distancia, atual = heapq.heappop(fila)
+            if (distancia > distancias[atual]):
+                continue
+            for vizinho, custo in self._vizinhos[atual].items():
+                if (self._loop.parado(vizinho)):
+                    continue
+                nova = distancia + custo
+                if (nova < distancias.get(vizinho, float("inf"))):
+                    distancias[vizinho] = nova
+                    heapq.heappush(fila, (nova, vizinho))
+        return distancias
+
+    def rota(self, router_id: str, destino: str) -> tuple[str, ...]:
+        """
+        Retorna os gateways da rota de maior prefixo do roteador (no plano de dados) que contém a rede de hosts do destino, como o kernel.
+        A rota pode ser um prefixo resumido ou comprimido. Sem rota, retorna uma tupla vazia
+        """
+        endereco = self._enderecos_hosts.get(destino)
+        if (endereco is None):
+            endereco = self._enderecos_hosts[destino] = int(ipaddress.ip_network(self._prefixo_hosts[destino]).network_address)
+        encontrado = self._fibs[router_id].plano_dados.buscar(endereco)
+        return encontrado[1] if (encontrado is not None) else ()
+
+    def rotas_incorretas(self) -> int:
+        """
+        Conta os pares (roteador, destino) ativos cuja rota para a rede de hosts do destino está ausente ou não segue um menor caminho
+
+        A rota de cada par é a de maior prefixo que contém a rede de hosts do destino, e é correta quando, para cada um dos seus gateways, custo(roteador, gateway) + distância(gateway, destino) == distância(roteador, destino)
+        Com mais de uma área, as rotas entre áreas passam pelos ABRs (sem garantir o menor caminho) e são verificadas por encaminhamento_incorreto
+        """
+        ativos = self.ativos
+        if (self._distancias is None):
+            self._distancias = {destino: self.distancias_ate(destino) for destino in ativos}
+        if (self._multiarea):
+            return sum(self.encaminhamento_incorreto(destino) for destino in ativos)
+
+        incorretas = 0
+        for router_id in ativos:
+            vizinhos = self._vizinhos[router_id]
+            for destino in ativos:
+                if (destino == router_id):
+                    continue
+                distancias = self._distancias[destino]
+                gateways = [self._dono_ip.get(ip) for ip in self.rota(router_id, destino)]
+                if (router_id not in distancias):
+                    # Destino inalcançável: não deve haver rota
+                    incorretas += bool(gateways)
+                elif (not gateways or any(gateway not in vizinhos or vizinhos[gateway] + distancias.get(gateway, float("inf")) != distancias[router_id]
+                                          for gateway in gateways)):
+                    incorretas += 1
+        return incorretas
+
+    def encaminhamento_incorreto(self, destino: str) -> int:
+        """
+        Conta os roteadores ativos (que alcançam o destino) cujos pacotes para a rede de hosts do destino não chegam até ele
+
+        Cada roteador encaminha pela rota de maior prefixo que contém a rede de hosts (como o kernel, incluindo os prefixos resumidos),
+        e todos os próximos pulos devem ser vizinhos ativos cujos encaminhamentos também chegam ao destino, sem laços
+        """
+        # Roteadores que encaminham para cada roteador e quantos dos seus próximos pulos ainda não chegam ao destino
+        anteriores = {}
+        pendentes = {}
+        ativos = self.ativos
+        for router_id in ativos:
+            if (router_id == destino):
+                continue
+            vizinhos = self._vizinhos[router_id]
+            gateways = self.rota(router_id, destino)
+            pulos = {self._dono_ip.get(ip) for ip in gateways}
+            if (not pulos or any(pulo not in vizinhos or self._loop.parado(pulo) for pulo in pulos)):
+                continue
+            pendentes[router_id] = len(pulos)
+            for pulo in pulos:
+                anteriores.setdefault(pulo, []).append(router_id)
+
+        # Propaga a partir do destino: um roteador chega ao destino quando todos os seus próximos pulos chegam (os laços nunca chegam)
+        chegam = {destino}
+        fila = [destino]
+        while (fila):
+            for router_id in anteriores.get(fila.pop(), ()):
+                pendentes[router_id] -= 1
+                if (pendentes[router_id] == 0):
+                    chegam.add(router_id)
+                    fila.append(router_id)
+        distancias = self._distancias[destino]
+        return sum(router_id not in chegam for router_id in ativos if router_id in distancias)
+
+    def verificar_kernel(self) -> dict[str, list[dict]]:
+        """
+        Compara o plano de dados de cada roteador ativo com as rotas calculadas (RIB), como o comando `roteador.py verificar`
+
+        Returns:
+            dict[str, list[dict]]: Divergências de cada roteador ativo (ver TabelaRotas.verificar_kernel)
+        """
+        return {router_id: self._roteadores[router_id].verificar_kernel() for router_id in self.ativos}
+
+    def aguardar_sincronizacao(self, router_id: str, limite: float, passo: float = 0.01) -> float | None:
+        """
+        Executa a simulação até que o roteador (reiniciado) conclua o reinício gracioso e sincronize a LSDB com todos os vizinhos ativos
+
+        Args:
+            router_id (str): Roteador aguardado
+            limite (float): Instante (virtual) máximo da execução
+            passo (float, opcional): Intervalo (virtual) entre as verificações, a resolução do instante retornado (Padrão: 0.01)
+
+        Returns:
+            float | None: Instante da conclusão (None caso não tenha concluído até o limite)
+        """
+        roteador = self._roteadores[router_id]
+        while True:
+            ativos = set(self.ativos)
+            if (not roteador.em_reinicio and
+                    all(roteador.sincronizado(vizinho) for vizinho in self._vizinhos[router_id] if vizinho in ativos)):
+                return self._loop.time()
+            if (self._loop.time() >= limite):
+                return None
+            self._loop.executar_ate(min(self._loop.time() + passo, limite))
+
+    def aguardar_alternativos(self, limite: float, passo: float = 0.1):
+        """
+        Executa a simulação até que os roteadores ativos calculem os próximos pulos alternativos (LFA) pendentes, agrupados após os
+        cálculos do SPF (ver LFA_THROTTLE), de forma que as estatísticas dos alternativos correspondam às rotas atuais
+
+        Args:
+            limite (float): Instante (virtual) máximo da execução
+            passo (float, opcional): Intervalo (virtual) entre as verificações (Padrão: 0.1)
+        """
+        while (self._loop.time() < limite and
+               any(self._roteadores[router_id].agendador_lfa.pendente for router_id in self.ativos)):
+            self._loop.executar_ate(min(self._loop.time() + passo, limite))
+
+    def ultima_escrita(self) -> float:
+        """
+        Retorna o instante da última alteração de rotas entre todos os roteadores ativos
+        """
+        return max((self._fibs[router_id].ultima_escrita or 0) for router_id in self.ativos)
+
+    def executar_ate_convergir(self, limite: float, passo: float = 1.0) -> float | None:
+        """
+        Executa a simulação até que todos os roteadores ativos tenham rotas corretas para todos os destinos
+
+        Args:
+            limite (float): Instante (virtual) máximo da simulação
+            passo (float, opcional): Intervalo (virtual) entre as verificações (Padrão: 1)
+
+        Returns:
+            float | None: Instante da última alteração de rotas antes da convergência (None caso não tenha convergido até o limite)
+        """
+        # Instante da última escrita já verificada sem sucesso (sem novas escritas, as rotas continuam incorretas)
+        escrita_verificada = None
+        while (self._loop.time() < limite):
+            escrita_anterior = self.ultima_escrita()
+            self.executar_ate(min(self._loop.time() + passo, limite))
+            escrita = self.ultima_escrita()
+            # A verificação completa é feita apenas quando as tabelas de rotas ficam estáveis durante um passo
+            if (escrita == escrita_anterior and escrita != escrita_verificada):
+                if (self.rotas_incorretas() == 0):
+                    return escrita
+                escrita_verificada = escrita
+        return None
+
+    def estatisticas(self) -> dict:
+        """
+        Retorna os totais de eventos, pacotes, cálculos do SPF e escritas de rotas da simulação
+        """
+        totais = {}
+        for estatisticas in self.estatisticas_roteadores().values():
+            for chave, valor in estatisticas.items():
+                totais[chave] = totais.get(chave, 0) + valor
+        return {
+            "roteadores": len(self._roteadores),
+            "enlaces": len(self._conexoes),
+            "eventos": self._loop.eventos,
+            "pacotes_enviados": self._rede.enviados,
+            "pacotes_entregues": self._rede.entregues,
+            "pacotes_perdidos": self._rede.perdidos,
+            **totais,
+        }
+
+    def tempos_failover(self) -> list[dict]:
+        """
+        Tempos de failover medidos pelos roteadores ativos nas quedas de seus vizinhos
+
+        Returns:
+            list[dict]: Medições de todos os roteadores ativos, identificando o roteador que as mediu
+        """
+        return [
+            {"medido_por": router_id, **tempo}
+            for router_id in self.ativos for tempo in self._roteadores[router_id].tempos_failover
+        ]
+
+    def salvar_rastreamento(self, caminho: str):
+        """
+        Grava em um único arquivo .json (formato de eventos do Chrome) o rastreamento de todos os roteadores, um processo por roteador
+        Os instantes e as durações são medidos no relógio real (time.perf_counter), refletindo o custo de processamento e não o tempo virtual
+        """
+        eventos = []
+        for parametros in self._parametros.values():
+            if (parametros["rastreamento"] is not None):
+                eventos.extend(parametros["rastreamento"].exportar()["traceEvents"])
+        with open(caminho, "w") as arquivo:
+            json.dump({"traceEvents": eventos, "displayTimeUnit": "ms"}, arquivo)
+
+    def estatisticas_roteadores(self) -> dict[str, dict]:
+        """
+        Retorna os contadores de cada roteador (LSAs enviados/recebidos, cálculos do SPF e escritas de rotas)
+        """
+        return {router_id: roteador.estatisticas() for router_id, roteador in self._roteadores.items()}
+
+
+# Função para carregar as conexões de um grafo salvo em .csv (mesmo formato usado pelo compose.py)
+def carregar_conexoes(caminho_csv: str) -> list[tuple[str, str, int]]:
+    conexoes = []
+    with open(caminho_csv, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            conexoes.append((row['no_origem'], row['no_destino'], int(row['peso'])))
+    return conexoes
+
+
+# Função para carregar a área de cada enlace de um grafo salvo em .csv (coluna "area" opcional, a mesma usada pelo compose.py)
+def carregar_areas(caminho_csv: str) -> dict[tuple[str, str], int]:
+    areas = {}
+    with open(caminho_csv, newline='') as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            if (row.get('area')):
+                areas[(row['no_origem'], row['no_destino'])] = int(row['area'])
+    return areas
+
+
+# Função para gerar as conexões de um grafo aleatório com o grau médio informado
+def gerar_conexoes(quant_nos: int, grau_medio: float = 8) -> list[tuple[str, str, int]]:
+    from grafo import gerar_grafo
+
+    grafo = gerar_grafo(quant_nos, prob_conexao=min(0.3, grau_medio / max(quant_nos - 1, 1)))
+    return [(origem, destino, dados["weight"]) for origem, destino, dados in grafo.edges(data=True)]
+
+
+if (__name__ == '__main__'):
+    parser = argparse.ArgumentParser(
+        description="Simula a rede de roteadores em um único processo, sem containers, medindo o tempo de convergência")
+    parser.add_argument("grafo", nargs="?", default="grafos/grafo.csv",
+                        help="Arquivo .csv com a topologia (Padrão: grafos/grafo.csv)")
+    parser.add_argument("--gerar", type=int,
+                        help="Gera uma topologia aleatória com a quantidade de roteadores informada, no lugar do .csv")
+    parser.add_argument("--grau-medio", type=float, default=8,
+                        help="Grau médio da topologia gerada")
+    parser.add_argument("--latencia", type=float, default=0.005,
+                        help="Latência (em segundos) de cada enlace")
+    parser.add_argument("--variacao", type=float, default=0.0,
+                        help="Variação máxima (em segundos) somada aleatoriamente à latência")
+    parser.add_argument("--perda", type=float, default=0.0,
+                        help="Probabilidade de perda de cada pacote (entre 0 e 1)")
+    parser.add_argument("--formato", choices=["binario", "json"], default="binario",
+                        help="Formato preferido dos pacotes")
+    parser.add_argument("--limite", type=float, default=300,
+                        help="Tempo (virtual, em segundos) máximo aguardado pela convergência")
+    parser.add_argument("--derrubar", nargs="*", default=[],
+                        help="Roteadores derrubados após a convergência inicial, medindo a nova convergência")
+    parser.add_argument("--hello", type=float, default=10,
+                        help="Intervalo (em segundos) entre os HELLOs de cada roteador")
+    parser.add_argument("--queda", type=float, default=30,
+                        help="Intervalo (em segundos) sem HELLOs após o qual um vizinho é considerado inativo")
+    parser.add_argument("--bfd", type=float,
+                        help="Ativa as sessões BFD entre vizinhos, com o intervalo (em segundos) informado entre os pacotes de controle")
+    parser.add_argument("--multiplicador", type=int, default=3,
+                        help="Multiplicador de detecção das sessões BFD")
+    parser.add_argument("--maximo-caminhos", type=int, default=4,
+                        help="Quantidade máxima de próximos pulos de mesmo custo (ECMP) em cada rota (1 desativa o ECMP)")
+    parser.add_argument("--sem-compressao", action="store_true",
+                        help="Instala uma rota por prefixo calculado, sem a compressão das rotas de cada roteador")
+    parser.add_argument("--sem-lfa", action="store_true",
+                        help="Desativa o pré-cálculo dos próximos pulos alternativos livres de laços (LFA)")
+    parser.add_argument("--reiniciar", nargs="*", default=[],
+                        help="Roteadores reiniciados após a convergência, medindo a nova convergência e as escritas de rotas")
+    parser.add_argument("--parado", type=float, default=1,
+                        help="Tempo (em segundos) que cada roteador reiniciado fica parado")
+    parser.add_argument("--snapshot", type=float,
+                        help="Ativa os snapshots da LSDB, com o intervalo (em segundos) informado entre as gravações")
+    parser.add_argument("--reinicio-gracioso", type=float,
+                        help="Reinicia os roteadores a partir do snapshot, com o prazo (em segundos) informado para a sincronização com os vizinhos")
+    parser.add_argument("--rastreamento",
+                        help="Arquivo .json onde o rastreamento das etapas de processamento dos LSAs é salvo (formato do chrome://tracing e do Perfetto)")
+    parser.add_argument("--areas", type=int,
+                        help="Divide a topologia na quantidade de áreas informada (como o compose.py), no lugar da coluna \"area\" do .csv")
+    parser.add_argument("--verificar-kernel", action="store_true",
+                        help="Ao final, compara o plano de dados de cada roteador com as rotas calculadas (RIB)")
+    parser.add_argument("--semente", type=int, default=None,
+                        help="Semente dos geradores aleatórios")
+    parser.add_argument("--verbose", action="store_true",
+                        help="Exibe as mensagens de todos os roteadores")
+    args = parser.parse_args()
+
+    if (args.semente is not None):
+        random.seed(args.semente)
+    conexoes = gerar_conexoes(args.gerar, args.grau_medio) if (args.gerar) else carregar_conexoes(args.grafo)
+    formatos = [FORMATO_JSON] if (args.formato == FORMATO_JSON) else FORMATOS_SUPORTADOS
+    areas = carregar_areas(args.grafo) if (not args.gerar) else {}
+    if (args.areas):
+        from compose import definir_areas
+
+        areas = definir_areas(conexoes, args.areas)
+
+    inicio_cpu = time.process_time()
+    inicio = time.perf_counter()
+    simulador = Simulador(conexoes, args.latencia, args.variacao, args.perda, args.semente, formatos,
+                          intervalo_hello=args.hello, intervalo_queda=args.queda,
+                          bfd=(args.bfd, args.multiplicador) if (args.bfd) else None, intervalo_snapshot=args.snapshot,
+                          reinicio_gracioso=args.reinicio_gracioso, maximo_caminhos=args.maximo_caminhos,
+                          comprimir_fib=not args.sem_compressao, lfa=not args.sem_lfa,
+                          rastreamento=args.rastreamento is not None, verbose=args.verbose, areas=areas)
+    print(f"Topologia: {len(simulador.roteadores)} roteadores, {len(conexoes)} enlaces")
+    if (len(set(areas.values())) > 1):
+        abrs = sum(roteador.abr for roteador in simulador.roteadores.values())
+        print(f"Áreas: {len(set(areas.values()))} ({abrs} ABRs)")
+
+    convergencia = simulador.executar_ate_convergir(args.limite)
+    if (convergencia is None):
+        print(f"A rede não convergiu em {args.limite:.0f} s ({simulador.rotas_incorretas()} rotas incorretas)")
+    else:
+        print(f"Convergência inicial: {convergencia:.3f} s (virtual)")
+    estatisticas = simulador.estatisticas()
+    if (not args.sem_lfa and estatisticas["destinos_alcancaveis"]):
+        print(f"Destinos protegidos por um LFA ou por ECMP: {100 * estatisticas['destinos_protegidos'] / estatisticas['destinos_alcancaveis']:.1f}%")
+    if (not args.sem_compressao and estatisticas["rotas_calculadas"]):
+        print(f"Rotas instaladas: {estatisticas['rotas_instaladas']} de {estatisticas['rotas_calculadas']} calculadas "
+              f"({100 * (1 - estatisticas['rotas_instaladas'] / estatisticas['rotas_calculadas']):.1f}% a menos com a compressão)")
+
+    for router_id in args.derrubar:
+        instante_queda = simulador.loop.time()
+        simulador.derrubar(router_id)
+        # Com intervalos curtos, a convergência é verificada com resolução equivalente
+        convergencia = simulador.executar_ate_convergir(instante_queda + args.limite, min(1.0, args.hello, args.bfd or 1.0))
+        if (convergencia is None):
+            print(f"A rede não convergiu após a queda de {router_id} ({simulador.rotas_incorretas()} rotas incorretas)")
+        else:
+            print(f"Convergência após a queda de {router_id}: {convergencia - instante_queda:.3f} s (virtual)")
+
+        # Failover medido pelos vizinhos: do último HELLO recebido até a detecção e até as novas rotas
+        tempos = [tempo for tempo in simulador.tempos_failover() if tempo["roteador"] == router_id]
+        if (tempos):
+            print(f"  Failover nos vizinhos de {router_id}: detecção em até {max(t['deteccao'] for t in tempos):.3f} s, "
+                  f"rotas em até {max(t['rotas'] for t in tempos):.3f} s, total de até {max(t['failover'] for t in tempos):.3f} s")
+            afetados = sum(t["destinos_afetados"] for t in tempos)
+            if (afetados):
+                print(f"  Reparo local: {sum(t['destinos_reparados'] for t in tempos)} de {afetados} destinos afetados "
+                      f"passaram para um alternativo na detecção")
+
+    for router_id in args.reiniciar:
+        # Aguarda um snapshot da LSDB já convergida antes do reinício
+        simulador.executar_ate(simulador.loop.time() + (args.snapshot or 0))
+        # Os contadores do roteador reiniciado recomeçam do zero no novo processo
+        escritas = {router: fib.escritas for router, fib in simulador.fibs.items()}
+        escritas[router_id] = 0
+        instante_queda = simulador.loop.time()
+        simulador.derrubar(router_id)
+        simulador.executar_ate(instante_queda + args.parado)
+        simulador.reiniciar(router_id)
+        instante_reinicio = simulador.loop.time()
+        # Até a conclusão do reinício gracioso (e da sincronização da LSDB), as rotas mantidas no kernel ainda não foram conferidas
+        sincronizacao = simulador.aguardar_sincronizacao(router_id, instante_reinicio + args.limite)
+        if (sincronizacao is None):
+            print(f"{router_id} não concluiu o reinício e a sincronização com os vizinhos em {args.limite:.0f} s")
+            continue
+        convergencia = simulador.executar_ate_convergir(sincronizacao + args.limite, min(1.0, args.hello))
+        if (convergencia is None):
+            print(f"A rede não convergiu após o reinício de {router_id} ({simulador.rotas_incorretas()} rotas incorretas)")
+        else:
+            # A última escrita pode ser anterior ao reinício (nenhuma rota alterada): a rede convergiu com a sincronização
+            print(f"Convergência após o reinício de {router_id}: {max(convergencia, sincronizacao) - instante_reinicio:.3f} s (virtual) "
+                  f"(reinício concluído e LSDB sincronizada em {sincronizacao - instante_reinicio:.3f} s)")
+        # Contadas após a conclusão do reinício e a convergência, incluindo a reconciliação das rotas mantidas no kernel
+        escritas = {router: fib.escritas - escritas[router] for router, fib in simulador.fibs.items()}
+        print(f"  Escritas de rotas após o reinício: {sum(escritas.values())} na rede ({escritas[router_id]} em {router_id})")
+
+    if (args.verificar_kernel):
+        divergencias = simulador.verificar_kernel()
+        print(f"Verificação do plano de dados: {sum(map(len, divergencias.values()))} divergências em "
+              f"{sum(map(bool, divergencias.values()))} de {len(divergencias)} roteadores")
+
+    simulador.aguardar_alternativos(simulador.loop.time() + args.limite)
+    duracao = time.perf_counter() - inicio
+    cpu = time.process_time() - inicio_cpu
+    for chave, valor in simulador.estatisticas().items():
+        print(f"  {chave}: {valor}")
+    print(f"  tempo_virtual: {simulador.loop.time():.1f} s")
+    print(f"  tempo_real: {duracao:.2f} s")
+    print(f"  tempo_cpu: {cpu:.2f} s")
+    if (args.rastreamento):
+        simulador.salvar_rastreamento(args.rastreamento)
+        print(f"Rastreamento salvo em: {args.rastreamento}")